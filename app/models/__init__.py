@@ -67,4 +67,9 @@ from app.models.booking_log import BookingLog
 from app.models.loyalty_ledger import LoyaltyLedger
 from app.models.notification import Notification
 from app.models.folio_item import FolioItem
-from app.models.revenue_forecast import RevenueForecast, ForecastAggregation
\ No newline at end of file
+from app.models.revenue_forecast import RevenueForecast, ForecastAggregation, ForecastAccuracy
+from app.models.report_cache import ReportCache, ReportCacheGeneration
+from app.models.activity_feed import ActivityFeed
+from app.models.daily_kpi import DailyKpi
+from app.models.customer_stats import CustomerStats
+from app.models.booking_pace import BookingPace
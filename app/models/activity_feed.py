@@ -0,0 +1,155 @@
+"""
+Activity feed model module.
+
+This module defines the ActivityFeed model, an append-only timeline of
+hotel activity (booking actions, room status changes and payments), and
+the mapper hooks that write a feed row whenever one of those log records
+is inserted. The dashboard timeline reads the feed with a single indexed
+query instead of merging the underlying log tables on every page view.
+"""
+
+from datetime import datetime
+from sqlalchemy import event, select, literal, func
+
+from db import db
+from app.models import BaseModel
+from app.models.booking import Booking
+from app.models.booking_log import BookingLog
+from app.models.payment import Payment
+from app.models.room import Room
+from app.models.room_status_log import RoomStatusLog
+from app.models.user import User
+
+
+class ActivityFeed(BaseModel):
+    """
+    One entry in the hotel activity timeline.
+
+    Rows are only ever inserted; they carry the display text computed when
+    the activity happened so reading the timeline needs no joins.
+
+    Attributes:
+        id: Primary key
+        activity_type: Kind of activity ('booking', 'room' or 'payment')
+        action: Action name (e.g. 'check_in', 'status_change')
+        description: Human-readable summary
+        details: Secondary line of detail
+        user_id: User who performed the action, if any
+        username: Username at the time of the action, if any
+        source_type: Table the activity was recorded from
+        source_id: ID of the source record
+        occurred_at: When the activity happened
+    """
+
+    __tablename__ = 'activity_feed'
+
+    TYPE_BOOKING = 'booking'
+    TYPE_ROOM = 'room'
+    TYPE_PAYMENT = 'payment'
+
+    activity_type = db.Column(db.String(20), nullable=False)
+    action = db.Column(db.String(30), nullable=False)
+    description = db.Column(db.String(255), nullable=False)
+    details = db.Column(db.String(255), nullable=True)
+    user_id = db.Column(db.Integer, nullable=True)
+    username = db.Column(db.String(64), nullable=True)
+    source_type = db.Column(db.String(30), nullable=False)
+    source_id = db.Column(db.Integer, nullable=False)
+    occurred_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('idx_activity_feed_time', 'occurred_at', 'id'),
+        db.UniqueConstraint('source_type', 'source_id', name='uix_activity_feed_source'),
+    )
+
+    def to_dict(self):
+        """Convert the entry to the dictionary shape used by the dashboards."""
+        return {
+            'id': self.id,
+            'type': self.activity_type,
+            'action': self.action,
+            'description': self.description,
+            'time': self.occurred_at,
+            'user': self.username or 'System',
+            'details': self.details or ''
+        }
+
+    def __repr__(self):
+        """Provide a readable representation of an ActivityFeed instance."""
+        return f'<ActivityFeed {self.activity_type}:{self.action} at {self.occurred_at}>'
+
+
+def _username(user_id):
+    """Scalar subquery for a user's name, NULL when there is no user."""
+    return select(User.username).where(User.id == user_id).scalar_subquery()
+
+
+def _room_number(room_id):
+    """Scalar subquery for a room's number."""
+    return select(Room.number).where(Room.id == room_id).scalar_subquery()
+
+
+def _booking_room_number(booking_id):
+    """Scalar subquery for the number of a booking's room."""
+    return select(Room.number).join(
+        Booking, Booking.room_id == Room.id
+    ).where(Booking.id == booking_id).scalar_subquery()
+
+
+def _append(connection, **values):
+    connection.execute(ActivityFeed.__table__.insert().values(
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow(),
+        **values
+    ))
+
+
+@event.listens_for(BookingLog, 'after_insert')
+def _record_booking_log(mapper, connection, target):
+    _append(
+        connection,
+        activity_type=ActivityFeed.TYPE_BOOKING,
+        action=target.action,
+        description=f"Booking {target.booking_id} {target.action.replace('_', ' ')}",
+        details=func.coalesce(literal('Room ') + _booking_room_number(target.booking_id), ''),
+        user_id=target.user_id,
+        username=_username(target.user_id),
+        source_type=BookingLog.__tablename__,
+        source_id=target.id,
+        occurred_at=target.action_time
+    )
+
+
+@event.listens_for(RoomStatusLog, 'after_insert')
+def _record_room_status_log(mapper, connection, target):
+    _append(
+        connection,
+        activity_type=ActivityFeed.TYPE_ROOM,
+        action='status_change',
+        description=(
+            literal('Room ') + func.coalesce(_room_number(target.room_id), str(target.room_id))
+            + literal(f' status changed to {target.new_status}')
+        ),
+        details=f"From {target.old_status}" if target.old_status else '',
+        user_id=target.changed_by,
+        username=_username(target.changed_by),
+        source_type=RoomStatusLog.__tablename__,
+        source_id=target.id,
+        occurred_at=target.change_time
+    )
+
+
+@event.listens_for(Payment, 'after_insert')
+def _record_payment(mapper, connection, target):
+    _append(
+        connection,
+        activity_type=ActivityFeed.TYPE_PAYMENT,
+        action='payment_processed',
+        description=f"Payment of ${target.amount} processed for booking {target.booking_id}",
+        details=f"Method: {target.payment_type}",
+        user_id=target.processed_by,
+        username=_username(target.processed_by),
+        source_type=Payment.__tablename__,
+        source_id=target.id,
+        occurred_at=target.payment_date
+    )
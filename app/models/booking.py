@@ -170,6 +170,8 @@ class Booking(BaseModel):
         db.Index('idx_bookings_dates', 'room_id', 'check_in_date', 'check_out_date'),
         # Index for customer lookups
         db.Index('idx_bookings_customer', 'customer_id', 'status'),
+        # Index for departure lists by date
+        db.Index('idx_bookings_check_out', 'check_out_date', 'status'),
     )
 
     def __repr__(self):
@@ -440,6 +442,10 @@ class Booking(BaseModel):
         if self.room and self.room.status == self.room.STATUS_BOOKED:
             self.room.change_status(self.room.STATUS_AVAILABLE)
             
+        # Update customer statistics
+        if self.customer:
+            self.customer.update_stats_after_cancellation(self)
+            
         return self
     
     def check_in(self, staff_id=None):
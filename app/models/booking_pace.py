@@ -0,0 +1,46 @@
+"""
+Booking pace model module.
+
+This module defines the BookingPace model, nightly snapshots of the room
+nights and revenue on the books for each future stay date. Comparing the
+snapshots of a stay date over time gives its booking pace, and comparing
+two snapshot dates gives the pickup between them.
+"""
+
+from db import db
+from app.models import BaseModel
+
+
+class BookingPace(BaseModel):
+    """
+    Rooms and revenue on the books for one stay date as of one snapshot date.
+
+    Attributes:
+        id: Primary key
+        snapshot_date: Day the snapshot was taken
+        stay_date: Night the figures are for
+        rooms_on_books: Reserved or in-house room nights for the stay date
+        revenue_on_books: Room revenue of those nights
+    """
+
+    __tablename__ = 'booking_pace'
+
+    snapshot_date = db.Column(db.Date, nullable=False)
+    stay_date = db.Column(db.Date, nullable=False)
+    rooms_on_books = db.Column(db.Integer, nullable=False, default=0)
+    revenue_on_books = db.Column(db.Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        # Pickup reads whole snapshots, pace curves read one stay date across snapshots
+        db.UniqueConstraint('snapshot_date', 'stay_date', name='uix_booking_pace_snapshot_stay'),
+        db.Index('idx_booking_pace_stay', 'stay_date', 'snapshot_date'),
+    )
+
+    @property
+    def days_out(self):
+        """Get the lead time of the snapshot in days."""
+        return (self.stay_date - self.snapshot_date).days
+
+    def __repr__(self):
+        """Provide a readable representation of a BookingPace instance."""
+        return f'<BookingPace {self.stay_date} as of {self.snapshot_date}: {self.rooms_on_books} rooms>'
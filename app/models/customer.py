@@ -8,6 +8,7 @@ import json
 from datetime import datetime
 from db import db
 from app.models import BaseModel
+from app.utils.full_text import register_full_text
 
 
 class Customer(BaseModel):
@@ -104,6 +105,14 @@ class Customer(BaseModel):
         passive_deletes=True
     )
 
+    stats = db.relationship(
+        'CustomerStats',
+        back_populates='customer',
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
     __table_args__ = (
         db.Index('idx_customers_loyalty', 'loyalty_tier', 'loyalty_points'),
     )
@@ -219,6 +228,10 @@ class Customer(BaseModel):
         # Add total spent
         if booking.total_price:
             self.total_spent += booking.total_price
+
+        # Keep the lifetime value aggregate in step
+        from app.models.customer_stats import CustomerStats
+        CustomerStats.record_stay(self, booking)
             
         # Add loyalty points (10 points per dollar spent)
         if booking.total_price:
@@ -233,6 +246,20 @@ class Customer(BaseModel):
             
         return self
     
+    def update_stats_after_cancellation(self, booking):
+        """
+        Update customer statistics after a booking is cancelled.
+        
+        Args:
+            booking: The cancelled booking
+            
+        Returns:
+            Updated customer
+        """
+        from app.models.customer_stats import CustomerStats
+        CustomerStats.record_cancellation(self, booking)
+        return self
+    
     def get_upcoming_bookings(self):
         """
         Get customer's upcoming bookings.
@@ -298,3 +325,7 @@ class Customer(BaseModel):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+
+
+# Guest search reads a full-text index of these columns
+register_full_text(Customer, 'name', 'phone', 'notes')
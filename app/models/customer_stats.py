@@ -0,0 +1,129 @@
+"""
+Customer stats model module.
+
+This module defines the CustomerStats model, a maintained per-customer
+aggregate of lifetime value. It is updated as stays complete and bookings
+are cancelled, so leaderboards and segmentation views read the top rows of
+an index instead of aggregating every booking.
+"""
+
+from datetime import datetime
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import object_session
+from sqlalchemy.sql.expression import ClauseElement
+
+from db import db
+from app.models import BaseModel
+
+
+class CustomerStats(BaseModel):
+    """
+    Lifetime value aggregate for one customer.
+
+    Attributes:
+        id: Primary key
+        customer_id: Foreign key to the Customer model
+        lifetime_spend: Spend on completed stays plus cancellation fees
+        stay_count: Number of completed stays
+        total_nights: Nights across completed stays
+        last_stay_date: Check-out date of the most recent completed stay
+        cancellation_count: Number of cancelled bookings
+    """
+
+    __tablename__ = 'customer_stats'
+
+    customer_id = db.Column(db.Integer, db.ForeignKey('customers.id', ondelete='CASCADE'), nullable=False, unique=True)
+    lifetime_spend = db.Column(db.Float, nullable=False, default=0.0)
+    stay_count = db.Column(db.Integer, nullable=False, default=0)
+    total_nights = db.Column(db.Integer, nullable=False, default=0)
+    last_stay_date = db.Column(db.Date, nullable=True)
+    cancellation_count = db.Column(db.Integer, nullable=False, default=0)
+
+    customer = db.relationship('Customer', back_populates='stats')
+
+    __table_args__ = (
+        # Top-K by value reads the head of this index
+        db.Index('idx_customer_stats_spend', 'lifetime_spend', 'customer_id'),
+        db.Index('idx_customer_stats_last_stay', 'last_stay_date'),
+    )
+
+    @classmethod
+    def for_customer(cls, customer):
+        """
+        Get a customer's stats row, adding an empty one if there is none.
+
+        Args:
+            customer: Customer instance
+
+        Returns:
+            CustomerStats instance
+        """
+        session = object_session(customer) or db.session
+        with session.no_autoflush:
+            stats = customer.stats
+        if stats is None:
+            stats = cls(lifetime_spend=0.0, stay_count=0, total_nights=0, cancellation_count=0)
+            customer.stats = stats
+        return stats
+
+    @classmethod
+    def record_stay(cls, customer, booking):
+        """
+        Add a completed stay to a customer's stats.
+
+        Counters are incremented in SQL so concurrent check-outs for the
+        same customer do not overwrite each other.
+
+        Args:
+            customer: Customer who stayed
+            booking: The completed booking
+        """
+        stats = cls.for_customer(customer)
+        check_out = booking.check_out_date
+        if isinstance(check_out, datetime):
+            check_out = check_out.date()
+
+        if stats.last_stay_date is None or (check_out and check_out > stats.last_stay_date):
+            stats.last_stay_date = check_out
+        stats._increment('lifetime_spend', booking.total_price or 0.0)
+        stats._increment('stay_count', 1)
+        stats._increment('total_nights', max(booking.nights or 0, 0))
+
+    @classmethod
+    def record_cancellation(cls, customer, booking):
+        """
+        Add a cancelled booking, and any fee charged for it, to a customer's stats.
+
+        Args:
+            customer: Customer whose booking was cancelled
+            booking: The cancelled booking
+        """
+        stats = cls.for_customer(customer)
+        stats._increment('lifetime_spend', booking.cancellation_fee or 0.0)
+        stats._increment('cancellation_count', 1)
+
+    def _increment(self, name, amount):
+        """Add to a counter, as a SQL increment once the row exists."""
+        pending = self.__dict__.get(name)
+        if not sa_inspect(self).persistent:
+            setattr(self, name, (pending or 0) + amount)
+        elif isinstance(pending, ClauseElement):
+            # Already incremented in this flush; add to the same expression
+            setattr(self, name, pending + amount)
+        else:
+            setattr(self, name, getattr(type(self), name) + amount)
+
+    def to_dict(self):
+        """Convert the stats to a dictionary."""
+        return {
+            'customer_id': self.customer_id,
+            'lifetime_spend': self.lifetime_spend,
+            'stay_count': self.stay_count,
+            'total_nights': self.total_nights,
+            'last_stay_date': self.last_stay_date,
+            'cancellation_count': self.cancellation_count
+        }
+
+    def __repr__(self):
+        """Provide a readable representation of a CustomerStats instance."""
+        return f'<CustomerStats customer={self.customer_id} spend={self.lifetime_spend}>'
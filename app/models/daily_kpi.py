@@ -0,0 +1,89 @@
+"""
+Daily KPI model module.
+
+This module defines the DailyKpi model, a snapshot of the hotel's key
+performance indicators for one business day. Snapshots are written by the
+night audit once the day has closed, so analytics over months or years
+read one row per day instead of re-aggregating the booking history.
+"""
+
+import json
+
+from db import db
+from app.models import BaseModel
+
+
+class DailyKpi(BaseModel):
+    """
+    Key performance indicators for one business day.
+
+    A room night belongs to the business day it starts on: a booking from
+    the 1st to the 3rd sells the nights of the 1st and the 2nd. Revenue is
+    the booking's total price spread evenly over its nights.
+
+    Attributes:
+        id: Primary key
+        business_date: Day the figures are for
+        total_rooms: Rooms in inventory when the snapshot was taken
+        rooms_sold: Room nights sold for the day
+        room_revenue: Room revenue earned for the day
+        occupancy_rate: Rooms sold as a percentage of total rooms
+        adr: Average daily rate (room revenue per room sold)
+        revpar: Revenue per available room
+        arrivals: Bookings starting on the day
+        departures: Bookings ending on the day
+        cancellations: Bookings cancelled during the day
+        no_shows: Bookings due on the day that were marked as no-shows
+        revenue_by_source_json: JSON mapping of booking source to room revenue
+    """
+
+    __tablename__ = 'daily_kpis'
+
+    business_date = db.Column(db.Date, nullable=False, unique=True)
+    total_rooms = db.Column(db.Integer, nullable=False, default=0)
+    rooms_sold = db.Column(db.Integer, nullable=False, default=0)
+    room_revenue = db.Column(db.Float, nullable=False, default=0.0)
+    occupancy_rate = db.Column(db.Float, nullable=False, default=0.0)
+    adr = db.Column(db.Float, nullable=False, default=0.0)
+    revpar = db.Column(db.Float, nullable=False, default=0.0)
+    arrivals = db.Column(db.Integer, nullable=False, default=0)
+    departures = db.Column(db.Integer, nullable=False, default=0)
+    cancellations = db.Column(db.Integer, nullable=False, default=0)
+    no_shows = db.Column(db.Integer, nullable=False, default=0)
+    revenue_by_source_json = db.Column(db.Text, nullable=True)
+
+    @property
+    def revenue_by_source(self):
+        """Get room revenue per booking source as a dictionary."""
+        if not self.revenue_by_source_json:
+            return {}
+        try:
+            return json.loads(self.revenue_by_source_json)
+        except (TypeError, ValueError):
+            return {}
+
+    @revenue_by_source.setter
+    def revenue_by_source(self, value):
+        """Store room revenue per booking source as JSON."""
+        self.revenue_by_source_json = json.dumps(value or {})
+
+    def to_dict(self):
+        """Convert the snapshot to a dictionary."""
+        return {
+            'business_date': self.business_date,
+            'total_rooms': self.total_rooms,
+            'rooms_sold': self.rooms_sold,
+            'room_revenue': self.room_revenue,
+            'occupancy_rate': self.occupancy_rate,
+            'adr': self.adr,
+            'revpar': self.revpar,
+            'arrivals': self.arrivals,
+            'departures': self.departures,
+            'cancellations': self.cancellations,
+            'no_shows': self.no_shows,
+            'revenue_by_source': self.revenue_by_source
+        }
+
+    def __repr__(self):
+        """Provide a readable representation of a DailyKpi instance."""
+        return f'<DailyKpi {self.business_date} occupancy={self.occupancy_rate}%>'
@@ -8,6 +8,7 @@ from datetime import datetime
 from sqlalchemy import ForeignKey, Index
 from db import db
 from app.models import BaseModel
+from app.utils.full_text import register_full_text
 
 
 class HousekeepingTask(BaseModel):
@@ -58,4 +59,8 @@ class HousekeepingTask(BaseModel):
 
     def __repr__(self):
         """Provide a readable representation of a HousekeepingTask instance."""
-        return f'<HousekeepingTask id={self.id}, room_id={self.room_id}, status={self.status}>' 
\ No newline at end of file
+        return f'<HousekeepingTask id={self.id}, room_id={self.room_id}, status={self.status}>'
+
+
+# Task search reads a full-text index of these columns
+register_full_text(HousekeepingTask, 'description', 'notes')
@@ -8,6 +8,7 @@ from datetime import datetime
 from sqlalchemy import ForeignKey, Index
 from db import db
 from app.models import BaseModel
+from app.utils.full_text import register_full_text
 
 
 class MaintenanceRequest(BaseModel):
@@ -55,4 +56,8 @@ class MaintenanceRequest(BaseModel):
 
     def __repr__(self):
         """Provide a readable representation of a MaintenanceRequest instance."""
-        return f'<MaintenanceRequest id={self.id}, room_id={self.room_id}, status={self.status}>' 
\ No newline at end of file
+        return f'<MaintenanceRequest id={self.id}, room_id={self.room_id}, status={self.status}>'
+
+
+# Request search reads a full-text index of these columns
+register_full_text(MaintenanceRequest, 'description', 'notes')
@@ -0,0 +1,324 @@
+"""
+Report cache model module.
+
+This module defines the ReportCache model, which stores computed report
+results for closed periods, and the session hooks that invalidate cached
+periods when the bookings behind them change and that hold back cache
+writes until the data they were computed from has committed. A global
+generation counter, bumped by every invalidation, stops a report built
+before a concurrent invalidation from being stored after it.
+"""
+
+from datetime import datetime, date
+from sqlalchemy import event, delete, insert, select, update, and_, inspect as sa_inspect
+from sqlalchemy.orm import Session
+
+from db import db
+from app.models import BaseModel
+from app.models.booking import Booking
+from app.models.room import Room
+from app.models.room_type import RoomType
+
+
+class ReportCache(BaseModel):
+    """
+    Cached result of a report for one period.
+
+    Only periods that have fully ended are cached. Entries are removed when
+    a booking overlapping the period is inserted, updated or deleted.
+
+    Attributes:
+        id: Primary key
+        report_type: Report name (e.g. 'monthly', 'occupancy', 'revenue')
+        period_start: First day of the report period
+        period_end: Last day of the report period (inclusive)
+        data_version: Format version the payload was computed with
+        payload: JSON-serialized report result
+    """
+
+    __tablename__ = 'report_cache'
+
+    # Bump whenever the structure or calculation of a cached report changes
+    DATA_VERSION = 1
+
+    report_type = db.Column(db.String(50), nullable=False)
+    period_start = db.Column(db.Date, nullable=False)
+    period_end = db.Column(db.Date, nullable=False)
+    data_version = db.Column(db.Integer, nullable=False, default=DATA_VERSION)
+    payload = db.Column(db.JSON, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint('report_type', 'period_start', 'period_end', name='uix_report_cache_period'),
+        db.Index('idx_report_cache_period', 'period_start', 'period_end'),
+    )
+
+    def __repr__(self):
+        """Provide a readable representation of a ReportCache instance."""
+        return f'<ReportCache {self.report_type} {self.period_start} to {self.period_end}>'
+
+
+class ReportCacheGeneration(BaseModel):
+    """
+    Counter bumped whenever cached report periods are invalidated.
+
+    The table holds a single row. A report is only stored if the counter
+    still has the value it had before the report was built.
+
+    Attributes:
+        id: Primary key (always GENERATION_ROW_ID)
+        generation: Number of invalidations so far
+    """
+
+    __tablename__ = 'report_cache_generation'
+
+    GENERATION_ROW_ID = 1
+
+    generation = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        """Provide a readable representation of a ReportCacheGeneration instance."""
+        return f'<ReportCacheGeneration {self.generation}>'
+
+
+# Session key holding the spans to invalidate once the flush has run
+_STALE_SPANS_KEY = 'report_cache_stale_spans'
+
+# Session key set while the transaction holds flushed or bulk writes
+_HAS_WRITES_KEY = 'report_cache_has_writes'
+
+# Session key holding cache rows to write once the transaction commits
+_QUEUED_KEY = 'report_cache_queued'
+
+# Marker span meaning every cached period is stale
+_ALL_PERIODS = (date.min, date.max)
+
+
+def current_generation(session):
+    """
+    Read the cache generation, to be passed to store_report later.
+
+    Args:
+        session: Database session the report is built with
+
+    Returns:
+        int: Current generation (0 before the first invalidation)
+    """
+    table = ReportCacheGeneration.__table__
+    generation = session.execute(
+        select(table.c.generation).where(table.c.id == ReportCacheGeneration.GENERATION_ROW_ID)
+    ).scalar()
+    return generation or 0
+
+
+def _bump_generation(connection):
+    """Advance the cache generation inside the invalidating transaction."""
+    table = ReportCacheGeneration.__table__
+    result = connection.execute(
+        update(table)
+        .where(table.c.id == ReportCacheGeneration.GENERATION_ROW_ID)
+        .values(generation=table.c.generation + 1)
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(table).values(id=ReportCacheGeneration.GENERATION_ROW_ID, generation=1))
+
+
+def _claim_generation(cache_session, generation):
+    """
+    Lock the generation row if it still has the expected value.
+
+    The UPDATE waits for an invalidating transaction holding the row to
+    finish and then matches nothing if that transaction bumped it; the
+    lock it takes keeps new invalidations out until the write commits.
+    """
+    table = ReportCacheGeneration.__table__
+    claimed = cache_session.execute(
+        update(table)
+        .where(table.c.id == ReportCacheGeneration.GENERATION_ROW_ID, table.c.generation == generation)
+        .values(generation=table.c.generation)
+    ).rowcount
+    if claimed:
+        return True
+
+    row_exists = cache_session.execute(
+        select(table.c.id).where(table.c.id == ReportCacheGeneration.GENERATION_ROW_ID)
+    ).first() is not None
+    if row_exists or generation != 0:
+        return False
+
+    # Nothing has been invalidated yet and the row was never created
+    cache_session.execute(insert(table).values(id=ReportCacheGeneration.GENERATION_ROW_ID, generation=0))
+    return True
+
+
+def _write_entry(bind, generation, report_type, period_start, period_end, payload):
+    """Insert or update a cache row through a session of its own, unless the generation moved on."""
+    try:
+        with Session(bind=bind) as cache_session:
+            if not _claim_generation(cache_session, generation):
+                # A booking change invalidated the cache while the report was built
+                return
+
+            stored = cache_session.execute(
+                select(ReportCache).filter_by(
+                    report_type=report_type,
+                    period_start=period_start,
+                    period_end=period_end
+                )
+            ).scalar_one_or_none()
+            if stored is None:
+                stored = ReportCache(
+                    report_type=report_type,
+                    period_start=period_start,
+                    period_end=period_end
+                )
+                cache_session.add(stored)
+            stored.data_version = ReportCache.DATA_VERSION
+            stored.payload = payload
+            cache_session.commit()
+    except Exception as e:
+        # A failed cache write must never fail the report itself
+        print(f"Error caching {report_type} report: {str(e)}")
+
+
+def store_report(session, generation, report_type, period_start, period_end, payload):
+    """
+    Save a computed report in the cache.
+
+    The row is written through a separate session so that caching never
+    commits or rolls back the caller's transaction. If that transaction
+    holds uncommitted writes, the report may reflect changes that can
+    still roll back, and a separate write could wait on rows the caller
+    has locked, so the write is queued until the session commits instead.
+    Queued writes are dropped on rollback. Either way the write is skipped
+    if any period was invalidated after the generation was read.
+
+    Args:
+        session: The caller's database session
+        generation: Value of current_generation read before building the report
+        report_type: Report name
+        period_start: First day of the period
+        period_end: Last day of the period (inclusive)
+        payload: Report result
+    """
+    if session.new or session.dirty or session.deleted or session.info.get(_HAS_WRITES_KEY):
+        queued = session.info.setdefault(_QUEUED_KEY, {})
+        queued[(report_type, period_start, period_end)] = (generation, payload)
+        return
+
+    _write_entry(session.get_bind(), generation, report_type, period_start, period_end, payload)
+
+
+def _as_date(value):
+    """Convert a date or datetime to a date; pass None through."""
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _attribute_values(obj, name):
+    """Return the current and previously persisted values of an attribute."""
+    history = sa_inspect(obj).attrs[name].history
+    values = list(history.added) + list(history.unchanged) + list(history.deleted)
+    return [_as_date(value) for value in values if value is not None]
+
+
+def _booking_spans(booking):
+    """Return the date spans whose reports a booking change can affect."""
+    stay_dates = (_attribute_values(booking, 'check_in_date')
+                  + _attribute_values(booking, 'check_out_date'))
+    spans = []
+    if stay_dates:
+        spans.append((min(stay_dates), max(stay_dates)))
+
+    # Reports also count bookings by creation and last update date
+    for name in ('created_at', 'updated_at'):
+        spans.extend((day, day) for day in _attribute_values(booking, name))
+    return spans
+
+
+def _load_previous_stay_date(target, value, oldvalue, initiator):
+    """No-op set hook; registering it with active_history keeps old dates in history."""
+
+
+# Load the previous stay dates on assignment so moved bookings also
+# invalidate the period they were moved out of
+for _attribute in (Booking.check_in_date, Booking.check_out_date):
+    event.listen(_attribute, 'set', _load_previous_stay_date, active_history=True)
+
+
+@event.listens_for(Session, 'before_flush')
+def _collect_stale_report_periods(session, flush_context, instances):
+    """Record which cached periods the pending changes make stale."""
+    spans = session.info.setdefault(_STALE_SPANS_KEY, set())
+
+    with session.no_autoflush:
+        for obj in list(session.new) + list(session.deleted):
+            if isinstance(obj, Booking):
+                spans.update(_booking_spans(obj))
+            elif isinstance(obj, Room):
+                # Room count changes every occupancy rate
+                spans.add(_ALL_PERIODS)
+
+        for obj in session.dirty:
+            if isinstance(obj, Booking) and session.is_modified(obj):
+                spans.update(_booking_spans(obj))
+            elif isinstance(obj, RoomType) and sa_inspect(obj).attrs.base_rate.history.has_changes():
+                # Revenue is computed from base rates
+                spans.add(_ALL_PERIODS)
+
+    if not spans:
+        session.info.pop(_STALE_SPANS_KEY, None)
+
+
+@event.listens_for(Session, 'after_flush')
+def _invalidate_stale_report_periods(session, flush_context):
+    """Delete cached reports overlapping the spans recorded before the flush."""
+    session.info[_HAS_WRITES_KEY] = True
+    spans = session.info.pop(_STALE_SPANS_KEY, None)
+    if not spans:
+        return
+
+    # Reports built before this point, including ones queued on this
+    # session, no longer match the generation they were built at
+    _bump_generation(session.connection())
+
+    table = ReportCache.__table__
+    if _ALL_PERIODS in spans:
+        session.connection().execute(delete(table))
+        return
+
+    for first_day, last_day in spans:
+        session.connection().execute(
+            delete(table).where(and_(
+                table.c.period_start <= last_day,
+                table.c.period_end >= first_day
+            ))
+        )
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _mark_bulk_writes(orm_execute_state):
+    """Treat bulk statements like flushed changes when deciding to queue cache writes."""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_HAS_WRITES_KEY] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _write_queued_reports(session):
+    """Write the cache rows queued while the transaction held changes."""
+    session.info.pop(_HAS_WRITES_KEY, None)
+    queued = session.info.pop(_QUEUED_KEY, None)
+    if not queued:
+        return
+
+    bind = session.get_bind()
+    for (report_type, period_start, period_end), (generation, payload) in queued.items():
+        _write_entry(bind, generation, report_type, period_start, period_end, payload)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_queued_reports(session, previous_transaction):
+    """Drop queued cache rows whose data was rolled back."""
+    session.info.pop(_QUEUED_KEY, None)
+    if previous_transaction.parent is None:
+        session.info.pop(_HAS_WRITES_KEY, None)
@@ -1,7 +1,8 @@
 """
 Revenue Forecast model module.
 
-This module defines the RevenueForecast model for storing predicted occupancy and revenue data.
+This module defines the RevenueForecast model for storing predicted occupancy and revenue data,
+with its period aggregations and running accuracy aggregates.
 """
 
 from datetime import datetime
@@ -170,4 +171,93 @@ class ForecastAggregation(BaseModel):
 
     def __repr__(self):
         """Provide a readable representation of a ForecastAggregation instance."""
-        return f'<ForecastAggregation {self.period_type} from {self.period_start} to {self.period_end}>' 
\ No newline at end of file
+        return f'<ForecastAggregation {self.period_type} from {self.period_start} to {self.period_end}>' 
+
+
+class ForecastAccuracy(BaseModel):
+    """
+    Running forecast error aggregates for one forecast horizon bucket.
+    
+    Each forecast is added once, when its actuals are recorded, so reading
+    MAPE, bias and RMSE never rescans the forecast history. Errors are
+    measured on room revenue as predicted minus actual; percentage errors
+    are relative to the prediction, like RevenueForecast.accuracy_score.
+    
+    Attributes:
+        id: Primary key
+        horizon_bucket: Lead time bucket label (e.g. '0-7' days)
+        forecast_count: Number of forecasts recorded
+        sum_error: Sum of errors (for bias)
+        sum_abs_error: Sum of absolute errors (for MAE)
+        sum_squared_error: Sum of squared errors (for RMSE)
+        pct_error_count: Number of forecasts with a non-zero prediction
+        sum_abs_pct_error: Sum of absolute percentage errors (for MAPE)
+    """
+
+    __tablename__ = 'forecast_accuracy'
+
+    # (label, shortest lead time, longest lead time) in days, open-ended last
+    HORIZON_BUCKETS = [
+        ('0-7', 0, 7),
+        ('8-30', 8, 30),
+        ('31-90', 31, 90),
+        ('91+', 91, None)
+    ]
+
+    horizon_bucket = db.Column(db.String(10), nullable=False, unique=True)
+    forecast_count = db.Column(db.Integer, nullable=False, default=0)
+    sum_error = db.Column(db.Float, nullable=False, default=0.0)
+    sum_abs_error = db.Column(db.Float, nullable=False, default=0.0)
+    sum_squared_error = db.Column(db.Float, nullable=False, default=0.0)
+    pct_error_count = db.Column(db.Integer, nullable=False, default=0)
+    sum_abs_pct_error = db.Column(db.Float, nullable=False, default=0.0)
+
+    def __repr__(self):
+        """Provide a readable representation of a ForecastAccuracy instance."""
+        return f'<ForecastAccuracy {self.horizon_bucket} days: {self.forecast_count} forecasts>'
+
+    @classmethod
+    def bucket_for(cls, lead_days):
+        """Get the label of the bucket a lead time in days falls into."""
+        lead_days = max(lead_days, 0)
+        for label, shortest, longest in cls.HORIZON_BUCKETS:
+            if lead_days >= shortest and (longest is None or lead_days <= longest):
+                return label
+        return cls.HORIZON_BUCKETS[-1][0]
+
+    def add(self, predicted, actual):
+        """
+        Add one forecast's error to the running aggregates.
+        
+        Args:
+            predicted: Predicted room revenue
+            actual: Actual room revenue
+        """
+        error = predicted - actual
+        self.forecast_count = (self.forecast_count or 0) + 1
+        self.sum_error = (self.sum_error or 0.0) + error
+        self.sum_abs_error = (self.sum_abs_error or 0.0) + abs(error)
+        self.sum_squared_error = (self.sum_squared_error or 0.0) + error * error
+        if predicted:
+            self.pct_error_count = (self.pct_error_count or 0) + 1
+            self.sum_abs_pct_error = (self.sum_abs_pct_error or 0.0) + abs(error / predicted) * 100
+
+    @property
+    def mape(self):
+        """Mean absolute percentage error."""
+        return self.sum_abs_pct_error / self.pct_error_count if self.pct_error_count else None
+
+    @property
+    def bias(self):
+        """Mean error; positive when forecasts run high."""
+        return self.sum_error / self.forecast_count if self.forecast_count else None
+
+    @property
+    def mae(self):
+        """Mean absolute error."""
+        return self.sum_abs_error / self.forecast_count if self.forecast_count else None
+
+    @property
+    def rmse(self):
+        """Root mean squared error."""
+        return (self.sum_squared_error / self.forecast_count) ** 0.5 if self.forecast_count else None
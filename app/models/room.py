@@ -201,6 +201,17 @@ class Room(BaseModel):
             self.STATUS_MAINTENANCE,
             self.STATUS_OUT_OF_SERVICE
         ]
+    
+    @property
+    def floor(self):
+        """Get the floor the room is on, derived from its number."""
+        return self.floor_for_number(self.number)
+    
+    @staticmethod
+    def floor_for_number(number):
+        """Derive a floor from a room number, e.g. '1204' is on floor 12."""
+        digits = ''.join(ch for ch in str(number or '') if ch.isdigit())
+        return int(digits[:-2]) if len(digits) > 2 else 0
         
     def to_dict(self):
         """
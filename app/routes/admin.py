@@ -4,13 +4,13 @@ Admin routes module.
 This module defines the routes for admin operations.
 """
 
-from datetime import datetime, timedelta
-import io
-import csv
-from flask import Blueprint, jsonify, render_template, redirect, url_for, flash, request, send_file, Response, render_template_string
+from datetime import datetime, timedelta, date
+from calendar import monthrange
+from flask import Blueprint, jsonify, render_template, redirect, url_for, flash, request, send_file, Response, render_template_string, stream_with_context
 from flask_login import login_required, current_user
 from sqlalchemy import func, desc, extract, case, and_, or_
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, contains_eager
 
 from app.utils.decorators import role_required
 from app.services.dashboard_service import DashboardService
@@ -207,10 +207,12 @@ def roles():
 def guests():
     """Manage guest information."""
     from app.models.customer import Customer
+    from app.models.customer_stats import CustomerStats
     from app.models.user import User
     
     # Get filter parameters
     search_query = request.args.get('q', '')
+    sort = request.args.get('sort', 'name')
     
     # Base query - join with users to get email
     query = db.session.query(Customer, User).join(User, Customer.user_id == User.id)
@@ -229,12 +231,23 @@ def guests():
     # Get paginated results
     page = request.args.get('page', 1, type=int)
     per_page = 20
-    pagination = query.order_by(Customer.name).paginate(page=page, per_page=per_page, error_out=False)
+    if sort == 'value':
+        # Rank by lifetime value from the maintained customer stats; guests
+        # without stats yet are listed last rather than dropped
+        query = query.outerjoin(CustomerStats, CustomerStats.customer_id == Customer.id).options(
+            contains_eager(Customer.stats)
+        ).order_by(
+            CustomerStats.lifetime_spend.desc().nulls_last(), Customer.id.desc()
+        )
+    else:
+        query = query.options(joinedload(Customer.stats)).order_by(Customer.name)
+    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
     
     return render_template(
         'admin/guests.html',
         pagination=pagination,
-        search_query=search_query
+        search_query=search_query,
+        sort=sort
     )
 
 
@@ -647,167 +660,35 @@ def export_report():
             )
             
         elif format_type == 'csv':
-            # Create a CSV in memory
-            output = io.StringIO()
-            writer = csv.writer(output)
-            
-            # Write headers
-            writer.writerow(['Hotel Monthly Report', f'{month_name} {year}'])
-            writer.writerow([])
-            
-            # Write revenue summary
-            writer.writerow(['Revenue Summary'])
-            writer.writerow(['Category', 'Amount'])
-            writer.writerow(['Total Revenue', f"${report_data['revenue_summary']['total_revenue']:.2f}"])
-            writer.writerow(['Room Revenue', f"${report_data['revenue_summary']['room_revenue']:.2f}"])
-            
-            # Write occupancy summary
-            writer.writerow([])
-            writer.writerow(['Occupancy Summary'])
-            writer.writerow(['Metric', 'Value'])
-            writer.writerow(['Average Occupancy Rate', f"{report_data['occupancy_summary']['average_occupancy_rate']:.2f}%"])
-            writer.writerow(['Peak Occupancy Date', report_data['occupancy_summary']['peak_occupancy_date']])
-            writer.writerow(['Peak Occupancy Rate', f"{report_data['occupancy_summary']['peak_occupancy_rate']:.2f}%"])
-            writer.writerow(['Total Room Nights', report_data['occupancy_summary']['total_room_nights']])
-            
-            # Write booking summary
-            writer.writerow([])
-            writer.writerow(['Booking Summary'])
-            writer.writerow(['Metric', 'Value'])
-            writer.writerow(['Total Bookings', report_data['booking_summary']['total_bookings']])
-            writer.writerow(['New Bookings', report_data['booking_summary']['new_bookings']])
-            writer.writerow(['Cancelled Bookings', report_data['booking_summary']['cancelled_bookings']])
-            writer.writerow(['Completed Stays', report_data['booking_summary']['completed_stays']])
-            
-            # Write room type revenue
-            writer.writerow([])
-            writer.writerow(['Room Type Revenue'])
-            writer.writerow(['Room Type', 'Revenue', 'Percentage'])
-            for room_type, data in report_data['room_type_revenue'].items():
-                writer.writerow([room_type, f"${data['revenue']:.2f}", f"{data['percentage']:.2f}%"])
-            
-            # Set the file pointer at the beginning
-            output.seek(0)
+            # Stream the CSV row by row instead of building it in memory
+            _, last_day = monthrange(year, month)
+            rows = report_service.iter_monthly_report_rows(
+                report_data,
+                f'{month_name} {year}',
+                date(year, month, 1),
+                date(year, month, last_day)
+            )
             
             return Response(
-                output,
+                stream_with_context(report_service.iter_csv(rows)),
                 mimetype="text/csv",
                 headers={"Content-Disposition": f"attachment;filename={filename}.csv"}
             )
             
         elif format_type == 'excel':
-            # For Excel, we'll use pandas which is more robust for Excel files
+            # Rows are written in constant-memory mode to a temporary file
             try:
-                import pandas as pd
-                from io import BytesIO
-                
-                # Create an Excel writer with multiple sheets
-                output = BytesIO()
-                with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                    # Add a title sheet
-                    title_data = {
-                        'Title': [f'Hotel Monthly Report - {month_name} {year}', '']
-                    }
-                    title_df = pd.DataFrame(title_data)
-                    title_df.to_excel(writer, sheet_name='Report Info', index=False)
-                    
-                    # Format the title sheet
-                    title_sheet = writer.sheets['Report Info']
-                    title_sheet.set_column(0, 0, 50)
-                    title_format = writer.book.add_format({
-                        'bold': True,
-                        'font_size': 16
-                    })
-                    title_sheet.write('A1', f'Hotel Monthly Report - {month_name} {year}', title_format)
-                    title_sheet.write('A2', f'Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}')
-                    
-                    # Summary sheet
-                    summary_data = {
-                        'Metric': [
-                            'Total Revenue', 'Room Revenue', 
-                            'Average Occupancy Rate', 'Peak Occupancy Date', 'Peak Occupancy Rate',
-                            'Total Room Nights', 'Total Bookings', 'New Bookings',
-                            'Cancelled Bookings', 'Completed Stays'
-                        ],
-                        'Value': [
-                            f"${report_data['revenue_summary']['total_revenue']:.2f}",
-                            f"${report_data['revenue_summary']['room_revenue']:.2f}",
-                            f"{report_data['occupancy_summary']['average_occupancy_rate']:.2f}%",
-                            report_data['occupancy_summary']['peak_occupancy_date'],
-                            f"{report_data['occupancy_summary']['peak_occupancy_rate']:.2f}%",
-                            report_data['occupancy_summary']['total_room_nights'],
-                            report_data['booking_summary']['total_bookings'],
-                            report_data['booking_summary']['new_bookings'],
-                            report_data['booking_summary']['cancelled_bookings'],
-                            report_data['booking_summary']['completed_stays']
-                        ]
-                    }
-                    summary_df = pd.DataFrame(summary_data)
-                    summary_df.to_excel(writer, sheet_name='Summary', index=False)
-                    
-                    # Room Type Revenue sheet
-                    room_type_data = {
-                        'Room Type': [],
-                        'Revenue': [],
-                        'Percentage': []
-                    }
-                    for room_type, data in report_data['room_type_revenue'].items():
-                        room_type_data['Room Type'].append(room_type)
-                        room_type_data['Revenue'].append(f"${data['revenue']:.2f}")
-                        room_type_data['Percentage'].append(f"{data['percentage']:.2f}%")
-                    
-                    room_type_df = pd.DataFrame(room_type_data)
-                    room_type_df.to_excel(writer, sheet_name='Room Type Revenue', index=False)
-                    
-                    # Daily occupancy sheet
-                    daily_data = {
-                        'Date': list(report_data['daily_occupancy'].keys()),
-                        'Occupancy Rate': [f"{rate:.2f}%" for rate in report_data['daily_occupancy'].values()]
-                    }
-                    daily_df = pd.DataFrame(daily_data)
-                    daily_df.to_excel(writer, sheet_name='Daily Occupancy', index=False)
-                    
-                    # Format the sheets
-                    workbook = writer.book
-                    header_format = workbook.add_format({
-                        'bold': True,
-                        'text_wrap': True,
-                        'valign': 'top',
-                        'fg_color': '#D7E4BC',
-                        'border': 1
-                    })
-                    
-                    # Format each sheet individually
-                    for sheet_name in writer.sheets:
-                        worksheet = writer.sheets[sheet_name]
-                        
-                        if sheet_name == 'Report Info':
-                            # Format title sheet
-                            worksheet.set_column(0, 0, 50)
-                        elif sheet_name == 'Summary':
-                            # Format summary sheet
-                            worksheet.set_column(0, 0, 25)  # Metric column
-                            worksheet.set_column(1, 1, 20)  # Value column
-                            # Apply header format to first row
-                            worksheet.write(0, 0, 'Metric', header_format)
-                            worksheet.write(0, 1, 'Value', header_format)
-                        elif sheet_name == 'Room Type Revenue':
-                            # Format room type revenue sheet
-                            worksheet.set_column(0, 0, 20)  # Room Type column
-                            worksheet.set_column(1, 1, 15)  # Revenue column
-                            worksheet.set_column(2, 2, 15)  # Percentage column
-                            # Apply header format to first row
-                            worksheet.write(0, 0, 'Room Type', header_format)
-                            worksheet.write(0, 1, 'Revenue', header_format)
-                            worksheet.write(0, 2, 'Percentage', header_format)
-                        elif sheet_name == 'Daily Occupancy':
-                            # Format daily occupancy sheet
-                            worksheet.set_column(0, 0, 15)  # Date column
-                            worksheet.set_column(1, 1, 18)  # Occupancy Rate column
-                            # Apply header format to first row
-                            worksheet.write(0, 0, 'Date', header_format)
-                            worksheet.write(0, 1, 'Occupancy Rate', header_format)
+                import tempfile
                 
+                _, last_day = monthrange(year, month)
+                output = tempfile.TemporaryFile()
+                report_service.export_monthly_report_to_excel(
+                    report_data,
+                    f'{month_name} {year}',
+                    date(year, month, 1),
+                    date(year, month, last_day),
+                    output
+                )
                 output.seek(0)
                 
                 return send_file(
@@ -818,7 +699,7 @@ def export_report():
                 )
                 
             except ImportError as e:
-                missing_module = str(e).split("'")[1] if "'" in str(e) else "pandas or xlsxwriter"
+                missing_module = str(e).split("'")[1] if "'" in str(e) else "xlsxwriter"
                 flash(f"Excel export requires {missing_module}. Please install it using 'pip install {missing_module}'. Defaulting to CSV.", "warning")
                 return redirect(url_for('admin.export_report', month=month, year=year, format='csv'))
         
@@ -10,11 +10,12 @@ from datetime import datetime, timedelta
 from sqlalchemy import func
 
 from app.utils.decorators import role_required
+from app.utils.event_bus import live_event_response
 from app.services.dashboard_service import DashboardService
 from app.services.housekeeping_service import HousekeepingService
+from app.services.cleaning_schedule_service import CleaningScheduleService
 from app.services.maintenance_service import MaintenanceService
 from app.models.room import Room
-from app.models.housekeeping_task import HousekeepingTask
 from app.models.room_status_log import RoomStatusLog
 from app.models.user import User
 from app.models.booking import Booking
@@ -43,6 +44,14 @@ def dashboard():
         return render_template('housekeeping/dashboard.html', metrics=error_metrics)
 
 
+@housekeeping_bp.route('/dashboard/events')
+@login_required
+@role_required('housekeeping')
+def dashboard_events():
+    """Stream room status, task and check-out changes to the dashboard."""
+    return live_event_response(('room.', 'task.', 'booking.checked_out'))
+
+
 @housekeeping_bp.route('/tasks')
 @login_required
 @role_required('housekeeping')
@@ -50,6 +59,7 @@ def tasks():
     """View and manage cleaning tasks."""
     page = request.args.get('page', 1, type=int)
     per_page = 10
+    cursor = request.args.get('cursor')
 
     # Filter parameters
     filters = {}
@@ -65,7 +75,7 @@ def tasks():
         filters['assigned_to'] = current_user.id
 
     housekeeping_service = HousekeepingService(db.session)
-    tasks_pagination = housekeeping_service.get_all_housekeeping_tasks(filters, page, per_page)
+    tasks_pagination = housekeeping_service.get_all_housekeeping_tasks(filters, page, per_page, cursor=cursor)
 
     task_types = ['regular_cleaning', 'deep_cleaning', 'turnover', 'restocking', 'maintenance_followup']
     priorities = ['low', 'normal', 'high', 'urgent']
@@ -118,13 +128,10 @@ def rooms_to_clean_view():
     # Get rooms that need cleaning
     rooms = db.session.query(Room).filter(Room.status.in_(['dirty', 'checkout'])).order_by(Room.number).all()
 
-    # Group rooms by floor
+    # Group rooms by floor, lowest floor first
     rooms_by_floor = {}
-    for room in rooms:
-        floor = str(room.number)[0] if len(str(room.number)) > 1 else '1'
-        if floor not in rooms_by_floor:
-            rooms_by_floor[floor] = []
-        rooms_by_floor[floor].append(room)
+    for room in sorted(rooms, key=lambda room: room.floor):
+        rooms_by_floor.setdefault(room.floor, []).append(room)
 
     return render_template('housekeeping/rooms_to_clean.html', rooms_by_floor=rooms_by_floor, total_rooms=len(rooms))
 
@@ -309,50 +316,12 @@ def cleaning_schedule():
     else:
         start_date = datetime.now().date()
 
-    end_date = start_date + timedelta(days=6)  # Show a week
-
-    # Get all housekeeping tasks in date range
-    housekeeping_service = HousekeepingService(db.session)
+    weeks = request.args.get('weeks', 1, type=int)
+    floor = request.args.get('floor', type=int)
 
-    # Get checkouts in date range for turnover tasks
-    checkouts = (
-        db.session.query(Booking)
-        .filter(
-            func.date(Booking.check_out_date) >= start_date,
-            func.date(Booking.check_out_date) <= end_date,
-            Booking.status.in_(['confirmed', 'checked_in'])
-        )
-        .order_by(Booking.check_out_date)
-        .all()
-    )
-
-    # Get pending tasks for date range
-    tasks = (
-        db.session.query(HousekeepingTask)
-        .filter(
-            func.date(HousekeepingTask.due_date) >= start_date,
-            func.date(HousekeepingTask.due_date) <= end_date,
-            HousekeepingTask.status.in_(['pending', 'in_progress'])
-        )
-        .order_by(HousekeepingTask.due_date)
-        .all()
-    )
-
-    # Organize tasks by day
-    days = []
-    current_date = start_date
-    while current_date <= end_date:
-        day_tasks = [t for t in tasks if t.due_date.date() == current_date]
-        day_checkouts = [b for b in checkouts if b.check_out_date.date() == current_date]
-
-        days.append({
-            'date': current_date,
-            'tasks': day_tasks,
-            'checkouts': day_checkouts,
-            'total': len(day_tasks) + len(day_checkouts)
-        })
-
-        current_date += timedelta(days=1)
+    # Tasks and departures for the range, grouped by day
+    schedule = CleaningScheduleService(db.session).get_schedule(start_date, weeks=weeks, floor=floor)
+    step = timedelta(days=7 * schedule['weeks'])
 
     # Add a helper function to get current date for template
     def now():
@@ -360,11 +329,15 @@ def cleaning_schedule():
 
     return render_template(
         'housekeeping/cleaning_schedule.html',
-        days=days,
+        days=schedule['days'],
         start_date=start_date,
-        end_date=end_date,
-        prev_week=start_date - timedelta(days=7),
-        next_week=start_date + timedelta(days=7),
+        end_date=schedule['end_date'],
+        weeks=schedule['weeks'],
+        floor=floor,
+        floors=schedule['floors'],
+        max_weeks=CleaningScheduleService.MAX_WEEKS,
+        prev_week=start_date - step,
+        next_week=start_date + step,
         now=now
     )
 
@@ -425,6 +398,17 @@ def assign_tasks():
     
     housekeeping_service = HousekeepingService(db.session)
 
+    if request.method == 'POST' and request.form.get('action') == 'auto_assign':
+        result = housekeeping_service.auto_assign_tasks()
+        if result['assigned']:
+            flash(f"Auto-assigned {len(result['assigned'])} task(s)", 'success')
+        if result['skipped']:
+            flash(f"{len(result['skipped'])} task(s) could not be assigned: "
+                  f"{', '.join(sorted({entry['reason'] for entry in result['skipped']}))}", 'warning')
+        if not result['assigned'] and not result['skipped']:
+            flash('There are no unassigned tasks', 'info')
+        return redirect(url_for('housekeeping.assign_tasks'))
+
     if request.method == 'POST':
         # Process task assignment form
         task_id = request.form.get('task_id', type=int)
@@ -458,24 +442,19 @@ def assign_tasks():
         filters={'status': 'pending', 'assigned_to': None}
     ).items
 
-    # Get available housekeeping staff (active users with housekeeping role)
-    available_staff = db.session.query(User).filter(
-        User.role.in_(['housekeeping', 'manager']),
-        User.is_active == True
-    ).all()
-
-    # Get current task assignments for staff workload display
-    staff_workload = {}
-    for staff in available_staff:
-        active_tasks = db.session.query(HousekeepingTask).filter(
-            HousekeepingTask.assigned_to == staff.id,
-            HousekeepingTask.status.in_(['pending', 'in_progress'])
-        ).count()
-        staff_workload[staff.id] = active_tasks
+    # Get assignable staff with their current workload in one grouped query
+    staff_workload = housekeeping_service.get_staff_workloads()
+
+    room_ids = {task.room_id for task in unassigned_tasks}
+    rooms = {
+        room.id: room
+        for room in db.session.query(Room).filter(Room.id.in_(room_ids))
+    } if room_ids else {}
 
     return render_template(
         'housekeeping/assign_tasks.html',
         unassigned_tasks=unassigned_tasks,
-        available_staff=available_staff,
-        staff_workload=staff_workload
+        staff_workload=staff_workload,
+        rooms=rooms,
+        max_tasks=HousekeepingService.MAX_CONCURRENT_TASKS
     )
@@ -4,7 +4,7 @@ Manager routes module.
 This module defines the routes for manager operations.
 """
 
-from flask import Blueprint, jsonify, render_template, request, send_file, flash, redirect, url_for
+from flask import Blueprint, jsonify, render_template, request, send_file, flash, redirect, url_for, Response, stream_with_context
 from flask_login import login_required, current_user
 from datetime import datetime, timedelta, timezone
 import io
@@ -21,34 +21,36 @@ from app.services.analytics_service import AnalyticsService
 from app.services.maintenance_service import MaintenanceService
 from app.services.housekeeping_service import HousekeepingService
 from app.services.forecast_service import ForecastService
+from app.services.pace_service import PaceService
 from app.models.user import User
 from app.models.room import Room
 from app.models.room_type import RoomType
 from app.models.pricing import Pricing
 from app.models.revenue_forecast import RevenueForecast, ForecastAggregation
 from app.forms.seasonal_rate_form import SeasonalRateForm
+from app.tasks.waitlist_promotion import waitlist_promotion_worker
 from db import db
 
 # Create blueprint
 manager_bp = Blueprint('manager', __name__)
 
+# Largest number of charts accepted by one analytics batch request
+MAX_BATCH_CHARTS = 20
+
+# Accepted range of each numeric analytics chart parameter
+BATCH_PARAM_BOUNDS = {'year': (1900, 2999), 'month': (1, 12), 'limit': (1, 100), 'days': (1, 365)}
+
 
 @manager_bp.route('/dashboard')
 @login_required
 @role_required('manager')
 def dashboard():
     """Display manager dashboard."""
-    from flask import g
-    
-    # Check if metrics are already cached for this request
-    if hasattr(g, 'dashboard_metrics'):
-        return render_template('manager/dashboard.html', metrics=g.dashboard_metrics)
-    
     dashboard_service = DashboardService(db.session)
     analytics_service = AnalyticsService(db.session)
     
     try:
-        # Get manager metrics
+        # Get manager metrics (shared across requests by DashboardService)
         metrics = dashboard_service.get_manager_metrics()
         
         # Enrich with additional analytics data
@@ -59,9 +61,6 @@ def dashboard():
         revenue_data = analytics_service.get_revenue_by_room_type(current_year, current_month)
         metrics['room_type_revenue'] = {label: value for label, value in zip(revenue_data['labels'], revenue_data['datasets'][0]['data'])}
         
-        # Cache the metrics
-        g.dashboard_metrics = metrics
-        
         return render_template('manager/dashboard.html', metrics=metrics)
     except Exception as e:
         error_metrics = {
@@ -828,10 +827,11 @@ def waitlist():
     """Display list of waitlist entries."""
     page = request.args.get('page', 1, type=int)
     per_page = 10
+    cursor = request.args.get('cursor')
     status = request.args.get('status', None)
     
     waitlist_service = WaitlistService(db.session)
-    entries_pagination = waitlist_service.get_all_waitlist_entries(status, page, per_page)
+    entries_pagination = waitlist_service.get_all_waitlist_entries(status, page, per_page, cursor=cursor)
     
     # Get counts by room type for the dashboard widget
     room_type_counts = waitlist_service.get_waitlist_counts_by_room_type()
@@ -927,13 +927,30 @@ def expire_waitlist_entry(entry_id):
 @role_required('manager')
 def process_waitlist_cancellations():
     """Process all recent cancellations and notify waitlisted customers."""
-    # In a real application, this would process actual cancellations
-    # For this example, we'll just show a success message
+    waitlist_service = WaitlistService(db.session)
+    
+    try:
+        processed, notified = waitlist_service.process_recent_cancellations()
+        flash(
+            f'{processed} recent cancellations have been processed and '
+            f'{len(notified)} matching waitlist customers have been notified',
+            'success'
+        )
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Error processing cancellations: {str(e)}', 'danger')
     
-    flash('All recent cancellations have been processed and matching waitlist customers have been notified', 'success')
     return redirect(url_for('manager.waitlist'))
 
 
+@manager_bp.route('/waitlist/promotion-status')
+@login_required
+@role_required('manager')
+def waitlist_promotion_status():
+    """Get the automatic waitlist promotion worker's backlog and totals."""
+    return jsonify(waitlist_promotion_worker.stats())
+
+
 # Add analytics routes
 @manager_bp.route('/analytics')
 @login_required
@@ -963,6 +980,8 @@ def analytics_data():
     
     if chart_type == 'occupancy':
         data = analytics_service.get_monthly_occupancy(year)
+    elif chart_type == 'kpis':
+        data = analytics_service.get_kpi_trend(year, month)
     elif chart_type == 'revenue':
         data = analytics_service.get_revenue_by_room_type(year, month)
     elif chart_type == 'top_customers':
@@ -979,6 +998,107 @@ def analytics_data():
     return jsonify(data)
 
 
+@manager_bp.route('/analytics/batch', methods=['POST'])
+@login_required
+@role_required('manager')
+def analytics_batch():
+    """
+    Get the data of several analytics charts in one request.
+
+    Expects a JSON body with a 'charts' list of chart specs, e.g.
+    {"year": 2024, "charts": [{"chart": "occupancy"}, {"id": "may", "chart": "kpis", "month": 5}]}.
+    Top-level 'year', 'month', 'limit' and 'days' apply to every spec that
+    does not set its own.
+    """
+    payload = request.get_json(silent=True) or {}
+    specs = payload.get('charts')
+    if not isinstance(specs, list) or not specs or len(specs) > MAX_BATCH_CHARTS:
+        return jsonify({'error': f'charts must be a list of 1 to {MAX_BATCH_CHARTS} chart specs'}), 400
+
+    planned = []
+    for spec in specs:
+        if not isinstance(spec, dict):
+            return jsonify({'error': 'Each chart spec must be an object'}), 400
+        spec = {**{key: payload.get(key) for key in BATCH_PARAM_BOUNDS}, **spec}
+        try:
+            for key in BATCH_PARAM_BOUNDS:
+                if spec.get(key) is not None:
+                    spec[key] = int(spec[key])
+        except (TypeError, ValueError):
+            return jsonify({'error': f'Invalid parameters for chart {spec.get("chart")}'}), 400
+        if any(spec.get(key) is not None and not low <= spec[key] <= high
+               for key, (low, high) in BATCH_PARAM_BOUNDS.items()):
+            return jsonify({'error': f'Invalid parameters for chart {spec.get("chart")}'}), 400
+        planned.append(spec)
+
+    analytics_service = AnalyticsService(db.session)
+    return jsonify({'charts': analytics_service.get_charts(planned)})
+
+
+@manager_bp.route('/analytics/pace')
+@login_required
+@role_required('manager')
+def analytics_pace():
+    """Get the booking pace curve of one stay date from the nightly snapshots."""
+    try:
+        stay_date = datetime.strptime(request.args.get('stay_date', ''), '%Y-%m-%d').date()
+    except ValueError:
+        return jsonify({'error': 'stay_date must be a date in YYYY-MM-DD format'}), 400
+    max_days_out = min(request.args.get('days_out', 90, type=int), 365)
+
+    pace_service = PaceService(db.session)
+    curve = pace_service.get_pace_curve(stay_date, max_days_out=max_days_out)
+    return jsonify({
+        'stay_date': stay_date.isoformat(),
+        'curve': [dict(point, snapshot_date=point['snapshot_date'].isoformat()) for point in curve]
+    })
+
+
+@manager_bp.route('/analytics/pickup')
+@login_required
+@role_required('manager')
+def analytics_pickup():
+    """Get the pickup per stay date between two nightly snapshots."""
+    try:
+        snapshot_date = datetime.strptime(
+            request.args.get('snapshot_date', datetime.now().date().isoformat()), '%Y-%m-%d'
+        ).date()
+    except ValueError:
+        return jsonify({'error': 'snapshot_date must be a date in YYYY-MM-DD format'}), 400
+    compare_days = min(max(request.args.get('compare_days', 7, type=int), 1), 365)
+    stay_days = min(max(request.args.get('stay_days', 30, type=int), 1), 365)
+
+    pace_service = PaceService(db.session)
+    pickup = pace_service.get_pickup(
+        snapshot_date,
+        snapshot_date - timedelta(days=compare_days),
+        end_date=snapshot_date + timedelta(days=stay_days - 1)
+    )
+    return jsonify({
+        'snapshot_date': snapshot_date.isoformat(),
+        'compare_date': (snapshot_date - timedelta(days=compare_days)).isoformat(),
+        'pickup': [dict(row, stay_date=row['stay_date'].isoformat()) for row in pickup]
+    })
+
+
+@manager_bp.route('/activity')
+@login_required
+@role_required('manager')
+def activity_feed():
+    """Get a page of the activity timeline for AJAX scrolling."""
+    dashboard_service = DashboardService(db.session)
+    limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+    
+    try:
+        page = dashboard_service.get_activity_page(limit=limit, cursor=request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    for activity in page['activities']:
+        activity['time'] = activity['time'].isoformat()
+    return jsonify(page)
+
+
 # Add maintenance routes
 @manager_bp.route('/maintenance')
 @login_required
@@ -987,6 +1107,7 @@ def maintenance():
     """Display list of maintenance requests."""
     page = request.args.get('page', 1, type=int)
     per_page = 10
+    cursor = request.args.get('cursor')
     
     # Filter parameters
     filters = {}
@@ -1002,7 +1123,7 @@ def maintenance():
         filters['q'] = request.args.get('q')
     
     maintenance_service = MaintenanceService(db.session)
-    requests_pagination = maintenance_service.get_all_maintenance_requests(filters, page, per_page)
+    requests_pagination = maintenance_service.get_all_maintenance_requests(filters, page, per_page, cursor=cursor)
     
     # Get stats for the dashboard
     stats = maintenance_service.get_maintenance_stats()
@@ -1188,6 +1309,7 @@ def housekeeping():
     """Display list of housekeeping tasks."""
     page = request.args.get('page', 1, type=int)
     per_page = 10
+    cursor = request.args.get('cursor')
     
     # Filter parameters
     filters = {}
@@ -1213,7 +1335,7 @@ def housekeeping():
         filters['q'] = request.args.get('q')
     
     housekeeping_service = HousekeepingService(db.session)
-    tasks_pagination = housekeeping_service.get_all_housekeeping_tasks(filters, page, per_page)
+    tasks_pagination = housekeeping_service.get_all_housekeeping_tasks(filters, page, per_page, cursor=cursor)
     
     # Get stats for the dashboard
     stats = housekeeping_service.get_housekeeping_stats()
@@ -1413,6 +1535,7 @@ def verify_housekeeping_task(task_id):
 def generate_turnover_tasks():
     """Generate turnover tasks for rooms with checkouts."""
     date_str = request.form.get('date')
+    days = min(max(request.form.get('days', 1, type=int), 1), 31)
     checkout_date = None
     
     if date_str:
@@ -1423,7 +1546,7 @@ def generate_turnover_tasks():
             return redirect(url_for('manager.housekeeping'))
     
     housekeeping_service = HousekeepingService(db.session)
-    tasks_created = housekeeping_service.generate_turnover_tasks(checkout_date)
+    tasks_created = housekeeping_service.generate_turnover_tasks(checkout_date, days=days)
     
     if tasks_created > 0:
         flash(f'Successfully generated {tasks_created} turnover tasks', 'success')
@@ -1515,8 +1638,8 @@ def forecasts():
         elif avg_confidence >= 40:
             confidence_class = 'medium'
         
-        # Get accuracy metrics for past forecasts
-        accuracy_metrics = forecast_service.get_accuracy_metrics(period_days=30)
+        # Get accuracy metrics for past forecasts from the running aggregates
+        accuracy_metrics = forecast_service.get_accuracy_by_horizon()
         
         # Format data for display
         monthly_data = []
@@ -1606,7 +1729,6 @@ def refresh_forecasts():
 @role_required('manager')
 def export_forecast():
     """Export forecast data in various formats."""
-    forecast_service = ForecastService(db.session)
     report_service = ReportService(db.session)
     
     export_format = request.args.get('format', 'csv')
@@ -1630,87 +1752,40 @@ def export_forecast():
         start_date = today
         end_date = today + timedelta(days=days)
     
+    filename = f"revenue_forecast_{start_date.strftime('%Y-%m-%d')}_to_{end_date.strftime('%Y-%m-%d')}"
+    
     try:
-        # Get forecast data
-        chart_data = forecast_service.get_forecast_chart_data(
-            start_date=start_date,
-            days=(end_date - start_date).days,
-            include_actuals=True
-        )
-        
-        # Format data for export
-        export_data = []
+        # Rows are streamed from the database one batch at a time
+        rows = report_service.iter_forecast_rows(start_date, end_date)
         
-        # Add header row
-        export_data.append([
-            'Date', 
-            'Predicted Occupancy (%)', 
-            'Actual Occupancy (%)',
-            'Predicted ADR ($)', 
-            'Actual ADR ($)',
-            'Predicted RevPAR ($)', 
-            'Actual RevPAR ($)',
-            'Predicted Revenue ($)', 
-            'Actual Revenue ($)',
-            'Confidence Score (%)'
-        ])
-        
-        # Get forecasts from database to include confidence score
-        forecasts = db.session.query(RevenueForecast).filter(
-            RevenueForecast.forecast_date >= start_date,
-            RevenueForecast.forecast_date <= end_date
-        ).order_by(RevenueForecast.forecast_date).all()
-        
-        # Build forecast dictionary for quick lookup
-        forecast_dict = {f.forecast_date.strftime('%Y-%m-%d'): f for f in forecasts}
-        
-        # Add data rows
-        for i, date_str in enumerate(chart_data['dates']):
-            forecast = forecast_dict.get(date_str)
-            confidence = forecast.confidence_score if forecast else 'N/A'
-            
-            export_data.append([
-                date_str,
-                chart_data['occupancy']['predicted'][i],
-                chart_data['occupancy']['actual'][i] if chart_data['occupancy']['actual'][i] else 'N/A',
-                chart_data['adr']['predicted'][i],
-                chart_data['adr']['actual'][i] if chart_data['adr']['actual'][i] else 'N/A',
-                chart_data['revpar']['predicted'][i],
-                chart_data['revpar']['actual'][i] if chart_data['revpar']['actual'][i] else 'N/A',
-                chart_data['revenue']['predicted'][i],
-                chart_data['revenue']['actual'][i] if chart_data['revenue']['actual'][i] else 'N/A',
-                confidence
-            ])
-        
-        # Export data in requested format
-        if export_format == 'csv':
-            output = report_service.export_to_csv(export_data, 'Revenue Forecast')
-            mimetype = 'text/csv'
-            extension = 'csv'
-        elif export_format == 'excel':
-            output = report_service.export_to_excel(export_data, 'Revenue Forecast')
+        output = None
+        if export_format == 'excel':
+            output = report_service.export_to_excel(rows, 'Revenue Forecast')
             mimetype = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
             extension = 'xlsx'
         elif export_format == 'pdf':
+            export_data = list(rows)
             try:
                 output = report_service.export_to_pdf(export_data, 'Revenue Forecast')
                 mimetype = 'application/pdf'
                 extension = 'pdf'
             except ImportError:
                 flash("PDF export requires additional dependencies. Falling back to CSV format.", "warning")
-                output = report_service.export_to_csv(export_data, 'Revenue Forecast')
-                mimetype = 'text/csv'
-                extension = 'csv'
-        else:
-            output = report_service.export_to_csv(export_data, 'Revenue Forecast')
-            mimetype = 'text/csv'
-            extension = 'csv'
+                rows = iter(export_data)
+        
+        if output is None:
+            # CSV is streamed straight to the client
+            return Response(
+                stream_with_context(report_service.iter_csv(rows, title='Revenue Forecast')),
+                mimetype='text/csv',
+                headers={"Content-Disposition": f"attachment;filename={filename}.csv"}
+            )
         
         return send_file(
             io.BytesIO(output),
             mimetype=mimetype,
             as_attachment=True,
-            download_name=f"revenue_forecast_{start_date.strftime('%Y-%m-%d')}_to_{end_date.strftime('%Y-%m-%d')}.{extension}"
+            download_name=f"{filename}.{extension}"
         )
     except Exception as e:
         flash(f"Error exporting forecast: {str(e)}", "danger")
@@ -4,13 +4,17 @@ Receptionist routes module.
 This module defines the routes for receptionist operations.
 """
 
+import re
 from datetime import datetime, timedelta
 from flask import Blueprint, jsonify, render_template, request, redirect, url_for, flash, current_app
 from flask_login import login_required, current_user
 from werkzeug.exceptions import HTTPException
+from sqlalchemy import select
 
 from db import db
 from app.utils.decorators import role_required
+from app.utils.event_bus import live_event_response
+from app.utils.full_text import apply_search, search_ids
 from app.services.dashboard_service import DashboardService
 from app.services.booking_service import BookingService
 from app.services.room_service import RoomService
@@ -25,6 +29,9 @@ from app.models.payment import Payment
 # Create blueprint
 receptionist_bp = Blueprint('receptionist', __name__)
 
+# Customer searches that are (part of) a phone number
+PHONE_QUERY = re.compile(r'[\d\s()+.-]*\d[\d\s()+.-]*')
+
 
 @receptionist_bp.route('/dashboard')
 @login_required
@@ -46,6 +53,43 @@ def dashboard():
         return render_template('receptionist/dashboard.html', metrics=error_metrics), 500
 
 
+@receptionist_bp.route('/dashboard/events')
+@login_required
+@role_required('receptionist')
+def dashboard_events():
+    """Stream booking and room status changes to the dashboard."""
+    return live_event_response(('booking.', 'room.'))
+
+
+def _guest_ids_matching(search_query):
+    """
+    Select the IDs of guests whose name or phone number matches a search.
+
+    Matches like search_customers: digits and phone punctuation match
+    anywhere in the phone number, names are looked up in the guest
+    full-text index, keeping only guests whose name contains the query so
+    that matches in their notes are left out, and a name fragment from the
+    middle of a word falls back to a substring match when the index finds
+    nothing.
+
+    Args:
+        search_query: Text entered in the guest filter
+
+    Returns:
+        Select statement yielding customer IDs
+    """
+    if PHONE_QUERY.fullmatch(search_query):
+        return select(Customer.id).where(Customer.phone.ilike(f'%{search_query.strip()}%'))
+
+    name_matches = Customer.name.ilike(f'%{search_query}%')
+    matches = search_ids(db.session, Customer, search_query)
+    if matches is not None:
+        indexed = select(Customer.id).join(matches, matches.c.id == Customer.id).where(name_matches)
+        if db.session.execute(indexed.limit(1)).first() is not None:
+            return indexed
+    return select(Customer.id).where(name_matches)
+
+
 @receptionist_bp.route('/bookings')
 @login_required
 @role_required('receptionist')
@@ -79,9 +123,9 @@ def bookings():
         except ValueError:
             pass
 
-    # Apply search query
+    # Apply search query to the guest's name or phone number
     if search_query:
-        query = query.join(Customer).filter(Customer.name.ilike(f'%{search_query}%'))
+        query = query.filter(Booking.customer_id.in_(_guest_ids_matching(search_query)))
 
     # Get paginated results
     page = request.args.get('page', 1, type=int)
@@ -299,9 +343,17 @@ def new_booking():
 @login_required
 @role_required('receptionist')
 def search_customers():
-    """Search for customers by name, email, or phone."""
-    from app.models.customer import Customer
-    from sqlalchemy import or_
+    """
+    Search for customers by name, email, or phone.
+
+    Emails match from their start. Names are looked up in the guest
+    full-text index, which matches whole words and word prefixes only,
+    so a name fragment from the middle of a word falls back to a
+    substring match when the index finds nothing. Queries made up of
+    digits and phone punctuation match anywhere in the phone number, so
+    the last digits of a number are enough.
+    """
+    from app.models.user import User
 
     query = request.args.get('q', '')
     if not query or len(query) < 2:
@@ -311,14 +363,24 @@ def search_customers():
             'customers': []
         })
 
-    # Search for customers
-    customers = Customer.query.filter(
-        or_(
-            Customer.name.ilike(f'%{query}%'),
-            Customer.email.ilike(f'%{query}%'),
-            Customer.phone.ilike(f'%{query}%')
-        )
-    ).limit(10).all()
+    # Search for customers; emails live on the user, the rest in the guest full-text index
+    if '@' in query:
+        customers = Customer.query.join(Customer.user).filter(
+            User.email.ilike(f'{query}%')
+        ).limit(10).all()
+    elif PHONE_QUERY.fullmatch(query):
+        customers = Customer.query.filter(
+            Customer.phone.ilike(f'%{query.strip()}%')
+        ).order_by(Customer.name).limit(10).all()
+    else:
+        search, relevance = apply_search(db.session, Customer.query, Customer, query)
+        if relevance is not None:
+            search = search.order_by(relevance)
+        customers = search.limit(10).all()
+        if not customers:
+            customers = Customer.query.filter(
+                Customer.name.ilike(f'%{query}%')
+            ).order_by(Customer.name).limit(10).all()
 
     # Format results
     results = []
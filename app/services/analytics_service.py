@@ -4,17 +4,24 @@ Analytics service module.
 This module provides service layer functionality for analytics data.
 """
 
-from datetime import datetime, timedelta
-from sqlalchemy import func, extract, and_, text
+from datetime import datetime, timedelta, date
+from sqlalchemy import select, func, extract, and_
 from app.models.booking import Booking
+from app.models.customer import Customer
+from app.models.customer_stats import CustomerStats
 from app.models.room import Room
-from app.models.room_type import RoomType
 from app.models.user import User
+from app.utils.revenue import room_type_revenue
+from app.utils.time_series import occupancy_series
+from app.services.kpi_service import KpiService, summarize
 
 
 class AnalyticsService:
     """Service class for analytics data."""
 
+    # Chart types understood by get_charts and the analytics data endpoints
+    CHART_TYPES = ('occupancy', 'kpis', 'revenue', 'top_customers', 'booking_sources', 'forecast')
+
     def __init__(self, db_session):
         """Initialize with a database session."""
         self.db_session = db_session
@@ -31,38 +38,20 @@ class AnalyticsService:
         """
         if year is None:
             year = datetime.now().year
-            
-        # Calculate total rooms available per month
-        total_rooms_query = self.db_session.query(func.count(Room.id)).scalar()
-        total_rooms = total_rooms_query or 0
-        days_in_month = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
-        
-        # Adjust for leap year
-        if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
-            days_in_month[1] = 29
-            
-        # Calculate room-nights per month
-        room_nights = [days * total_rooms for days in days_in_month]
-        
-        # Query bookings by month
-        bookings_by_month = self.db_session.query(
-            extract('month', Booking.check_in_date).label('month'),
-            func.sum(
-                func.julianday(func.min(Booking.check_out_date, func.date(f"{year}-12-31"))) - 
-                func.julianday(func.max(Booking.check_in_date, func.date(f"{year}-01-01")))
-            ).label('booked_days')
-        ).filter(
-            Booking.check_in_date <= func.date(f"{year}-12-31"),
-            Booking.check_out_date >= func.date(f"{year}-01-01")
-        ).group_by('month').all()
-        
-        # Initialize results with zeros
-        occupancy_rates = [0] * 12
-        
-        # Fill in actual data
-        for month, booked_days in bookings_by_month:
-            if month >= 1 and month <= 12 and room_nights[month-1] > 0:
-                occupancy_rates[month-1] = round((booked_days / room_nights[month-1]) * 100, 2)
+
+        # Closed days come from the daily KPI snapshots, the rest of the year is computed live
+        daily_kpis = KpiService(self.db_session).get_daily_kpis(*_kpi_period(year))
+        return self._occupancy_chart(year, daily_kpis)
+
+    def _occupancy_chart(self, year, daily_kpis):
+        """Format monthly occupancy rates of a year from daily KPIs covering it."""
+        occupancy_rates = [
+            summarize(
+                day for day in daily_kpis
+                if day['business_date'].year == year and day['business_date'].month == month
+            )['occupancy_rate']
+            for month in range(1, 13)
+        ]
         
         # Format data for Chart.js
         result = {
@@ -78,6 +67,64 @@ class AnalyticsService:
         
         return result
     
+    def get_kpi_trend(self, year=None, month=None):
+        """
+        Get occupancy, ADR and RevPAR over a year by month, or over a month by day.
+        
+        Args:
+            year: Year to get data for (defaults to current year)
+            month: Month to break down by day (defaults to the whole year by month)
+            
+        Returns:
+            Dictionary with KPI trend data
+        """
+        if year is None:
+            year = datetime.now().year
+
+        daily_kpis = KpiService(self.db_session).get_daily_kpis(*_kpi_period(year, month))
+        return self._kpi_trend_chart(year, month, daily_kpis)
+
+    def _kpi_trend_chart(self, year, month, daily_kpis):
+        """Format the KPI trend of a year or month from daily KPIs covering it."""
+        first_day, last_day = _kpi_period(year, month)
+        in_period = [day for day in daily_kpis if first_day <= day['business_date'] <= last_day]
+        if month:
+            periods = in_period
+            labels = [day['business_date'].strftime('%b %d') for day in periods]
+        else:
+            periods = [
+                summarize(day for day in in_period if day['business_date'].month == number)
+                for number in range(1, 13)
+            ]
+            labels = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+        # Format for Chart.js
+        result = {
+            'labels': labels,
+            'datasets': [
+                {
+                    'label': 'Occupancy Rate (%)',
+                    'data': [period['occupancy_rate'] for period in periods],
+                    'borderColor': 'rgba(54, 162, 235, 1)',
+                    'borderWidth': 1
+                },
+                {
+                    'label': 'ADR ($)',
+                    'data': [period['adr'] for period in periods],
+                    'borderColor': 'rgba(75, 192, 192, 1)',
+                    'borderWidth': 1
+                },
+                {
+                    'label': 'RevPAR ($)',
+                    'data': [period['revpar'] for period in periods],
+                    'borderColor': 'rgba(255, 159, 64, 1)',
+                    'borderWidth': 1
+                }
+            ]
+        }
+        
+        return result
+    
     def get_daily_occupancy(self, date):
         """
         Get occupancy rate for a specific date.
@@ -162,31 +209,29 @@ class AnalyticsService:
         """
         if year is None:
             year = datetime.now().year
-            
-        # Build query filters
-        filters = [
-            extract('year', Booking.check_in_date) == year,
-            Booking.status.in_(['confirmed', 'checked_in', 'checked_out'])
-        ]
         
-        if month is not None:
-            filters.append(extract('month', Booking.check_in_date) == month)
-            
-        # Query revenue by room type
-        revenue_by_type = self.db_session.query(
-            RoomType.name,
-            func.sum(
-                Booking.total_price
-            ).label('revenue')
-        ).join(
-            Room, Booking.room_id == Room.id
-        ).join(
-            RoomType, Room.room_type_id == RoomType.id
-        ).filter(
-            *filters
-        ).group_by(
-            RoomType.name
-        ).all()
+        # Nights are clipped to the period [start, end) in SQL
+        if month is None:
+            start_date = date(year, 1, 1)
+            end_date = date(year + 1, 1, 1)
+        else:
+            start_date = date(year, month, 1)
+            end_date = date(year + month // 12, month % 12 + 1, 1)
+        
+        revenue_by_type = [
+            (name, revenue)
+            for name, revenue, nights in room_type_revenue(
+                self.db_session,
+                start_date,
+                end_date,
+                statuses=[
+                    Booking.STATUS_RESERVED,
+                    Booking.STATUS_CHECKED_IN,
+                    Booking.STATUS_CHECKED_OUT
+                ]
+            )
+            if nights > 0
+        ]
         
         # Format data for Chart.js
         result = {
@@ -216,7 +261,11 @@ class AnalyticsService:
     
     def get_top_customers(self, limit=5):
         """
-        Get the top customers by booking amount.
+        Get the top customers by lifetime spend.
+        
+        Reads the head of the customer stats spend index, so the cost
+        depends on the limit rather than on the number of customers or
+        bookings.
         
         Args:
             limit: Number of customers to return
@@ -224,32 +273,27 @@ class AnalyticsService:
         Returns:
             List of top customers with their total spend
         """
-        # Query top customers
-        top_customers = self.db_session.query(
-            User.id,
-            User.username,
-            User.email,
-            func.sum(Booking.total_price).label('total_spend'),
-            func.count(Booking.id).label('booking_count')
-        ).join(
-            Booking, User.id == Booking.customer_id
-        ).filter(
-            Booking.status.in_(['confirmed', 'checked_in', 'checked_out'])
-        ).group_by(
-            User.id
-        ).order_by(
-            text('total_spend DESC')
-        ).limit(limit).all()
+        top_customers = self.db_session.execute(
+            select(CustomerStats, Customer.name, User.username, User.email)
+            .join(Customer, Customer.id == CustomerStats.customer_id)
+            .join(User, User.id == Customer.user_id)
+            .filter(CustomerStats.lifetime_spend > 0)
+            .order_by(CustomerStats.lifetime_spend.desc(), CustomerStats.customer_id.desc())
+            .limit(limit)
+        ).all()
         
         # Format results
         result = []
-        for customer in top_customers:
+        for stats, name, username, email in top_customers:
             result.append({
-                'id': customer[0],
-                'username': customer[1],
-                'email': customer[2],
-                'total_spend': float(customer[3]),
-                'booking_count': customer[4]
+                'id': stats.customer_id,
+                'name': name,
+                'username': username,
+                'email': email,
+                'total_spend': float(stats.lifetime_spend),
+                'booking_count': stats.stay_count,
+                'total_nights': stats.total_nights,
+                'last_stay_date': stats.last_stay_date
             })
             
         return result
@@ -425,25 +469,22 @@ class AnalyticsService:
         Returns:
             Dictionary with forecast data
         """
+        return self._forecast_chart(self._expected_occupancy(days))
+
+    def _expected_occupancy(self, days):
+        """Get reserved room counts for the next days from a single booking scan."""
         today = datetime.now().date()
-        end_date = today + timedelta(days=days)
-        
-        # Get daily counts for next 'days' days
-        daily_counts = []
-        labels = []
-        
-        for day in range(days):
-            date = today + timedelta(days=day)
-            labels.append(date.strftime('%b %d'))
-        
-            # Count bookings for this day
-            count = self.db_session.query(func.count(Booking.id)).filter(
-                Booking.check_in_date <= date,
-                Booking.check_out_date > date,
-                Booking.status == Booking.STATUS_RESERVED
-            ).scalar() or 0
-            
-            daily_counts.append(count)
+        return occupancy_series(
+            self.db_session,
+            today,
+            today + timedelta(days=days - 1),
+            statuses=[Booking.STATUS_RESERVED]
+        )
+
+    def _forecast_chart(self, occupied_by_day):
+        """Format expected occupancy per day as a forecast chart."""
+        labels = [date.strftime('%b %d') for date in occupied_by_day]
+        daily_counts = list(occupied_by_day.values())
         
         # Format for Chart.js
         result = {
@@ -458,4 +499,92 @@ class AnalyticsService:
             }]
         }
         
-        return result 
\ No newline at end of file
+        return result
+
+    def get_charts(self, specs):
+        """
+        Build several charts at once, sharing the queries they have in common.
+        
+        The specs are planned together: occupancy and KPI charts read daily
+        KPIs once per distinct period, sharing the read of any requested
+        period that covers theirs, forecasts share one booking scan for the
+        longest horizon, top customer lists share one query for the largest
+        limit, and identical charts are only built once.
+        
+        Args:
+            specs: List of chart spec dictionaries, each with a 'chart' type
+                (one of CHART_TYPES), an optional 'id' to key its result by
+                (defaults to the chart type) and the chart's parameters
+                ('year', 'month', 'limit' or 'days')
+            
+        Returns:
+            Dictionary mapping each spec's id to its chart data, or to an
+            error for an unknown chart type
+        """
+        this_year = datetime.now().year
+        plans = []
+        for spec in specs:
+            chart = spec.get('chart')
+            plans.append((spec.get('id') or chart, chart, {
+                'year': spec.get('year') or this_year,
+                'month': spec.get('month') or None,
+                'limit': spec.get('limit') or 5,
+                'days': spec.get('days') or 30
+            }))
+
+        # One KPI read per distinct period, longest first, so that a month
+        # inside a requested year reuses the year's read while unrelated
+        # years never pull in the days between them
+        kpi_periods = sorted(
+            {
+                _kpi_period(params['year'], params['month'] if chart == 'kpis' else None)
+                for _, chart, params in plans if chart in ('occupancy', 'kpis')
+            },
+            key=lambda period: (period[0] - period[1], period[0])
+        )
+        period_kpis = {}
+        for first_day, last_day in kpi_periods:
+            covering = next(
+                (period for period in period_kpis if period[0] <= first_day and last_day <= period[1]),
+                None
+            )
+            if covering:
+                period_kpis[(first_day, last_day)] = period_kpis[covering]
+            else:
+                period_kpis[(first_day, last_day)] = KpiService(self.db_session).get_daily_kpis(first_day, last_day)
+
+        forecast_days = [params['days'] for _, chart, params in plans if chart == 'forecast']
+        expected_occupancy = self._expected_occupancy(max(forecast_days)) if forecast_days else {}
+
+        customer_limits = [params['limit'] for _, chart, params in plans if chart == 'top_customers']
+        top_customers = self.get_top_customers(max(customer_limits)) if customer_limits else []
+
+        builders = {
+            'occupancy': lambda p: self._occupancy_chart(p['year'], period_kpis[_kpi_period(p['year'])]),
+            'kpis': lambda p: self._kpi_trend_chart(
+                p['year'], p['month'], period_kpis[_kpi_period(p['year'], p['month'])]
+            ),
+            'revenue': lambda p: self.get_revenue_by_room_type(p['year'], p['month']),
+            'top_customers': lambda p: top_customers[:p['limit']],
+            'booking_sources': lambda p: self.get_booking_source_distribution(),
+            'forecast': lambda p: self._forecast_chart(dict(list(expected_occupancy.items())[:p['days']]))
+        }
+
+        built = {}
+        results = {}
+        for key, chart, params in plans:
+            if chart not in builders:
+                results[key] = {'error': 'Invalid chart type'}
+                continue
+            signature = (chart, tuple(sorted(params.items())))
+            if signature not in built:
+                built[signature] = builders[chart](params)
+            results[key] = built[signature]
+        return results
+
+
+def _kpi_period(year, month=None):
+    """Get the first and last day of a year, or of one of its months."""
+    if month:
+        return date(year, month, 1), date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return date(year, 1, 1), date(year, 12, 31)
@@ -13,6 +13,7 @@ from app.models.room_type import RoomType
 from app.models.seasonal_rate import SeasonalRate
 from app.models.booking_log import BookingLog
 from app.models.room_status_log import RoomStatusLog
+from app.utils.event_bus import event_bus, publish_room_status
 from db import db
 from decimal import Decimal
 from app.utils.error_handling import (
@@ -597,20 +598,30 @@ class BookingService:
             reason: Reason for cancellation
             cancelled_by: ID of the user who cancelled the booking
 
+        Cancelling a booking that is already cancelled changes nothing and
+        returns it as is, so a repeated request does not count the
+        cancellation, its fee or the freed room twice.
+
         Returns:
             The cancelled booking
 
         Raises:
-            ValueError: If the booking does not exist or is already checked in
+            ValueError: If the booking does not exist or is already checked in or out
         """
         try:
             booking = self.db_session.get(Booking, booking_id)
             if not booking:
                 raise ValueError(f"Booking with ID {booking_id} does not exist")
 
+            if booking.status == Booking.STATUS_CANCELLED:
+                return booking
+
             if booking.status == Booking.STATUS_CHECKED_IN:
                 raise ValueError("Cannot cancel a booking that is already checked in")
 
+            if booking.status == Booking.STATUS_CHECKED_OUT:
+                raise ValueError("Cannot cancel a booking that is already checked out")
+
             # Update booking status
             booking.status = Booking.STATUS_CANCELLED
             booking.cancellation_reason = reason
@@ -626,6 +637,10 @@ class BookingService:
             else:
                 booking.cancellation_fee = 0  # No fee
 
+            # Update customer statistics
+            if booking.customer:
+                booking.customer.update_stats_after_cancellation(booking)
+
             # Update room status
             room = booking.room
             if not room:
@@ -655,6 +670,7 @@ class BookingService:
                         notes=f"Status changed due to booking #{booking.id} cancellation"
                     )
                     self.db_session.add(room_log)
+                    publish_room_status(self.db_session, room, old_status)
 
             # Log booking cancellation
             booking_log = BookingLog(
@@ -664,6 +680,8 @@ class BookingService:
                 notes=f"Booking cancelled. Reason: {reason}"
             )
             self.db_session.add(booking_log)
+            self._publish_booking_event('booking.cancelled', booking)
+            self._publish_capacity_freed(booking, room)
 
             self.db_session.commit()
             return booking
@@ -762,6 +780,7 @@ class BookingService:
                 notes=f"Status changed due to check-in of booking #{booking.id}"
             )
             self.db_session.add(room_log)
+            publish_room_status(self.db_session, room, old_status)
 
         # Log booking check-in
         booking_log = BookingLog(
@@ -771,6 +790,7 @@ class BookingService:
             notes=f"Guest checked in at {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M')}"
         )
         self.db_session.add(booking_log)
+        self._publish_booking_event('booking.checked_in', booking)
 
         self.db_session.commit()
         return booking
@@ -817,6 +837,7 @@ class BookingService:
                 notes=f"Status changed due to check-out of booking #{booking.id}"
             )
             self.db_session.add(room_log)
+            publish_room_status(self.db_session, room, old_status)
 
         # Log booking check-out
         booking_log = BookingLog(
@@ -826,6 +847,7 @@ class BookingService:
             notes=f"Guest checked out at {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M')}"
         )
         self.db_session.add(booking_log)
+        self._publish_booking_event('booking.checked_out', booking)
 
         # Update customer statistics if applicable
         if booking.customer:
@@ -838,6 +860,33 @@ class BookingService:
         self.db_session.commit()
         return booking
 
+    def _publish_booking_event(self, event_type, booking):
+        """Queue a live dashboard event for a booking, sent on commit."""
+        event_bus.publish_on_commit(self.db_session, event_type, {
+            'booking_id': booking.id,
+            'room_id': booking.room_id,
+            'room_number': booking.room.number if booking.room else None,
+            'customer_name': booking.customer.name if booking.customer else None,
+            'check_in_date': booking.check_in_date.isoformat(),
+            'check_out_date': booking.check_out_date.isoformat(),
+            'status': booking.status
+        })
+
+    def _publish_capacity_freed(self, booking, room):
+        """
+        Queue an 'inventory.capacity_freed' event for the room a cancelled
+        booking gave back, sent on commit for the waitlist promotion worker.
+        """
+        if not room:
+            return
+        event_bus.publish_on_commit(self.db_session, 'inventory.capacity_freed', {
+            'booking_id': booking.id,
+            'room_id': room.id,
+            'room_type_id': room.room_type_id,
+            'start_date': booking.check_in_date.isoformat(),
+            'end_date': booking.check_out_date.isoformat()
+        })
+
     def get_bookings_by_customer(self, customer_id):
         """
         Get all bookings for a customer.
@@ -0,0 +1,107 @@
+"""
+Cleaning schedule service module.
+
+This module builds the housekeeping cleaning schedule: the open tasks and
+the departures due on each day of a range, optionally limited to one floor.
+Both are read with plain range predicates on the indexed due_date and
+check_out_date columns and grouped into days in a single pass.
+"""
+
+from datetime import datetime, time, timedelta
+from sqlalchemy.orm import joinedload
+
+from app.models.booking import Booking
+from app.models.housekeeping_task import HousekeepingTask
+from app.models.room import Room
+from app.utils.time_series import date_range
+
+
+class CleaningScheduleService:
+    """Service class for building the housekeeping cleaning schedule."""
+
+    # Booking statuses that still have a departure to turn over
+    DEPARTING_STATUSES = (Booking.STATUS_RESERVED, Booking.STATUS_CHECKED_IN)
+
+    # Task statuses shown on the schedule
+    OPEN_TASK_STATUSES = ('pending', 'in_progress')
+
+    # Longest range the schedule can show at once
+    MAX_WEEKS = 6
+
+    def __init__(self, db_session):
+        """Initialize with a database session."""
+        self.db_session = db_session
+
+    def get_schedule(self, start_date=None, weeks=1, floor=None):
+        """
+        Get the open tasks and departures for each day of a range.
+
+        Args:
+            start_date: First day of the schedule (defaults to today)
+            weeks: Number of weeks to show, capped at MAX_WEEKS
+            floor: Optional floor to limit the schedule to
+
+        Returns:
+            Dictionary with start_date, end_date, weeks, floor, days (one
+            entry per day with date, tasks, checkouts, total and a by_floor
+            count) and floors (every floor with work in the range)
+        """
+        if start_date is None:
+            start_date = datetime.now().date()
+        weeks = min(max(int(weeks or 1), 1), self.MAX_WEEKS)
+        end_date = start_date + timedelta(days=weeks * 7 - 1)
+
+        days = {
+            day: {'date': day, 'tasks': [], 'checkouts': [], 'total': 0, 'by_floor': {}}
+            for day in date_range(start_date, end_date)
+        }
+        floors = set()
+
+        for booking in self._get_checkouts(start_date, end_date):
+            self._add_to_day(days[booking.check_out_date], 'checkouts', booking, booking.room, floor, floors)
+
+        for task in self._get_tasks(start_date, end_date):
+            self._add_to_day(days[task.due_date.date()], 'tasks', task, task.room, floor, floors)
+
+        return {
+            'start_date': start_date,
+            'end_date': end_date,
+            'weeks': weeks,
+            'floor': floor,
+            'days': list(days.values()),
+            'floors': sorted(floors)
+        }
+
+    def _get_checkouts(self, start_date, end_date):
+        """Get departures in a date range, ordered by day and room."""
+        return self.db_session.query(Booking).join(Booking.room).options(
+            joinedload(Booking.room),
+            joinedload(Booking.customer)
+        ).filter(
+            Booking.check_out_date >= start_date,
+            Booking.check_out_date <= end_date,
+            Booking.status.in_(self.DEPARTING_STATUSES)
+        ).order_by(Booking.check_out_date, Room.number).all()
+
+    def _get_tasks(self, start_date, end_date):
+        """Get open tasks due in a date range, ordered by due time."""
+        return self.db_session.query(HousekeepingTask).options(
+            joinedload(HousekeepingTask.room),
+            joinedload(HousekeepingTask.assignee)
+        ).filter(
+            HousekeepingTask.due_date >= datetime.combine(start_date, time.min),
+            HousekeepingTask.due_date < datetime.combine(end_date + timedelta(days=1), time.min),
+            HousekeepingTask.status.in_(self.OPEN_TASK_STATUSES)
+        ).order_by(HousekeepingTask.due_date).all()
+
+    @staticmethod
+    def _add_to_day(day, kind, item, room, floor, floors):
+        """Add a task or departure to its day unless it is on another floor."""
+        room_floor = room.floor if room else None
+        if room_floor is not None:
+            floors.add(room_floor)
+        if floor is not None and room_floor != floor:
+            return
+        day[kind].append(item)
+        day['total'] += 1
+        day['by_floor'][room_floor] = day['by_floor'].get(room_floor, 0) + 1
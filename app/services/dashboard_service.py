@@ -5,18 +5,30 @@ This module provides services for dashboard data and metrics.
 """
 
 from datetime import datetime, timedelta
-from sqlalchemy import func, and_, or_, select, text, distinct
+from flask import current_app, has_app_context
+from sqlalchemy import func, and_, or_, select, text, distinct, case
+from sqlalchemy.orm import joinedload
 
 from app.models.booking import Booking
 from app.models.room import Room
 from app.models.room_status_log import RoomStatusLog
+from app.models.housekeeping_task import HousekeepingTask
 from app.models.customer import Customer
 from app.models.user import User
 from app.models.room_type import RoomType
-from app.services.analytics_service import AnalyticsService
+from app.services.kpi_service import KpiService
 from app.services.notification_service import NotificationService
 from app.models.booking_log import BookingLog
 from app.models.payment import Payment
+from app.models.activity_feed import ActivityFeed
+from app.utils.metrics_cache import MetricsCache
+from app.utils.time_series import daily_series, occupancy_series
+
+
+# Dashboard metrics shared across requests; any committed booking, room,
+# room status, task, user or payment change drops every role's entry
+dashboard_cache = MetricsCache('dashboard')
+dashboard_cache.invalidate_on_commit(Booking, Room, RoomStatusLog, HousekeepingTask, User, Payment)
 
 
 class DashboardService:
@@ -26,9 +38,36 @@ class DashboardService:
     This service provides methods for retrieving dashboard data for different user roles.
     """
 
+    # Seconds a role's dashboard metrics are reused before recomputing
+    METRICS_TTL = {
+        'receptionist': 15,
+        'housekeeping': 15,
+        'manager': 60,
+        'admin': 60
+    }
+
     def __init__(self, db_session):
         """Initialize the service with a database session."""
         self.db_session = db_session
+
+    def _cached_metrics(self, role, compute):
+        """
+        Get a role's metrics from the shared dashboard cache.
+        
+        Concurrent requests for the same role wait for a single computation.
+        Caching is disabled when DASHBOARD_CACHE_ENABLED is false.
+        
+        Args:
+            role: Dashboard role used as the cache key
+            compute: Callable computing the metrics
+            
+        Returns:
+            Dictionary of dashboard metrics
+        """
+        ttl = self.METRICS_TTL.get(role, 0)
+        if has_app_context() and not current_app.config.get('DASHBOARD_CACHE_ENABLED', True):
+            ttl = 0
+        return dashboard_cache.get_or_compute(f'dashboard:{role}', ttl, compute)
     
     def get_customer_metrics(self, user_id):
         """
@@ -52,7 +91,6 @@ class DashboardService:
         
         # Get upcoming bookings with eager loading to prevent N+1 queries
         today = datetime.now().date()
-        from sqlalchemy.orm import joinedload
         
         upcoming_bookings = self.db_session.execute(
             select(Booking)
@@ -172,54 +210,86 @@ class DashboardService:
         """
         Get dashboard metrics for receptionists.
         
+        Results are shared across requests for a short time; see _cached_metrics.
+        
         Returns:
             Dictionary of dashboard metrics
         """
+        metrics = self._cached_metrics('receptionist', self._compute_receptionist_metrics)
+        metrics['current_time'] = datetime.now()
+        return metrics
+    
+    def _compute_receptionist_metrics(self):
+        """
+        Compute receptionist dashboard metrics, bypassing the cache.
+        
+        Booking and room counts are each taken from one conditional
+        aggregate query, and the guest lists are loaded with their
+        customer, room and room type in the same statement.
+        """
         today = datetime.now().date()
         tomorrow = today + timedelta(days=1)
         
-        # Today's check-ins
-        todays_checkins = self.db_session.execute(
-            select(func.count(Booking.id)).filter(
-                Booking.check_in_date == today,
-                Booking.status == Booking.STATUS_RESERVED
-            )
-        ).scalar_one()
+        arriving_today = and_(Booking.check_in_date == today, Booking.status == Booking.STATUS_RESERVED)
+        departing_today = and_(Booking.check_out_date == today, Booking.status == Booking.STATUS_CHECKED_IN)
         
-        # Today's check-outs
-        todays_checkouts = self.db_session.execute(
-            select(func.count(Booking.id)).filter(
-                Booking.check_out_date == today,
-                Booking.status == Booking.STATUS_CHECKED_IN
+        # Booking counts in a single scan
+        todays_checkins, todays_checkouts, tomorrows_checkins = self.db_session.execute(
+            select(
+                func.count(case((arriving_today, Booking.id))),
+                func.count(case((departing_today, Booking.id))),
+                func.count(case((and_(
+                    Booking.check_in_date == tomorrow,
+                    Booking.status == Booking.STATUS_RESERVED
+                ), Booking.id)))
+            ).filter(
+                Booking.check_in_date.in_([today, tomorrow]) | (Booking.check_out_date == today)
             )
-        ).scalar_one()
+        ).one()
+        
+        # Room counts per room type and status in a single scan
+        room_counts = self.db_session.execute(
+            select(RoomType.id, RoomType.name, Room.status, func.count(Room.id))
+            .outerjoin(Room, Room.room_type_id == RoomType.id)
+            .group_by(RoomType.id, RoomType.name, Room.status)
+            .order_by(RoomType.id)
+        ).all()
         
-        # Tomorrow's check-ins
-        tomorrows_checkins = self.db_session.execute(
-            select(func.count(Booking.id)).filter(
-                Booking.check_in_date == tomorrow,
-                Booking.status == Booking.STATUS_RESERVED
-            )
-        ).scalar_one()
+        room_status_data = {}
+        type_counts = {}
+        for room_type_id, room_type_name, status, count in room_counts:
+            status_counts = type_counts.setdefault((room_type_id, room_type_name), {})
+            if count:
+                status_counts[status] = count
+                room_status_data[status] = room_status_data.get(status, 0) + count
         
-        # Currently occupied rooms
-        occupied_rooms = self.db_session.execute(
-            select(func.count(Room.id)).filter(Room.status == Room.STATUS_OCCUPIED)
-        ).scalar_one()
+        # Detailed room status information by room type
+        room_type_status = {}
+        for (room_type_id, room_type_name), status_counts in type_counts.items():
+            total_type_rooms = sum(status_counts.values())
+            room_type_status[room_type_id] = {
+                "id": room_type_id,
+                "name": room_type_name,
+                "total_rooms": total_type_rooms,
+                "available_rooms": status_counts.get(Room.STATUS_AVAILABLE, 0),
+                "occupied_rooms": status_counts.get(Room.STATUS_OCCUPIED, 0),
+                "cleaning_rooms": status_counts.get(Room.STATUS_CLEANING, 0),
+                "maintenance_rooms": status_counts.get(Room.STATUS_MAINTENANCE, 0),
+                "booked_rooms": status_counts.get(Room.STATUS_BOOKED, 0),
+                "occupancy_rate": round((status_counts.get(Room.STATUS_OCCUPIED, 0) / total_type_rooms) * 100, 1) if total_type_rooms > 0 else 0
+            }
         
-        # Available rooms
-        available_rooms = self.db_session.execute(
-            select(func.count(Room.id)).filter(Room.status == Room.STATUS_AVAILABLE)
-        ).scalar_one()
+        occupied_rooms = room_status_data.get(Room.STATUS_OCCUPIED, 0)
+        total_rooms = sum(room_status_data.values())
         
-        # Rooms needing cleaning
-        cleaning_rooms = self.db_session.execute(
-            select(func.count(Room.id)).filter(Room.status == Room.STATUS_CLEANING)
-        ).scalar_one()
+        list_options = (
+            joinedload(Booking.customer),
+            joinedload(Booking.room).joinedload(Room.room_type)
+        )
         
         # Recent bookings (last 10)
         recent_bookings = self.db_session.execute(
-            select(Booking).order_by(Booking.created_at.desc()).limit(10)
+            select(Booking).options(*list_options).order_by(Booking.created_at.desc()).limit(10)
         ).scalars().all()
         
         recent_bookings_data = [{
@@ -231,21 +301,26 @@ class DashboardService:
             "status": booking.status
         } for booking in recent_bookings]
         
-        # Get room status breakdown for chart
-        room_status_counts = self.db_session.execute(
-            select(Room.status, func.count(Room.id)).group_by(Room.status)
-        ).all()
-        
-        room_status_data = {status: count for status, count in room_status_counts}
-        
-        # Get today's check-ins for table display with enhanced details
-        todays_checkin_bookings = self.db_session.execute(
-            select(Booking).filter(
-                Booking.check_in_date == today,
-                Booking.status == Booking.STATUS_RESERVED
-            ).order_by(Booking.check_in_date)
+        # Today's arrivals, today's departures and in-house guests in one query
+        front_desk_bookings = self.db_session.execute(
+            select(Booking).options(*list_options).filter(
+                or_(
+                    arriving_today,
+                    and_(Booking.status == Booking.STATUS_CHECKED_IN, Booking.check_out_date >= today)
+                )
+            ).order_by(Booking.check_out_date, Booking.id)
         ).scalars().all()
         
+        todays_checkin_bookings = [b for b in front_desk_bookings if b.status == Booking.STATUS_RESERVED]
+        todays_checkout_bookings = [
+            b for b in front_desk_bookings
+            if b.status == Booking.STATUS_CHECKED_IN and b.check_out_date == today
+        ]
+        in_house_bookings = [
+            b for b in front_desk_bookings
+            if b.status == Booking.STATUS_CHECKED_IN and b.check_out_date > today
+        ]
+        
         todays_checkin_data = [{
             "id": booking.id,
             "customer_name": booking.customer.name,
@@ -267,14 +342,6 @@ class DashboardService:
             "notes": booking.notes
         } for booking in todays_checkin_bookings]
         
-        # Get today's check-outs for table display with enhanced details
-        todays_checkout_bookings = self.db_session.execute(
-            select(Booking).filter(
-                Booking.check_out_date == today,
-                Booking.status == Booking.STATUS_CHECKED_IN
-            ).order_by(Booking.check_out_date)
-        ).scalars().all()
-        
         todays_checkout_data = [{
             "id": booking.id,
             "customer_name": booking.customer.name,
@@ -293,14 +360,6 @@ class DashboardService:
             "notes": booking.notes
         } for booking in todays_checkout_bookings]
         
-        # Get in-house guests (currently checked in)
-        in_house_bookings = self.db_session.execute(
-            select(Booking).filter(
-                Booking.status == Booking.STATUS_CHECKED_IN,
-                Booking.check_out_date > today
-            ).order_by(Booking.check_out_date)
-        ).scalars().all()
-        
         in_house_data = [{
             "id": booking.id,
             "customer_name": booking.customer.name,
@@ -317,41 +376,6 @@ class DashboardService:
                      booking.customer.loyalty_tier in [booking.customer.TIER_GOLD, booking.customer.TIER_PLATINUM]
         } for booking in in_house_bookings]
         
-        # Detailed room status information by room type
-        room_type_status = {}
-        room_types = self.db_session.execute(select(RoomType)).scalars().all()
-        
-        for room_type in room_types:
-            # Count rooms of this type by status
-            room_counts = self.db_session.execute(
-                select(Room.status, func.count(Room.id))
-                .filter(Room.room_type_id == room_type.id)
-                .group_by(Room.status)
-            ).all()
-            
-            status_counts = {status: count for status, count in room_counts}
-            
-            # Calculate total rooms of this type
-            total_type_rooms = sum(status_counts.values())
-            
-            # Get available count
-            available_count = status_counts.get(Room.STATUS_AVAILABLE, 0)
-            
-            room_type_status[room_type.id] = {
-                "id": room_type.id,
-                "name": room_type.name,
-                "total_rooms": total_type_rooms,
-                "available_rooms": available_count,
-                "occupied_rooms": status_counts.get(Room.STATUS_OCCUPIED, 0),
-                "cleaning_rooms": status_counts.get(Room.STATUS_CLEANING, 0),
-                "maintenance_rooms": status_counts.get(Room.STATUS_MAINTENANCE, 0),
-                "booked_rooms": status_counts.get(Room.STATUS_BOOKED, 0),
-                "occupancy_rate": round((status_counts.get(Room.STATUS_OCCUPIED, 0) / total_type_rooms) * 100, 1) if total_type_rooms > 0 else 0
-            }
-        
-        # Total rooms count
-        total_rooms = self.db_session.execute(select(func.count(Room.id))).scalar_one()
-        
         # Calculate overall occupancy rate
         occupancy_rate = round((occupied_rooms / total_rooms) * 100, 1) if total_rooms > 0 else 0
         
@@ -360,11 +384,9 @@ class DashboardService:
             "todays_checkouts": todays_checkouts,
             "tomorrows_checkins": tomorrows_checkins,
             "occupied_rooms": occupied_rooms,
-            "available_rooms": available_rooms,
-            "cleaning_rooms": cleaning_rooms,
-            "maintenance_rooms": self.db_session.execute(
-                select(func.count(Room.id)).filter(Room.status == Room.STATUS_MAINTENANCE)
-            ).scalar_one() or 0,
+            "available_rooms": room_status_data.get(Room.STATUS_AVAILABLE, 0),
+            "cleaning_rooms": room_status_data.get(Room.STATUS_CLEANING, 0),
+            "maintenance_rooms": room_status_data.get(Room.STATUS_MAINTENANCE, 0),
             "total_rooms": total_rooms,
             "occupancy_rate": occupancy_rate,
             "current_time": datetime.now(),
@@ -380,17 +402,21 @@ class DashboardService:
         """
         Get dashboard metrics for managers.
         
+        Results are shared across requests for a short time; see _cached_metrics.
+        
         Returns:
             Dictionary of dashboard metrics
         """
+        return self._cached_metrics('manager', self._compute_manager_metrics)
+    
+    def _compute_manager_metrics(self):
+        """Compute manager dashboard metrics, bypassing the cache."""
         today = datetime.now().date()
         start_of_month = datetime(today.year, today.month, 1).date()
         # Define period for ADR/RevPAR - e.g., last 30 days
         period_end_date = today
         period_start_date = today - timedelta(days=29) # for a 30 day period
 
-        analytics_service = AnalyticsService(self.db_session) # Instantiate AnalyticsService
-        
         # Room occupancy rate - currently occupied rooms / total rooms
         total_rooms = self.db_session.execute(select(func.count(Room.id))).scalar_one()
         occupied_rooms = self.db_session.execute(
@@ -445,9 +471,10 @@ class DashboardService:
         maintenance_status = self._get_maintenance_status()
         housekeeping_status = self._get_housekeeping_status()
 
-        # Calculate ADR and RevPAR for the defined period
-        adr_value = analytics_service.calculate_adr(period_start_date, period_end_date)
-        revpar_value = analytics_service.calculate_revpar(period_start_date, period_end_date)
+        # ADR and RevPAR for the period, read from the daily KPI snapshots
+        period_kpis = KpiService(self.db_session).get_period_summary(period_start_date, period_end_date)
+        adr_value = period_kpis['adr']
+        revpar_value = period_kpis['revpar']
         
         # Get real revenue data
         revenue_data = self._get_revenue_analytics()
@@ -481,7 +508,6 @@ class DashboardService:
     def _get_top_staff_performers(self, limit=5):
         """Get top-performing staff based on real task completion, booking activities, and performance metrics."""
         from sqlalchemy import func, case, distinct
-        from app.models.booking_log import BookingLog
         from app.models.room_status_log import RoomStatusLog
         from app.models.payment import Payment
         import datetime
@@ -617,25 +643,17 @@ class DashboardService:
     def _get_booking_forecast(self, days=7):
         """Get booking forecast for the upcoming days."""
         today = datetime.now().date()
-        forecast = {}
         
-        for i in range(days):
-            date = today + timedelta(days=i)
-            date_str = date.strftime('%Y-%m-%d')
-            
-            # Count bookings for this day
-            bookings_count = self.db_session.execute(
-                select(func.count())
-                .select_from(Booking)
-                .filter(
-                    Booking.check_in_date == date,
-                    Booking.status.in_(['reserved', 'confirmed'])
-                )
-            ).scalar_one()
-            
-            forecast[date_str] = bookings_count
-            
-        return forecast
+        # Count arrivals per day in one grouped query
+        arrivals = daily_series(
+            self.db_session,
+            Booking.check_in_date,
+            today,
+            today + timedelta(days=days - 1),
+            criteria=(Booking.status == Booking.STATUS_RESERVED,)
+        )
+        
+        return {date.strftime('%Y-%m-%d'): count for date, count in arrivals.items()}
         
     def _get_maintenance_status(self):
         """Get maintenance request status summary."""
@@ -669,8 +687,6 @@ class DashboardService:
         housekeeping_status = {}
         
         try:
-            from app.models.housekeeping_task import HousekeepingTask
-            
             status_counts = self.db_session.execute(
                 select(HousekeepingTask.status, func.count())
                 .group_by(HousekeepingTask.status)
@@ -693,9 +709,15 @@ class DashboardService:
         """
         Get dashboard metrics for housekeeping staff.
         
+        Results are shared across requests for a short time; see _cached_metrics.
+        
         Returns:
             Dictionary of dashboard metrics
         """
+        return self._cached_metrics('housekeeping', self._compute_housekeeping_metrics)
+    
+    def _compute_housekeeping_metrics(self):
+        """Compute housekeeping dashboard metrics, bypassing the cache."""
         today = datetime.now().date()
         
         # Rooms that need cleaning
@@ -732,7 +754,12 @@ class DashboardService:
             RoomStatusLog.new_status == Room.STATUS_AVAILABLE,
             RoomStatusLog.change_time >= yesterday
         ).order_by(RoomStatusLog.change_time.desc())
-        recently_cleaned_logs = self.db_session.execute(recently_cleaned_query).scalars().all()
+        recently_cleaned_logs = [{
+            "id": log.id,
+            "room_id": log.room_id,
+            "new_status": log.new_status,
+            "change_time": log.change_time
+        } for log in self.db_session.execute(recently_cleaned_query).scalars().all()]
         
         # Cleaning schedule (upcoming check-outs today)
         upcoming_checkouts_query = select(Booking).join(Room, Room.id == Booking.room_id).filter(
@@ -749,6 +776,13 @@ class DashboardService:
             )
         ).scalar_one()
         
+        # Open housekeeping tasks
+        active_tasks_count = self.db_session.execute(
+            select(func.count(HousekeepingTask.id)).filter(
+                HousekeepingTask.status.in_(['pending', 'in_progress'])
+            )
+        ).scalar_one()
+        
         # Get cleaning history by day for the past week
         cleaning_history = self.get_cleaning_history(days=7)
         
@@ -759,6 +793,7 @@ class DashboardService:
             "cleaning_count_today": cleaning_count_today,
             "total_to_clean": len(rooms_to_clean_data),
             "total_checkout_today": len(checkout_rooms_data),
+            "active_tasks_count": active_tasks_count,
             "cleaning_history": cleaning_history
         }
     
@@ -766,9 +801,15 @@ class DashboardService:
         """
         Get dashboard metrics for admin users.
         
+        Results are shared across requests for a short time; see _cached_metrics.
+        
         Returns:
             Dictionary of dashboard metrics
         """
+        return self._cached_metrics('admin', self._compute_admin_metrics)
+    
+    def _compute_admin_metrics(self):
+        """Compute admin dashboard metrics, bypassing the cache."""
         # User counts by role (exclude 'pending' and 'Rejected')
         user_counts = self.db_session.execute(
             select(User.role, func.count(User.id)).where(~User.role.in_(["pending", "Rejected"])).group_by(User.role)
@@ -898,20 +939,10 @@ class DashboardService:
         ).all()
         
         # Daily revenue trend for last 7 days
-        daily_revenue_trend = []
-        for i in range(6, -1, -1):
-            date = today - timedelta(days=i)
-            day_revenue = self.db_session.execute(
-                select(func.sum(Booking.total_price))
-                .filter(
-                    Booking.check_in_date == date,
-                    Booking.status.in_([Booking.STATUS_CHECKED_IN, Booking.STATUS_CHECKED_OUT, Booking.STATUS_RESERVED])
-                )
-            ).scalar_one() or 0
-            daily_revenue_trend.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'revenue': float(day_revenue)
-            })
+        daily_revenue_trend = [{
+            'date': date.strftime('%Y-%m-%d'),
+            'revenue': float(day_revenue)
+        } for date, day_revenue in self._daily_booking_revenue(today - timedelta(days=6), today).items()]
         
         return {
             'monthly_revenue': float(monthly_revenue),
@@ -1049,51 +1080,41 @@ class DashboardService:
         today = datetime.now().date()
         
         # Upcoming arrivals (next 7 days)
-        upcoming_arrivals = []
-        for i in range(7):
-            date = today + timedelta(days=i)
-            arrivals = self.db_session.execute(
-                select(func.count(Booking.id))
-                .filter(
-                    Booking.check_in_date == date,
-                    Booking.status == Booking.STATUS_RESERVED
-                )
-            ).scalar_one()
-            upcoming_arrivals.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'arrivals': arrivals
-            })
+        arrivals_by_day = daily_series(
+            self.db_session,
+            Booking.check_in_date,
+            today,
+            today + timedelta(days=6),
+            criteria=(Booking.status == Booking.STATUS_RESERVED,)
+        )
+        upcoming_arrivals = [{
+            'date': date.strftime('%Y-%m-%d'),
+            'arrivals': arrivals
+        } for date, arrivals in arrivals_by_day.items()]
         
         # Upcoming departures (next 7 days)
-        upcoming_departures = []
-        for i in range(7):
-            date = today + timedelta(days=i)
-            departures = self.db_session.execute(
-                select(func.count(Booking.id))
-                .filter(
-                    Booking.check_out_date == date,
-                    Booking.status == Booking.STATUS_CHECKED_IN
-                )
-            ).scalar_one()
-            upcoming_departures.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'departures': departures
-            })
+        departures_by_day = daily_series(
+            self.db_session,
+            Booking.check_out_date,
+            today,
+            today + timedelta(days=6),
+            criteria=(Booking.status == Booking.STATUS_CHECKED_IN,)
+        )
+        upcoming_departures = [{
+            'date': date.strftime('%Y-%m-%d'),
+            'departures': departures
+        } for date, departures in departures_by_day.items()]
         
         # Occupancy forecast (next 14 days)
         total_rooms = self.db_session.execute(select(func.count(Room.id))).scalar_one()
+        occupied_by_day = occupancy_series(
+            self.db_session,
+            today,
+            today + timedelta(days=13),
+            distinct_rooms=True
+        )
         occupancy_forecast = []
-        for i in range(14):
-            date = today + timedelta(days=i)
-            occupied = self.db_session.execute(
-                select(func.count(distinct(Booking.room_id)))
-                .filter(
-                    Booking.check_in_date <= date,
-                    Booking.check_out_date > date,
-                    Booking.status.in_([Booking.STATUS_RESERVED, Booking.STATUS_CHECKED_IN])
-                )
-            ).scalar_one()
-            
+        for date, occupied in occupied_by_day.items():
             occupancy_rate = (occupied / total_rooms * 100) if total_rooms > 0 else 0
             occupancy_forecast.append({
                 'date': date.strftime('%Y-%m-%d'),
@@ -1129,19 +1150,14 @@ class DashboardService:
         if total_rooms == 0:
             return result
         
-        # For each day, calculate occupancy
-        for i in range(days, 0, -1):
-            date = today - timedelta(days=i)
-            # Count bookings active on that day
-            occupied_count = self.db_session.execute(
-                select(func.count(func.distinct(Booking.room_id))).filter(
-                    Booking.check_in_date <= date,
-                    Booking.check_out_date > date,
-                    Booking.status.in_([Booking.STATUS_CHECKED_IN, Booking.STATUS_RESERVED])
-                )
-            ).scalar_one()
-            
-            # Calculate occupancy rate
+        # One booking scan for the whole window
+        occupied_by_day = occupancy_series(
+            self.db_session,
+            today - timedelta(days=days),
+            today - timedelta(days=1),
+            distinct_rooms=True
+        )
+        for date, occupied_count in occupied_by_day.items():
             occupancy_rate = round((occupied_count / total_rooms * 100), 2)
             result[date.strftime("%Y-%m-%d")] = occupancy_rate
         
@@ -1159,34 +1175,19 @@ class DashboardService:
         """
         today = datetime.now().date()
         
-        # Initialize result dictionary with all zeros
-        result = {}
-        for i in range(days, 0, -1):
-            date = today - timedelta(days=i)
-            result[date.strftime("%Y-%m-%d")] = 0
-        
-        # Add today
-        result[today.strftime("%Y-%m-%d")] = 0
-        
-        # For each day in range, count rooms cleaned
-        for i in range(days, -1, -1):
-            date = today - timedelta(days=i)
-            
-            # Count room status changes to "Available" on that day
-            day_start = datetime.combine(date, datetime.min.time())
-            day_end = datetime.combine(date, datetime.max.time())
-            
-            cleaned_count = self.db_session.execute(
-                select(func.count(RoomStatusLog.id)).filter(
-                    RoomStatusLog.new_status == Room.STATUS_AVAILABLE,
-                    RoomStatusLog.old_status == Room.STATUS_CLEANING,
-                    RoomStatusLog.change_time.between(day_start, day_end)
-                )
-            ).scalar_one()
-            
-            result[date.strftime("%Y-%m-%d")] = cleaned_count
+        # Count room status changes from cleaning to "Available" per day
+        cleaned_by_day = daily_series(
+            self.db_session,
+            RoomStatusLog.change_time,
+            today - timedelta(days=days),
+            today,
+            criteria=(
+                RoomStatusLog.new_status == Room.STATUS_AVAILABLE,
+                RoomStatusLog.old_status == Room.STATUS_CLEANING
+            )
+        )
         
-        return result
+        return {date.strftime("%Y-%m-%d"): count for date, count in cleaned_by_day.items()}
     
     def get_user_registration_history(self, days=30):
         """
@@ -1200,32 +1201,15 @@ class DashboardService:
         """
         today = datetime.now().date()
         
-        # Initialize result dictionary with all zeros
-        result = {}
-        for i in range(days, 0, -1):
-            date = today - timedelta(days=i)
-            result[date.strftime("%Y-%m-%d")] = 0
-        
-        # Add today
-        result[today.strftime("%Y-%m-%d")] = 0
-        
-        # For each day in range, count new user registrations
-        for i in range(days, -1, -1):
-            date = today - timedelta(days=i)
-            
-            # Count user registrations on that day
-            day_start = datetime.combine(date, datetime.min.time())
-            day_end = datetime.combine(date, datetime.max.time())
-            
-            registration_count = self.db_session.execute(
-                select(func.count(User.id)).filter(
-                    User.created_at.between(day_start, day_end)
-                )
-            ).scalar_one()
-            
-            result[date.strftime("%Y-%m-%d")] = registration_count
+        # Count new user registrations per day
+        registrations_by_day = daily_series(
+            self.db_session,
+            User.created_at,
+            today - timedelta(days=days),
+            today
+        )
         
-        return result
+        return {date.strftime("%Y-%m-%d"): count for date, count in registrations_by_day.items()}
     
     def _get_revenue_analytics(self):
         """Get real revenue analytics data for the manager dashboard."""
@@ -1266,20 +1250,10 @@ class DashboardService:
         daily_average = monthly_revenue / days_in_month if days_in_month > 0 else 0
         
         # Revenue by day for the last 7 days
-        daily_revenue = []
-        for i in range(6, -1, -1):
-            date = today - timedelta(days=i)
-            day_revenue = self.db_session.execute(
-                select(func.sum(Booking.total_price))
-                .filter(
-                    Booking.check_in_date == date,
-                    Booking.status.in_([Booking.STATUS_CHECKED_IN, Booking.STATUS_CHECKED_OUT, Booking.STATUS_RESERVED])
-                )
-            ).scalar_one() or 0
-            daily_revenue.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'revenue': float(day_revenue)
-            })
+        daily_revenue = [{
+            'date': date.strftime('%Y-%m-%d'),
+            'revenue': float(day_revenue)
+        } for date, day_revenue in self._daily_booking_revenue(today - timedelta(days=6), today).items()]
         
         return {
             'total_revenue': float(monthly_revenue),
@@ -1288,70 +1262,93 @@ class DashboardService:
             'daily_revenue': daily_revenue
         }
     
-    def _get_recent_activities(self, limit=10):
-        """Get recent activities across the hotel for the activity timeline."""
-        activities = []
-        
-        # Recent booking activities
-        recent_bookings = self.db_session.execute(
-            select(BookingLog, Booking, User)
-            .join(Booking, BookingLog.booking_id == Booking.id)
-            .outerjoin(User, BookingLog.user_id == User.id)
-            .order_by(BookingLog.action_time.desc())
-            .limit(limit)
-        ).all()
+    def _daily_booking_revenue(self, start_date, end_date):
+        """
+        Get booked revenue per check-in day.
         
-        for log, booking, user in recent_bookings:
-            activities.append({
-                'type': 'booking',
-                'action': log.action,
-                'description': f"Booking {booking.id} {log.action.replace('_', ' ')}",
-                'time': log.action_time,
-                'user': user.username if user else 'System',
-                'details': f"Room {booking.room.number}" if booking.room else ""
-            })
+        Args:
+            start_date: First day
+            end_date: Last day (inclusive)
+            
+        Returns:
+            Dictionary mapping each date to the total price of bookings
+            checking in that day
+        """
+        return daily_series(
+            self.db_session,
+            Booking.check_in_date,
+            start_date,
+            end_date,
+            aggregate=func.sum(Booking.total_price),
+            criteria=(Booking.status.in_([
+                Booking.STATUS_CHECKED_IN, Booking.STATUS_CHECKED_OUT, Booking.STATUS_RESERVED
+            ]),)
+        )
+    
+    def _get_recent_activities(self, limit=10, before=None):
+        """
+        Get recent activities across the hotel for the activity timeline.
         
-        # Recent room status changes
-        recent_room_changes = self.db_session.execute(
-            select(RoomStatusLog, Room, User)
-            .join(Room, RoomStatusLog.room_id == Room.id)
-            .outerjoin(User, RoomStatusLog.changed_by == User.id)
-            .order_by(RoomStatusLog.change_time.desc())
-            .limit(limit)
-        ).all()
+        Reads the append-only activity feed newest first with one indexed
+        query. Pass the (time, id) of the last activity already shown as
+        before to scroll further back in history.
         
-        for log, room, user in recent_room_changes:
-            activities.append({
-                'type': 'room',
-                'action': 'status_change',
-                'description': f"Room {room.number} status changed to {log.new_status}",
-                'time': log.change_time,
-                'user': user.username if user else 'System',
-                'details': f"From {log.old_status}" if log.old_status else ""
-            })
+        Args:
+            limit: Maximum number of activities to return
+            before: Optional (time, id) keyset of the last activity shown
+            
+        Returns:
+            List of activity dictionaries, newest first
+        """
+        query = select(ActivityFeed).order_by(
+            ActivityFeed.occurred_at.desc(), ActivityFeed.id.desc()
+        ).limit(limit)
+        
+        if before is not None:
+            before_time, before_id = before
+            query = query.filter(or_(
+                ActivityFeed.occurred_at < before_time,
+                and_(ActivityFeed.occurred_at == before_time, ActivityFeed.id < before_id)
+            ))
         
-        # Recent payments
-        recent_payments = self.db_session.execute(
-            select(Payment, Booking, User)
-            .join(Booking, Payment.booking_id == Booking.id)
-            .outerjoin(User, Payment.processed_by == User.id)
-            .order_by(Payment.payment_date.desc())
-            .limit(limit)
-        ).all()
+        return [entry.to_dict() for entry in self.db_session.execute(query).scalars()]
+    
+    def get_activity_page(self, limit=20, cursor=None):
+        """
+        Get one page of the activity timeline for infinite scrolling.
         
-        for payment, booking, user in recent_payments:
-            activities.append({
-                'type': 'payment',
-                'action': 'payment_processed',
-                'description': f"Payment of ${payment.amount} processed for booking {booking.id}",
-                'time': payment.payment_date,
-                'user': user.username if user else 'System',
-                'details': f"Method: {payment.payment_type}"
-            })
+        Args:
+            limit: Page size
+            cursor: Opaque cursor from a previous page (None for the newest)
+            
+        Returns:
+            Dictionary with 'activities' and 'next_cursor' (None at the end)
+            
+        Raises:
+            ValueError: If the cursor is malformed or limit is below 1
+        """
+        if limit < 1:
+            raise ValueError(f"Activity page size must be at least 1, got {limit}")
+        
+        before = None
+        if cursor:
+            try:
+                time_part, id_part = cursor.rsplit('_', 1)
+                before = (datetime.fromisoformat(time_part), int(id_part))
+            except ValueError:
+                raise ValueError(f"Invalid activity cursor: {cursor}")
+        
+        activities = self._get_recent_activities(limit=limit + 1, before=before)
+        next_cursor = None
+        if len(activities) > limit:
+            activities = activities[:limit]
+            last = activities[-1]
+            next_cursor = f"{last['time'].isoformat()}_{last['id']}"
         
-        # Sort all activities by time and return the most recent
-        activities.sort(key=lambda x: x['time'], reverse=True)
-        return activities[:limit]
+        return {
+            'activities': activities,
+            'next_cursor': next_cursor
+        }
     
     def _calculate_guest_satisfaction(self):
         """Calculate guest satisfaction score based on completed stays and ratings."""
@@ -7,10 +7,11 @@ This module provides service layer functionality for revenue forecasting.
 from datetime import datetime, timedelta
 import numpy as np
 from sqlalchemy import func, and_, or_, extract
-from app.models.revenue_forecast import RevenueForecast, ForecastAggregation
+from app.models.revenue_forecast import RevenueForecast, ForecastAggregation, ForecastAccuracy
 from app.models.booking import Booking
 from app.models.room import Room
 from app.services.analytics_service import AnalyticsService
+from app.services.kpi_service import KpiService
 
 
 class ForecastService:
@@ -20,6 +21,7 @@ class ForecastService:
         """Initialize with a database session."""
         self.db_session = db_session
         self.analytics_service = AnalyticsService(db_session)
+        self.kpi_service = KpiService(db_session)
 
     def generate_daily_forecasts(self, start_date=None, days=90):
         """
@@ -506,33 +508,20 @@ class ForecastService:
         forecasts_to_update = self.db_session.query(RevenueForecast).filter(
             RevenueForecast.forecast_date >= start_date,
             RevenueForecast.forecast_date <= end_date,
-            or_(
-                RevenueForecast.actual_occupancy_rate.is_(None),
-                RevenueForecast.actual_adr.is_(None),
-                RevenueForecast.actual_revpar.is_(None),
-                RevenueForecast.actual_room_revenue.is_(None)
-            )
+            _missing_actuals()
         ).all()
         
+        # Actuals for the whole range come from one daily KPI read
+        kpis_by_date = {}
+        if forecasts_to_update:
+            kpis_by_date = {
+                kpis['business_date']: kpis
+                for kpis in self.kpi_service.get_daily_kpis(start_date, end_date)
+            }
+        
         count = 0
         for forecast in forecasts_to_update:
-            date = forecast.forecast_date
-            
-            # Get actual metrics from analytics service
-            occupancy_rate = self.analytics_service.get_daily_occupancy(date)
-            adr = self.analytics_service.get_daily_adr(date)
-            revpar = occupancy_rate * adr / 100
-            
-            # Calculate total room revenue
-            total_rooms = self.db_session.query(func.count(Room.id)).scalar() or 0
-            room_revenue = total_rooms * revpar
-            
-            # Update forecast with actuals
-            forecast.actual_occupancy_rate = occupancy_rate
-            forecast.actual_adr = adr
-            forecast.actual_revpar = revpar
-            forecast.actual_room_revenue = room_revenue
-            
+            self._apply_actuals(forecast, kpis_by_date[forecast.forecast_date])
             count += 1
         
         # Commit updates
@@ -544,6 +533,86 @@ class ForecastService:
         
         return count
     
+    def record_actuals(self, business_date):
+        """
+        Record the actuals of every closed day whose forecast still lacks them.
+        
+        Called by the night audit after the daily KPI snapshots are written.
+        Forecasts for nights the audit missed are scored along with the
+        day that has just ended.
+        
+        Args:
+            business_date: The last closed day
+            
+        Returns:
+            int: Number of forecasts updated
+        """
+        earliest = self.db_session.query(func.min(RevenueForecast.forecast_date)).filter(
+            RevenueForecast.forecast_date <= business_date,
+            _missing_actuals()
+        ).scalar()
+        if earliest is None:
+            return 0
+        
+        return self.update_actuals(start_date=earliest, end_date=business_date)
+    
+    def _apply_actuals(self, forecast, kpis):
+        """
+        Copy a day's actual KPIs onto its forecast and add its error to the accuracy aggregates.
+        
+        Args:
+            forecast: RevenueForecast for the day
+            kpis: Daily KPI dictionary for the day
+        """
+        # Lead time of the prediction, taken before the update below moves updated_at
+        predicted_on = forecast.updated_at or forecast.created_at or datetime.utcnow()
+        lead_days = (forecast.forecast_date - predicted_on.date()).days
+        first_actuals = not forecast.has_actuals
+        
+        forecast.actual_occupancy_rate = kpis['occupancy_rate']
+        forecast.actual_adr = kpis['adr']
+        forecast.actual_revpar = kpis['revpar']
+        forecast.actual_room_revenue = kpis['room_revenue']
+        
+        if first_actuals:
+            bucket = ForecastAccuracy.bucket_for(lead_days)
+            accuracy = self.db_session.query(ForecastAccuracy).filter_by(horizon_bucket=bucket).first()
+            if accuracy is None:
+                accuracy = ForecastAccuracy(horizon_bucket=bucket)
+                self.db_session.add(accuracy)
+            accuracy.add(forecast.predicted_room_revenue, forecast.actual_room_revenue)
+    
+    def get_accuracy_by_horizon(self):
+        """
+        Get forecast error metrics per lead time bucket and overall.
+        
+        Reads the running aggregates kept up to date as actuals are
+        recorded, so the cost does not grow with the forecast history.
+        
+        Returns:
+            Dictionary with a 'horizons' list (one entry per bucket, in
+            lead time order) and an 'overall' entry, each with count,
+            mape, bias, mae and rmse (None when there is no data)
+        """
+        rows = {
+            row.horizon_bucket: row
+            for row in self.db_session.query(ForecastAccuracy).all()
+        }
+        
+        overall = ForecastAccuracy(horizon_bucket='all')
+        horizons = []
+        for label, _, _ in ForecastAccuracy.HORIZON_BUCKETS:
+            row = rows.get(label) or ForecastAccuracy(horizon_bucket=label)
+            horizons.append(_accuracy_summary(row))
+            for name in ('forecast_count', 'sum_error', 'sum_abs_error', 'sum_squared_error',
+                         'pct_error_count', 'sum_abs_pct_error'):
+                setattr(overall, name, (getattr(overall, name) or 0) + (getattr(row, name) or 0))
+        
+        return {
+            'horizons': horizons,
+            'overall': _accuracy_summary(overall)
+        }
+    
     def get_forecast_chart_data(self, start_date=None, days=90, include_actuals=True):
         """
         Get forecast data formatted for charts.
@@ -675,4 +744,29 @@ class ForecastService:
             'mean_absolute_percentage_error': round(mape, 2) if mape is not None else None,
             'accuracy_score': round(avg_accuracy, 2) if avg_accuracy is not None else None,
             'count': len(forecasts)
-        } 
\ No newline at end of file
+        }
+
+
+def _missing_actuals():
+    """Filter matching forecasts that have not been given all their actuals."""
+    return or_(
+        RevenueForecast.actual_occupancy_rate.is_(None),
+        RevenueForecast.actual_adr.is_(None),
+        RevenueForecast.actual_revpar.is_(None),
+        RevenueForecast.actual_room_revenue.is_(None)
+    )
+
+
+def _accuracy_summary(accuracy):
+    """Format the metrics of a ForecastAccuracy aggregate, rounded for display."""
+    def rounded(value):
+        return round(value, 2) if value is not None else None
+    
+    return {
+        'horizon': accuracy.horizon_bucket,
+        'count': accuracy.forecast_count or 0,
+        'mape': rounded(accuracy.mape),
+        'bias': rounded(accuracy.bias),
+        'mae': rounded(accuracy.mae),
+        'rmse': rounded(accuracy.rmse)
+    }
@@ -4,14 +4,28 @@ Housekeeping service module.
 This module provides service layer functionality for managing housekeeping tasks.
 """
 
-from datetime import datetime, timedelta
-from sqlalchemy import func, or_, and_
+from datetime import datetime, time, timedelta
+from flask import current_app, has_app_context
+from sqlalchemy import func, and_, case, select, update, insert, exists, literal, bindparam
 from app.models.housekeeping_task import HousekeepingTask
 from app.models.room import Room
 from app.models.user import User
 from app.models.booking import Booking
 from app.models.room_status_log import RoomStatusLog
 from app.models.maintenance_request import MaintenanceRequest
+from app.utils.event_bus import event_bus
+from app.utils.full_text import apply_search
+from app.utils.metrics_cache import MetricsCache
+from app.utils.pagination import paginate
+
+
+# Task statistics shared across requests; any committed task change drops them
+stats_cache = MetricsCache('housekeeping_stats')
+stats_cache.invalidate_on_commit(HousekeepingTask)
+
+# Open maintenance by room, consulted by assignment and completion checks
+maintenance_cache = MetricsCache('open_maintenance')
+maintenance_cache.invalidate_on_commit(MaintenanceRequest)
 
 
 class HousekeepingError(Exception):
@@ -22,11 +36,52 @@ class HousekeepingError(Exception):
 class HousekeepingService:
     """Service class for managing housekeeping tasks."""
 
+    # Roles that can be assigned housekeeping tasks
+    ASSIGNABLE_ROLES = ['housekeeping', 'manager', 'admin']
+
+    # Most pending or in-progress tasks one staff member may hold
+    MAX_CONCURRENT_TASKS = 10
+
+    # Task statuses that count towards a staff member's workload
+    ACTIVE_TASK_STATUSES = ['pending', 'in_progress']
+
+    # Order in which auto-assignment hands out tasks
+    PRIORITY_ORDER = {'urgent': 0, 'high': 1, 'normal': 2, 'low': 3}
+
+    # Extra tasks auto-assignment lets a staff member take to stay on one floor
+    FLOOR_AFFINITY_TASKS = 2
+
+    # Seconds task statistics are reused before recomputing
+    STATS_TTL = 30
+
+    # Seconds the open maintenance map is reused; commits of maintenance requests reload it sooner
+    MAINTENANCE_MAP_TTL = 10
+
+    # Maintenance request statuses that still affect housekeeping
+    OPEN_MAINTENANCE_STATUSES = ['pending', 'in_progress']
+
+    # Turnover tasks are due at the standard check-out time
+    TURNOVER_DUE_TIME = time(11, 0)
+
+    # Maintenance issue types that block each housekeeping task type
+    MAINTENANCE_CONFLICTS = {
+        'regular_cleaning': ['plumbing', 'electrical'],  # Can't clean if major work needed
+        'deep_cleaning': ['plumbing', 'electrical', 'furniture'],  # Deep clean conflicts with more
+        'turnover': ['plumbing', 'electrical'],  # Turnover needs working utilities
+        'maintenance_cleaning': []  # Maintenance cleaning can work around issues
+    }
+
+    # Critical maintenance types that must be resolved before a room can be marked clean
+    COMPLETION_BLOCKING_MAINTENANCE = ['plumbing', 'electrical', 'hvac', 'safety']
+
+    # Only maintenance requests of these priorities block completion
+    COMPLETION_BLOCKING_PRIORITIES = ['high', 'urgent']
+
     def __init__(self, db_session):
         """Initialize with a database session."""
         self.db_session = db_session
 
-    def get_all_housekeeping_tasks(self, filters=None, page=1, per_page=10):
+    def get_all_housekeeping_tasks(self, filters=None, page=1, per_page=10, cursor=None, count='estimate'):
         """
         Get all housekeeping tasks with optional filtering and pagination.
         
@@ -34,11 +89,14 @@ class HousekeepingService:
             filters: Dictionary of filters to apply
             page: Page number (starting from 1)
             per_page: Number of items per page
+            cursor: Cursor from the previous page, to seek rather than skip rows
+            count: True for an exact total, 'estimate' for a bounded count, False for none
             
         Returns:
-            Paginated housekeeping tasks
+            Page of housekeeping tasks
         """
         query = self.db_session.query(HousekeepingTask)
+        relevance = None
         
         if filters:
             if 'status' in filters and filters['status']:
@@ -56,52 +114,20 @@ class HousekeepingService:
             if 'due_date_to' in filters and filters['due_date_to']:
                 query = query.filter(HousekeepingTask.due_date <= filters['due_date_to'])
             if 'q' in filters and filters['q']:
-                search_term = f"%{filters['q']}%"
-                query = query.filter(
-                    or_(
-                        HousekeepingTask.description.ilike(search_term),
-                        HousekeepingTask.notes.ilike(search_term)
-                    )
-                )
+                # Full-text index search, ranked by relevance
+                query, relevance = apply_search(self.db_session, query, HousekeepingTask, filters['q'])
                 
-        # Create a subquery to count total items (without ORDER BY)
-        count_subquery = query.with_entities(func.count()).scalar()
-        
-        # Apply ordering
-        query = query.order_by(
-            HousekeepingTask.due_date,
-            HousekeepingTask.priority.desc(),
-            HousekeepingTask.created_at.desc()
-        )
-        
-        # Calculate offset and limit
-        offset = (page - 1) * per_page
-        items = query.offset(offset).limit(per_page).all()
-        
-        # Create a pagination-like object
-        class PaginationObject:
-            def __init__(self, items, page, per_page, total):
-                self.items = items
-                self.page = page
-                self.per_page = per_page
-                self.total = total
-                self.pages = max(1, (total + per_page - 1) // per_page)
-                self.has_prev = page > 1
-                self.has_next = page < self.pages
-                self.prev_num = page - 1 if self.has_prev else None
-                self.next_num = page + 1 if self.has_next else None
-                
-            def iter_pages(self):
-                for i in range(1, self.pages + 1):
-                    yield i
-                
-            def prev(self):
-                return self.__class__(self.items, self.page - 1, self.per_page, self.total) if self.has_prev else None
-                
-            def next(self):
-                return self.__class__(self.items, self.page + 1, self.per_page, self.total) if self.has_next else None
-        
-        return PaginationObject(items, page, per_page, count_subquery)
+        # Most relevant first when searching; the ID keeps cursors stable
+        sort_keys = [
+            (HousekeepingTask.due_date, False),
+            (HousekeepingTask.priority, True),
+            (HousekeepingTask.created_at, True),
+            (HousekeepingTask.id, True)
+        ]
+        if relevance is not None:
+            sort_keys.insert(0, (relevance, False))
+        
+        return paginate(query, sort_keys, page, per_page, cursor=cursor, count=count)
     
     def get_housekeeping_task(self, task_id):
         """
@@ -141,6 +167,8 @@ class HousekeepingService:
         
         # Save to database
         self.db_session.add(housekeeping_task)
+        self.db_session.flush()
+        self._publish_task_event('task.created', housekeeping_task)
         self.db_session.commit()
         
         return housekeeping_task
@@ -159,6 +187,7 @@ class HousekeepingService:
         housekeeping_task = self.get_housekeeping_task(task_id)
         if not housekeeping_task:
             return None
+        previous_status = housekeeping_task.status
         
         # Update fields
         if 'task_type' in data:
@@ -186,6 +215,7 @@ class HousekeepingService:
             housekeeping_task.verified_at = datetime.now()
         
         # Save to database
+        self._publish_task_event('task.updated', housekeeping_task, previous_status)
         self.db_session.commit()
         
         return housekeeping_task
@@ -205,6 +235,7 @@ class HousekeepingService:
             return False
         
         # Delete from database
+        self._publish_task_event('task.deleted', housekeeping_task)
         self.db_session.delete(housekeeping_task)
         self.db_session.commit()
         
@@ -240,7 +271,7 @@ class HousekeepingService:
             raise HousekeepingError(f"Cannot assign task to inactive staff member: {staff_member.username}")
         
         # Validate staff role for housekeeping tasks
-        valid_roles = ['housekeeping', 'manager', 'admin']
+        valid_roles = self.ASSIGNABLE_ROLES
         if staff_member.role not in valid_roles:
             raise HousekeepingError(
                 f"Staff member {staff_member.username} (role: {staff_member.role}) "
@@ -250,10 +281,10 @@ class HousekeepingService:
         # Check if staff member is available (not overloaded)
         current_tasks = self.db_session.query(HousekeepingTask).filter(
             HousekeepingTask.assigned_to == staff_id,
-            HousekeepingTask.status.in_(['pending', 'in_progress'])
+            HousekeepingTask.status.in_(self.ACTIVE_TASK_STATUSES)
         ).count()
         
-        max_concurrent_tasks = 10  # Configurable limit
+        max_concurrent_tasks = self.MAX_CONCURRENT_TASKS
         if current_tasks >= max_concurrent_tasks:
             raise HousekeepingError(
                 f"Staff member {staff_member.username} already has {current_tasks} active tasks. "
@@ -295,26 +326,183 @@ class HousekeepingService:
         Returns:
             bool: True if there are conflicting maintenance requests
         """
-        # Define which maintenance types conflict with which housekeeping tasks
-        conflicts = {
-            'regular_cleaning': ['plumbing', 'electrical'],  # Can't clean if major work needed
-            'deep_cleaning': ['plumbing', 'electrical', 'furniture'],  # Deep clean conflicts with more
-            'turnover': ['plumbing', 'electrical'],  # Turnover needs working utilities
-            'maintenance_cleaning': []  # Maintenance cleaning can work around issues
+        return self._conflicts_with_maintenance(self.get_open_maintenance(), room_id, task_type)
+    
+    def _conflicts_with_maintenance(self, open_maintenance, room_id, task_type):
+        """Check a prefetched open maintenance map for issues conflicting with a task type."""
+        conflicting_types = self.MAINTENANCE_CONFLICTS.get(task_type, [])
+        return any(issue_type in conflicting_types for issue_type in open_maintenance.get(room_id, {}))
+    
+    def get_open_maintenance(self):
+        """
+        Get the open maintenance issues of every room.
+        
+        Loaded in one grouped query and shared across requests for
+        MAINTENANCE_MAP_TTL seconds; committing a maintenance request
+        change reloads it. Caching follows DASHBOARD_CACHE_ENABLED.
+        
+        Returns:
+            Dictionary mapping room ID to a dictionary of its open issue
+            types, each True if any open request of that type is high
+            or urgent priority
+        """
+        ttl = self.MAINTENANCE_MAP_TTL
+        if has_app_context() and not current_app.config.get('DASHBOARD_CACHE_ENABLED', True):
+            ttl = 0
+        return maintenance_cache.get_or_compute('open_maintenance', ttl, self._load_open_maintenance)
+    
+    def _load_open_maintenance(self):
+        """Load the open maintenance map with one grouped query."""
+        rows = self.db_session.execute(
+            select(
+                MaintenanceRequest.room_id,
+                MaintenanceRequest.issue_type,
+                func.max(case(
+                    (MaintenanceRequest.priority.in_(self.COMPLETION_BLOCKING_PRIORITIES), 1),
+                    else_=0
+                ))
+            ).filter(
+                MaintenanceRequest.status.in_(self.OPEN_MAINTENANCE_STATUSES)
+            ).group_by(MaintenanceRequest.room_id, MaintenanceRequest.issue_type)
+        )
+        open_maintenance = {}
+        for room_id, issue_type, high_priority in rows:
+            open_maintenance.setdefault(room_id, {})[issue_type] = bool(high_priority)
+        return open_maintenance
+    
+    def get_staff_workloads(self):
+        """
+        Get the active staff who can take housekeeping tasks and their current workload.
+        
+        Returns:
+            Dictionary mapping staff user ID to a dictionary with username
+            and active_tasks, from one grouped query
+        """
+        rows = self.db_session.execute(
+            select(User.id, User.username, func.count(HousekeepingTask.id)).outerjoin(
+                HousekeepingTask, and_(
+                    HousekeepingTask.assigned_to == User.id,
+                    HousekeepingTask.status.in_(self.ACTIVE_TASK_STATUSES)
+                )
+            ).filter(
+                User.role.in_(self.ASSIGNABLE_ROLES),
+                User.is_active == True
+            ).group_by(User.id, User.username)
+        )
+        return {
+            staff_id: {'username': username, 'active_tasks': active_tasks}
+            for staff_id, username, active_tasks in rows
         }
+    
+    def auto_assign_tasks(self, staff_ids=None):
+        """
+        Assign every unassigned pending task in one batch.
         
-        conflicting_types = conflicts.get(task_type, [])
-        if not conflicting_types:
-            return False
+        Staff workloads, the unassigned tasks with their room states, and
+        the open maintenance map are loaded in at most three queries.
+        Tasks are handed out most urgent first to the least loaded staff
+        member under the workload cap, preferring staff already working
+        the task's floor, and the same occupancy and maintenance rules as
+        assign_housekeeping_task are applied. All assignments are written
+        with one bulk update, and tasks another user assigned in the
+        meantime are reported as skipped.
         
-        # Check for active maintenance requests of conflicting types
-        conflicting_count = self.db_session.query(MaintenanceRequest).filter(
-            MaintenanceRequest.room_id == room_id,
-            MaintenanceRequest.issue_type.in_(conflicting_types),
-            MaintenanceRequest.status.in_(['pending', 'in_progress'])
-        ).count()
+        Args:
+            staff_ids: Optional list of staff user IDs to limit assignment to
+            
+        Returns:
+            Dictionary with 'assigned' (task_id, room_id, staff_id) and
+            'skipped' (task_id, room_id, reason) lists
+        """
+        staff = self.get_staff_workloads()
+        if staff_ids is not None:
+            staff_ids = set(staff_ids)
+            staff = {staff_id: info for staff_id, info in staff.items() if staff_id in staff_ids}
+        workloads = {staff_id: info['active_tasks'] for staff_id, info in staff.items()}
+        staff_floors = {staff_id: set() for staff_id in staff}
+        
+        unassigned = and_(
+            HousekeepingTask.assigned_to.is_(None),
+            HousekeepingTask.status == 'pending'
+        )
+        tasks = self.db_session.execute(
+            select(
+                HousekeepingTask.id, HousekeepingTask.room_id, HousekeepingTask.task_type,
+                HousekeepingTask.priority, HousekeepingTask.due_date, Room.number, Room.status
+            ).join(Room, Room.id == HousekeepingTask.room_id).filter(unassigned)
+        ).all()
+        
+        open_maintenance = self.get_open_maintenance() if tasks else {}
+        
+        tasks.sort(key=lambda task: (
+            self.PRIORITY_ORDER.get(task.priority, len(self.PRIORITY_ORDER)),
+            task.due_date,
+            task.id
+        ))
+        
+        assigned = []
+        skipped = []
+        for task in tasks:
+            reason = None
+            if task.status == Room.STATUS_OCCUPIED:
+                reason = 'room is currently occupied'
+            elif self._conflicts_with_maintenance(open_maintenance, task.room_id, task.task_type):
+                reason = 'conflicting maintenance request exists'
+            
+            staff_id = None
+            if reason is None:
+                floor = Room.floor_for_number(task.number)
+                candidates = [
+                    staff_id for staff_id, load in workloads.items()
+                    if load < self.MAX_CONCURRENT_TASKS
+                ]
+                if candidates:
+                    staff_id = min(candidates, key=lambda staff_id: (
+                        workloads[staff_id] - (self.FLOOR_AFFINITY_TASKS if floor in staff_floors[staff_id] else 0),
+                        workloads[staff_id],
+                        staff_id
+                    ))
+                else:
+                    reason = 'all staff are at their task limit'
+            
+            if reason is not None:
+                skipped.append({'task_id': task.id, 'room_id': task.room_id, 'reason': reason})
+                continue
+            
+            workloads[staff_id] += 1
+            staff_floors[staff_id].add(floor)
+            assigned.append({'task_id': task.id, 'room_id': task.room_id, 'staff_id': staff_id})
+        
+        if assigned:
+            # Only tasks still unassigned are taken, so a concurrent manual assignment wins
+            tasks_table = HousekeepingTask.__table__
+            self.db_session.execute(
+                update(tasks_table).where(
+                    tasks_table.c.id == bindparam('task_id'),
+                    tasks_table.c.assigned_to.is_(None)
+                ).values(assigned_to=bindparam('staff_id'), updated_at=datetime.utcnow()),
+                [{'task_id': entry['task_id'], 'staff_id': entry['staff_id']} for entry in assigned]
+            )
+            
+            # A bulk update has no per-row count, so read back which tasks were taken
+            owners = dict(self.db_session.execute(
+                select(HousekeepingTask.id, HousekeepingTask.assigned_to)
+                .filter(HousekeepingTask.id.in_([entry['task_id'] for entry in assigned]))
+            ).all())
+            taken = [entry for entry in assigned if owners.get(entry['task_id']) == entry['staff_id']]
+            skipped.extend(
+                {'task_id': entry['task_id'], 'room_id': entry['room_id'], 'reason': 'already assigned'}
+                for entry in assigned if owners.get(entry['task_id']) != entry['staff_id']
+            )
+            assigned = taken
+        
+        if assigned:
+            event_bus.publish_on_commit(self.db_session, 'task.bulk_assigned', {
+                'assignments': assigned
+            })
+            self.db_session.commit()
         
-        return conflicting_count > 0
+        return {'assigned': assigned, 'skipped': skipped}
     
     def mark_in_progress(self, task_id, notes=None):
         """
@@ -437,6 +625,18 @@ class HousekeepingService:
         
         return updated_task
     
+    def _publish_task_event(self, event_type, task, previous_status=None):
+        """Queue a live dashboard event for a housekeeping task, sent on commit."""
+        event_bus.publish_on_commit(self.db_session, event_type, {
+            'task_id': task.id,
+            'room_id': task.room_id,
+            'task_type': task.task_type,
+            'status': task.status,
+            'previous_status': previous_status,
+            'priority': task.priority,
+            'assigned_to': task.assigned_to
+        })
+    
     def _has_pending_maintenance_blocking_completion(self, room_id):
         """
         Check if room has maintenance requests that block cleaning completion.
@@ -447,23 +647,11 @@ class HousekeepingService:
         Returns:
             bool: True if there are blocking maintenance requests
         """
-        try:
-            # Critical maintenance types that must be resolved before room can be marked clean
-            blocking_types = ['plumbing', 'electrical', 'hvac', 'safety']
-            
-            # Check for active maintenance requests of blocking types
-            blocking_count = self.db_session.query(MaintenanceRequest).filter(
-                MaintenanceRequest.room_id == room_id,
-                MaintenanceRequest.issue_type.in_(blocking_types),
-                MaintenanceRequest.status.in_(['pending', 'in_progress']),
-                MaintenanceRequest.priority.in_(['high', 'urgent'])  # Only high priority blocks
-            ).count()
-            
-            return blocking_count > 0
-            
-        except Exception:
-            # If maintenance model doesn't exist, assume no blocking maintenance
-            return False
+        # Only high priority requests of the critical types block
+        return any(
+            high_priority and issue_type in self.COMPLETION_BLOCKING_MAINTENANCE
+            for issue_type, high_priority in self.get_open_maintenance().get(room_id, {}).items()
+        )
     
     def verify_housekeeping_task(self, task_id, verified_by, notes=None):
         """
@@ -499,117 +687,125 @@ class HousekeepingService:
         """
         Get statistics about housekeeping tasks.
         
+        Results are shared across requests for STATS_TTL seconds and
+        dropped when a session commits a task change, including the bulk
+        writes of auto_assign_tasks and generate_turnover_tasks. Changes
+        made outside a session, such as raw SQL, wait out the TTL. Caching
+        is disabled when DASHBOARD_CACHE_ENABLED is false.
+        
         Returns:
             Dictionary with housekeeping statistics
         """
-        # Get counts by status
-        status_counts = dict(
-            self.db_session.query(
-                HousekeepingTask.status,
-                func.count(HousekeepingTask.id)
-            ).group_by(
-                HousekeepingTask.status
-            ).all()
-        )
-        
-        # Get counts by task type
-        type_counts = dict(
-            self.db_session.query(
-                HousekeepingTask.task_type,
-                func.count(HousekeepingTask.id)
-            ).group_by(
-                HousekeepingTask.task_type
-            ).all()
-        )
-        
-        # Calculate overdue tasks
+        ttl = self.STATS_TTL
+        if has_app_context() and not current_app.config.get('DASHBOARD_CACHE_ENABLED', True):
+            ttl = 0
+        return stats_cache.get_or_compute('housekeeping_stats', ttl, self._compute_housekeeping_stats)
+    
+    def _compute_housekeeping_stats(self):
+        """Compute housekeeping statistics with one grouped query, bypassing the cache."""
         now = datetime.now()
-        overdue_count = self.db_session.query(
-            func.count(HousekeepingTask.id)
-        ).filter(
-            HousekeepingTask.due_date < now,
-            HousekeepingTask.status.in_(['pending', 'in_progress'])
-        ).scalar() or 0
-        
-        # Calculate today's tasks
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
         today_end = today_start + timedelta(days=1)
-        today_count = self.db_session.query(
-            func.count(HousekeepingTask.id)
-        ).filter(
-            HousekeepingTask.due_date >= today_start,
-            HousekeepingTask.due_date < today_end
-        ).scalar() or 0
-        
-        # Calculate average completion time
-        avg_completion = self.db_session.query(
-            func.avg(
-                func.julianday(HousekeepingTask.completed_at) - 
-                func.julianday(HousekeepingTask.created_at)
-            ) * 24  # Convert days to hours
-        ).filter(
-            HousekeepingTask.completed_at.isnot(None)
-        ).scalar()
+        completion_hours = (
+            func.julianday(HousekeepingTask.completed_at) -
+            func.julianday(HousekeepingTask.created_at)
+        ) * 24  # Convert days to hours
+        
+        # One row per status and task type, with the other figures as
+        # conditional aggregates that are summed across the groups below
+        rows = self.db_session.execute(
+            select(
+                HousekeepingTask.status,
+                HousekeepingTask.task_type,
+                func.count(HousekeepingTask.id),
+                func.sum(case((and_(
+                    HousekeepingTask.due_date < now,
+                    HousekeepingTask.status.in_(self.ACTIVE_TASK_STATUSES)
+                ), 1), else_=0)),
+                func.sum(case((and_(
+                    HousekeepingTask.due_date >= today_start,
+                    HousekeepingTask.due_date < today_end
+                ), 1), else_=0)),
+                func.sum(completion_hours),
+                func.count(completion_hours)
+            ).group_by(HousekeepingTask.status, HousekeepingTask.task_type)
+        ).all()
+        
+        status_counts = {}
+        type_counts = {}
+        overdue_count = today_count = completed_count = 0
+        completion_total = 0.0
+        for status, task_type, count, overdue, due_today, hours, completed in rows:
+            status_counts[status] = status_counts.get(status, 0) + count
+            type_counts[task_type] = type_counts.get(task_type, 0) + count
+            overdue_count += overdue or 0
+            today_count += due_today or 0
+            completion_total += hours or 0.0
+            completed_count += completed or 0
         
         return {
             'status_counts': status_counts,
             'type_counts': type_counts,
             'overdue_count': overdue_count,
             'today_count': today_count,
-            'avg_completion_hours': float(avg_completion) if avg_completion else None,
+            'avg_completion_hours': completion_total / completed_count if completed_count else None,
             'total': sum(status_counts.values())
         }
     
-    def generate_turnover_tasks(self, checkout_date=None):
+    def generate_turnover_tasks(self, checkout_date=None, days=1):
         """
         Generate turnover tasks for rooms with checkouts.
         
+        Each day is filled by one INSERT ... SELECT that takes the rooms
+        with a departure that day and skips any room that already has a
+        turnover task due that day, so running it again creates nothing.
+        
         Args:
-            checkout_date: Date to generate tasks for (defaults to today)
+            checkout_date: First date to generate tasks for (defaults to today)
+            days: Number of days to generate, for looking ahead
             
         Returns:
             Number of tasks created
         """
         if checkout_date is None:
             checkout_date = datetime.now().date()
-            
-        # Find rooms with checkouts on the given date
-        checkouts = self.db_session.query(
-            Booking.room_id
-        ).filter(
-            func.date(Booking.check_out_date) == checkout_date,
-            Booking.status.in_(['confirmed', 'checked_in'])
-        ).all()
         
-        room_ids = [checkout[0] for checkout in checkouts]
-        
-        # Check if tasks already exist
-        existing_tasks = self.db_session.query(
-            HousekeepingTask.room_id
-        ).filter(
-            HousekeepingTask.room_id.in_(room_ids),
-            func.date(HousekeepingTask.due_date) == checkout_date,
-            HousekeepingTask.task_type == 'turnover'
-        ).all()
-        
-        existing_room_ids = [task[0] for task in existing_tasks]
-        
-        # Create tasks for rooms without existing turnover tasks
+        tasks_table = HousekeepingTask.__table__
+        now = datetime.utcnow()
         tasks_created = 0
-        for room_id in room_ids:
-            if room_id not in existing_room_ids:
-                # Create new turnover task
-                task = HousekeepingTask(
-                    room_id=room_id,
-                    task_type='turnover',
-                    description='Room turnover after guest checkout',
-                    status='pending',
-                    priority='high',  # Turnover tasks are high priority
-                    due_date=datetime.combine(checkout_date, datetime.now().time())
+        for offset in range(max(days, 1)):
+            day = checkout_date + timedelta(days=offset)
+            day_start = datetime.combine(day, time.min)
+            
+            already_scheduled = exists().where(
+                tasks_table.c.room_id == Booking.room_id,
+                tasks_table.c.task_type == 'turnover',
+                tasks_table.c.due_date >= day_start,
+                tasks_table.c.due_date < day_start + timedelta(days=1)
+            )
+            departures = select(
+                Booking.room_id,
+                literal('turnover'),
+                literal('Room turnover after guest checkout'),
+                literal('pending'),
+                literal('high'),  # Turnover tasks are high priority
+                literal(datetime.combine(day, self.TURNOVER_DUE_TIME)),
+                literal(now),
+                literal(now)
+            ).filter(
+                Booking.check_out_date == day,
+                Booking.status.in_([Booking.STATUS_RESERVED, Booking.STATUS_CHECKED_IN]),
+                ~already_scheduled
+            ).distinct()
+            
+            result = self.db_session.execute(
+                insert(tasks_table).from_select(
+                    ['room_id', 'task_type', 'description', 'status', 'priority',
+                     'due_date', 'created_at', 'updated_at'],
+                    departures
                 )
-                
-                self.db_session.add(task)
-                tasks_created += 1
-                
+            )
+            tasks_created += max(result.rowcount, 0)
+        
         self.db_session.commit()
-        return tasks_created 
\ No newline at end of file
+        return tasks_created
\ No newline at end of file
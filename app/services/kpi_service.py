@@ -0,0 +1,303 @@
+"""
+KPI service module.
+
+This module provides the daily KPI rollup: it computes occupancy, ADR,
+RevPAR, arrivals, departures, cancellations, no-shows and revenue by
+source for a range of business days, stores closed days as DailyKpi
+snapshots and serves analytics from those snapshots.
+"""
+
+import json
+from collections import defaultdict
+from datetime import datetime, timedelta
+from sqlalchemy import select, func, delete, insert
+
+from app.models.booking import Booking
+from app.models.daily_kpi import DailyKpi
+from app.models.room import Room
+from app.utils.time_series import date_range, daily_series
+
+
+class KpiService:
+    """Service class for daily KPI snapshots."""
+
+    # Statuses whose nights count as sold
+    SOLD_STATUSES = (Booking.STATUS_RESERVED, Booking.STATUS_CHECKED_IN, Booking.STATUS_CHECKED_OUT)
+
+    # Longest range computed from one booking scan during a back-fill
+    BACKFILL_CHUNK_DAYS = 366
+
+    def __init__(self, db_session):
+        """Initialize with a database session."""
+        self.db_session = db_session
+
+    def compute_range(self, start_date, end_date):
+        """
+        Compute the KPIs of every day in a range from the raw booking data.
+
+        The range is covered by one booking scan and one grouped
+        cancellation query, whatever its length.
+
+        Args:
+            start_date: First business day
+            end_date: Last business day (inclusive)
+
+        Returns:
+            List of KPI dictionaries, one per day in ascending order
+        """
+        start_date = _as_date(start_date)
+        end_date = _as_date(end_date)
+        if end_date < start_date:
+            return []
+
+        total_rooms = self.db_session.execute(select(func.count(Room.id))).scalar_one()
+        days = {day: _empty_day(day) for day in date_range(start_date, end_date)}
+
+        bookings = self.db_session.execute(
+            select(
+                Booking.check_in_date,
+                Booking.check_out_date,
+                Booking.total_price,
+                Booking.source,
+                Booking.status
+            ).filter(
+                Booking.check_in_date <= end_date,
+                Booking.check_out_date >= start_date
+            )
+        )
+
+        for check_in, check_out, total_price, source, status in bookings:
+            check_in = _as_date(check_in)
+            check_out = _as_date(check_out)
+
+            if status == Booking.STATUS_NO_SHOW:
+                if check_in in days:
+                    days[check_in]['no_shows'] += 1
+                continue
+            if status not in self.SOLD_STATUSES:
+                continue
+
+            if check_in in days:
+                days[check_in]['arrivals'] += 1
+            if check_out in days:
+                days[check_out]['departures'] += 1
+
+            nights = (check_out - check_in).days
+            if nights <= 0:
+                continue
+            nightly_rate = (total_price or 0.0) / nights
+            source = source or 'Unknown'
+            for night in date_range(max(check_in, start_date), min(check_out - timedelta(days=1), end_date)):
+                day = days[night]
+                day['rooms_sold'] += 1
+                day['room_revenue'] += nightly_rate
+                day['revenue_by_source'][source] += nightly_rate
+
+        cancellations = daily_series(
+            self.db_session,
+            Booking.cancellation_date,
+            start_date,
+            end_date,
+            criteria=(Booking.status == Booking.STATUS_CANCELLED,)
+        )
+
+        for day, kpis in days.items():
+            kpis['cancellations'] = cancellations[day]
+            _finish_day(kpis, total_rooms)
+        return list(days.values())
+
+    def snapshot_range(self, start_date, end_date):
+        """
+        Store snapshots for a range of days, replacing any already stored.
+
+        Args:
+            start_date: First business day
+            end_date: Last business day (inclusive)
+
+        Returns:
+            int: Number of days written
+        """
+        rows = self.compute_range(start_date, end_date)
+        if not rows:
+            return 0
+
+        now = datetime.utcnow()
+        self.db_session.execute(
+            delete(DailyKpi).where(
+                DailyKpi.business_date >= _as_date(start_date),
+                DailyKpi.business_date <= _as_date(end_date)
+            )
+        )
+        self.db_session.execute(insert(DailyKpi), [
+            dict(
+                {key: value for key, value in row.items() if key != 'revenue_by_source'},
+                revenue_by_source_json=json.dumps(row['revenue_by_source']),
+                created_at=now,
+                updated_at=now
+            )
+            for row in rows
+        ])
+        self.db_session.commit()
+        return len(rows)
+
+    def backfill(self, until=None):
+        """
+        Snapshot every closed day that has no snapshot yet.
+
+        Starts the day after the latest snapshot, or at the first booking
+        when nothing has been stored, so the first run back-fills the whole
+        history and later runs catch up on any nights that were missed.
+
+        Args:
+            until: Last day to snapshot (defaults to yesterday)
+
+        Returns:
+            int: Number of days written
+        """
+        until = _as_date(until) if until is not None else datetime.now().date() - timedelta(days=1)
+
+        latest = self.db_session.execute(select(func.max(DailyKpi.business_date))).scalar()
+        if latest is not None:
+            start_date = _as_date(latest) + timedelta(days=1)
+        else:
+            first_booking = self.db_session.execute(select(func.min(Booking.check_in_date))).scalar()
+            if first_booking is None:
+                return 0
+            start_date = _as_date(first_booking)
+
+        written = 0
+        while start_date <= until:
+            chunk_end = min(start_date + timedelta(days=self.BACKFILL_CHUNK_DAYS - 1), until)
+            written += self.snapshot_range(start_date, chunk_end)
+            start_date = chunk_end + timedelta(days=1)
+        return written
+
+    def get_daily_kpis(self, start_date, end_date):
+        """
+        Get the KPIs of every day in a range.
+
+        Stored snapshots are used where they exist; days without one (such
+        as today and future days) are computed live from the bookings.
+
+        Args:
+            start_date: First business day
+            end_date: Last business day (inclusive)
+
+        Returns:
+            List of KPI dictionaries, one per day in ascending order
+        """
+        start_date = _as_date(start_date)
+        end_date = _as_date(end_date)
+        if end_date < start_date:
+            return []
+
+        stored = {
+            _as_date(snapshot.business_date): snapshot.to_dict()
+            for snapshot in self.db_session.execute(
+                select(DailyKpi).filter(
+                    DailyKpi.business_date >= start_date,
+                    DailyKpi.business_date <= end_date
+                )
+            ).scalars()
+        }
+
+        missing = [day for day in date_range(start_date, end_date) if day not in stored]
+        if missing:
+            for kpis in self.compute_range(missing[0], missing[-1]):
+                stored.setdefault(kpis['business_date'], kpis)
+
+        return [stored[day] for day in date_range(start_date, end_date)]
+
+    def get_period_summary(self, start_date, end_date):
+        """
+        Roll the daily KPIs of a period up into period totals.
+
+        Args:
+            start_date: First business day
+            end_date: Last business day (inclusive)
+
+        Returns:
+            Dictionary with the period's totals and rates
+        """
+        return summarize(self.get_daily_kpis(start_date, end_date))
+
+
+def summarize(daily_kpis):
+    """
+    Combine daily KPI dictionaries into totals and rates for the period.
+
+    Rates are recomputed from the summed room nights and revenue rather
+    than averaged, so days with more inventory weigh more.
+
+    Args:
+        daily_kpis: Iterable of KPI dictionaries
+
+    Returns:
+        Dictionary with the combined figures
+    """
+    summary = {
+        'available_room_nights': 0,
+        'rooms_sold': 0,
+        'room_revenue': 0.0,
+        'arrivals': 0,
+        'departures': 0,
+        'cancellations': 0,
+        'no_shows': 0,
+        'revenue_by_source': defaultdict(float)
+    }
+    for kpis in daily_kpis:
+        summary['available_room_nights'] += kpis['total_rooms']
+        for key in ('rooms_sold', 'room_revenue', 'arrivals', 'departures', 'cancellations', 'no_shows'):
+            summary[key] += kpis[key]
+        for source, revenue in kpis['revenue_by_source'].items():
+            summary['revenue_by_source'][source] += revenue
+
+    available = summary['available_room_nights']
+    sold = summary['rooms_sold']
+    summary['room_revenue'] = round(summary['room_revenue'], 2)
+    summary['occupancy_rate'] = round(sold / available * 100, 2) if available else 0.0
+    summary['adr'] = round(summary['room_revenue'] / sold, 2) if sold else 0.0
+    summary['revpar'] = round(summary['room_revenue'] / available, 2) if available else 0.0
+    summary['revenue_by_source'] = {
+        source: round(revenue, 2) for source, revenue in summary['revenue_by_source'].items()
+    }
+    return summary
+
+
+def _as_date(value):
+    """Convert a date or datetime to a date."""
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _empty_day(day):
+    """Create the zeroed KPI accumulator for one day."""
+    return {
+        'business_date': day,
+        'total_rooms': 0,
+        'rooms_sold': 0,
+        'room_revenue': 0.0,
+        'occupancy_rate': 0.0,
+        'adr': 0.0,
+        'revpar': 0.0,
+        'arrivals': 0,
+        'departures': 0,
+        'cancellations': 0,
+        'no_shows': 0,
+        'revenue_by_source': defaultdict(float)
+    }
+
+
+def _finish_day(kpis, total_rooms):
+    """Derive the rates of an accumulated day and round its money figures."""
+    sold = kpis['rooms_sold']
+    revenue = round(kpis['room_revenue'], 2)
+    kpis['total_rooms'] = total_rooms
+    kpis['room_revenue'] = revenue
+    kpis['occupancy_rate'] = round(sold / total_rooms * 100, 2) if total_rooms else 0.0
+    kpis['adr'] = round(revenue / sold, 2) if sold else 0.0
+    kpis['revpar'] = round(revenue / total_rooms, 2) if total_rooms else 0.0
+    kpis['revenue_by_source'] = {
+        source: round(value, 2) for source, value in kpis['revenue_by_source'].items()
+    }
@@ -5,21 +5,33 @@ This module provides service layer functionality for managing maintenance reques
 """
 
 from datetime import datetime
-from sqlalchemy import func, or_, and_
+from flask import current_app, has_app_context
+from sqlalchemy import func, and_, select
 from app.models.maintenance_request import MaintenanceRequest
 from app.models.room import Room
 from app.models.user import User
 from app.models.room_status_log import RoomStatusLog
+from app.utils.full_text import apply_search
+from app.utils.metrics_cache import MetricsCache
+from app.utils.pagination import paginate
+
+
+# Request statistics shared across requests; any committed request change drops them
+stats_cache = MetricsCache('maintenance_stats')
+stats_cache.invalidate_on_commit(MaintenanceRequest)
 
 
 class MaintenanceService:
     """Service class for managing maintenance requests."""
 
+    # Seconds request statistics are reused before recomputing
+    STATS_TTL = 30
+
     def __init__(self, db_session):
         """Initialize with a database session."""
         self.db_session = db_session
 
-    def get_all_maintenance_requests(self, filters=None, page=1, per_page=10):
+    def get_all_maintenance_requests(self, filters=None, page=1, per_page=10, cursor=None, count='estimate'):
         """
         Get all maintenance requests with optional filtering and pagination.
         
@@ -27,11 +39,14 @@ class MaintenanceService:
             filters: Dictionary of filters to apply
             page: Page number (starting from 1)
             per_page: Number of items per page
+            cursor: Cursor from the previous page, to seek rather than skip rows
+            count: True for an exact total, 'estimate' for a bounded count, False for none
             
         Returns:
-            Paginated maintenance requests
+            Page of maintenance requests
         """
         query = self.db_session.query(MaintenanceRequest)
+        relevance = None
         
         if filters:
             if 'status' in filters and filters['status']:
@@ -45,52 +60,20 @@ class MaintenanceService:
             if 'issue_type' in filters and filters['issue_type']:
                 query = query.filter(MaintenanceRequest.issue_type == filters['issue_type'])
             if 'q' in filters and filters['q']:
-                search_term = f"%{filters['q']}%"
-                query = query.filter(
-                    or_(
-                        MaintenanceRequest.description.ilike(search_term),
-                        MaintenanceRequest.notes.ilike(search_term)
-                    )
-                )
-        
-        # Create a subquery to count total items (without ORDER BY)
-        count_subquery = query.with_entities(func.count()).scalar()
-        
-        # Apply ordering
-        query = query.order_by(
-            MaintenanceRequest.status,
-            MaintenanceRequest.priority.desc(),
-            MaintenanceRequest.created_at.desc()
-        )
-        
-        # Calculate offset and limit
-        offset = (page - 1) * per_page
-        items = query.offset(offset).limit(per_page).all()
-        
-        # Create a pagination-like object
-        class PaginationObject:
-            def __init__(self, items, page, per_page, total):
-                self.items = items
-                self.page = page
-                self.per_page = per_page
-                self.total = total
-                self.pages = max(1, (total + per_page - 1) // per_page)
-                self.has_prev = page > 1
-                self.has_next = page < self.pages
-                self.prev_num = page - 1 if self.has_prev else None
-                self.next_num = page + 1 if self.has_next else None
-                
-            def iter_pages(self):
-                for i in range(1, self.pages + 1):
-                    yield i
-                
-            def prev(self):
-                return self.__class__(self.items, self.page - 1, self.per_page, self.total) if self.has_prev else None
-                
-            def next(self):
-                return self.__class__(self.items, self.page + 1, self.per_page, self.total) if self.has_next else None
-        
-        return PaginationObject(items, page, per_page, count_subquery)
+                # Full-text index search, ranked by relevance
+                query, relevance = apply_search(self.db_session, query, MaintenanceRequest, filters['q'])
+        
+        # Most relevant first when searching; the ID keeps cursors stable
+        sort_keys = [
+            (MaintenanceRequest.status, False),
+            (MaintenanceRequest.priority, True),
+            (MaintenanceRequest.created_at, True),
+            (MaintenanceRequest.id, True)
+        ]
+        if relevance is not None:
+            sort_keys.insert(0, (relevance, False))
+        
+        return paginate(query, sort_keys, page, per_page, cursor=cursor, count=count)
     
     def get_maintenance_request(self, request_id):
         """
@@ -316,53 +299,59 @@ class MaintenanceService:
         """
         Get statistics about maintenance requests.
         
+        Results are shared across requests for STATS_TTL seconds and
+        dropped when a session commits a request change. Changes made
+        outside a session, such as raw SQL, wait out the TTL. Caching is
+        disabled when DASHBOARD_CACHE_ENABLED is false.
+        
         Returns:
             Dictionary with maintenance statistics
         """
-        # Get counts by status
-        status_counts = dict(
-            self.db_session.query(
+        ttl = self.STATS_TTL
+        if has_app_context() and not current_app.config.get('DASHBOARD_CACHE_ENABLED', True):
+            ttl = 0
+        return stats_cache.get_or_compute('maintenance_stats', ttl, self._compute_maintenance_stats)
+    
+    def _compute_maintenance_stats(self):
+        """Compute maintenance statistics with one grouped query, bypassing the cache."""
+        resolution_hours = (
+            func.julianday(MaintenanceRequest.resolved_at) -
+            func.julianday(MaintenanceRequest.created_at)
+        ) * 24  # Convert days to hours
+        
+        # One row per status, priority and issue type; each breakdown is
+        # summed from these groups below
+        rows = self.db_session.execute(
+            select(
                 MaintenanceRequest.status,
-                func.count(MaintenanceRequest.id)
-            ).group_by(
-                MaintenanceRequest.status
-            ).all()
-        )
-        
-        # Get counts by priority
-        priority_counts = dict(
-            self.db_session.query(
                 MaintenanceRequest.priority,
-                func.count(MaintenanceRequest.id)
-            ).group_by(
-                MaintenanceRequest.priority
-            ).all()
-        )
-        
-        # Get counts by issue type
-        issue_type_counts = dict(
-            self.db_session.query(
                 MaintenanceRequest.issue_type,
-                func.count(MaintenanceRequest.id)
+                func.count(MaintenanceRequest.id),
+                func.sum(resolution_hours),
+                func.count(resolution_hours)
             ).group_by(
+                MaintenanceRequest.status,
+                MaintenanceRequest.priority,
                 MaintenanceRequest.issue_type
-            ).all()
-        )
-        
-        # Calculate average resolution time
-        avg_resolution = self.db_session.query(
-            func.avg(
-                func.julianday(MaintenanceRequest.resolved_at) - 
-                func.julianday(MaintenanceRequest.created_at)
-            ) * 24  # Convert days to hours
-        ).filter(
-            MaintenanceRequest.resolved_at.isnot(None)
-        ).scalar()
+            )
+        ).all()
+        
+        status_counts = {}
+        priority_counts = {}
+        issue_type_counts = {}
+        resolution_total = 0.0
+        resolved_count = 0
+        for status, priority, issue_type, count, hours, resolved in rows:
+            status_counts[status] = status_counts.get(status, 0) + count
+            priority_counts[priority] = priority_counts.get(priority, 0) + count
+            issue_type_counts[issue_type] = issue_type_counts.get(issue_type, 0) + count
+            resolution_total += hours or 0.0
+            resolved_count += resolved or 0
         
         return {
             'status_counts': status_counts,
             'priority_counts': priority_counts,
             'issue_type_counts': issue_type_counts,
-            'avg_resolution_hours': float(avg_resolution) if avg_resolution else None,
+            'avg_resolution_hours': resolution_total / resolved_count if resolved_count else None,
             'total': sum(status_counts.values())
         } 
\ No newline at end of file
@@ -3,7 +3,7 @@ Notification service module.
 
 This module provides services for managing and retrieving notifications.
 """
-from sqlalchemy import desc
+from sqlalchemy import desc, insert, select
 from app.models.notification import Notification
 from app.models.user import User # For type hinting or fetching user if needed
 from db import db # Assuming db.py has SQLAlchemy session
@@ -54,6 +54,79 @@ class NotificationService:
             # Re-raise the exception so the caller can handle it
             raise e
 
+    def create_notifications_bulk(self, user_ids, message, type=None, link_url=None, priority='normal', category='general',
+                                  channels='web', template_id=None, template_data=None, recipient_data=None, **kwargs):
+        """
+        Create the same notification for many users in one transaction.
+
+        Recipients are checked with one IN query and the rows are inserted
+        with a single executemany, instead of a lookup and commit per user.
+        When template_id is given, the message is a str.format template
+        filled from template_data, overlaid with the recipient's own
+        values from recipient_data; the merged values are stored with each
+        notification.
+
+        Args:
+            user_ids (iterable[int]): The IDs of the users to notify. Duplicates are ignored.
+            message (str): The notification message, or its template when template_id is given.
+            type (str, optional): The type of notification (e.g., 'booking_update').
+            link_url (str, optional): A URL for the notifications to link to.
+            priority (str, optional): Priority level ('low', 'normal', 'high', 'urgent'). Defaults to 'normal'.
+            category (str, optional): Category of notification. Defaults to 'general'.
+            channels (str, optional): Delivery channels. Defaults to 'web'.
+            template_id (str, optional): Identifier of the message template.
+            template_data (dict, optional): Template values shared by every recipient.
+            recipient_data (dict, optional): Template values by user ID, overriding template_data.
+            **kwargs: Additional notification fields.
+
+        Returns:
+            dict: 'created', the number of notifications created, and 'skipped',
+            the requested user IDs that do not exist.
+
+        Raises:
+            ValueError: If a template value is missing.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return {'created': 0, 'skipped': []}
+
+        existing = set(self.db_session.scalars(select(User.id).where(User.id.in_(user_ids))))
+        recipients = [user_id for user_id in user_ids if user_id in existing]
+        skipped = [user_id for user_id in user_ids if user_id not in existing]
+
+        rows = []
+        for user_id in recipients:
+            row = dict(
+                kwargs,
+                user_id=user_id,
+                message=message,
+                type=type,
+                link_url=link_url,
+                priority=priority,
+                category=category,
+                channels=channels
+            )
+            if template_id is not None:
+                data = {**(template_data or {}), **((recipient_data or {}).get(user_id) or {})}
+                try:
+                    row['message'] = message.format_map(data)
+                except (KeyError, IndexError) as e:
+                    raise ValueError(f"Missing value {e} for notification template '{template_id}'") from e
+                row['template_id'] = template_id
+                row['template_data'] = data
+            rows.append(row)
+
+        if not rows:
+            return {'created': 0, 'skipped': skipped}
+
+        try:
+            self.db_session.execute(insert(Notification), rows)
+            self.db_session.commit()
+        except Exception as e:
+            self.db_session.rollback()
+            raise e
+        return {'created': len(rows), 'skipped': skipped}
+
     def get_user_notifications(self, user_id, limit=10, include_read=False):
         """
         Get notifications for a specific user, most recent first.
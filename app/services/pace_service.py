@@ -0,0 +1,164 @@
+"""
+Pace service module.
+
+This module provides on-the-books pace tracking: a nightly snapshot of the
+room nights and revenue booked for every future stay date, and the pace
+curve and pickup reports read back from those snapshots.
+"""
+
+from datetime import datetime, timedelta
+from sqlalchemy import select, delete, insert
+
+from app.models.booking import Booking
+from app.models.booking_pace import BookingPace
+from app.utils.time_series import date_range
+
+
+class PaceService:
+    """Service class for booking pace snapshots and reports."""
+
+    # Statuses whose nights count as on the books
+    ON_BOOKS_STATUSES = (Booking.STATUS_RESERVED, Booking.STATUS_CHECKED_IN)
+
+    # Number of future stay dates recorded by each snapshot
+    HORIZON_DAYS = 365
+
+    def __init__(self, db_session):
+        """Initialize with a database session."""
+        self.db_session = db_session
+
+    def take_snapshot(self, snapshot_date=None, horizon_days=HORIZON_DAYS):
+        """
+        Record what is on the books for each stay date in the horizon.
+
+        Every stay date from the snapshot date onwards gets a row, including
+        empty ones, so a missing row always means no snapshot was taken.
+        The whole horizon is covered by one booking scan.
+
+        Args:
+            snapshot_date: Day the snapshot is taken (defaults to today)
+            horizon_days: Number of stay dates to record
+
+        Returns:
+            int: Number of stay dates recorded
+        """
+        if snapshot_date is None:
+            snapshot_date = datetime.now().date()
+        last_stay_date = snapshot_date + timedelta(days=horizon_days - 1)
+
+        on_books = {
+            stay_date: [0, 0.0] for stay_date in date_range(snapshot_date, last_stay_date)
+        }
+        bookings = self.db_session.execute(
+            select(Booking.check_in_date, Booking.check_out_date, Booking.total_price).filter(
+                Booking.check_in_date <= last_stay_date,
+                Booking.check_out_date > snapshot_date,
+                Booking.status.in_(self.ON_BOOKS_STATUSES)
+            )
+        )
+        for check_in, check_out, total_price in bookings:
+            nights = (check_out - check_in).days
+            if nights <= 0:
+                continue
+            nightly_rate = (total_price or 0.0) / nights
+            for night in date_range(max(check_in, snapshot_date), min(check_out - timedelta(days=1), last_stay_date)):
+                on_books[night][0] += 1
+                on_books[night][1] += nightly_rate
+
+        now = datetime.utcnow()
+        self.db_session.execute(delete(BookingPace).where(BookingPace.snapshot_date == snapshot_date))
+        self.db_session.execute(insert(BookingPace), [
+            {
+                'snapshot_date': snapshot_date,
+                'stay_date': stay_date,
+                'rooms_on_books': rooms,
+                'revenue_on_books': round(revenue, 2),
+                'created_at': now,
+                'updated_at': now
+            }
+            for stay_date, (rooms, revenue) in on_books.items()
+        ])
+        self.db_session.commit()
+        return len(on_books)
+
+    def get_pace_curve(self, stay_date, max_days_out=90):
+        """
+        Get how the books for one stay date built up over lead time.
+
+        Args:
+            stay_date: Night to get the curve for
+            max_days_out: Longest lead time to include
+
+        Returns:
+            List of dictionaries with days_out, snapshot_date, rooms and
+            revenue, from the longest lead time to the shortest
+        """
+        snapshots = self.db_session.execute(
+            select(BookingPace).filter(
+                BookingPace.stay_date == stay_date,
+                BookingPace.snapshot_date >= stay_date - timedelta(days=max_days_out),
+                BookingPace.snapshot_date <= stay_date
+            ).order_by(BookingPace.snapshot_date)
+        ).scalars()
+
+        return [
+            {
+                'days_out': snapshot.days_out,
+                'snapshot_date': snapshot.snapshot_date,
+                'rooms': snapshot.rooms_on_books,
+                'revenue': snapshot.revenue_on_books
+            }
+            for snapshot in snapshots
+        ]
+
+    def get_pickup(self, snapshot_date, compare_date, start_date=None, end_date=None):
+        """
+        Get the rooms and revenue picked up for each stay date between two snapshots.
+
+        Only stay dates recorded by both snapshots are compared, so the
+        range starts no earlier than the later snapshot date.
+
+        Args:
+            snapshot_date: Later snapshot date
+            compare_date: Earlier snapshot date to compare against
+            start_date: First stay date (defaults to the later snapshot date)
+            end_date: Last stay date (defaults to 30 days after the start)
+
+        Returns:
+            List of dictionaries with stay_date, rooms, revenue, rooms_picked_up
+            and revenue_picked_up, ordered by stay date
+
+        Raises:
+            ValueError: If the compare date is not before the snapshot date
+        """
+        if compare_date >= snapshot_date:
+            raise ValueError("Compare date must be before the snapshot date")
+
+        start_date = max(start_date or snapshot_date, snapshot_date)
+        end_date = end_date or start_date + timedelta(days=29)
+
+        rows = self.db_session.execute(
+            select(BookingPace).filter(
+                BookingPace.snapshot_date.in_([snapshot_date, compare_date]),
+                BookingPace.stay_date >= start_date,
+                BookingPace.stay_date <= end_date
+            )
+        ).scalars()
+
+        by_snapshot = {snapshot_date: {}, compare_date: {}}
+        for row in rows:
+            by_snapshot[row.snapshot_date][row.stay_date] = row
+
+        pickup = []
+        for stay_date, current in sorted(by_snapshot[snapshot_date].items()):
+            previous = by_snapshot[compare_date].get(stay_date)
+            if previous is None:
+                continue
+            pickup.append({
+                'stay_date': stay_date,
+                'rooms': current.rooms_on_books,
+                'revenue': current.revenue_on_books,
+                'rooms_picked_up': current.rooms_on_books - previous.rooms_on_books,
+                'revenue_picked_up': round(current.revenue_on_books - previous.revenue_on_books, 2)
+            })
+        return pickup
@@ -4,6 +4,7 @@ Report service module.
 This module provides services for generating reports on hotel operations.
 """
 
+import itertools
 from datetime import datetime, timedelta, date
 from calendar import monthrange
 from sqlalchemy import func, extract, case, and_, or_, select
@@ -13,6 +14,12 @@ from db import db
 from app.models.user import User
 from app.models.room import Room
 from app.models.booking import Booking
+from app.models.report_cache import ReportCache, current_generation, store_report
+from app.utils.revenue import room_type_revenue
+from app.utils.time_series import occupancy_series
+
+# Rows fetched per round trip when streaming exports
+EXPORT_BATCH_SIZE = 1000
 
 class ReportService:
     """
@@ -25,7 +32,54 @@ class ReportService:
     def __init__(self, db_session):
         """Initialize the service with a database session."""
         self.db_session = db_session
-    
+
+    def _cached_report(self, report_type, start_date, end_date, build):
+        """
+        Return a report from the report cache, computing it if needed.
+
+        Only closed periods (ending before today) are cached, since open
+        periods still change as the day goes on. Cached entries are removed
+        by the ReportCache session hooks whenever a booking touching the
+        period changes. A report built while the session holds uncommitted
+        writes is only cached once those writes commit, and one built while
+        another transaction invalidated the cache is not stored at all.
+
+        Args:
+            report_type: Cache key for the kind of report
+            start_date: First day of the period
+            end_date: Last day of the period (inclusive)
+            build: Callable that computes the report
+
+        Returns:
+            The report dictionary
+        """
+        if end_date >= date.today():
+            return build()
+
+        entry = self.db_session.execute(
+            select(ReportCache).filter_by(
+                report_type=report_type,
+                period_start=start_date,
+                period_end=end_date
+            )
+        ).scalar_one_or_none()
+        if entry is not None and entry.data_version == ReportCache.DATA_VERSION:
+            return entry.payload
+
+        # Read first, so an invalidation committed while building is noticed
+        generation = current_generation(self.db_session)
+        report = build()
+        if report is None:
+            return report
+
+        store_report(self.db_session, generation, report_type, start_date, end_date, report)
+
+        if entry is not None:
+            # The caller's copy of the row is now out of date
+            self.db_session.expire(entry)
+
+        return report
+
     def get_occupancy_report(self, start_date_str, end_date_str):
         """
         Generate an occupancy report for a date range.
@@ -41,74 +95,81 @@ class ReportService:
             start_date_obj = datetime.strptime(start_date_str, '%Y-%m-%d').date()
             end_date_obj = datetime.strptime(end_date_str, '%Y-%m-%d').date()
             
-            total_rooms = self.db_session.execute(select(func.count(Room.id))).scalar_one_or_none() or 0
-            
-            daily_occupancy = self._calculate_daily_occupancy(start_date_obj, end_date_obj, total_rooms)
-            
-            avg_occupancy = sum(daily_occupancy.values()) / len(daily_occupancy) if daily_occupancy else 0
-            
-            peak_date = None
-            peak_rate = 0
-            for day, rate in daily_occupancy.items():
-                if rate > peak_rate:
-                    peak_date = day
-                    peak_rate = rate
-            
-            total_room_nights = self._calculate_total_room_nights(start_date_obj, end_date_obj)
-            
-            total_bookings_query = select(func.count(Booking.id)).filter(
-                or_(
-                    and_(Booking.check_in_date >= start_date_obj, Booking.check_in_date <= end_date_obj),
-                    and_(Booking.check_out_date >= start_date_obj, Booking.check_out_date <= end_date_obj),
-                    and_(Booking.check_in_date <= start_date_obj, Booking.check_out_date >= end_date_obj)
-                )
-            )
-            total_bookings = self.db_session.execute(total_bookings_query).scalar_one_or_none() or 0
-            
-            new_bookings_query = select(func.count(Booking.id)).filter(
-                    Booking.created_at >= start_date_obj,
-                Booking.created_at < (end_date_obj + timedelta(days=1)) # up to, but not including, the next day
-            )
-            new_bookings = self.db_session.execute(new_bookings_query).scalar_one_or_none() or 0
-            
-            cancelled_bookings_query = select(func.count(Booking.id)).filter(
-                    Booking.status == Booking.STATUS_CANCELLED,
-                    Booking.updated_at >= start_date_obj,
-                Booking.updated_at < (end_date_obj + timedelta(days=1))
-            )
-            cancelled_bookings = self.db_session.execute(cancelled_bookings_query).scalar_one_or_none() or 0
-            
-            completed_stays_query = select(func.count(Booking.id)).filter(
-                    Booking.status == Booking.STATUS_CHECKED_OUT,
-                    Booking.updated_at >= start_date_obj,
-                Booking.updated_at < (end_date_obj + timedelta(days=1))
+            return self._cached_report(
+                'occupancy', start_date_obj, end_date_obj,
+                lambda: self._build_occupancy_report(start_date_obj, end_date_obj)
             )
-            completed_stays = self.db_session.execute(completed_stays_query).scalar_one_or_none() or 0
-            
-            return {
-                'occupancy_summary': {
-                    'average_occupancy_rate': avg_occupancy,
-                    'peak_occupancy_date': peak_date.strftime('%Y-%m-%d') if peak_date else None,
-                    'peak_occupancy_rate': peak_rate,
-                    'total_room_nights': total_room_nights
-                },
-                'booking_summary': {
-                    'total_bookings': total_bookings,
-                    'new_bookings': new_bookings,
-                    'cancelled_bookings': cancelled_bookings,
-                    'completed_stays': completed_stays
-                },
-                'daily_occupancy': daily_occupancy,
-                'revenue_summary': {
-                    'total_revenue': 0,
-                    'room_revenue': 0,
-                },
-                'room_type_revenue': {}
-            }
         except Exception as e:
             print(f"Error generating occupancy report: {str(e)}")
             return None
     
+    def _build_occupancy_report(self, start_date_obj, end_date_obj):
+        """Compute the occupancy report for a date range."""
+        total_rooms = self.db_session.execute(select(func.count(Room.id))).scalar_one_or_none() or 0
+        
+        daily_occupancy = self._calculate_daily_occupancy(start_date_obj, end_date_obj, total_rooms)
+        
+        avg_occupancy = sum(daily_occupancy.values()) / len(daily_occupancy) if daily_occupancy else 0
+        
+        peak_date = None
+        peak_rate = 0
+        for day, rate in daily_occupancy.items():
+            if rate > peak_rate:
+                peak_date = day
+                peak_rate = rate
+        
+        _, _, total_room_nights = self._calculate_revenue_summary(start_date_obj, end_date_obj)
+        
+        total_bookings_query = select(func.count(Booking.id)).filter(
+            or_(
+                and_(Booking.check_in_date >= start_date_obj, Booking.check_in_date <= end_date_obj),
+                and_(Booking.check_out_date >= start_date_obj, Booking.check_out_date <= end_date_obj),
+                and_(Booking.check_in_date <= start_date_obj, Booking.check_out_date >= end_date_obj)
+            )
+        )
+        total_bookings = self.db_session.execute(total_bookings_query).scalar_one_or_none() or 0
+        
+        new_bookings_query = select(func.count(Booking.id)).filter(
+                Booking.created_at >= start_date_obj,
+            Booking.created_at < (end_date_obj + timedelta(days=1)) # up to, but not including, the next day
+        )
+        new_bookings = self.db_session.execute(new_bookings_query).scalar_one_or_none() or 0
+        
+        cancelled_bookings_query = select(func.count(Booking.id)).filter(
+                Booking.status == Booking.STATUS_CANCELLED,
+                Booking.updated_at >= start_date_obj,
+            Booking.updated_at < (end_date_obj + timedelta(days=1))
+        )
+        cancelled_bookings = self.db_session.execute(cancelled_bookings_query).scalar_one_or_none() or 0
+        
+        completed_stays_query = select(func.count(Booking.id)).filter(
+                Booking.status == Booking.STATUS_CHECKED_OUT,
+                Booking.updated_at >= start_date_obj,
+            Booking.updated_at < (end_date_obj + timedelta(days=1))
+        )
+        completed_stays = self.db_session.execute(completed_stays_query).scalar_one_or_none() or 0
+        
+        return {
+            'occupancy_summary': {
+                'average_occupancy_rate': avg_occupancy,
+                'peak_occupancy_date': peak_date,
+                'peak_occupancy_rate': peak_rate,
+                'total_room_nights': total_room_nights
+            },
+            'booking_summary': {
+                'total_bookings': total_bookings,
+                'new_bookings': new_bookings,
+                'cancelled_bookings': cancelled_bookings,
+                'completed_stays': completed_stays
+            },
+            'daily_occupancy': daily_occupancy,
+            'revenue_summary': {
+                'total_revenue': 0,
+                'room_revenue': 0,
+            },
+            'room_type_revenue': {}
+        }
+    
     def get_revenue_report(self, start_date_str, end_date_str):
         """
         Generate a revenue report for a date range.
@@ -124,46 +185,52 @@ class ReportService:
             start_date_obj = datetime.strptime(start_date_str, '%Y-%m-%d').date()
             end_date_obj = datetime.strptime(end_date_str, '%Y-%m-%d').date()
             
-            monthly_revenue = self._calculate_monthly_revenue(start_date_obj, end_date_obj)
-            room_type_revenue = self._calculate_room_type_revenue(start_date_obj, end_date_obj)
-            
-            total_bookings_query = select(func.count(Booking.id)).filter(
-                or_(
-                    and_(Booking.check_in_date >= start_date_obj, Booking.check_in_date <= end_date_obj),
-                    and_(Booking.check_out_date >= start_date_obj, Booking.check_out_date <= end_date_obj),
-                    and_(Booking.check_in_date <= start_date_obj, Booking.check_out_date >= end_date_obj)
-                )
+            return self._cached_report(
+                'revenue', start_date_obj, end_date_obj,
+                lambda: self._build_revenue_report(start_date_obj, end_date_obj)
             )
-            total_bookings = self.db_session.execute(total_bookings_query).scalar_one_or_none() or 0
-            
-            total_rooms = self.db_session.execute(select(func.count(Room.id))).scalar_one_or_none() or 0
-            daily_occupancy = self._calculate_daily_occupancy(start_date_obj, end_date_obj, total_rooms)
-            avg_occupancy = sum(daily_occupancy.values()) / len(daily_occupancy) if daily_occupancy else 0
-            
-            return {
-                'revenue_summary': {
-                    'total_revenue': monthly_revenue,
-                    'room_revenue': monthly_revenue, 
-                },
-                'room_type_revenue': room_type_revenue,
-                'booking_summary': {
-                    'total_bookings': total_bookings,
-                    'new_bookings': 0, 
-                    'cancelled_bookings': 0, 
-                    'completed_stays': 0 
-                },
-                'occupancy_summary': {
-                    'average_occupancy_rate': avg_occupancy,
-                    'peak_occupancy_date': None, 
-                    'peak_occupancy_rate': 0, 
-                    'total_room_nights': 0 
-                },
-                'daily_occupancy': daily_occupancy
-            }
         except Exception as e:
             print(f"Error generating revenue report: {str(e)}")
             return None
     
+    def _build_revenue_report(self, start_date_obj, end_date_obj):
+        """Compute the revenue report for a date range."""
+        monthly_revenue, room_type_revenue, _ = self._calculate_revenue_summary(start_date_obj, end_date_obj)
+        
+        total_bookings_query = select(func.count(Booking.id)).filter(
+            or_(
+                and_(Booking.check_in_date >= start_date_obj, Booking.check_in_date <= end_date_obj),
+                and_(Booking.check_out_date >= start_date_obj, Booking.check_out_date <= end_date_obj),
+                and_(Booking.check_in_date <= start_date_obj, Booking.check_out_date >= end_date_obj)
+            )
+        )
+        total_bookings = self.db_session.execute(total_bookings_query).scalar_one_or_none() or 0
+        
+        total_rooms = self.db_session.execute(select(func.count(Room.id))).scalar_one_or_none() or 0
+        daily_occupancy = self._calculate_daily_occupancy(start_date_obj, end_date_obj, total_rooms)
+        avg_occupancy = sum(daily_occupancy.values()) / len(daily_occupancy) if daily_occupancy else 0
+        
+        return {
+            'revenue_summary': {
+                'total_revenue': monthly_revenue,
+                'room_revenue': monthly_revenue, 
+            },
+            'room_type_revenue': room_type_revenue,
+            'booking_summary': {
+                'total_bookings': total_bookings,
+                'new_bookings': 0, 
+                'cancelled_bookings': 0, 
+                'completed_stays': 0 
+            },
+            'occupancy_summary': {
+                'average_occupancy_rate': avg_occupancy,
+                'peak_occupancy_date': None, 
+                'peak_occupancy_rate': 0, 
+                'total_room_nights': 0 
+            },
+            'daily_occupancy': daily_occupancy
+        }
+    
     def get_staff_activity_report(self, start_date_str, end_date_str):
         """
         Generate a staff activity report for a date range.
@@ -224,6 +291,13 @@ class ReportService:
         start_date = date(year, month, 1)
         end_date = date(year, month, last_day)
         
+        return self._cached_report(
+            'monthly', start_date, end_date,
+            lambda: self._build_monthly_report(year, month, start_date, end_date)
+        )
+    
+    def _build_monthly_report(self, year, month, start_date, end_date):
+        """Compute the monthly report for the given month."""
         # Total number of rooms
         total_rooms = self.db_session.execute(select(func.count(Room.id))).scalar_one_or_none() or 0
         
@@ -244,14 +318,10 @@ class ReportService:
                 peak_date = day
                 peak_rate = rate
         
-        # Calculate revenue for the month
-        monthly_revenue = self._calculate_monthly_revenue(start_date, end_date)
-        
-        # Calculate revenue by room type
-        room_type_revenue = self._calculate_room_type_revenue(start_date, end_date)
-        
-        # Calculate total room nights
-        total_room_nights = self._calculate_total_room_nights(start_date, end_date)
+        # Calculate revenue for the month, by room type and in room nights
+        monthly_revenue, room_type_revenue, total_room_nights = self._calculate_revenue_summary(
+            start_date, end_date
+        )
         
         # Booking statistics
         total_bookings_query = select(func.count(Booking.id)).filter(
@@ -326,209 +396,46 @@ class ReportService:
         Returns:
             Dictionary with dates as keys and occupancy rates as values
         """
-        from app.models.booking import Booking
+        occupied_by_day = occupancy_series(self.db_session, start_date, end_date)
         
-        # Generate all dates in the range
         result = {}
-        current_date = start_date
-        while current_date <= end_date:
-            # Count bookings for the current date
-            occupied_rooms_query = select(func.count(Booking.id)).filter(
-                    Booking.check_in_date <= current_date,
-                    Booking.check_out_date > current_date,
-                    Booking.status.in_([Booking.STATUS_RESERVED, Booking.STATUS_CHECKED_IN])
-            )
-            occupied_rooms = self.db_session.execute(occupied_rooms_query).scalar_one_or_none() or 0
-            
+        for day, occupied_rooms in occupied_by_day.items():
             # Calculate occupancy rate
             occupancy_rate = 0
             if total_rooms > 0:
                 occupancy_rate = (occupied_rooms / total_rooms) * 100
             
-            # Store the result
-            result[current_date.strftime('%Y-%m-%d')] = occupancy_rate
-            
-            # Move to the next day
-            current_date += timedelta(days=1)
+            result[day.strftime('%Y-%m-%d')] = occupancy_rate
         
         return result
     
-    def _calculate_monthly_revenue(self, start_date, end_date):
+    def _calculate_revenue_summary(self, start_date, end_date):
         """
-        Calculate total revenue for a month.
+        Calculate total revenue, revenue by room type and total room nights.
         
-        Args:
-            start_date: Start date
-            end_date: End date
-            
-        Returns:
-            Total revenue for the month
-        """
-        from app.models.booking import Booking
-        from app.models.room import Room
-        from app.models.room_type import RoomType
-        
-        # For each booking, calculate the revenue:
-        # - If a booking spans outside the month, only count the days within the month
-        # - Use room base_rate * number of nights
-        
-        # Get all bookings that overlap with the month
-        bookings_query = select(Booking, Room, RoomType).join(
-            Room, Booking.room_id == Room.id
-        ).join(
-            RoomType, Room.room_type_id == RoomType.id
-        ).filter(
-            or_(
-                and_(
-                    Booking.check_in_date >= start_date,
-                    Booking.check_in_date <= end_date
-                ),
-                and_(
-                    Booking.check_out_date >= start_date,
-                    Booking.check_out_date <= end_date
-                ),
-                and_(
-                    Booking.check_in_date <= start_date,
-                    Booking.check_out_date >= end_date
-                )
-            ),
-            Booking.status != Booking.STATUS_CANCELLED
-        )
-        bookings_results = self.db_session.execute(bookings_query).all() # .all() gives list of Row objects
-        
-        total_revenue = 0
-        # Each item in bookings_results is a Row, access attributes by model name or index
-        for row in bookings_results:
-            booking = row.Booking
-            room_type = row.RoomType
-            # Calculate the number of nights within the month
-            booking_start = max(booking.check_in_date, start_date)
-            booking_end = min(booking.check_out_date, end_date)
-            nights = (booking_end - booking_start).days
-            
-            # Add the revenue for this booking
-            if nights > 0:
-                total_revenue += float(room_type.base_rate) * nights
-        
-        return total_revenue
-    
-    def _calculate_room_type_revenue(self, start_date, end_date):
-        """
-        Calculate revenue by room type.
+        All three come from a single room_type_revenue query, where nights
+        are clipped to the period and priced at the room type base rate.
         
         Args:
             start_date: Start date
             end_date: End date
             
         Returns:
-            Dictionary with room types as keys and revenue information as values
+            Tuple of (total revenue, dictionary with room types as keys and
+            revenue information as values, total room nights)
         """
-        from app.models.booking import Booking
-        from app.models.room import Room
-        from app.models.room_type import RoomType
-        
-        # Get all room types
-        room_types_query = select(RoomType)
-        room_types = self.db_session.execute(room_types_query).scalars().all()
-        
-        result = {}
-        total_revenue = 0
-        
-        # For each room type, calculate the revenue
-        for rt in room_types:
-            # Get all bookings for this room type in the month
-            bookings_query = select(Booking, Room).join(
-                Room, Booking.room_id == Room.id
-            ).filter(
-                Room.room_type_id == rt.id,
-                or_(
-                    and_(
-                        Booking.check_in_date >= start_date,
-                        Booking.check_in_date <= end_date
-                    ),
-                    and_(
-                        Booking.check_out_date >= start_date,
-                        Booking.check_out_date <= end_date
-                    ),
-                    and_(
-                        Booking.check_in_date <= start_date,
-                        Booking.check_out_date >= end_date
-                    )
-                ),
-                Booking.status != Booking.STATUS_CANCELLED
-            )
-            bookings_results = self.db_session.execute(bookings_query).all() # List of Row objects
-            
-            rt_revenue = 0
-            for row in bookings_results:
-                booking = row.Booking
-                # Calculate the number of nights within the month
-                booking_start = max(booking.check_in_date, start_date)
-                booking_end = min(booking.check_out_date, end_date)
-                nights = (booking_end - booking_start).days
-                
-                # Add the revenue for this booking
-                if nights > 0:
-                    rt_revenue += float(rt.base_rate) * nights
-            
-            result[rt.name] = {
-                'revenue': rt_revenue,
-                'percentage': 0  # Will calculate after getting total
+        rows = room_type_revenue(self.db_session, start_date, end_date)
+        total_revenue = sum(revenue for _, revenue, _ in rows)
+        total_room_nights = sum(nights for _, _, nights in rows)
+        
+        by_room_type = {}
+        for name, revenue, _ in rows:
+            by_room_type[name] = {
+                'revenue': revenue,
+                'percentage': (revenue / total_revenue) * 100 if total_revenue > 0 else 0
             }
-            total_revenue += rt_revenue
-        
-        # Calculate percentages
-        if total_revenue > 0:
-            for rt_name in result:
-                result[rt_name]['percentage'] = (result[rt_name]['revenue'] / total_revenue) * 100
-        
-        return result
-    
-    def _calculate_total_room_nights(self, start_date, end_date):
-        """
-        Calculate total room nights for the month.
-        
-        Args:
-            start_date: Start date
-            end_date: End date
-            
-        Returns:
-            Total room nights
-        """
-        from app.models.booking import Booking
-        
-        # Get all bookings that overlap with the month
-        bookings_query = select(Booking).filter(
-            or_(
-                and_(
-                    Booking.check_in_date >= start_date,
-                    Booking.check_in_date <= end_date
-                ),
-                and_(
-                    Booking.check_out_date >= start_date,
-                    Booking.check_out_date <= end_date
-                ),
-                and_(
-                    Booking.check_in_date <= start_date,
-                    Booking.check_out_date >= end_date
-                )
-            ),
-            Booking.status != Booking.STATUS_CANCELLED
-        )
-        bookings = self.db_session.execute(bookings_query).scalars().all()
-        
-        total_nights = 0
-        for booking in bookings:
-            # Calculate the number of nights within the month
-            booking_start = max(booking.check_in_date, start_date)
-            booking_end = min(booking.check_out_date, end_date)
-            nights = (booking_end - booking_start).days
-            
-            # Add the nights for this booking
-            if nights > 0:
-                total_nights += nights
         
-        return total_nights
+        return total_revenue, by_room_type, total_room_nights
     
     def get_available_report_periods(self):
         """
@@ -562,122 +469,326 @@ class ReportService:
     # Add the missing export methods
     def export_to_csv(self, data, title):
         """Exports report data to CSV format."""
+        return ''.join(self.iter_csv(self._report_rows(data, title))).encode('utf-8')
+
+    def iter_csv(self, rows, title=None):
+        """
+        Encode rows as CSV text one line at a time.
+        
+        A single small buffer is reused for every row, so memory use does not
+        grow with the number of rows. The generator can be passed straight to
+        a Flask streaming response.
+        
+        Args:
+            rows: Iterable of row sequences
+            title: Optional title written as the first row
+            
+        Yields:
+            CSV-formatted lines
+        """
         import csv
         import io
 
-        output = io.StringIO()
-        writer = csv.writer(output)
+        if title is not None:
+            rows = itertools.chain([[title]], rows)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
 
-        # Placeholder: Write a title and headers
-        writer.writerow([title])
+    def _report_rows(self, data, title):
+        """Yield CSV rows for a report dictionary or a list of rows."""
+        yield [title]
         if data and isinstance(data, dict) and data.get('daily_occupancy'): # Example for occupancy
-            writer.writerow(['Date', 'Occupancy Rate'])
+            yield ['Date', 'Occupancy Rate']
             for date_str, rate in data['daily_occupancy'].items():
-                writer.writerow([date_str, rate])
-        elif data and isinstance(data, list): # Generic list of dicts
-            if data:
-                headers = data[0].keys()
-                writer.writerow(headers)
+                yield [date_str, rate]
+        elif data and isinstance(data, list): # Generic list of dicts or list of rows
+            if isinstance(data[0], dict):
+                yield list(data[0].keys())
                 for row in data:
-                    writer.writerow(row.values())
+                    yield list(row.values())
+            else:
+                # First row is headers, rest is data
+                yield from data
         else:
-            writer.writerow(['No data available to export.'])
+            yield ['No data available to export.']
+
+    def iter_monthly_report_rows(self, report_data, period_label, start_date, end_date):
+        """
+        Yield CSV rows for the monthly report followed by its booking details.
+        
+        The summary sections come from the already computed report_data; the
+        booking details are streamed from the database.
         
-        return output.getvalue().encode('utf-8')
+        Args:
+            report_data: Dictionary returned by get_monthly_report
+            period_label: Period shown in the title row (e.g. 'May 2024')
+            start_date: First day of the report period
+            end_date: Last day of the report period
+            
+        Yields:
+            Row lists
+        """
+        revenue = report_data['revenue_summary']
+        occupancy = report_data['occupancy_summary']
+        bookings = report_data['booking_summary']
+
+        yield ['Hotel Monthly Report', period_label]
+        yield []
+
+        yield ['Revenue Summary']
+        yield ['Category', 'Amount']
+        yield ['Total Revenue', f"${revenue['total_revenue']:.2f}"]
+        yield ['Room Revenue', f"${revenue['room_revenue']:.2f}"]
+
+        yield []
+        yield ['Occupancy Summary']
+        yield ['Metric', 'Value']
+        yield ['Average Occupancy Rate', f"{occupancy['average_occupancy_rate']:.2f}%"]
+        yield ['Peak Occupancy Date', occupancy['peak_occupancy_date']]
+        yield ['Peak Occupancy Rate', f"{occupancy['peak_occupancy_rate']:.2f}%"]
+        yield ['Total Room Nights', occupancy['total_room_nights']]
+
+        yield []
+        yield ['Booking Summary']
+        yield ['Metric', 'Value']
+        yield ['Total Bookings', bookings['total_bookings']]
+        yield ['New Bookings', bookings['new_bookings']]
+        yield ['Cancelled Bookings', bookings['cancelled_bookings']]
+        yield ['Completed Stays', bookings['completed_stays']]
+
+        yield []
+        yield ['Room Type Revenue']
+        yield ['Room Type', 'Revenue', 'Percentage']
+        for room_type, data in report_data['room_type_revenue'].items():
+            yield [room_type, f"${data['revenue']:.2f}", f"{data['percentage']:.2f}%"]
+
+        yield []
+        yield ['Bookings']
+        yield from self.iter_booking_rows(start_date, end_date)
+
+    def iter_booking_rows(self, start_date, end_date, batch_size=EXPORT_BATCH_SIZE):
+        """
+        Stream bookings overlapping a date range as export rows.
+        
+        Rows are fetched through a server-side cursor in batches of
+        batch_size, so only one batch is held in memory at a time.
+        
+        Args:
+            start_date: First day of the range
+            end_date: Last day of the range (inclusive)
+            batch_size: Number of rows fetched per round trip
+            
+        Yields:
+            A header row, then one row per booking
+        """
+        from app.models.customer import Customer
+        from app.models.room_type import RoomType
+
+        yield ['Booking ID', 'Confirmation Code', 'Room', 'Room Type', 'Guest',
+               'Check-in', 'Check-out', 'Status', 'Total Price']
+
+        query = select(
+            Booking.id,
+            Booking.confirmation_code,
+            Room.number,
+            RoomType.name,
+            Customer.name,
+            Booking.check_in_date,
+            Booking.check_out_date,
+            Booking.status,
+            Booking.total_price
+        ).join(
+            Room, Room.id == Booking.room_id
+        ).join(
+            RoomType, RoomType.id == Room.room_type_id
+        ).outerjoin(
+            Customer, Customer.id == Booking.customer_id
+        ).filter(
+            Booking.check_in_date <= end_date,
+            Booking.check_out_date > start_date
+        ).order_by(Booking.check_in_date, Booking.id).execution_options(yield_per=batch_size)
+
+        for row in self.db_session.execute(query):
+            (booking_id, confirmation_code, room_number, room_type, guest,
+             check_in, check_out, status, total_price) = row
+            yield [
+                booking_id,
+                confirmation_code or '',
+                room_number,
+                room_type,
+                guest or '',
+                check_in.strftime('%Y-%m-%d'),
+                check_out.strftime('%Y-%m-%d'),
+                status,
+                f"{total_price or 0:.2f}"
+            ]
+
+    def iter_forecast_rows(self, start_date, end_date, batch_size=EXPORT_BATCH_SIZE):
+        """
+        Stream daily revenue forecasts as export rows.
+        
+        Args:
+            start_date: First forecast date
+            end_date: Last forecast date (inclusive)
+            batch_size: Number of rows fetched per round trip
+            
+        Yields:
+            A header row, then one row per forecast date
+        """
+        from app.models.revenue_forecast import RevenueForecast
+
+        yield [
+            'Date',
+            'Predicted Occupancy (%)',
+            'Actual Occupancy (%)',
+            'Predicted ADR ($)',
+            'Actual ADR ($)',
+            'Predicted RevPAR ($)',
+            'Actual RevPAR ($)',
+            'Predicted Revenue ($)',
+            'Actual Revenue ($)',
+            'Confidence Score (%)'
+        ]
+
+        query = select(RevenueForecast).filter(
+            RevenueForecast.forecast_date >= start_date,
+            RevenueForecast.forecast_date <= end_date
+        ).order_by(RevenueForecast.forecast_date).execution_options(yield_per=batch_size)
+
+        for forecast in self.db_session.execute(query).scalars():
+            has_actuals = forecast.has_actuals
+
+            def actual(value):
+                return value if has_actuals and value else 'N/A'
+
+            yield [
+                forecast.forecast_date.strftime('%Y-%m-%d'),
+                forecast.predicted_occupancy_rate,
+                actual(forecast.actual_occupancy_rate),
+                forecast.predicted_adr,
+                actual(forecast.actual_adr),
+                forecast.predicted_revpar,
+                actual(forecast.actual_revpar),
+                forecast.predicted_room_revenue,
+                actual(forecast.actual_room_revenue),
+                forecast.confidence_score
+            ]
 
     def export_to_excel(self, data, title):
-        """Exports report data to Excel (XLSX) format."""
+        """
+        Exports report data to Excel (XLSX) format.
+        
+        Rows are written incrementally in constant-memory mode, so data may
+        be a row iterator (header row first) as well as a list or dictionary.
+        """
+        header, rows = self._table_rows(data)
+
         try:
-            import pandas as pd
             from io import BytesIO
-            
-            output = BytesIO()
-            
-            # Handle different data formats
-            if isinstance(data, list) and data:
-                # If it's a list of lists (like from forecast export)
-                if isinstance(data[0], list):
-                    # First row is headers, rest is data
-                    headers = data[0]
-                    rows = data[1:]
-                    df = pd.DataFrame(rows, columns=headers)
-                else:
-                    # List of dictionaries
-                    df = pd.DataFrame(data)
-            elif isinstance(data, dict):
-                # Handle dictionary data (like report data)
-                if 'daily_occupancy' in data:
-                    # Occupancy report format
-                    df_data = []
-                    for date_str, rate in data['daily_occupancy'].items():
-                        df_data.append({'Date': date_str, 'Occupancy Rate': f"{rate:.2f}%"})
-                    df = pd.DataFrame(df_data)
-                else:
-                    # Generic dictionary - convert to key-value pairs
-                    df_data = []
-                    for key, value in data.items():
-                        if isinstance(value, (dict, list)):
-                            df_data.append({'Metric': key, 'Value': str(value)})
-                        else:
-                            df_data.append({'Metric': key, 'Value': value})
-                    df = pd.DataFrame(df_data)
-            else:
-                # Fallback - create a simple dataframe
-                df = pd.DataFrame([{'Data': str(data)}])
-            
-            # Create Excel writer
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                # Write the main data
-                df.to_excel(writer, sheet_name='Data', index=False)
-                
-                # Add title sheet
-                title_df = pd.DataFrame({
-                    'Report Information': [
-                        title,
-                        f'Generated on: {pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")}',
-                        f'Total Records: {len(df)}'
-                    ]
-                })
-                title_df.to_excel(writer, sheet_name='Report Info', index=False)
-                
-                # Format the sheets
-                workbook = writer.book
-                
-                # Header format
-                header_format = workbook.add_format({
-                    'bold': True,
-                    'text_wrap': True,
-                    'valign': 'top',
-                    'fg_color': '#D7E4BC',
-                    'border': 1
-                })
-                
-                # Title format
-                title_format = workbook.add_format({
-                    'bold': True,
-                    'font_size': 14,
-                    'fg_color': '#B8CCE4'
-                })
-                
-                # Format Data sheet
-                data_worksheet = writer.sheets['Data']
-                for col_num, column in enumerate(df.columns):
-                    data_worksheet.set_column(col_num, col_num, 18)
-                    data_worksheet.write(0, col_num, column, header_format)
-                
-                # Format Report Info sheet
-                info_worksheet = writer.sheets['Report Info']
-                info_worksheet.set_column(0, 0, 40)
-                info_worksheet.write(0, 0, 'Report Information', header_format)
-                for row_num in range(len(title_df)):
-                    info_worksheet.write(row_num + 1, 0, title_df.iloc[row_num, 0], title_format if row_num == 0 else None)
-            
-            output.seek(0)
-            return output.getvalue()
-            
+            from app.utils.xlsx_export import StreamingWorkbook
         except ImportError:
-            # Fallback to CSV if pandas/xlsxwriter not available
-            return self.export_to_csv(data, title)
+            # Fallback to CSV with the same rows, so row iterators export too
+            return ''.join(self.iter_csv(itertools.chain([header], rows), title=title)).encode('utf-8')
+
+        output = BytesIO()
+        with StreamingWorkbook(output) as workbook:
+            total_records = workbook.add_sheet('Data', header, rows, widths=[18] * len(header))
+            workbook.add_info_sheet('Report Info', [
+                title,
+                f'Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}',
+                f'Total Records: {total_records}'
+            ], width=40)
+
+        return output.getvalue()
+
+    def export_monthly_report_to_excel(self, report_data, period_label, start_date, end_date, output):
+        """
+        Write the monthly report as a multi-sheet workbook.
+        
+        The summary sheets come from report_data; the booking sheet is
+        streamed from the database, so memory use does not depend on the
+        number of bookings in the period.
+        
+        Args:
+            report_data: Dictionary returned by get_monthly_report
+            period_label: Period shown in the title (e.g. 'May 2024')
+            start_date: First day of the report period
+            end_date: Last day of the report period
+            output: Path or writable binary file object
+        """
+        from app.utils.xlsx_export import StreamingWorkbook
+
+        revenue = report_data['revenue_summary']
+        occupancy = report_data['occupancy_summary']
+        bookings = report_data['booking_summary']
+
+        with StreamingWorkbook(output) as workbook:
+            workbook.add_info_sheet('Report Info', [
+                f'Hotel Monthly Report - {period_label}',
+                f'Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}'
+            ])
+
+            workbook.add_sheet('Summary', ['Metric', 'Value'], [
+                ['Total Revenue', f"${revenue['total_revenue']:.2f}"],
+                ['Room Revenue', f"${revenue['room_revenue']:.2f}"],
+                ['Average Occupancy Rate', f"{occupancy['average_occupancy_rate']:.2f}%"],
+                ['Peak Occupancy Date', occupancy['peak_occupancy_date']],
+                ['Peak Occupancy Rate', f"{occupancy['peak_occupancy_rate']:.2f}%"],
+                ['Total Room Nights', occupancy['total_room_nights']],
+                ['Total Bookings', bookings['total_bookings']],
+                ['New Bookings', bookings['new_bookings']],
+                ['Cancelled Bookings', bookings['cancelled_bookings']],
+                ['Completed Stays', bookings['completed_stays']]
+            ], widths=[25, 20])
+
+            workbook.add_sheet('Room Type Revenue', ['Room Type', 'Revenue', 'Percentage'], (
+                [room_type, f"${data['revenue']:.2f}", f"{data['percentage']:.2f}%"]
+                for room_type, data in report_data['room_type_revenue'].items()
+            ), widths=[20, 15, 15])
+
+            workbook.add_sheet('Daily Occupancy', ['Date', 'Occupancy Rate'], (
+                [date_str, f"{rate:.2f}%"]
+                for date_str, rate in report_data['daily_occupancy'].items()
+            ), widths=[15, 18])
+
+            booking_rows = self.iter_booking_rows(start_date, end_date)
+            workbook.add_sheet('Bookings', next(booking_rows), booking_rows,
+                               widths=[12, 20, 10, 20, 25, 12, 12, 14, 14])
+
+    def _table_rows(self, data):
+        """Split export data into a header row and an iterator of data rows."""
+        if isinstance(data, dict):
+            if 'daily_occupancy' in data:
+                # Occupancy report format
+                return ['Date', 'Occupancy Rate'], (
+                    [date_str, f"{rate:.2f}%"]
+                    for date_str, rate in data['daily_occupancy'].items()
+                )
+            # Generic dictionary - convert to key-value pairs
+            return ['Metric', 'Value'], (
+                [key, str(value) if isinstance(value, (dict, list)) else value]
+                for key, value in data.items()
+            )
+
+        if isinstance(data, list) and data and isinstance(data[0], dict):
+            # List of dictionaries
+            return list(data[0].keys()), (list(row.values()) for row in data)
+
+        if isinstance(data, (list, tuple)) or hasattr(data, '__next__'):
+            # Header row followed by data rows
+            rows = iter(data)
+            header = next(rows, None)
+            if header is not None:
+                return list(header), rows
+
+        # Fallback - a single cell describing the data
+        return ['Data'], iter([[str(data)]])
 
     def export_to_pdf(self, data, title):
         """Exports report data to PDF format. Placeholder."""
@@ -11,6 +11,7 @@ from sqlalchemy.exc import IntegrityError
 from app.models.room import Room
 from app.models.room_type import RoomType
 from app.models.room_status_log import RoomStatusLog
+from app.utils.event_bus import publish_room_status
 
 
 class DuplicateRoomNumberError(Exception):
@@ -134,7 +135,9 @@ class RoomService:
             raise ValueError(f"Room with ID {room_id} does not exist")
         
         # Change status and create log entry
+        old_status = room.status
         room.change_status(new_status, user_id)
+        publish_room_status(self.db_session, room, old_status)
         
         self.db_session.commit()
         return room
@@ -172,6 +175,7 @@ class RoomService:
         )
         
         self.db_session.add(log)
+        publish_room_status(self.db_session, room, old_status)
         self.db_session.commit()
         
         return room
@@ -4,23 +4,32 @@ Waitlist service module.
 This module provides service layer functionality for managing the waitlist.
 """
 
+import logging
 from datetime import datetime, timedelta
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, select, update
 from app.models.waitlist import Waitlist
+from app.models.room import Room
 from app.models.room_type import RoomType
 from app.models.user import User
 from app.models.booking import Booking
-from db import db
+from app.utils.error_handling import DatabaseError, ValidationError, BusinessLogicError
+from app.utils.interval_index import IntervalIndex
+from app.utils.pagination import paginate
+
+logger = logging.getLogger(__name__)
 
 
 class WaitlistService:
     """Service class for managing the waitlist system."""
 
+    # Hours back the manager's cancellation run looks for cancelled bookings
+    RECENT_CANCELLATION_HOURS = 24
+
     def __init__(self, db_session):
         """Initialize with a database session."""
         self.db_session = db_session
 
-    def get_all_waitlist_entries(self, status=None, page=1, per_page=10):
+    def get_all_waitlist_entries(self, status=None, page=1, per_page=10, cursor=None, count='estimate'):
         """
         Get all waitlist entries with optional filtering and pagination.
         
@@ -28,52 +37,25 @@ class WaitlistService:
             status: Filter by status (optional)
             page: Page number (starting from 1)
             per_page: Number of items per page
+            cursor: Cursor from the previous page, to seek rather than skip rows
+            count: True for an exact total, 'estimate' for a bounded count, False for none
             
         Returns:
-            Paginated waitlist entries
+            Page of waitlist entries
         """
         query = self.db_session.query(Waitlist)
         
         if status:
             query = query.filter(Waitlist.status == status)
             
-        # Create a subquery to count total items
-        count_subquery = query.with_entities(db.func.count()).scalar()
-        
-        # Apply ordering
-        query = query.order_by(
-            Waitlist.status,
-            Waitlist.created_at.desc()
-        )
+        # The ID keeps cursors stable between entries created together
+        sort_keys = [
+            (Waitlist.status, False),
+            (Waitlist.created_at, True),
+            (Waitlist.id, True)
+        ]
         
-        # Calculate offset and limit
-        offset = (page - 1) * per_page
-        items = query.offset(offset).limit(per_page).all()
-        
-        # Create a pagination-like object
-        class PaginationObject:
-            def __init__(self, items, page, per_page, total):
-                self.items = items
-                self.page = page
-                self.per_page = per_page
-                self.total = total
-                self.pages = max(1, (total + per_page - 1) // per_page)
-                self.has_prev = page > 1
-                self.has_next = page < self.pages
-                self.prev_num = page - 1 if self.has_prev else None
-                self.next_num = page + 1 if self.has_next else None
-                
-            def iter_pages(self):
-                for i in range(1, self.pages + 1):
-                    yield i
-                
-            def prev(self):
-                return self.__class__(self.items, self.page - 1, self.per_page, self.total) if self.has_prev else None
-                
-            def next(self):
-                return self.__class__(self.items, self.page + 1, self.per_page, self.total) if self.has_next else None
-        
-        return PaginationObject(items, page, per_page, count_subquery)
+        return paginate(query, sort_keys, page, per_page, cursor=cursor, count=count)
     
     def get_waitlist_entry(self, entry_id):
         """
@@ -212,29 +194,171 @@ class WaitlistService:
         Returns:
             List of waitlist entries that were notified
         """
-        # Get cancelled booking details
-        booking = self.db_session.query(Booking).get(booking_id)
-        if not booking:
+        return self.process_cancellations([booking_id])
+    
+    def process_cancellations(self, booking_ids):
+        """
+        Process several booking cancellations and notify waitlisted customers.
+        
+        The freed slots are loaded in one query, matched together by
+        match_freed_slots, and every matching entry not notified before
+        is flagged as notified with one bulk update.
+        
+        Args:
+            booking_ids: IDs of the cancelled bookings
+            
+        Returns:
+            List of waitlist entries newly notified, oldest first
+        """
+        if not booking_ids:
             return []
         
-        # Find matching waitlist entries
-        matching_entries = self.find_matching_waitlist_entries(
-            booking.room.room_type_id,
-            booking.check_in_date,
-            booking.check_out_date
-        )
+        slots = self.db_session.execute(
+            select(Room.room_type_id, Booking.check_in_date, Booking.check_out_date).join(
+                Room, Room.id == Booking.room_id
+            ).filter(Booking.id.in_(booking_ids))
+        ).all()
+        
+        matches = self.match_freed_slots(slots)
+        entries = {}
+        for slot_entries in matches.values():
+            for entry in slot_entries:
+                # Entries told about an earlier cancellation are not told again
+                if not entry.notification_sent:
+                    entries[entry.id] = entry
+        entries = sorted(entries.values(), key=lambda entry: (entry.created_at, entry.id))
+        
+        self.mark_notified([entry.id for entry in entries])
+        
+        # In a real application, you would send email notifications here
+        return entries
+    
+    def process_recent_cancellations(self, hours=None):
+        """
+        Process the bookings cancelled recently whose stay has not ended.
+        
+        Args:
+            hours: How far back to look (defaults to RECENT_CANCELLATION_HOURS)
+            
+        Returns:
+            Tuple of (number of cancellations processed, notified waitlist entries)
+        """
+        hours = hours or self.RECENT_CANCELLATION_HOURS
+        since = datetime.utcnow() - timedelta(hours=hours)
+        booking_ids = self.db_session.execute(
+            select(Booking.id).filter(
+                Booking.status == Booking.STATUS_CANCELLED,
+                Booking.check_out_date > datetime.now().date(),
+                # Cancellations made outside cancel_booking may lack a cancellation date
+                func.coalesce(Booking.cancellation_date, Booking.updated_at) >= since
+            )
+        ).scalars().all()
+        return len(booking_ids), self.process_cancellations(booking_ids)
+    
+    def match_freed_slots(self, slots):
+        """
+        Match freed room slots against the waiting entries.
+        
+        All waiting entries for the slots' room types and dates are loaded
+        in one query into an interval index per room type, so each slot
+        is matched without another query. An entry matches a slot when
+        its requested stay fits inside the freed dates.
+        
+        Args:
+            slots: Iterable of (room_type_id, start_date, end_date) tuples
+            
+        Returns:
+            Dictionary mapping each slot tuple to its matching entries,
+            oldest first
+        """
+        slots = [tuple(slot) for slot in slots]
+        if not slots:
+            return {}
+        
+        entries = self.db_session.query(Waitlist).filter(
+            Waitlist.status == 'waiting',
+            Waitlist.room_type_id.in_({room_type_id for room_type_id, _, _ in slots}),
+            Waitlist.requested_date_start >= min(start for _, start, _ in slots),
+            Waitlist.requested_date_end <= max(end for _, _, end in slots)
+        ).order_by(Waitlist.created_at, Waitlist.id).all()
         
-        notified_entries = []
-        for entry in matching_entries:
-            # Update entry to mark as notified
-            self.update_waitlist_entry(entry.id, {
-                'notification_sent': True
-            })
-            notified_entries.append(entry)
+        indexes = {}
+        for entry in entries:
+            indexes.setdefault(entry.room_type_id, IntervalIndex()).add(
+                entry.requested_date_start, entry.requested_date_end, entry
+            )
+        
+        return {
+            slot: indexes[slot[0]].contained_in(slot[1], slot[2]) if slot[0] in indexes else []
+            for slot in slots
+        }
+    
+    def mark_notified(self, entry_ids):
+        """
+        Flag waitlist entries as notified with one bulk update.
+        
+        Entries already notified keep their original notification time.
+        
+        Args:
+            entry_ids: IDs of the waitlist entries
             
-            # In a real application, you would send an email notification here
+        Returns:
+            Number of entries newly flagged
+        """
+        if not entry_ids:
+            return 0
+        
+        now = datetime.now()
+        result = self.db_session.execute(
+            update(Waitlist).where(
+                Waitlist.id.in_(entry_ids),
+                or_(Waitlist.notification_sent.is_(False), Waitlist.notification_sent.is_(None))
+            ).values(
+                notification_sent=True,
+                notification_sent_at=now,
+                updated_at=datetime.utcnow()
+            )
+        )
+        self.db_session.commit()
+        return result.rowcount
+    
+    def create_hold(self, entry, room_id):
+        """
+        Hold a freed room for a waiting entry by booking it for the entry's dates.
+        
+        The booking is reserved and unpaid, and the entry is marked as
+        promoted and notified in the same transaction, so a failed
+        booking leaves the entry waiting.
+        
+        Args:
+            entry: Waiting waitlist entry
+            room_id: ID of the room to hold
             
-        return notified_entries
+        Returns:
+            The new booking, or None if the room could not be booked
+        """
+        from app.services.booking_service import BookingService, RoomNotAvailableError
+        
+        room = self.db_session.get(Room, room_id)
+        if room is None:
+            return None
+        
+        # Committed by create_booking together with the booking itself
+        now = datetime.now()
+        entry.status = 'promoted'
+        entry.notification_sent = True
+        entry.notification_sent_at = now
+        entry.notes = f"{entry.notes or ''}\nRoom {room.number} held as a waitlist booking at {now}"
+        
+        try:
+            return BookingService(self.db_session).create_booking(
+                room_id, entry.customer_id, entry.requested_date_start, entry.requested_date_end,
+                source='waitlist'
+            )
+        except (RoomNotAvailableError, ValueError, DatabaseError, ValidationError, BusinessLogicError) as e:
+            # create_booking has rolled back, undoing the entry changes too
+            logger.warning(f"Could not hold room {room_id} for waitlist entry {entry.id}: {str(e)}")
+            return None
     
     def promote_waitlist_entry(self, entry_id, booking_data=None):
         """
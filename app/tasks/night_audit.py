@@ -0,0 +1,39 @@
+import logging
+from datetime import datetime, timedelta
+from app.services.forecast_service import ForecastService
+from app.services.kpi_service import KpiService
+from app.services.pace_service import PaceService
+from db import db
+
+logger = logging.getLogger(__name__)
+
+def run_night_audit(app, business_date=None):
+    """
+    Close the business day that has just ended.
+
+    Each step runs on its own, so a failure in one is logged and rolled
+    back without skipping the others; the pace snapshot in particular
+    cannot be taken again once the day has passed.
+    """
+    if business_date is None:
+        business_date = datetime.now().date() - timedelta(days=1)
+
+    with app.app_context():
+        steps = [
+            # Snapshots every day since the last one, so missed nights are caught up
+            # and the first run back-fills the whole booking history
+            ('KPI snapshots', lambda: KpiService(db.session).backfill(until=business_date)),
+            # Score every closed day's forecast that has no actuals yet, including missed nights
+            ('forecast actuals', lambda: ForecastService(db.session).record_actuals(business_date)),
+            # Record what is on the books for the days ahead as of the new day
+            ('pace snapshot', lambda: PaceService(db.session).take_snapshot(
+                snapshot_date=business_date + timedelta(days=1)
+            )),
+        ]
+
+        for name, step in steps:
+            try:
+                step()
+            except Exception:
+                db.session.rollback()
+                logger.exception(f"Night audit step '{name}' failed for {business_date}")
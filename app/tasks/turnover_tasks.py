@@ -0,0 +1,13 @@
+from datetime import datetime
+from app.services.housekeeping_service import HousekeepingService
+from db import db
+
+def generate_upcoming_turnover_tasks(app, days=None):
+    """Create the turnover tasks for today's departures and those of the next `days` days."""
+    with app.app_context():
+        if days is None:
+            days = app.config.get('TURNOVER_LOOKAHEAD_DAYS', 3)
+
+        # Tasks that already exist are skipped, so the overlapping look-ahead
+        # of consecutive runs only adds departures booked since the last one
+        HousekeepingService(db.session).generate_turnover_tasks(datetime.now().date(), days=days + 1)
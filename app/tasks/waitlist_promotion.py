@@ -0,0 +1,245 @@
+"""
+Automatic waitlist promotion.
+
+BookingService.cancel_booking publishes an 'inventory.capacity_freed' event
+for the nights a cancellation gives back. This worker collects those
+events on a background thread, coalesces the ones freeing the same room
+type and dates, and runs the batch waitlist matcher over them, notifying
+the matching entries and, when WAITLIST_AUTO_HOLD is on, holding each
+freed room for the oldest entry that fits it.
+
+Each run handles at most WAITLIST_PROMOTION_BATCH_SIZE slots and runs are
+WAITLIST_PROMOTION_INTERVAL seconds apart, so a burst of cancellations
+cannot monopolise the database. Slots waiting for a run are reported as
+the backlog. If events arrive faster than the subscription can queue
+them, the worker falls back to sweeping all recent cancellations.
+"""
+
+import logging
+import threading
+import time
+from datetime import date, datetime
+
+from app.services.waitlist_service import WaitlistService
+from app.utils.event_bus import event_bus
+from db import db
+
+logger = logging.getLogger(__name__)
+
+CAPACITY_FREED = 'inventory.capacity_freed'
+
+
+class WaitlistPromotionWorker:
+    """Background worker promoting waitlist entries as capacity frees up."""
+
+    def __init__(self, bus=None):
+        """
+        Create a stopped worker.
+
+        Args:
+            bus: EventBus to listen on (the application bus if None)
+        """
+        self.bus = bus or event_bus
+        self.app = None
+        self._subscription = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        # Freed room IDs by (room_type_id, start_date, end_date), oldest slot first
+        self._pending = {}
+        self._sweep_needed = False
+        self._totals = {'events': 0, 'slots': 0, 'notified': 0, 'holds': 0}
+        self._last_run_at = None
+
+    def attach(self, app):
+        """
+        Start listening for capacity-freed events without starting the thread.
+
+        Args:
+            app: Flask application the matcher runs in
+        """
+        self.app = app
+        if self._subscription is None:
+            self._subscription = self.bus.subscribe([CAPACITY_FREED])
+
+    def start(self, app):
+        """
+        Listen for events and process them on a daemon thread.
+
+        Args:
+            app: Flask application the matcher runs in
+        """
+        self.attach(app)
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='waitlist-promotion', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the thread and stop listening."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._subscription is not None:
+            self.bus.unsubscribe(self._subscription)
+            self._subscription = None
+
+    @property
+    def backlog(self):
+        """Number of freed slots and undrained events waiting to be matched."""
+        queued = self._subscription.pending if self._subscription is not None else 0
+        with self._lock:
+            return len(self._pending) + queued
+
+    def stats(self):
+        """
+        Get the worker's state for monitoring.
+
+        Returns:
+            Dictionary with running, backlog, whether a catch-up sweep is
+            due, totals of events, slots, notified entries and holds, and
+            the last run time
+        """
+        backlog = self.backlog
+        with self._lock:
+            return {
+                'running': self._thread is not None and self._thread.is_alive(),
+                'backlog': backlog,
+                'sweep_pending': self._sweep_needed,
+                'last_run_at': self._last_run_at.isoformat() if self._last_run_at else None,
+                **self._totals
+            }
+
+    def drain(self, timeout=0):
+        """
+        Move the queued events into the pending slots, coalescing duplicates.
+
+        Args:
+            timeout: Seconds to wait for the first event
+
+        Returns:
+            Number of events taken from the queue
+        """
+        taken = 0
+        while self._subscription is not None:
+            event_data = self._subscription.get(timeout=timeout if not taken else 0)
+            if event_data is None:
+                break
+            taken += 1
+            data = event_data['data']
+            # Only the nights still ahead can be resold
+            start_date = max(date.fromisoformat(data['start_date']), date.today())
+            end_date = date.fromisoformat(data['end_date'])
+            with self._lock:
+                self._totals['events'] += 1
+                if end_date <= start_date:
+                    continue
+                rooms = self._pending.setdefault((data['room_type_id'], start_date, end_date), [])
+                if data['room_id'] not in rooms:
+                    rooms.append(data['room_id'])
+
+        if self._subscription is not None and self._subscription.overflowed:
+            # Some events were dropped; catch up from the bookings themselves
+            self._subscription.overflowed = False
+            with self._lock:
+                self._sweep_needed = True
+        return taken
+
+    def run_once(self, batch_size=None, auto_hold=None):
+        """
+        Match one batch of pending slots against the waitlist.
+
+        If the run fails, its slots are put back to be retried by the next
+        run and the error is raised.
+
+        Args:
+            batch_size: Most slots handled (WAITLIST_PROMOTION_BATCH_SIZE if None)
+            auto_hold: Hold freed rooms for the oldest entries (WAITLIST_AUTO_HOLD if None)
+
+        Returns:
+            Dictionary with the numbers of slots matched, entries notified and holds made
+        """
+        config = self.app.config
+        if batch_size is None:
+            batch_size = config.get('WAITLIST_PROMOTION_BATCH_SIZE', 50)
+        if auto_hold is None:
+            auto_hold = config.get('WAITLIST_AUTO_HOLD', False)
+
+        with self._lock:
+            slots = list(self._pending)[:batch_size]
+            batch = {slot: self._pending.pop(slot) for slot in slots}
+            sweep, self._sweep_needed = self._sweep_needed, False
+
+        try:
+            notified, holds = self._process(batch, sweep, auto_hold)
+        except Exception:
+            self._requeue(batch, sweep)
+            raise
+
+        with self._lock:
+            self._totals['slots'] += len(batch)
+            self._totals['notified'] += notified
+            self._totals['holds'] += holds
+            self._last_run_at = datetime.now()
+        return {'slots': len(batch), 'notified': notified, 'holds': holds}
+
+    def _process(self, batch, sweep, auto_hold):
+        """Match a batch of slots, returning the numbers of entries notified and holds made."""
+        notified = holds = 0
+        with self.app.app_context():
+            service = WaitlistService(db.session)
+            if sweep:
+                notified += len(service.process_recent_cancellations()[1])
+
+            matches = service.match_freed_slots(batch)
+            held = set()
+            to_notify = set()
+            for slot, room_ids in batch.items():
+                candidate_ids = [entry.id for entry in matches[slot] if entry.id not in held]
+                if auto_hold:
+                    for room_id in room_ids:
+                        if not candidate_ids:
+                            break
+                        # Oldest entry first; a room that was rebooked meanwhile is skipped
+                        try:
+                            entry = service.get_waitlist_entry(candidate_ids[0])
+                            booking = service.create_hold(entry, room_id)
+                        except Exception:
+                            # One bad hold must not cost the rest of the batch
+                            logger.exception("Could not hold room %s for waitlist entry %s",
+                                             room_id, candidate_ids[0])
+                            db.session.rollback()
+                            continue
+                        if booking:
+                            held.add(candidate_ids.pop(0))
+                            holds += 1
+                to_notify.update(candidate_ids)
+            notified += service.mark_notified(sorted(to_notify - held))
+        return notified, holds
+
+    def _requeue(self, batch, sweep):
+        """Put the slots of a failed run back in front of the pending ones."""
+        with self._lock:
+            pending, self._pending = self._pending, dict(batch)
+            for slot, room_ids in pending.items():
+                rooms = self._pending.setdefault(slot, [])
+                rooms.extend(room_id for room_id in room_ids if room_id not in rooms)
+            self._sweep_needed = self._sweep_needed or sweep
+
+    def _run(self):
+        interval = self.app.config.get('WAITLIST_PROMOTION_INTERVAL', 5)
+        while not self._stop.is_set():
+            self.drain(timeout=interval)
+            if self.backlog or self._sweep_needed:
+                started = time.monotonic()
+                try:
+                    self.run_once()
+                except Exception:
+                    logger.exception("Waitlist promotion run failed")
+                # Runs start at most once per interval
+                self._stop.wait(max(0, interval - (time.monotonic() - started)))
+
+
+# Worker started by the application factory
+waitlist_promotion_worker = WaitlistPromotionWorker()
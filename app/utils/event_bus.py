@@ -0,0 +1,297 @@
+"""
+In-process event bus for live dashboard updates.
+
+Services publish small JSON-serialisable events (a room changed status, a
+guest checked in, a housekeeping task was completed) and dashboard
+server-sent-event streams subscribed to those event types forward them to
+the browser, which patches the page in place instead of reloading it.
+
+The bus lives in the web process, so events only reach clients connected
+to the process that handled the write. Each subscriber has a bounded
+queue; a subscriber that falls behind is told to resynchronise rather than
+holding memory for a stalled connection.
+
+Deployment: every open stream occupies a request worker while it is
+connected, so live updates are off by default (LIVE_UPDATES_ENABLED). Only
+enable them behind a server with threaded or async workers (e.g. gunicorn
+--worker-class gthread or gevent) running a single process; with several
+processes the bus has to be replaced by a cross-process broker such as
+Redis pub/sub. Streams end after LIVE_UPDATES_MAX_STREAM_SECONDS and the
+browser reconnects, replaying missed events through Last-Event-ID, so no
+connection holds a worker indefinitely.
+"""
+
+import itertools
+import json
+import queue
+import threading
+import time
+from collections import deque
+
+from flask import Response, current_app, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+_PENDING_KEY = 'event_bus_pending'
+
+
+class Subscription:
+    """
+    A subscriber's view of the event bus.
+
+    Attributes:
+        prefixes: Event type prefixes this subscriber receives
+        overflowed: True once events were dropped because the queue was full
+    """
+
+    def __init__(self, prefixes, max_queue_size):
+        """
+        Create a subscription.
+
+        Args:
+            prefixes: Event type prefixes to receive (all events if empty)
+            max_queue_size: Maximum number of undelivered events
+        """
+        self.prefixes = tuple(prefixes or ())
+        self.overflowed = False
+        self._queue = queue.Queue(maxsize=max_queue_size)
+
+    def wants(self, event_type):
+        """Check whether this subscriber receives an event type."""
+        return not self.prefixes or event_type.startswith(self.prefixes)
+
+    def put(self, event_data):
+        """Queue an event, flagging the subscription if it has fallen behind."""
+        try:
+            self._queue.put_nowait(event_data)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout=None):
+        """
+        Wait for the next event.
+
+        Args:
+            timeout: Seconds to wait (forever if None)
+
+        Returns:
+            Event dictionary, or None if the timeout expired
+        """
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    @property
+    def pending(self):
+        """Number of events queued but not yet received."""
+        return self._queue.qsize()
+
+
+class EventBus:
+    """Thread-safe publish/subscribe bus with a short replay history."""
+
+    def __init__(self, history_size=200, max_queue_size=100):
+        """
+        Create an event bus.
+
+        Args:
+            history_size: Number of recent events kept for reconnecting clients
+            max_queue_size: Maximum number of undelivered events per subscriber
+        """
+        self.max_queue_size = max_queue_size
+        self._subscribers = set()
+        self._history = deque(maxlen=history_size)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def publish(self, event_type, data):
+        """
+        Deliver an event to every interested subscriber.
+
+        Args:
+            event_type: Dotted event type, e.g. 'room.status_changed'
+            data: JSON-serialisable payload
+
+        Returns:
+            The published event dictionary
+        """
+        with self._lock:
+            event_data = {'id': next(self._ids), 'type': event_type, 'data': data}
+            self._history.append(event_data)
+            subscribers = [s for s in self._subscribers if s.wants(event_type)]
+        for subscriber in subscribers:
+            subscriber.put(event_data)
+        return event_data
+
+    def publish_on_commit(self, session, event_type, data):
+        """
+        Publish an event once the session's transaction commits.
+
+        Events queued this way are dropped if the transaction rolls back,
+        so clients never see a change that did not happen.
+
+        Args:
+            session: Database session performing the write
+            event_type: Dotted event type
+            data: JSON-serialisable payload
+        """
+        session.info.setdefault(_PENDING_KEY, []).append((self, event_type, data))
+
+    def subscribe(self, prefixes=None, last_event_id=None):
+        """
+        Register a subscriber.
+
+        Args:
+            prefixes: Event type prefixes to receive (all events if None)
+            last_event_id: ID of the last event the client saw; newer events
+                still in the history are queued for replay
+
+        Returns:
+            Subscription
+        """
+        subscription = Subscription(prefixes, self.max_queue_size)
+        with self._lock:
+            if last_event_id is not None:
+                for event_data in self._history:
+                    if event_data['id'] > last_event_id and subscription.wants(event_data['type']):
+                        subscription.put(event_data)
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Remove a subscriber."""
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self):
+        """Number of connected subscribers."""
+        with self._lock:
+            return len(self._subscribers)
+
+
+def format_sse(event_data):
+    """
+    Format an event as a server-sent-events message.
+
+    Args:
+        event_data: Event dictionary as produced by EventBus.publish
+
+    Returns:
+        Message string
+    """
+    return 'id: {}\nevent: {}\ndata: {}\n\n'.format(
+        event_data['id'], event_data['type'], json.dumps(event_data['data'], default=str)
+    )
+
+
+def sse_stream(bus, subscription, keepalive=25, max_lifetime=300):
+    """
+    Yield server-sent-events messages for a subscription until the client
+    disconnects or the stream reaches its maximum lifetime.
+
+    A comment line is sent after keepalive seconds without events so
+    proxies keep the connection open. If the subscriber overflowed, a
+    'resync' event is sent and the stream ends; the client reloads. When
+    max_lifetime expires the stream simply ends, releasing the worker; the
+    browser's EventSource reconnects with its Last-Event-ID.
+
+    Args:
+        bus: EventBus the subscription belongs to
+        subscription: Subscription to stream
+        keepalive: Seconds between keep-alive comments
+        max_lifetime: Seconds before the stream is closed
+
+    Yields:
+        Message strings
+    """
+    deadline = time.monotonic() + max_lifetime
+    try:
+        yield 'retry: 3000\n\n'
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            event_data = subscription.get(timeout=min(keepalive, remaining))
+            if subscription.overflowed:
+                yield 'event: resync\ndata: {}\n\n'
+                return
+            if event_data is None:
+                yield ': keep-alive\n\n'
+            else:
+                yield format_sse(event_data)
+    finally:
+        bus.unsubscribe(subscription)
+
+
+def live_event_response(prefixes, bus=None):
+    """
+    Build a server-sent-events response streaming live dashboard events.
+
+    Honours the Last-Event-ID header so a reconnecting browser receives
+    the events it missed while they are still in the bus history.
+
+    Args:
+        prefixes: Event type prefixes the stream carries
+        bus: EventBus to subscribe to (the application bus if None)
+
+    Returns:
+        Flask streaming response, or 404 if live updates are disabled
+    """
+    if not current_app.config.get('LIVE_UPDATES_ENABLED', False):
+        return Response(status=404)
+
+    bus = bus or event_bus
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', ''))
+    except ValueError:
+        last_event_id = None
+
+    subscription = bus.subscribe(prefixes, last_event_id=last_event_id)
+    keepalive = current_app.config.get('LIVE_UPDATES_KEEPALIVE', 25)
+    max_lifetime = current_app.config.get('LIVE_UPDATES_MAX_STREAM_SECONDS', 300)
+    return Response(
+        sse_stream(bus, subscription, keepalive, max_lifetime),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+
+# Application-wide bus used by the services and dashboard streams
+event_bus = EventBus()
+
+
+def publish_room_status(session, room, old_status):
+    """
+    Queue a 'room.status_changed' event, sent when the session commits.
+
+    Args:
+        session: Database session performing the change
+        room: Room whose status changed
+        old_status: Status before the change
+    """
+    if old_status == room.status:
+        return
+    event_bus.publish_on_commit(session, 'room.status_changed', {
+        'room_id': room.id,
+        'room_number': room.number,
+        'old_status': old_status,
+        'new_status': room.status
+    })
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_pending(session):
+    for bus, event_type, data in session.info.pop(_PENDING_KEY, []):
+        bus.publish(event_type, data)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_pending(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+
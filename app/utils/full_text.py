@@ -0,0 +1,181 @@
+"""
+Full-text search indexes.
+
+This module keeps a full-text index of selected text columns of a model
+and searches it with relevance ranking, replacing leading-wildcard LIKE
+filters that scan the whole table.
+
+On SQLite each indexed table gets an external-content FTS5 table kept in
+step by triggers; on PostgreSQL a GIN index over the columns' tsvector is
+maintained by the database itself. Both are created alongside the table,
+so db.create_all() and the migrations produce the same schema. On other
+databases, or an SQLite build without FTS5, searches fall back to LIKE.
+"""
+
+import re
+import weakref
+
+from sqlalchemy import event, func, literal_column, or_, select, table, column, text
+
+
+# Indexed text columns by table name
+FULL_TEXT_COLUMNS = {}
+
+# SQLite full-text tables found on each engine
+_fts_tables = weakref.WeakKeyDictionary()
+
+
+def register_full_text(model, *columns):
+    """
+    Maintain a full-text index over some of a model's text columns.
+
+    Args:
+        model: Model class whose table is indexed
+        *columns: Names of the text columns to index
+    """
+    model_table = model.__table__
+    FULL_TEXT_COLUMNS[model_table.name] = columns
+
+    def create_index(target, connection, **kw):
+        if connection.dialect.name == 'sqlite' and not connection.exec_driver_sql(
+            "SELECT sqlite_compileoption_used('ENABLE_FTS5')"
+        ).scalar():
+            return
+        for statement in full_text_ddl(target.name, columns, connection.dialect.name):
+            connection.exec_driver_sql(statement)
+
+    def drop_index(target, connection, **kw):
+        for statement in full_text_drop_ddl(target.name, connection.dialect.name):
+            connection.exec_driver_sql(statement)
+
+    event.listen(model_table, 'after_create', create_index)
+    event.listen(model_table, 'before_drop', drop_index)
+
+
+def full_text_ddl(table_name, columns, dialect_name):
+    """
+    Get the statements that create a table's full-text index.
+
+    Args:
+        table_name: Indexed table
+        columns: Indexed column names
+        dialect_name: SQLAlchemy dialect name
+
+    Returns:
+        List of SQL statements (empty if the dialect has no full-text index)
+    """
+    if dialect_name == 'sqlite':
+        fts = f'{table_name}_fts'
+        names = ', '.join(columns)
+        new_values = ', '.join(f'new.{name}' for name in columns)
+        old_values = ', '.join(f'old.{name}' for name in columns)
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{names}, content='{table_name}', content_rowid='id', tokenize='porter unicode61')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} BEGIN "
+            f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {names} ON {table_name} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END",
+            # Index any rows that already exist
+            f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+        ]
+    if dialect_name == 'postgresql':
+        return [
+            f"CREATE INDEX IF NOT EXISTS idx_{table_name}_fts ON {table_name} "
+            f"USING GIN ({_tsvector_sql(columns)})"
+        ]
+    return []
+
+
+def full_text_drop_ddl(table_name, dialect_name):
+    """Get the statements that drop a table's full-text index."""
+    if dialect_name == 'sqlite':
+        return [f'DROP TABLE IF EXISTS {table_name}_fts']
+    if dialect_name == 'postgresql':
+        return [f'DROP INDEX IF EXISTS idx_{table_name}_fts']
+    return []
+
+
+def search_ids(session, model, q):
+    """
+    Get the IDs of a model's rows matching a search, with their relevance.
+
+    Every word of the query must appear, as a prefix on SQLite, in any of
+    the indexed columns.
+
+    Args:
+        session: Database session
+        model: Model class registered with register_full_text
+        q: User search text
+
+    Returns:
+        Selectable with 'id' and 'rank' columns, lower rank being more
+        relevant, or None if full-text search is unavailable
+    """
+    table_name = model.__table__.name
+    columns = FULL_TEXT_COLUMNS[table_name]
+    words = re.findall(r'\w+', q or '')
+    if not words:
+        return None
+
+    dialect_name = session.get_bind().dialect.name
+    if dialect_name == 'sqlite' and _has_fts_table(session, table_name):
+        fts = table(f'{table_name}_fts', column('rowid'))
+        match = ' '.join(f'"{word}"*' for word in words)
+        return select(
+            fts.c.rowid.label('id'),
+            literal_column(f'bm25({table_name}_fts)').label('rank')
+        ).where(literal_column(table_name + '_fts').op('MATCH')(match)).subquery()
+    if dialect_name == 'postgresql':
+        document = literal_column(_tsvector_sql(columns))
+        query = func.plainto_tsquery('english', ' '.join(words))
+        return select(
+            model.id.label('id'),
+            (-func.ts_rank(document, query)).label('rank')
+        ).where(document.op('@@')(query)).subquery()
+    return None
+
+
+def apply_search(session, query, model, q):
+    """
+    Filter a model query to rows matching a search.
+
+    Args:
+        session: Database session
+        query: ORM query over the model
+        model: Model class registered with register_full_text
+        q: User search text
+
+    Returns:
+        Tuple of the filtered query and a relevance expression to order by
+        (ascending, most relevant first), or None when the LIKE fallback
+        was used and there is no ranking
+    """
+    matches = search_ids(session, model, q)
+    if matches is None:
+        # No full-text index here; match the whole text anywhere, as before
+        columns = [getattr(model, name) for name in FULL_TEXT_COLUMNS[model.__table__.name]]
+        return query.filter(or_(*[col.ilike(f'%{q}%') for col in columns])), None
+    return query.join(matches, matches.c.id == model.id), matches.c.rank
+
+
+def _tsvector_sql(columns):
+    """Get the tsvector expression a PostgreSQL index and its searches share."""
+    document = " || ' ' || ".join(f"coalesce({name}, '')" for name in columns)
+    return f"to_tsvector('english', {document})"
+
+
+def _has_fts_table(session, table_name):
+    """Check whether the SQLite full-text table exists, remembering it once found."""
+    bind = session.get_bind()
+    engine = getattr(bind, 'engine', bind)
+    fts = f'{table_name}_fts'
+    found = _fts_tables.setdefault(engine, set())
+    if fts not in found and session.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {'name': fts}
+    ).first():
+        found.add(fts)
+    return fts in found
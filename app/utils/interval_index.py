@@ -0,0 +1,65 @@
+"""
+Interval index.
+
+This module provides an in-memory index of date intervals that answers
+"which intervals fit inside this range" without scanning every interval,
+used to match many freed booking slots against waiting requests in one
+pass.
+"""
+
+from bisect import bisect_left, insort
+
+
+class IntervalIndex:
+    """
+    Intervals kept sorted by start, each carrying a value.
+
+    Intervals are half-open, [start, end), like a booking's check-in and
+    check-out dates. A containment lookup bisects to the intervals
+    starting inside the range and only checks their ends.
+    """
+
+    def __init__(self, intervals=()):
+        """
+        Build an index.
+
+        Args:
+            intervals: Iterable of (start, end, value) tuples
+        """
+        self._entries = []
+        self._sequence = 0
+        for start, end, value in intervals:
+            self.add(start, end, value)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, start, end, value):
+        """
+        Add an interval.
+
+        Args:
+            start: Interval start
+            end: Interval end (exclusive)
+            value: Value returned by lookups
+        """
+        # The sequence number keeps insertion order among equal starts
+        insort(self._entries, (start, self._sequence, end, value))
+        self._sequence += 1
+
+    def contained_in(self, start, end):
+        """
+        Get the values of the intervals lying within [start, end).
+
+        Args:
+            start: Range start
+            end: Range end (exclusive)
+
+        Returns:
+            List of values, in the order their intervals were added
+        """
+        low = bisect_left(self._entries, (start,))
+        high = bisect_left(self._entries, (end,))
+        matches = [entry for entry in self._entries[low:high] if entry[2] <= end]
+        matches.sort(key=lambda entry: entry[1])
+        return [entry[3] for entry in matches]
@@ -0,0 +1,145 @@
+"""
+In-process metrics cache.
+
+This module provides a small thread-safe TTL cache for expensive,
+read-mostly computations such as dashboard metrics. Values are shared
+across requests within a process, concurrent misses for the same key are
+collapsed into a single computation, and entries can be invalidated when
+the underlying tables are written.
+"""
+
+import copy
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class MetricsCache:
+    """
+    Thread-safe TTL cache with single-flight recomputation.
+
+    Attributes:
+        name: Name used to tag sessions with pending invalidations
+    """
+
+    def __init__(self, name):
+        """
+        Create an empty cache.
+
+        Args:
+            name: Unique name for this cache
+        """
+        self.name = name
+        self._entries = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def get_or_compute(self, key, ttl, compute):
+        """
+        Return the cached value for key, computing it on a miss.
+
+        Only one caller computes a missing or expired key at a time; other
+        callers for the same key wait for that result instead of running the
+        computation themselves. Callers always receive their own copy, so
+        mutating the result never affects the cached value.
+
+        Args:
+            key: Cache key
+            ttl: Time to live in seconds; 0 or less disables caching
+            compute: Zero-argument callable producing the value
+
+        Returns:
+            The cached or freshly computed value
+        """
+        if ttl <= 0:
+            return compute()
+
+        value = self._get_fresh(key)
+        if value is not None:
+            return copy.deepcopy(value)
+
+        with self._lock_for(key):
+            # Another caller may have filled the entry while we waited
+            value = self._get_fresh(key)
+            if value is not None:
+                return copy.deepcopy(value)
+
+            generation = self._generation
+            value = compute()
+            with self._lock:
+                # Don't store a value computed before an invalidation
+                if generation == self._generation:
+                    self._entries[key] = (time.monotonic() + ttl, value)
+            return copy.deepcopy(value)
+
+    def invalidate(self, prefix=None):
+        """
+        Drop cached entries.
+
+        Args:
+            prefix: Only drop keys starting with this prefix (all if None)
+        """
+        with self._lock:
+            self._generation += 1
+            if prefix is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k.startswith(prefix)]:
+                    del self._entries[key]
+
+    def invalidate_on_commit(self, *models, prefix=None):
+        """
+        Invalidate the cache whenever instances of the given models are
+        inserted, updated or deleted and the transaction commits.
+
+        Both flushed ORM changes and bulk INSERT, UPDATE or DELETE
+        statements run through the session on the models' tables count.
+
+        Args:
+            *models: Model classes whose writes make the cache stale
+            prefix: Only drop keys starting with this prefix (all if None)
+        """
+        pending_key = f'metrics_cache_pending:{self.name}:{prefix}'
+        tables = {model.__table__ for model in models}
+
+        def mark_pending(session, flush_context, instances):
+            for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+                if isinstance(obj, models):
+                    session.info[pending_key] = True
+                    return
+
+        def mark_bulk_write(orm_execute_state):
+            if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+                return
+            if getattr(orm_execute_state.statement, 'table', None) in tables:
+                orm_execute_state.session.info[pending_key] = True
+
+        def invalidate_pending(session):
+            if session.info.pop(pending_key, False):
+                self.invalidate(prefix)
+
+        def discard_pending(session):
+            session.info.pop(pending_key, None)
+
+        event.listen(Session, 'before_flush', mark_pending)
+        event.listen(Session, 'do_orm_execute', mark_bulk_write)
+        event.listen(Session, 'after_commit', invalidate_pending)
+        event.listen(Session, 'after_soft_rollback', lambda session, previous_transaction: discard_pending(session))
+
+    def _get_fresh(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def _lock_for(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
@@ -0,0 +1,277 @@
+"""
+Keyset pagination.
+
+This module pages through ordered queries. Moving to the next or previous
+page uses a cursor holding the sort key values of the last (or first) row
+shown, so the database seeks straight to the page instead of skipping
+OFFSET rows, and deep pages cost the same as the first one. Jumping to an
+arbitrary page number still works through OFFSET.
+
+Counting is optional: an exact COUNT, a bounded count that stops at a cap
+and reports the total as approximate, or none at all, in which case the
+page only knows whether a next page exists.
+"""
+
+import base64
+import json
+from datetime import date, datetime
+
+from sqlalchemy import and_, false, func, or_, select
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+    pass
+
+
+class Page:
+    """
+    One page of query results.
+
+    Navigation mirrors Flask-SQLAlchemy's Pagination, so templates can use
+    either; next_cursor and prev_cursor add keyset navigation.
+
+    Attributes:
+        items: Rows on this page
+        page: Page number, starting from 1
+        per_page: Maximum rows per page
+        total: Total matching rows, or None when not counted
+        total_is_estimate: True when total is a lower bound
+        pages: Number of pages known to exist
+        has_prev: Whether a previous page exists
+        has_next: Whether a next page exists
+        prev_num: Previous page number, or None
+        next_num: Next page number, or None
+        prev_cursor: Cursor for the previous page, or None
+        next_cursor: Cursor for the next page, or None
+    """
+
+    def __init__(self, items, page, per_page, total=None, has_next=None,
+                 prev_cursor=None, next_cursor=None, total_is_estimate=False, fetch=None):
+        """
+        Create a page.
+
+        Args:
+            items: Rows on this page
+            page: Page number, starting from 1
+            per_page: Maximum rows per page
+            total: Total matching rows, or None when not counted
+            has_next: Whether a next page exists (derived from total if None)
+            prev_cursor: Cursor for the previous page
+            next_cursor: Cursor for the next page
+            total_is_estimate: True when total is a lower bound
+            fetch: Callable(page, cursor) loading another page, for prev() and next()
+        """
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+        self.total_is_estimate = total_is_estimate
+        if has_next is None:
+            has_next = total is not None and page * per_page < total
+        self.has_next = has_next
+        self.has_prev = page > 1
+        self.prev_num = page - 1 if self.has_prev else None
+        self.next_num = page + 1 if self.has_next else None
+        self.prev_cursor = prev_cursor if self.has_prev else None
+        self.next_cursor = next_cursor if self.has_next else None
+        self._fetch = fetch
+
+        pages = max(1, (total + per_page - 1) // per_page) if total is not None else page
+        if has_next:
+            pages = max(pages, page + 1)
+        self.pages = pages
+
+    def iter_pages(self, left_edge=2, left_current=2, right_current=5, right_edge=2):
+        """
+        Yield page numbers for a pagination widget, with None for gaps.
+
+        Args:
+            left_edge: Pages shown at the start
+            left_current: Pages shown before the current page
+            right_current: Pages shown after the current page
+            right_edge: Pages shown at the end
+        """
+        last = 0
+        for number in range(1, self.pages + 1):
+            if (number <= left_edge
+                    or self.page - left_current <= number <= self.page + right_current
+                    or number > self.pages - right_edge):
+                if last + 1 != number:
+                    yield None
+                yield number
+                last = number
+
+    def prev(self):
+        """Load the previous page, or return None if there is none."""
+        if not self.has_prev or self._fetch is None:
+            return None
+        return self._fetch(self.prev_num, self.prev_cursor)
+
+    def next(self):
+        """Load the next page, or return None if there is none."""
+        if not self.has_next or self._fetch is None:
+            return None
+        return self._fetch(self.next_num, self.next_cursor)
+
+
+def paginate(query, sort_keys, page=1, per_page=10, cursor=None, count=True, count_cap=1000):
+    """
+    Get one page of an ORM query.
+
+    The query must not be ordered yet; the sort keys order it, and the last
+    key must be unique (normally the primary key) so cursors are stable.
+    NULLs sort after other values in both directions.
+
+    Args:
+        query: ORM query with its filters applied
+        sort_keys: List of (column expression, descending) pairs
+        page: Page number, starting from 1
+        per_page: Maximum rows per page
+        cursor: Cursor from a previous page; seeks instead of using OFFSET
+        count: True for an exact total, 'estimate' for a total counted up
+            to count_cap, False to skip counting
+        count_cap: Most rows counted when count is 'estimate'
+
+    Returns:
+        Page
+    """
+    page = max(int(page or 1), 1)
+
+    total = None
+    total_is_estimate = False
+    if count == 'estimate':
+        counted = query.order_by(None).limit(count_cap + 1).subquery()
+        total = query.session.execute(select(func.count()).select_from(counted)).scalar()
+        if total > count_cap:
+            total, total_is_estimate = count_cap, True
+    elif count:
+        total = query.order_by(None).count()
+
+    values = None
+    backwards = False
+    if cursor:
+        try:
+            direction, values = decode_cursor(cursor)
+            if len(values) != len(sort_keys):
+                raise InvalidCursor(f"Cursor does not match the sort keys: {cursor}")
+            backwards = direction == 'before'
+        except InvalidCursor:
+            # A stale or mangled link falls back to the page number
+            values = None
+
+    page_query = query
+    if values is not None:
+        page_query = page_query.filter(_seek(sort_keys, values, backwards))
+    page_query = page_query.order_by(*[_order(column, descending, backwards) for column, descending in sort_keys])
+    if values is None:
+        page_query = page_query.offset((page - 1) * per_page)
+
+    # One extra row tells whether there is another page in the walking direction
+    rows = page_query.add_columns(*[column for column, _ in sort_keys]).limit(per_page + 1).all()
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+        page = page if more else 1
+
+    keys = [tuple(row[1:]) for row in rows]
+
+    def fetch(number, next_cursor):
+        return paginate(query, sort_keys, number, per_page, next_cursor, count, count_cap)
+
+    return Page(
+        [row[0] for row in rows], page, per_page, total,
+        # Walking back from a page means there is one after it
+        has_next=True if backwards else more,
+        prev_cursor=encode_cursor('before', keys[0]) if keys else None,
+        next_cursor=encode_cursor('after', keys[-1]) if keys else None,
+        total_is_estimate=total_is_estimate,
+        fetch=fetch
+    )
+
+
+def encode_cursor(direction, values):
+    """
+    Encode a row's sort key values as an opaque, URL-safe cursor.
+
+    Args:
+        direction: 'after' for the page following the row, 'before' for the one preceding it
+        values: Sort key values of the row
+
+    Returns:
+        Cursor string
+    """
+    encoded = []
+    for value in values:
+        if isinstance(value, datetime):
+            encoded.append(['dt', value.isoformat()])
+        elif isinstance(value, date):
+            encoded.append(['d', value.isoformat()])
+        else:
+            encoded.append(['v', value])
+    payload = json.dumps([direction, encoded], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor made by encode_cursor.
+
+    Returns:
+        Tuple of direction and list of sort key values
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        direction, encoded = json.loads(payload)
+        if direction not in ('after', 'before'):
+            raise ValueError(direction)
+        values = []
+        for kind, value in encoded:
+            if kind == 'dt':
+                value = datetime.fromisoformat(value)
+            elif kind == 'd':
+                value = date.fromisoformat(value)
+            values.append(value)
+        return direction, values
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid pagination cursor: {cursor}") from e
+
+
+def _order(column, descending, backwards):
+    """Order by a sort key with NULLs last, reversing everything when walking backwards."""
+    if descending != backwards:
+        ordered = column.desc()
+    else:
+        ordered = column.asc()
+    return ordered.nulls_first() if backwards else ordered.nulls_last()
+
+
+def _seek(sort_keys, values, backwards):
+    """
+    Build the condition selecting the rows after (or before) a cursor row.
+
+    Expands the row-value comparison into (k1 beyond v1) OR (k1 = v1 AND
+    k2 beyond v2) ..., so it works with mixed sort directions and NULLs.
+    """
+    conditions = []
+    equal_so_far = []
+    for (column, descending), value in zip(sort_keys, values):
+        conditions.append(and_(*equal_so_far, _beyond(column, value, descending, backwards)))
+        equal_so_far.append(column.is_(None) if value is None else column == value)
+    return or_(*conditions)
+
+
+def _beyond(column, value, descending, backwards):
+    """Condition for a key value strictly past the cursor's in the walking direction."""
+    if not backwards:
+        # NULLs sort last, so they follow every value and nothing follows NULL
+        if value is None:
+            return false()
+        return or_(column < value if descending else column > value, column.is_(None))
+    if value is None:
+        return column.isnot(None)
+    return column > value if descending else column < value
@@ -0,0 +1,83 @@
+"""
+Revenue aggregation utilities.
+
+This module computes room revenue for a period in a single aggregate
+query: each booking's nights are clipped to the period in SQL and
+multiplied by its room type's base rate, grouped by room type.
+"""
+
+from sqlalchemy import select, func, and_
+
+from app.models.booking import Booking
+from app.models.room import Room
+from app.models.room_type import RoomType
+from app.utils.sql_functions import day_number, greatest, least
+
+
+def clipped_nights(start_date, end_date):
+    """
+    SQL expression for the nights of a booking that fall inside a period.
+
+    Nights are counted from max(check-in, start_date) up to
+    min(check-out, end_date), and never below zero.
+
+    Args:
+        start_date: First night of the period
+        end_date: Bound the nights are clipped to
+
+    Returns:
+        SQLAlchemy column expression
+    """
+    return greatest(
+        0,
+        least(day_number(Booking.check_out_date), day_number(end_date))
+        - greatest(day_number(Booking.check_in_date), day_number(start_date))
+    )
+
+
+def room_type_revenue(session, start_date, end_date, statuses=None):
+    """
+    Get room revenue and room nights per room type for a period.
+
+    Every room type is returned, with zero revenue if it had no bookings.
+
+    Args:
+        session: Database session
+        start_date: First night of the period
+        end_date: Bound the booking nights are clipped to
+        statuses: Booking statuses to include (defaults to every status
+            except Cancelled)
+
+    Returns:
+        List of (room type name, revenue, nights) tuples ordered by room type
+    """
+    nights = clipped_nights(start_date, end_date)
+
+    booking_filter = and_(
+        Booking.room_id == Room.id,
+        Booking.check_in_date < end_date,
+        Booking.check_out_date > start_date
+    )
+    if statuses is None:
+        booking_filter = and_(booking_filter, Booking.status != Booking.STATUS_CANCELLED)
+    else:
+        booking_filter = and_(booking_filter, Booking.status.in_(statuses))
+
+    query = select(
+        RoomType.name,
+        func.coalesce(func.sum(nights * RoomType.base_rate), 0),
+        func.coalesce(func.sum(nights), 0)
+    ).select_from(
+        RoomType
+    ).outerjoin(
+        Room, Room.room_type_id == RoomType.id
+    ).outerjoin(
+        Booking, booking_filter
+    ).group_by(
+        RoomType.id, RoomType.name
+    ).order_by(RoomType.id)
+
+    return [
+        (name, float(revenue), int(total_nights))
+        for name, revenue, total_nights in session.execute(query)
+    ]
@@ -9,6 +9,7 @@ from enum import Enum
 from datetime import datetime
 from sqlalchemy.exc import IntegrityError
 from db import db
+from app.utils.event_bus import publish_room_status
 
 
 class RoomState(Enum):
@@ -178,6 +179,7 @@ class RoomStateMachine:
             
             # Log the status change
             self._log_status_change(room_id, current_status, new_status, user_id, notes, force)
+            publish_room_status(self.db_session, room, current_status)
             
             # Commit the transaction
             self.db_session.commit()
@@ -0,0 +1,64 @@
+"""
+Dialect-portable SQL functions.
+
+This module defines SQL expressions whose spelling differs between the
+databases the application runs on (SQLite in development and tests,
+PostgreSQL or MySQL in production), so services can push date arithmetic
+into the database without writing dialect-specific SQL.
+"""
+
+from sqlalchemy import Integer
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement, ReturnTypeFromArgs
+
+
+class day_number(FunctionElement):
+    """
+    Whole-day ordinal of a date, usable for day differences.
+
+    day_number(a) - day_number(b) is the number of days between two dates
+    on every supported dialect.
+    """
+
+    type = Integer()
+    inherit_cache = True
+    name = 'day_number'
+
+
+@compiles(day_number)
+def _day_number_default(element, compiler, **kw):
+    return 'CAST(julianday(%s) AS INTEGER)' % compiler.process(element.clauses, **kw)
+
+
+@compiles(day_number, 'postgresql')
+def _day_number_postgresql(element, compiler, **kw):
+    return "(%s - DATE '1970-01-01')" % compiler.process(element.clauses, **kw)
+
+
+@compiles(day_number, 'mysql')
+def _day_number_mysql(element, compiler, **kw):
+    return 'TO_DAYS(%s)' % compiler.process(element.clauses, **kw)
+
+
+class greatest(ReturnTypeFromArgs):
+    """Largest of its arguments (GREATEST, or multi-argument MAX on SQLite)."""
+
+    _register = False
+    inherit_cache = True
+
+
+@compiles(greatest, 'sqlite')
+def _greatest_sqlite(element, compiler, **kw):
+    return 'MAX(%s)' % compiler.process(element.clauses, **kw)
+
+
+class least(ReturnTypeFromArgs):
+    """Smallest of its arguments (LEAST, or multi-argument MIN on SQLite)."""
+
+    _register = False
+    inherit_cache = True
+
+
+@compiles(least, 'sqlite')
+def _least_sqlite(element, compiler, **kw):
+    return 'MIN(%s)' % compiler.process(element.clauses, **kw)
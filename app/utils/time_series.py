@@ -0,0 +1,171 @@
+"""
+Time series utilities.
+
+This module provides helpers that build per-day series for dashboards
+and reports from a single database scan instead of one query per day.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from sqlalchemy import select, func, DateTime
+
+from app.models.booking import Booking
+from app.models.room import Room
+
+
+def _as_date(value):
+    """Normalize a date, datetime or ISO string to a date."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+
+def date_range(start_date, end_date):
+    """
+    Yield every date from start_date to end_date inclusive.
+
+    Args:
+        start_date: First date of the range
+        end_date: Last date of the range
+
+    Yields:
+        date objects in ascending order
+    """
+    current = start_date
+    while current <= end_date:
+        yield current
+        current += timedelta(days=1)
+
+
+def daily_series(session, day_column, start_date, end_date, aggregate=None, criteria=()):
+    """
+    Bucket rows by day with one GROUP BY query and zero-fill missing days.
+
+    Date columns are grouped as they are. DateTime columns are filtered
+    with a half-open range on the raw column, so an index on it can be
+    used, and grouped by their calendar date.
+
+    Args:
+        session: Database session
+        day_column: Date or DateTime column to bucket by
+        start_date: First day of the series
+        end_date: Last day of the series (inclusive)
+        aggregate: Aggregate expression per day (defaults to a row count)
+        criteria: Additional filter expressions
+
+    Returns:
+        Dictionary mapping each date in the range, in ascending order, to
+        its aggregate value (0 for days without rows)
+    """
+    start_date = _as_date(start_date)
+    end_date = _as_date(end_date)
+    if aggregate is None:
+        aggregate = func.count()
+
+    if isinstance(day_column.type, DateTime):
+        bucket = func.date(day_column)
+        range_filter = (
+            day_column >= datetime.combine(start_date, datetime.min.time()),
+            day_column < datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+        )
+    else:
+        bucket = day_column
+        range_filter = (day_column >= start_date, day_column <= end_date)
+
+    query = select(bucket, aggregate).filter(*range_filter, *criteria).group_by(bucket)
+
+    totals = {_as_date(day): value for day, value in session.execute(query) if day is not None}
+    return {day: totals.get(day) or 0 for day in date_range(start_date, end_date)}
+
+
+def occupancy_series(session, start_date, end_date, room_type_id=None,
+                     statuses=None, distinct_rooms=False):
+    """
+    Get the number of occupied rooms for every night in a date range.
+
+    A booking occupies the nights from its check-in date up to, but not
+    including, its check-out date. All bookings overlapping the range are
+    fetched in one query and swept with a difference array, so the cost is
+    one round trip plus O(bookings + days) work.
+
+    Args:
+        session: Database session
+        start_date: First night of the range
+        end_date: Last night of the range (inclusive)
+        room_type_id: Optional room type to restrict the series to
+        statuses: Booking statuses that count as occupying a room
+            (defaults to Reserved and Checked In)
+        distinct_rooms: Count each room at most once per night, even if
+            several bookings for it overlap
+
+    Returns:
+        Dictionary mapping each date in the range to its occupied count
+    """
+    if statuses is None:
+        statuses = [Booking.STATUS_RESERVED, Booking.STATUS_CHECKED_IN]
+
+    start_date = _as_date(start_date)
+    end_date = _as_date(end_date)
+    if end_date < start_date:
+        return {}
+
+    days = (end_date - start_date).days + 1
+
+    query = select(
+        Booking.room_id,
+        Booking.check_in_date,
+        Booking.check_out_date
+    ).filter(
+        Booking.check_in_date <= end_date,
+        Booking.check_out_date > start_date,
+        Booking.status.in_(statuses)
+    )
+    if room_type_id is not None:
+        query = query.join(Room, Room.id == Booking.room_id).filter(
+            Room.room_type_id == room_type_id
+        )
+
+    intervals = []
+    for room_id, check_in, check_out in session.execute(query):
+        first = max((_as_date(check_in) - start_date).days, 0)
+        last = min((_as_date(check_out) - start_date).days, days)
+        if last > first:
+            intervals.append((room_id, first, last))
+
+    if distinct_rooms:
+        intervals = _merge_room_intervals(intervals)
+
+    # Difference array: +1 on the first occupied night, -1 after the last
+    diff = [0] * (days + 1)
+    for _, first, last in intervals:
+        diff[first] += 1
+        diff[last] -= 1
+
+    result = {}
+    running = 0
+    for offset, day in enumerate(date_range(start_date, end_date)):
+        running += diff[offset]
+        result[day] = running
+    return result
+
+
+def _merge_room_intervals(intervals):
+    """Merge overlapping night intervals per room so each room counts once."""
+    by_room = defaultdict(list)
+    for room_id, first, last in intervals:
+        by_room[room_id].append((first, last))
+
+    merged = []
+    for room_id, spans in by_room.items():
+        spans.sort()
+        current_first, current_last = spans[0]
+        for first, last in spans[1:]:
+            if first <= current_last:
+                current_last = max(current_last, last)
+            else:
+                merged.append((room_id, current_first, current_last))
+                current_first, current_last = first, last
+        merged.append((room_id, current_first, current_last))
+    return merged
@@ -0,0 +1,95 @@
+"""
+XLSX export utilities.
+
+This module writes Excel workbooks row by row using xlsxwriter's
+constant_memory mode, so exports can be fed directly from query
+iterators without building DataFrames or holding every row in memory.
+"""
+
+import xlsxwriter
+
+
+class StreamingWorkbook:
+    """
+    Write-once XLSX workbook fed from row iterators.
+
+    In constant_memory mode xlsxwriter flushes each row to a temporary file
+    as soon as the next row starts, so memory use stays flat regardless of
+    the number of rows. Rows must therefore be written in order, one sheet
+    at a time.
+
+    Attributes:
+        workbook: Underlying xlsxwriter Workbook
+        header_format: Format applied to header rows
+        title_format: Format applied to sheet titles
+    """
+
+    def __init__(self, output):
+        """
+        Open a workbook on a filename or writable binary file object.
+
+        Args:
+            output: Path or file-like object (e.g. BytesIO, TemporaryFile)
+        """
+        self.workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+        self.header_format = self.workbook.add_format({
+            'bold': True,
+            'text_wrap': True,
+            'valign': 'top',
+            'fg_color': '#D7E4BC',
+            'border': 1
+        })
+        self.title_format = self.workbook.add_format({
+            'bold': True,
+            'font_size': 14,
+            'fg_color': '#B8CCE4'
+        })
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def add_sheet(self, name, header, rows, widths=None):
+        """
+        Add a worksheet and stream rows into it.
+
+        Args:
+            name: Worksheet name
+            header: List of column headings
+            rows: Iterable of row sequences
+            widths: Optional list of column widths
+
+        Returns:
+            Number of data rows written
+        """
+        worksheet = self.workbook.add_worksheet(name)
+        for col_num, width in enumerate(widths or []):
+            worksheet.set_column(col_num, col_num, width)
+
+        worksheet.write_row(0, 0, header, self.header_format)
+
+        count = 0
+        for count, row in enumerate(rows, start=1):
+            worksheet.write_row(count, 0, row)
+        return count
+
+    def add_info_sheet(self, name, lines, width=50):
+        """
+        Add a single-column information sheet with a formatted title line.
+
+        Args:
+            name: Worksheet name
+            lines: Text lines; the first is formatted as the title
+            width: Column width
+        """
+        worksheet = self.workbook.add_worksheet(name)
+        worksheet.set_column(0, 0, width)
+        for row_num, line in enumerate(lines):
+            worksheet.write(row_num, 0, line, self.title_format if row_num == 0 else None)
+
+    def close(self):
+        """Finish the workbook and write the zip container to the output."""
+        self.workbook.close()
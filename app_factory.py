@@ -16,6 +16,9 @@ from flask_mail import Mail
 from flask_wtf.csrf import CSRFProtect
 from apscheduler.schedulers.background import BackgroundScheduler
 from app.tasks.auto_checkout import auto_check_out_overdue
+from app.tasks.night_audit import run_night_audit
+from app.tasks.turnover_tasks import generate_upcoming_turnover_tasks
+from app.tasks.waitlist_promotion import waitlist_promotion_worker
 
 from config import get_config
 from db import init_db, db
@@ -143,6 +146,13 @@ def create_app(config_class=None):
     if not app.testing and not scheduler.running:
         scheduler.start()
         scheduler.add_job(auto_check_out_overdue, 'cron', hour=0, minute=0)
+        # Runs after the overdue check-outs and no-shows have been settled
+        scheduler.add_job(run_night_audit, 'cron', hour=0, minute=15, args=[app])
+        # Morning housekeeping board for today's and the next days' departures
+        scheduler.add_job(generate_upcoming_turnover_tasks, 'cron', hour=6, minute=0, args=[app])
+    # Offer freed inventory to the waitlist as cancellations come in
+    if not app.testing and app.config.get('WAITLIST_AUTO_PROMOTION', True):
+        waitlist_promotion_worker.start(app)
 
     # Shell context for flask cli
     @app.shell_context_processor
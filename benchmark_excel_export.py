@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark the constant-memory XLSX exporter against the pandas path.
+
+Both exporters write the same synthetic booking rows. Each one runs in
+its own child process so that its wall time and peak resident memory are
+measured independently.
+
+Usage:
+    python benchmark_excel_export.py [--rows 1000000] [--skip-pandas]
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# Add the parent directory to the path so we can import the app
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app.utils.xlsx_export import StreamingWorkbook
+
+HEADER = ['Booking ID', 'Confirmation Code', 'Room', 'Room Type', 'Guest',
+          'Check-in', 'Check-out', 'Status', 'Total Price']
+
+
+def generate_rows(count):
+    """Yield synthetic booking export rows."""
+    start = date(2024, 1, 1)
+    for i in range(count):
+        check_in = start + timedelta(days=i % 365)
+        yield [
+            i + 1,
+            f'BK{i + 1:08d}',
+            str(100 + i % 200),
+            ('Standard', 'Deluxe', 'Suite')[i % 3],
+            f'Guest {i % 5000}',
+            check_in.strftime('%Y-%m-%d'),
+            (check_in + timedelta(days=1 + i % 5)).strftime('%Y-%m-%d'),
+            'Checked Out',
+            f'{100 + i % 400:.2f}'
+        ]
+
+
+def export_streaming(rows, path):
+    """Write rows with the constant-memory exporter."""
+    with StreamingWorkbook(path) as workbook:
+        workbook.add_sheet('Bookings', HEADER, generate_rows(rows))
+
+
+def export_pandas(rows, path):
+    """Write rows the way the previous pandas-based exporter did."""
+    import pandas as pd
+
+    df = pd.DataFrame(list(generate_rows(rows)), columns=HEADER)
+    with pd.ExcelWriter(path, engine='xlsxwriter') as writer:
+        df.to_excel(writer, sheet_name='Bookings', index=False)
+
+
+EXPORTERS = {
+    'streaming': export_streaming,
+    'pandas': export_pandas,
+}
+
+
+def run_child(label, rows):
+    """Run one exporter in this process and print its measurements."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'export.xlsx')
+        started = time.perf_counter()
+        EXPORTERS[label](rows, path)
+        elapsed = time.perf_counter() - started
+        size = os.path.getsize(path)
+
+    # ru_maxrss is reported in kilobytes on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{label:<12} {elapsed:>9.1f}s {peak:>12.1f} MB {size / 1024 / 1024:>10.1f} MB")
+
+
+def measure(label, rows):
+    """Run an exporter in a fresh interpreter so peak memory is not shared."""
+    subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--rows', str(rows), '--child', label],
+        check=True
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Number of rows to export')
+    parser.add_argument('--skip-pandas', action='store_true', help='Only run the streaming exporter')
+    parser.add_argument('--child', choices=sorted(EXPORTERS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.rows)
+        return
+
+    print(f"Exporting {args.rows:,} rows")
+    print(f"{'exporter':<12} {'time':>10} {'peak RSS':>15} {'file size':>13}")
+    measure('streaming', args.rows)
+    if not args.skip_pandas:
+        measure('pandas', args.rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -56,9 +56,28 @@ class Config:
     HOTEL_NAME = os.environ.get("HOTEL_NAME", "Horizon Hotel")
     DEFAULT_CURRENCY = os.environ.get("DEFAULT_CURRENCY", "USD")
     RESERVATION_TIMEOUT = int(os.environ.get("RESERVATION_TIMEOUT", 1800))  # 30 minutes
+    DASHBOARD_CACHE_ENABLED = (
+        os.environ.get("DASHBOARD_CACHE_ENABLED", "True").lower() == "true"
+    )
+    # Live dashboard streams hold a worker each and share events only within
+    # one process: enable with threaded/async workers and a single process
+    LIVE_UPDATES_ENABLED = (
+        os.environ.get("LIVE_UPDATES_ENABLED", "False").lower() == "true"
+    )
+    LIVE_UPDATES_KEEPALIVE = int(os.environ.get("LIVE_UPDATES_KEEPALIVE", 25))  # seconds
+    LIVE_UPDATES_MAX_STREAM_SECONDS = int(os.environ.get("LIVE_UPDATES_MAX_STREAM_SECONDS", 300))  # seconds
     ENABLE_NOTIFICATIONS = (
         os.environ.get("ENABLE_NOTIFICATIONS", "True").lower() == "true"
     )
+    TURNOVER_LOOKAHEAD_DAYS = int(os.environ.get("TURNOVER_LOOKAHEAD_DAYS", 3))  # days after today
+    WAITLIST_AUTO_PROMOTION = (
+        os.environ.get("WAITLIST_AUTO_PROMOTION", "True").lower() == "true"
+    )
+    WAITLIST_AUTO_HOLD = (
+        os.environ.get("WAITLIST_AUTO_HOLD", "False").lower() == "true"
+    )
+    WAITLIST_PROMOTION_BATCH_SIZE = int(os.environ.get("WAITLIST_PROMOTION_BATCH_SIZE", 50))  # slots per run
+    WAITLIST_PROMOTION_INTERVAL = int(os.environ.get("WAITLIST_PROMOTION_INTERVAL", 5))  # seconds between runs
 
     # Stripe settings
     STRIPE_SECRET_KEY = os.environ.get("STRIPE_SECRET_KEY", "sk_test_51OxXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX")
@@ -81,6 +100,7 @@ class TestingConfig(Config):
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
     WTF_CSRF_ENABLED = False
     MAIL_SUPPRESS_SEND = True
+    DASHBOARD_CACHE_ENABLED = False
 
     def __init__(self):
         """Initialize testing configuration and set environment variables."""
@@ -0,0 +1,40 @@
+"""Add report cache table
+
+Revision ID: 5a1c2e7f9b30
+Revises: 408b42b312f5
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a1c2e7f9b30'
+down_revision = '408b42b312f5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('report_cache',
+    sa.Column('report_type', sa.String(length=50), nullable=False),
+    sa.Column('period_start', sa.Date(), nullable=False),
+    sa.Column('period_end', sa.Date(), nullable=False),
+    sa.Column('data_version', sa.Integer(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_report_cache')),
+    sa.UniqueConstraint('report_type', 'period_start', 'period_end', name='uix_report_cache_period')
+    )
+    with op.batch_alter_table('report_cache', schema=None) as batch_op:
+        batch_op.create_index('idx_report_cache_period', ['period_start', 'period_end'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('report_cache', schema=None) as batch_op:
+        batch_op.drop_index('idx_report_cache_period')
+
+    op.drop_table('report_cache')
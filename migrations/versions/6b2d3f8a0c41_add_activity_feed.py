@@ -0,0 +1,144 @@
+"""Add activity feed table
+
+Revision ID: 6b2d3f8a0c41
+Revises: 5a1c2e7f9b30
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6b2d3f8a0c41'
+down_revision = '5a1c2e7f9b30'
+branch_labels = None
+depends_on = None
+
+
+activity_feed = sa.table(
+    'activity_feed',
+    sa.column('activity_type', sa.String), sa.column('action', sa.String),
+    sa.column('description', sa.String), sa.column('details', sa.String),
+    sa.column('user_id', sa.Integer), sa.column('username', sa.String),
+    sa.column('source_type', sa.String), sa.column('source_id', sa.Integer),
+    sa.column('occurred_at', sa.DateTime), sa.column('created_at', sa.DateTime),
+    sa.column('updated_at', sa.DateTime)
+)
+booking_logs = sa.table(
+    'booking_logs',
+    sa.column('id', sa.Integer), sa.column('booking_id', sa.Integer), sa.column('action', sa.String),
+    sa.column('action_time', sa.DateTime), sa.column('user_id', sa.Integer)
+)
+room_status_logs = sa.table(
+    'room_status_logs',
+    sa.column('id', sa.Integer), sa.column('room_id', sa.Integer), sa.column('old_status', sa.String),
+    sa.column('new_status', sa.String), sa.column('changed_by', sa.Integer),
+    sa.column('change_time', sa.DateTime)
+)
+payments = sa.table(
+    'payments',
+    sa.column('id', sa.Integer), sa.column('booking_id', sa.Integer), sa.column('amount', sa.Float),
+    sa.column('payment_date', sa.DateTime), sa.column('payment_type', sa.String),
+    sa.column('processed_by', sa.Integer)
+)
+bookings = sa.table('bookings', sa.column('id', sa.Integer), sa.column('room_id', sa.Integer))
+rooms = sa.table('rooms', sa.column('id', sa.Integer), sa.column('number', sa.String))
+users = sa.table('users', sa.column('id', sa.Integer), sa.column('username', sa.String))
+
+COLUMNS = ['activity_type', 'action', 'description', 'details', 'user_id', 'username',
+           'source_type', 'source_id', 'occurred_at', 'created_at', 'updated_at']
+
+
+def _text(column):
+    return sa.cast(column, sa.String)
+
+
+def _backfill():
+    """Copy the existing booking, room status and payment history into the feed."""
+    now = sa.func.current_timestamp()
+
+    booking_room = sa.select(rooms.c.number).select_from(
+        rooms.join(bookings, bookings.c.room_id == rooms.c.id)
+    ).where(bookings.c.id == booking_logs.c.booking_id).scalar_subquery()
+    op.execute(activity_feed.insert().from_select(COLUMNS, sa.select(
+        sa.literal('booking'),
+        booking_logs.c.action,
+        sa.literal('Booking ') + _text(booking_logs.c.booking_id) + sa.literal(' ')
+        + sa.func.replace(booking_logs.c.action, '_', ' '),
+        sa.func.coalesce(sa.literal('Room ') + booking_room, ''),
+        booking_logs.c.user_id,
+        users.c.username,
+        sa.literal('booking_logs'),
+        booking_logs.c.id,
+        booking_logs.c.action_time,
+        now,
+        now
+    ).select_from(booking_logs.outerjoin(users, users.c.id == booking_logs.c.user_id))))
+
+    op.execute(activity_feed.insert().from_select(COLUMNS, sa.select(
+        sa.literal('room'),
+        sa.literal('status_change'),
+        sa.literal('Room ') + sa.func.coalesce(rooms.c.number, _text(room_status_logs.c.room_id))
+        + sa.literal(' status changed to ') + room_status_logs.c.new_status,
+        sa.case(
+            (room_status_logs.c.old_status.isnot(None), sa.literal('From ') + room_status_logs.c.old_status),
+            else_=''
+        ),
+        room_status_logs.c.changed_by,
+        users.c.username,
+        sa.literal('room_status_logs'),
+        room_status_logs.c.id,
+        room_status_logs.c.change_time,
+        now,
+        now
+    ).select_from(
+        room_status_logs
+        .outerjoin(rooms, rooms.c.id == room_status_logs.c.room_id)
+        .outerjoin(users, users.c.id == room_status_logs.c.changed_by)
+    )))
+
+    op.execute(activity_feed.insert().from_select(COLUMNS, sa.select(
+        sa.literal('payment'),
+        sa.literal('payment_processed'),
+        sa.literal('Payment of $') + _text(payments.c.amount) + sa.literal(' processed for booking ')
+        + _text(payments.c.booking_id),
+        sa.literal('Method: ') + sa.func.coalesce(payments.c.payment_type, 'None'),
+        payments.c.processed_by,
+        users.c.username,
+        sa.literal('payments'),
+        payments.c.id,
+        payments.c.payment_date,
+        now,
+        now
+    ).select_from(payments.outerjoin(users, users.c.id == payments.c.processed_by))))
+
+
+def upgrade():
+    op.create_table('activity_feed',
+    sa.Column('activity_type', sa.String(length=20), nullable=False),
+    sa.Column('action', sa.String(length=30), nullable=False),
+    sa.Column('description', sa.String(length=255), nullable=False),
+    sa.Column('details', sa.String(length=255), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('username', sa.String(length=64), nullable=True),
+    sa.Column('source_type', sa.String(length=30), nullable=False),
+    sa.Column('source_id', sa.Integer(), nullable=False),
+    sa.Column('occurred_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_activity_feed')),
+    sa.UniqueConstraint('source_type', 'source_id', name='uix_activity_feed_source')
+    )
+    with op.batch_alter_table('activity_feed', schema=None) as batch_op:
+        batch_op.create_index('idx_activity_feed_time', ['occurred_at', 'id'], unique=False)
+
+    _backfill()
+
+
+def downgrade():
+    with op.batch_alter_table('activity_feed', schema=None) as batch_op:
+        batch_op.drop_index('idx_activity_feed_time')
+
+    op.drop_table('activity_feed')
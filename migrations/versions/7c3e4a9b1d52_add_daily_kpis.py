@@ -0,0 +1,45 @@
+"""Add daily KPI snapshots table
+
+The table is back-filled by the first night audit run, which snapshots
+every day from the first booking up to yesterday.
+
+Revision ID: 7c3e4a9b1d52
+Revises: 6b2d3f8a0c41
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3e4a9b1d52'
+down_revision = '6b2d3f8a0c41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('daily_kpis',
+    sa.Column('business_date', sa.Date(), nullable=False),
+    sa.Column('total_rooms', sa.Integer(), nullable=False),
+    sa.Column('rooms_sold', sa.Integer(), nullable=False),
+    sa.Column('room_revenue', sa.Float(), nullable=False),
+    sa.Column('occupancy_rate', sa.Float(), nullable=False),
+    sa.Column('adr', sa.Float(), nullable=False),
+    sa.Column('revpar', sa.Float(), nullable=False),
+    sa.Column('arrivals', sa.Integer(), nullable=False),
+    sa.Column('departures', sa.Integer(), nullable=False),
+    sa.Column('cancellations', sa.Integer(), nullable=False),
+    sa.Column('no_shows', sa.Integer(), nullable=False),
+    sa.Column('revenue_by_source_json', sa.Text(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_daily_kpis')),
+    sa.UniqueConstraint('business_date', name='uq_daily_kpis_business_date')
+    )
+
+
+def downgrade():
+    op.drop_table('daily_kpis')
@@ -0,0 +1,93 @@
+"""Add customer stats table
+
+Revision ID: 8d4f5b0c2e63
+Revises: 7c3e4a9b1d52
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from datetime import datetime, date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d4f5b0c2e63'
+down_revision = '7c3e4a9b1d52'
+branch_labels = None
+depends_on = None
+
+
+bookings = sa.table(
+    'bookings',
+    sa.column('customer_id', sa.Integer), sa.column('check_in_date', sa.Date),
+    sa.column('check_out_date', sa.Date), sa.column('status', sa.String),
+    sa.column('total_price', sa.Float), sa.column('cancellation_fee', sa.Float)
+)
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date) or value is None:
+        return value
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+
+def _backfill(customer_stats):
+    """Aggregate the existing completed stays and cancellations per customer."""
+    stats = {}
+    rows = op.get_bind().execute(sa.select(
+        bookings.c.customer_id, bookings.c.check_in_date, bookings.c.check_out_date,
+        bookings.c.status, bookings.c.total_price, bookings.c.cancellation_fee
+    ).where(bookings.c.status.in_(['Checked Out', 'Cancelled'])))
+
+    for customer_id, check_in, check_out, status, total_price, cancellation_fee in rows:
+        entry = stats.setdefault(customer_id, {
+            'customer_id': customer_id, 'lifetime_spend': 0.0, 'stay_count': 0,
+            'total_nights': 0, 'last_stay_date': None, 'cancellation_count': 0
+        })
+        if status == 'Cancelled':
+            entry['lifetime_spend'] += cancellation_fee or 0.0
+            entry['cancellation_count'] += 1
+            continue
+        check_in, check_out = _as_date(check_in), _as_date(check_out)
+        entry['lifetime_spend'] += total_price or 0.0
+        entry['stay_count'] += 1
+        entry['total_nights'] += max((check_out - check_in).days, 0)
+        if entry['last_stay_date'] is None or check_out > entry['last_stay_date']:
+            entry['last_stay_date'] = check_out
+
+    now = datetime.utcnow()
+    if stats:
+        op.bulk_insert(customer_stats, [dict(entry, created_at=now, updated_at=now) for entry in stats.values()])
+
+
+def upgrade():
+    customer_stats = op.create_table('customer_stats',
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('lifetime_spend', sa.Float(), nullable=False),
+    sa.Column('stay_count', sa.Integer(), nullable=False),
+    sa.Column('total_nights', sa.Integer(), nullable=False),
+    sa.Column('last_stay_date', sa.Date(), nullable=True),
+    sa.Column('cancellation_count', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], name='fk_customer_stats_customer_id_customers', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_customer_stats')),
+    sa.UniqueConstraint('customer_id', name='uq_customer_stats_customer_id')
+    )
+    with op.batch_alter_table('customer_stats', schema=None) as batch_op:
+        batch_op.create_index('idx_customer_stats_spend', ['lifetime_spend', 'customer_id'], unique=False)
+        batch_op.create_index('idx_customer_stats_last_stay', ['last_stay_date'], unique=False)
+
+    _backfill(customer_stats)
+
+
+def downgrade():
+    with op.batch_alter_table('customer_stats', schema=None) as batch_op:
+        batch_op.drop_index('idx_customer_stats_last_stay')
+        batch_op.drop_index('idx_customer_stats_spend')
+
+    op.drop_table('customer_stats')
@@ -0,0 +1,39 @@
+"""Add booking pace snapshots table
+
+Revision ID: 9e5a6c1d3f74
+Revises: 8d4f5b0c2e63
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e5a6c1d3f74'
+down_revision = '8d4f5b0c2e63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('booking_pace',
+    sa.Column('snapshot_date', sa.Date(), nullable=False),
+    sa.Column('stay_date', sa.Date(), nullable=False),
+    sa.Column('rooms_on_books', sa.Integer(), nullable=False),
+    sa.Column('revenue_on_books', sa.Float(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_booking_pace')),
+    sa.UniqueConstraint('snapshot_date', 'stay_date', name='uix_booking_pace_snapshot_stay')
+    )
+    with op.batch_alter_table('booking_pace', schema=None) as batch_op:
+        batch_op.create_index('idx_booking_pace_stay', ['stay_date', 'snapshot_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('booking_pace', schema=None) as batch_op:
+        batch_op.drop_index('idx_booking_pace_stay')
+
+    op.drop_table('booking_pace')
@@ -0,0 +1,101 @@
+"""Add forecast accuracy aggregates table
+
+Revision ID: af6b7d2e4085
+Revises: 9e5a6c1d3f74
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from datetime import datetime, date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'af6b7d2e4085'
+down_revision = '9e5a6c1d3f74'
+branch_labels = None
+depends_on = None
+
+
+# Mirrors ForecastAccuracy.HORIZON_BUCKETS at the time of this migration
+HORIZON_BUCKETS = [('0-7', 0, 7), ('8-30', 8, 30), ('31-90', 31, 90), ('91+', 91, None)]
+
+revenue_forecasts = sa.table(
+    'revenue_forecasts',
+    sa.column('forecast_date', sa.Date), sa.column('created_at', sa.DateTime),
+    sa.column('predicted_room_revenue', sa.Float), sa.column('actual_room_revenue', sa.Float)
+)
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date) or value is None:
+        return value
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+
+def _bucket_for(lead_days):
+    lead_days = max(lead_days, 0)
+    for label, shortest, longest in HORIZON_BUCKETS:
+        if lead_days >= shortest and (longest is None or lead_days <= longest):
+            return label
+    return HORIZON_BUCKETS[-1][0]
+
+
+def _backfill(forecast_accuracy):
+    """Aggregate the errors of forecasts that already have actuals.
+
+    The prediction time of these rows is no longer known once actuals were
+    written, so their lead time is taken from when they were created.
+    """
+    totals = {}
+    rows = op.get_bind().execute(sa.select(
+        revenue_forecasts.c.forecast_date, revenue_forecasts.c.created_at,
+        revenue_forecasts.c.predicted_room_revenue, revenue_forecasts.c.actual_room_revenue
+    ).where(revenue_forecasts.c.actual_room_revenue.isnot(None)))
+
+    now = datetime.utcnow()
+    for forecast_date, created_at, predicted, actual in rows:
+        created_on = _as_date(created_at) or now.date()
+        label = _bucket_for((_as_date(forecast_date) - created_on).days)
+        entry = totals.setdefault(label, {
+            'horizon_bucket': label, 'forecast_count': 0, 'sum_error': 0.0, 'sum_abs_error': 0.0,
+            'sum_squared_error': 0.0, 'pct_error_count': 0, 'sum_abs_pct_error': 0.0
+        })
+        predicted = predicted or 0.0
+        error = predicted - actual
+        entry['forecast_count'] += 1
+        entry['sum_error'] += error
+        entry['sum_abs_error'] += abs(error)
+        entry['sum_squared_error'] += error * error
+        if predicted:
+            entry['pct_error_count'] += 1
+            entry['sum_abs_pct_error'] += abs(error / predicted) * 100
+
+    if totals:
+        op.bulk_insert(forecast_accuracy, [dict(entry, created_at=now, updated_at=now) for entry in totals.values()])
+
+
+def upgrade():
+    forecast_accuracy = op.create_table('forecast_accuracy',
+    sa.Column('horizon_bucket', sa.String(length=10), nullable=False),
+    sa.Column('forecast_count', sa.Integer(), nullable=False),
+    sa.Column('sum_error', sa.Float(), nullable=False),
+    sa.Column('sum_abs_error', sa.Float(), nullable=False),
+    sa.Column('sum_squared_error', sa.Float(), nullable=False),
+    sa.Column('pct_error_count', sa.Integer(), nullable=False),
+    sa.Column('sum_abs_pct_error', sa.Float(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_forecast_accuracy')),
+    sa.UniqueConstraint('horizon_bucket', name='uq_forecast_accuracy_horizon_bucket')
+    )
+
+    _backfill(forecast_accuracy)
+
+
+def downgrade():
+    op.drop_table('forecast_accuracy')
@@ -0,0 +1,26 @@
+"""Add bookings check-out date index
+
+Revision ID: b07c8e3f5196
+Revises: af6b7d2e4085
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b07c8e3f5196'
+down_revision = 'af6b7d2e4085'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.create_index('idx_bookings_check_out', ['check_out_date', 'status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.drop_index('idx_bookings_check_out')
@@ -0,0 +1,72 @@
+"""Add full-text search indexes for tasks, maintenance requests and guests
+
+Revision ID: c18d9f4a62a7
+Revises: b07c8e3f5196
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c18d9f4a62a7'
+down_revision = 'b07c8e3f5196'
+branch_labels = None
+depends_on = None
+
+
+# Mirrors the register_full_text calls at the time of this migration
+INDEXED_COLUMNS = {
+    'housekeeping_tasks': ('description', 'notes'),
+    'maintenance_requests': ('description', 'notes'),
+    'customers': ('name', 'phone', 'notes'),
+}
+
+
+def _sqlite_statements(table_name, columns):
+    fts = f'{table_name}_fts'
+    names = ', '.join(columns)
+    new_values = ', '.join(f'new.{name}' for name in columns)
+    old_values = ', '.join(f'old.{name}' for name in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{names}, content='{table_name}', content_rowid='id', tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} BEGIN "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {names} ON {table_name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def _tsvector_sql(columns):
+    document = " || ' ' || ".join(f"coalesce({name}, '')" for name in columns)
+    return f"to_tsvector('english', {document})"
+
+
+def upgrade():
+    dialect_name = op.get_bind().dialect.name
+    for table_name, columns in INDEXED_COLUMNS.items():
+        if dialect_name == 'sqlite':
+            for statement in _sqlite_statements(table_name, columns):
+                op.execute(statement)
+        elif dialect_name == 'postgresql':
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table_name}_fts ON {table_name} "
+                f"USING GIN ({_tsvector_sql(columns)})"
+            )
+
+
+def downgrade():
+    dialect_name = op.get_bind().dialect.name
+    for table_name in INDEXED_COLUMNS:
+        fts = f'{table_name}_fts'
+        if dialect_name == 'sqlite':
+            for trigger in ('ai', 'ad', 'au'):
+                op.execute(f'DROP TRIGGER IF EXISTS {fts}_{trigger}')
+            op.execute(f'DROP TABLE IF EXISTS {fts}')
+        elif dialect_name == 'postgresql':
+            op.execute(f'DROP INDEX IF EXISTS idx_{table_name}_fts')
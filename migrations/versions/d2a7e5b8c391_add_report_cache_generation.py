@@ -0,0 +1,38 @@
+"""Add report cache generation counter
+
+Revision ID: d2a7e5b8c391
+Revises: c18d9f4a62a7
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a7e5b8c391'
+down_revision = 'c18d9f4a62a7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    report_cache_generation = op.create_table('report_cache_generation',
+    sa.Column('generation', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_report_cache_generation'))
+    )
+
+    # The single counter row every invalidation bumps
+    now = datetime.utcnow()
+    op.bulk_insert(report_cache_generation, [
+        {'id': 1, 'generation': 0, 'created_at': now, 'updated_at': now}
+    ])
+
+
+def downgrade():
+    op.drop_table('report_cache_generation')
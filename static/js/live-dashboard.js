@@ -0,0 +1,132 @@
+/**
+ * Live Dashboard Updates
+ * Subscribes to the dashboard's server-sent-events stream and patches
+ * counters and guest lists in place instead of reloading the page.
+ *
+ * The page opts in with a data-live-events-url attribute. Elements are
+ * addressed through data attributes:
+ *   data-live-count="<name>"        integer counter (room-status:<status>,
+ *                                   arrivals, departures, in-house, cleaned,
+ *                                   active-tasks)
+ *   data-live-booking="<id>"        guest row removed when the booking leaves it
+ *   data-live-occupancy             occupancy percentage
+ *   data-live-total-rooms           total room count
+ *   data-live-status-bar="<status>" progress bar sized by its status count
+ */
+
+(function() {
+    const ACTIVE_TASK_STATUSES = ['pending', 'in_progress'];
+
+    /**
+     * Add delta to every counter with the given name
+     * @param {string} name - Counter name
+     * @param {number} delta - Amount to add
+     */
+    function adjustCount(name, delta) {
+        if (!delta) return;
+        document.querySelectorAll(`[data-live-count="${CSS.escape(name)}"]`).forEach(el => {
+            const value = parseInt(el.textContent, 10) || 0;
+            el.textContent = Math.max(value + delta, 0);
+        });
+    }
+
+    /**
+     * Read the first counter with the given name
+     * @param {string} name - Counter name
+     * @returns {number} Counter value, 0 if absent
+     */
+    function readCount(name) {
+        const el = document.querySelector(`[data-live-count="${CSS.escape(name)}"]`);
+        return el ? parseInt(el.textContent, 10) || 0 : 0;
+    }
+
+    /**
+     * Remove the guest rows of a booking
+     * @param {number} bookingId - Booking ID
+     */
+    function removeBookingRows(bookingId) {
+        document.querySelectorAll(`[data-live-booking="${bookingId}"]`).forEach(el => el.remove());
+    }
+
+    /**
+     * Recompute occupancy percentage and status bars from the counters
+     */
+    function refreshOccupancy() {
+        const totalEl = document.querySelector('[data-live-total-rooms]');
+        const total = totalEl ? parseInt(totalEl.textContent, 10) || 0 : 0;
+        if (!total) return;
+
+        document.querySelectorAll('[data-live-occupancy]').forEach(el => {
+            el.textContent = Math.round(readCount('room-status:Occupied') / total * 1000) / 10;
+        });
+        document.querySelectorAll('[data-live-status-bar]').forEach(el => {
+            const count = readCount(`room-status:${el.dataset.liveStatusBar}`);
+            el.style.width = `${count / total * 100}%`;
+        });
+    }
+
+    const handlers = {
+        'room.status_changed': function(data) {
+            adjustCount(`room-status:${data.old_status}`, -1);
+            adjustCount(`room-status:${data.new_status}`, 1);
+            if (data.new_status === 'Available') {
+                adjustCount('cleaned', 1);
+            }
+            refreshOccupancy();
+        },
+
+        'booking.checked_in': function(data, today) {
+            removeBookingRows(data.booking_id);
+            if (data.check_in_date === today) adjustCount('arrivals', -1);
+            if (data.check_out_date > today) adjustCount('in-house', 1);
+        },
+
+        'booking.checked_out': function(data, today) {
+            removeBookingRows(data.booking_id);
+            if (data.check_out_date === today) {
+                adjustCount('departures', -1);
+            } else if (data.check_out_date > today) {
+                adjustCount('in-house', -1);
+            }
+        },
+
+        'booking.cancelled': function(data, today) {
+            removeBookingRows(data.booking_id);
+            if (data.check_in_date === today) adjustCount('arrivals', -1);
+        },
+
+        'task.created': function(data) {
+            adjustCount('active-tasks', ACTIVE_TASK_STATUSES.includes(data.status) ? 1 : 0);
+        },
+
+        'task.updated': function(data) {
+            const wasActive = ACTIVE_TASK_STATUSES.includes(data.previous_status);
+            const isActive = ACTIVE_TASK_STATUSES.includes(data.status);
+            adjustCount('active-tasks', isActive - wasActive);
+        },
+
+        'task.deleted': function(data) {
+            adjustCount('active-tasks', ACTIVE_TASK_STATUSES.includes(data.status) ? -1 : 0);
+        }
+    };
+
+    document.addEventListener('DOMContentLoaded', function() {
+        const root = document.querySelector('[data-live-events-url]');
+        if (!root || !window.EventSource) return;
+
+        const today = root.dataset.liveToday || new Date().toISOString().slice(0, 10);
+        const source = new EventSource(root.dataset.liveEventsUrl);
+
+        Object.keys(handlers).forEach(type => {
+            source.addEventListener(type, function(e) {
+                handlers[type](JSON.parse(e.data), today);
+            });
+        });
+
+        // The server dropped events for this page; start over from a fresh render
+        source.addEventListener('resync', function() {
+            source.close();
+            window.location.reload();
+        });
+    });
+})();
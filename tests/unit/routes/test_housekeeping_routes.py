@@ -12,11 +12,15 @@ from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
 from flask import url_for, template_rendered
 from contextlib import contextmanager
+from flask_login import login_user as flask_login_user
 
 from app.models.room import Room
 from app.models.booking import Booking
 from app.models.housekeeping_task import HousekeepingTask
 from app.models.customer import Customer
+from app.models.room_type import RoomType
+from app.models.user import User
+from app.routes.housekeeping import rooms_to_clean_view
 
 
 @contextmanager
@@ -270,3 +274,25 @@ class TestHousekeepingRoutes:
             assert len(today_data['tasks']) == 1
             assert len(today_data['checkouts']) == 1
             assert today_data['total'] == 2
+
+
+def test_rooms_to_clean_are_grouped_by_room_floor(app, db_session):
+    """Test that rooms to clean are grouped by Room.floor, so '1204' is on floor 12."""
+    user = User(username='floor_keeper', email='floor_keeper@example.com', role='housekeeping', password_hash='x')
+    room_type = RoomType(name='Floor Standard', base_rate=100.0, capacity=2)
+    db_session.add_all([user, room_type])
+    db_session.flush()
+    db_session.add_all([
+        Room(number=number, status='dirty', room_type_id=room_type.id)
+        for number in ['1204', '201', '105']
+    ])
+    db_session.commit()
+
+    with app.test_request_context('/housekeeping/rooms-to-clean'):
+        flask_login_user(user)
+        with patch('app.routes.housekeeping.render_template') as render:
+            rooms_to_clean_view()
+
+    rooms_by_floor = render.call_args.kwargs['rooms_by_floor']
+    assert list(rooms_by_floor) == [1, 2, 12]
+    assert [room.number for room in rooms_by_floor[12]] == ['1204']
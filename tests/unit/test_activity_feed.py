@@ -0,0 +1,112 @@
+"""
+Unit tests for the activity feed and the dashboard activity timeline.
+"""
+
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy import event
+
+from app.models.activity_feed import ActivityFeed
+from app.models.booking import Booking
+from app.models.booking_log import BookingLog
+from app.models.customer import Customer
+from app.models.payment import Payment
+from app.models.room import Room
+from app.models.room_type import RoomType
+from app.models.user import User
+from app.services.booking_service import BookingService
+from app.services.dashboard_service import DashboardService
+
+
+@pytest.fixture
+def feed_booking(db_session):
+    """Create a staff user and a reserved booking for today."""
+    staff = User(username='feed_staff', email='feed_staff@example.com', role='receptionist', password_hash='x')
+    guest = User(username='feed_guest', email='feed_guest@example.com', role='customer', password_hash='x')
+    room_type = RoomType(name='Feed Standard', base_rate=100.0, capacity=2)
+    db_session.add_all([staff, guest, room_type])
+    db_session.flush()
+    customer = Customer(user_id=guest.id, name='Feed Guest')
+    room = Room(number='F101', room_type_id=room_type.id, status=Room.STATUS_BOOKED)
+    db_session.add_all([customer, room])
+    db_session.flush()
+    booking = Booking(
+        room_id=room.id,
+        customer_id=customer.id,
+        check_in_date=date.today(),
+        check_out_date=date.today() + timedelta(days=2),
+        status=Booking.STATUS_RESERVED,
+        total_price=200.0
+    )
+    db_session.add(booking)
+    db_session.commit()
+    return staff, booking
+
+
+def test_feed_rows_are_written_with_log_records(db_session, feed_booking):
+    staff, booking = feed_booking
+
+    BookingService(db_session).check_in(booking.id, staff_id=staff.id)
+    db_session.add(Payment(booking_id=booking.id, amount=200.0, payment_type='Card'))
+    db_session.commit()
+
+    entries = {e.source_type: e for e in db_session.query(ActivityFeed).all()}
+
+    assert entries['booking_logs'].description == f"Booking {booking.id} check in"
+    assert entries['booking_logs'].details == 'Room F101'
+    assert entries['booking_logs'].username == 'feed_staff'
+    assert entries['room_status_logs'].description == 'Room F101 status changed to Occupied'
+    assert entries['room_status_logs'].details == f'From {Room.STATUS_BOOKED}'
+    assert entries['payments'].description == f"Payment of $200.0 processed for booking {booking.id}"
+    assert entries['payments'].username is None
+
+
+def test_recent_activities_use_one_query(db_session, app, feed_booking):
+    staff, booking = feed_booking
+    BookingService(db_session).check_in(booking.id, staff_id=staff.id)
+
+    statements = []
+    engine = db_session.get_bind().engine
+    count_statement = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, 'before_cursor_execute', count_statement)
+    try:
+        activities = DashboardService(db_session)._get_recent_activities(limit=10)
+    finally:
+        event.remove(engine, 'before_cursor_execute', count_statement)
+
+    assert len(statements) == 1
+    assert {a['type'] for a in activities} == {'booking', 'room'}
+    assert all(a['user'] == 'feed_staff' for a in activities)
+
+
+def test_activity_pages_scroll_through_history(db_session, feed_booking):
+    _, booking = feed_booking
+    start = datetime(2024, 1, 1, 12, 0)
+    for i in range(7):
+        # Pairs of entries share a timestamp to exercise the id tie-breaker
+        db_session.add(BookingLog(
+            booking_id=booking.id, action='note', action_time=start + timedelta(minutes=i // 2)
+        ))
+    db_session.commit()
+    dashboard_service = DashboardService(db_session)
+
+    seen = []
+    cursor = None
+    while True:
+        page = dashboard_service.get_activity_page(limit=3, cursor=cursor)
+        seen.extend(page['activities'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+
+    assert len(seen) == 7
+    assert len({a['id'] for a in seen}) == 7
+    keys = [(a['time'], a['id']) for a in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_invalid_activity_page_is_rejected(db_session):
+    with pytest.raises(ValueError):
+        DashboardService(db_session).get_activity_page(cursor='not-a-cursor')
+    with pytest.raises(ValueError):
+        DashboardService(db_session).get_activity_page(limit=0)
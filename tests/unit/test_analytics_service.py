@@ -5,8 +5,11 @@ This module provides unit tests for the analytics service.
 """
 
 import pytest
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from sqlalchemy import event
 from app.services.analytics_service import AnalyticsService
+from app.services.kpi_service import KpiService
+from app.models.customer import Customer
 from app.models.room_type import RoomType
 from app.models.room import Room
 from app.models.user import User
@@ -374,4 +377,80 @@ class TestAnalyticsService:
         total_available_nights = analytics_service.get_total_available_room_nights(start_date, end_date)
         expected_revpar = round(500 / total_available_nights, 2) if total_available_nights else 0.0
         actual_revpar = analytics_service.calculate_revpar(start_date, end_date)
-        assert actual_revpar == expected_revpar 
\ No newline at end of file
+        assert actual_revpar == expected_revpar
+
+
+@pytest.fixture
+def batch_bookings(db_session):
+    """Create a room with a past and an upcoming booking."""
+    user = User(username='batch_guest', email='batch_guest@example.com', role='customer', password_hash='x')
+    room_type = RoomType(name='Batch Standard', base_rate=100.0, capacity=2)
+    db_session.add_all([user, room_type])
+    db_session.flush()
+    customer = Customer(user_id=user.id, name='Batch Guest')
+    room = Room(number='B101', room_type_id=room_type.id, status=Room.STATUS_AVAILABLE)
+    db_session.add_all([customer, room])
+    db_session.flush()
+    today = datetime.now().date()
+    db_session.add_all([
+        Booking(room_id=room.id, customer_id=customer.id, check_in_date=date(today.year, 1, 10),
+                check_out_date=date(today.year, 1, 13), status=Booking.STATUS_CHECKED_OUT,
+                total_price=300.0, source='Website'),
+        Booking(room_id=room.id, customer_id=customer.id, check_in_date=today + timedelta(days=2),
+                check_out_date=today + timedelta(days=4), status=Booking.STATUS_RESERVED,
+                total_price=200.0, source='Phone'),
+    ])
+    db_session.commit()
+
+
+def test_get_charts_shares_queries_between_charts(db_session, batch_bookings):
+    analytics_service = AnalyticsService(db_session)
+    year = datetime.now().year
+    specs = [
+        {'chart': 'occupancy', 'year': year},
+        {'chart': 'kpis', 'year': year},
+        {'id': 'january', 'chart': 'kpis', 'year': year, 'month': 1},
+        {'id': 'week', 'chart': 'forecast', 'days': 7},
+        {'chart': 'forecast', 'days': 30},
+        {'chart': 'booking_sources'},
+        {'id': 'unknown', 'chart': 'nonsense'},
+    ]
+
+    statements = []
+    engine = db_session.get_bind().engine
+    count_statement = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, 'before_cursor_execute', count_statement)
+    try:
+        charts = analytics_service.get_charts(specs)
+    finally:
+        event.remove(engine, 'before_cursor_execute', count_statement)
+
+    # One KPI read (snapshots, room count, bookings, cancellations), one forecast scan, one source query
+    assert len(statements) == 6
+    assert charts['occupancy'] == analytics_service.get_monthly_occupancy(year)
+    assert charts['kpis'] == analytics_service.get_kpi_trend(year)
+    assert charts['january'] == analytics_service.get_kpi_trend(year, 1)
+    assert charts['week'] == analytics_service.get_forecast_data(7)
+    assert charts['forecast'] == analytics_service.get_forecast_data(30)
+    assert charts['booking_sources'] == analytics_service.get_booking_source_distribution()
+    assert charts['unknown'] == {'error': 'Invalid chart type'}
+
+
+
+def test_get_charts_reads_each_kpi_period_once(db_session, batch_bookings, monkeypatch):
+    year = datetime.now().year
+    reads = []
+    get_daily_kpis = KpiService.get_daily_kpis
+    def record_read(self, first_day, last_day):
+        reads.append((first_day, last_day))
+        return get_daily_kpis(self, first_day, last_day)
+    monkeypatch.setattr(KpiService, 'get_daily_kpis', record_read)
+
+    AnalyticsService(db_session).get_charts([
+        {'chart': 'occupancy', 'year': year - 5},
+        {'chart': 'kpis', 'year': year, 'month': 3},
+        {'chart': 'kpis', 'year': year},
+    ])
+
+    # The March trend is served from the current year's read
+    assert sorted(reads) == [(date(year - 5, 1, 1), date(year - 5, 12, 31)), (date(year, 1, 1), date(year, 12, 31))]
@@ -0,0 +1,74 @@
+"""
+Unit tests for the cleaning schedule service.
+"""
+
+import pytest
+from datetime import date, datetime, timedelta
+
+from app.models.booking import Booking
+from app.models.customer import Customer
+from app.models.housekeeping_task import HousekeepingTask
+from app.models.room import Room
+from app.models.room_type import RoomType
+from app.models.user import User
+from app.services.cleaning_schedule_service import CleaningScheduleService
+
+
+@pytest.fixture
+def schedule_setup(db_session):
+    """Create rooms on two floors, departures and tasks around a start date."""
+    start = date(2024, 3, 4)
+    user = User(username='schedule_guest', email='schedule_guest@example.com', role='customer', password_hash='x')
+    room_type = RoomType(name='Schedule Standard', base_rate=100.0, capacity=2)
+    db_session.add_all([user, room_type])
+    db_session.flush()
+    customer = Customer(user_id=user.id, name='Schedule Guest')
+    rooms = {number: Room(number=number, room_type_id=room_type.id, status=Room.STATUS_AVAILABLE)
+             for number in ('201', '202', '301')}
+    db_session.add(customer)
+    db_session.add_all(rooms.values())
+    db_session.flush()
+
+    db_session.add_all([
+        Booking(room_id=rooms['201'].id, customer_id=customer.id, check_in_date=start - timedelta(days=2),
+                check_out_date=start, status=Booking.STATUS_CHECKED_IN, total_price=200.0),
+        Booking(room_id=rooms['301'].id, customer_id=customer.id, check_in_date=start + timedelta(days=6),
+                check_out_date=start + timedelta(days=8), status=Booking.STATUS_RESERVED, total_price=200.0),
+        Booking(room_id=rooms['202'].id, customer_id=customer.id, check_in_date=start - timedelta(days=1),
+                check_out_date=start, status=Booking.STATUS_CANCELLED, total_price=100.0),
+        HousekeepingTask(room_id=rooms['202'].id, task_type='regular_cleaning', status='pending',
+                         due_date=datetime.combine(start, datetime.min.time()) + timedelta(hours=23, minutes=30)),
+        HousekeepingTask(room_id=rooms['301'].id, task_type='deep_cleaning', status='in_progress',
+                         due_date=datetime.combine(start + timedelta(days=13), datetime.min.time())),
+        HousekeepingTask(room_id=rooms['201'].id, task_type='regular_cleaning', status='completed',
+                         due_date=datetime.combine(start, datetime.min.time()) + timedelta(hours=10)),
+    ])
+    db_session.commit()
+    return start
+
+
+def test_schedule_groups_tasks_and_departures_by_day(db_session, schedule_setup):
+    start = schedule_setup
+    schedule = CleaningScheduleService(db_session).get_schedule(start)
+
+    assert schedule['end_date'] == start + timedelta(days=6)
+    assert len(schedule['days']) == 7
+    first_day = schedule['days'][0]
+    assert [booking.room.number for booking in first_day['checkouts']] == ['201']
+    assert [task.room.number for task in first_day['tasks']] == ['202']
+    assert first_day['total'] == 2
+    assert first_day['by_floor'] == {2: 2}
+    assert sum(day['total'] for day in schedule['days']) == 2
+
+
+def test_schedule_spans_weeks_and_filters_by_floor(db_session, schedule_setup):
+    start = schedule_setup
+    service = CleaningScheduleService(db_session)
+
+    schedule = service.get_schedule(start, weeks=2, floor=3)
+    assert len(schedule['days']) == 14
+    assert schedule['floors'] == [2, 3]
+    totals = {day['date']: day['total'] for day in schedule['days'] if day['total']}
+    assert totals == {start + timedelta(days=8): 1, start + timedelta(days=13): 1}
+
+    assert service.get_schedule(start, weeks=50)['weeks'] == CleaningScheduleService.MAX_WEEKS
@@ -0,0 +1,131 @@
+"""
+Unit tests for the maintained customer stats and the value leaderboard.
+"""
+
+import pytest
+from datetime import date, timedelta
+
+from app.models.booking import Booking
+from app.models.customer import Customer
+from app.models.customer_stats import CustomerStats
+from app.models.room import Room
+from app.models.room_type import RoomType
+from app.models.user import User
+from app.services.analytics_service import AnalyticsService
+from app.services.booking_service import BookingService
+
+
+@pytest.fixture
+def stats_setup(db_session):
+    """Create two customers and a room."""
+    room_type = RoomType(name='Stats Standard', base_rate=100.0, capacity=2)
+    users = [
+        User(username=f'stats_guest{i}', email=f'stats_guest{i}@example.com', role='customer', password_hash='x')
+        for i in range(2)
+    ]
+    db_session.add_all(users + [room_type])
+    db_session.flush()
+    customers = [Customer(user_id=user.id, name=f'Stats Guest {i}') for i, user in enumerate(users)]
+    room = Room(number='S101', room_type_id=room_type.id, status=Room.STATUS_AVAILABLE)
+    db_session.add_all(customers + [room])
+    db_session.commit()
+    return customers, room
+
+
+def _booking(db_session, customer, room, check_in, nights, status, total_price):
+    booking = Booking(
+        room_id=room.id,
+        customer_id=customer.id,
+        check_in_date=check_in,
+        check_out_date=check_in + timedelta(days=nights),
+        status=status,
+        total_price=total_price
+    )
+    db_session.add(booking)
+    db_session.commit()
+    return booking
+
+
+def test_check_outs_and_cancellations_update_stats(db_session, stats_setup):
+    (customer, _), room = stats_setup
+    booking_service = BookingService(db_session)
+    today = date.today()
+
+    first = _booking(db_session, customer, room, today - timedelta(days=10), 3, Booking.STATUS_CHECKED_IN, 300.0)
+    booking_service.check_out(first.id)
+    second = _booking(db_session, customer, room, today - timedelta(days=2), 2, Booking.STATUS_CHECKED_IN, 250.0)
+    booking_service.check_out(second.id)
+    cancelled = _booking(db_session, customer, room, today + timedelta(days=1), 2, Booking.STATUS_RESERVED, 200.0)
+    booking_service.cancel_booking(cancelled.id, reason='Plans changed')
+
+    stats = db_session.query(CustomerStats).filter_by(customer_id=customer.id).one()
+    assert stats.stay_count == 2
+    assert stats.total_nights == 5
+    assert stats.last_stay_date == today
+    assert stats.cancellation_count == 1
+    # Late cancellation charges half the booking
+    assert stats.lifetime_spend == 300.0 + 250.0 + 100.0
+
+
+def test_repeated_cancellation_is_counted_once(db_session, stats_setup):
+    (customer, _), room = stats_setup
+    booking_service = BookingService(db_session)
+    today = date.today()
+
+    cancelled = _booking(db_session, customer, room, today + timedelta(days=1), 2, Booking.STATUS_RESERVED, 200.0)
+    booking_service.cancel_booking(cancelled.id, reason='Plans changed')
+    again = booking_service.cancel_booking(cancelled.id, reason='Plans changed')
+
+    assert again.status == Booking.STATUS_CANCELLED
+    stats = db_session.query(CustomerStats).filter_by(customer_id=customer.id).one()
+    assert stats.cancellation_count == 1
+    assert stats.lifetime_spend == 100.0
+
+
+def test_checked_out_booking_cannot_be_cancelled(db_session, stats_setup):
+    (customer, _), room = stats_setup
+    booking_service = BookingService(db_session)
+    today = date.today()
+
+    stay = _booking(db_session, customer, room, today - timedelta(days=3), 2, Booking.STATUS_CHECKED_IN, 200.0)
+    booking_service.check_out(stay.id)
+
+    with pytest.raises(Exception, match='already checked out'):
+        booking_service.cancel_booking(stay.id)
+
+
+def test_stays_recorded_in_one_flush_accumulate(db_session, stats_setup):
+    (customer, _), room = stats_setup
+    today = date.today()
+    stays = [
+        _booking(db_session, customer, room, today - timedelta(days=9), 2, Booking.STATUS_CHECKED_OUT, 200.0),
+        _booking(db_session, customer, room, today - timedelta(days=5), 1, Booking.STATUS_CHECKED_OUT, 120.0),
+    ]
+    # Give the customer an existing row so the increments run in SQL
+    CustomerStats.record_stay(customer, stays[0])
+    db_session.commit()
+
+    CustomerStats.record_stay(customer, stays[1])
+    CustomerStats.record_stay(customer, stays[1])
+    db_session.commit()
+
+    stats = db_session.query(CustomerStats).filter_by(customer_id=customer.id).one()
+    assert stats.stay_count == 3
+    assert stats.lifetime_spend == 440.0
+    assert stats.total_nights == 4
+
+
+def test_top_customers_read_the_stats(db_session, stats_setup):
+    (low, high), room = stats_setup
+    today = date.today()
+    CustomerStats.record_stay(low, _booking(db_session, low, room, today - timedelta(days=6), 1, Booking.STATUS_CHECKED_OUT, 90.0))
+    CustomerStats.record_stay(high, _booking(db_session, high, room, today - timedelta(days=4), 2, Booking.STATUS_CHECKED_OUT, 400.0))
+    db_session.commit()
+
+    top = AnalyticsService(db_session).get_top_customers(limit=5)
+
+    assert [entry['id'] for entry in top] == [high.id, low.id]
+    assert top[0]['username'] == 'stats_guest1'
+    assert top[0]['total_spend'] == 400.0
+    assert top[0]['booking_count'] == 1
+    assert AnalyticsService(db_session).get_top_customers(limit=1)[0]['id'] == high.id
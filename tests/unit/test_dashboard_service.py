@@ -2,6 +2,7 @@
 Unit tests for the DashboardService.
 '''
 import pytest
+from sqlalchemy import event
 from datetime import datetime, date, timedelta
 from app.services.dashboard_service import DashboardService
 from app.models.booking import Booking
@@ -122,6 +123,49 @@ class TestReceptionistDashboardMetrics:
         assert 'room_status' in metrics and not metrics['room_status']
 
 
+    def test_receptionist_metrics_query_count_is_constant(self, dashboard_service, db_session):
+        today = date.today()
+        standard = _create_room_type(db_session, "Query Standard")
+        suite = _create_room_type(db_session, "Query Suite")
+        _create_room_type(db_session, "Query Empty")
+        user = User(username='query_guest', email='query_guest@example.com',
+                    role='customer', password_hash='x')
+        db_session.add(user)
+        db_session.commit()
+        customer = Customer(user_id=user.id, name="Query Guest")
+        db_session.add(customer)
+        db_session.commit()
+
+        for i in range(6):
+            room_type = standard if i % 2 else suite
+            room = _create_room(db_session, room_type.id, f"Q{i}", status='Occupied' if i < 4 else 'Available')
+            _create_booking(db_session, room.id, customer.id, today - timedelta(days=1), today + timedelta(days=i % 2),
+                            status=Booking.STATUS_CHECKED_IN)
+            _create_booking(db_session, room.id, customer.id, today + timedelta(days=i % 2), today + timedelta(days=3),
+                            status=Booking.STATUS_RESERVED)
+
+        statements = []
+        engine = db_session.get_bind().engine
+        count_statement = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(engine, 'before_cursor_execute', count_statement)
+        try:
+            metrics = dashboard_service.get_receptionist_metrics()
+        finally:
+            event.remove(engine, 'before_cursor_execute', count_statement)
+
+        # Booking counts, room counts, recent bookings, front desk lists
+        assert len(statements) == 4
+        assert metrics['todays_checkins'] == 3
+        assert metrics['tomorrows_checkins'] == 3
+        assert metrics['todays_checkouts'] == 3
+        assert len(metrics['todays_checkin_list']) == 3
+        assert len(metrics['todays_checkout_list']) == 3
+        assert len(metrics['in_house_guests']) == 3
+        assert metrics['room_status'] == {'Occupied': 4, 'Available': 2}
+        assert metrics['total_rooms'] == 6
+        assert [rt['total_rooms'] for rt in metrics['room_type_status'].values()] == [3, 3, 0]
+        assert metrics['in_house_guests'][0]['room_type'] in ("Query Standard", "Query Suite")
+
 class TestCustomerDashboardMetrics:
     def test_get_customer_dashboard_metrics(self, dashboard_service, setup_data_for_dashboard):
         customer1 = setup_data_for_dashboard["c1"]
@@ -0,0 +1,164 @@
+"""
+Unit tests for the live dashboard event bus.
+"""
+
+from datetime import date, timedelta
+
+from app.models.booking import Booking
+from app.models.customer import Customer
+from app.models.room import Room
+from app.models.room_type import RoomType
+from app.models.user import User
+from app.services.booking_service import BookingService
+from app.utils.event_bus import EventBus, event_bus, live_event_response, sse_stream
+
+
+def _drain(subscription):
+    events = []
+    while True:
+        event_data = subscription.get(timeout=0)
+        if event_data is None:
+            return events
+        events.append(event_data)
+
+
+def test_subscribers_only_receive_their_prefixes():
+    bus = EventBus()
+    rooms = bus.subscribe(('room.',))
+    everything = bus.subscribe()
+
+    bus.publish('room.status_changed', {'room_id': 1})
+    bus.publish('task.updated', {'task_id': 2})
+
+    assert [e['type'] for e in _drain(rooms)] == ['room.status_changed']
+    assert [e['type'] for e in _drain(everything)] == ['room.status_changed', 'task.updated']
+
+
+def test_reconnecting_subscriber_replays_missed_events():
+    bus = EventBus()
+    first = bus.publish('room.status_changed', {'room_id': 1})
+    bus.publish('room.status_changed', {'room_id': 2})
+    bus.publish('task.updated', {'task_id': 3})
+
+    subscription = bus.subscribe(('room.',), last_event_id=first['id'])
+
+    assert [e['data'] for e in _drain(subscription)] == [{'room_id': 2}]
+
+
+def test_stream_formats_events_and_keepalives():
+    bus = EventBus()
+    subscription = bus.subscribe()
+    stream = sse_stream(bus, subscription, keepalive=0.01)
+
+    assert next(stream) == 'retry: 3000\n\n'
+    assert next(stream) == ': keep-alive\n\n'
+
+    published = bus.publish('room.status_changed', {'room_id': 7})
+    assert next(stream) == (
+        f'id: {published["id"]}\nevent: room.status_changed\ndata: {{"room_id": 7}}\n\n'
+    )
+
+    stream.close()
+    assert bus.subscriber_count == 0
+
+
+def test_stream_ends_after_its_lifetime():
+    bus = EventBus()
+    subscription = bus.subscribe()
+    stream = sse_stream(bus, subscription, keepalive=0.01, max_lifetime=0.05)
+
+    assert next(stream) == 'retry: 3000\n\n'
+    assert set(stream) <= {': keep-alive\n\n'}
+    assert bus.subscriber_count == 0
+
+
+def test_slow_subscriber_is_told_to_resync():
+    bus = EventBus(max_queue_size=2)
+    subscription = bus.subscribe()
+    stream = sse_stream(bus, subscription, keepalive=0.01)
+    next(stream)
+
+    for room_id in range(3):
+        bus.publish('room.status_changed', {'room_id': room_id})
+
+    assert next(stream) == 'event: resync\ndata: {}\n\n'
+    assert list(stream) == []
+    assert bus.subscriber_count == 0
+
+
+def test_events_are_published_on_commit_only(db_session):
+    bus = EventBus()
+    subscription = bus.subscribe()
+
+    db_session.add(RoomType(name='Rolled Back', base_rate=100.0, capacity=2))
+    db_session.flush()
+    bus.publish_on_commit(db_session, 'task.updated', {'task_id': 1})
+    assert _drain(subscription) == []
+    db_session.rollback()
+    db_session.commit()
+    assert _drain(subscription) == []
+
+    bus.publish_on_commit(db_session, 'task.updated', {'task_id': 2})
+    db_session.commit()
+    assert [e['data'] for e in _drain(subscription)] == [{'task_id': 2}]
+
+
+def test_check_in_publishes_booking_and_room_events(db_session):
+    user = User(username='live_guest', email='live_guest@example.com', role='customer', password_hash='x')
+    room_type = RoomType(name='Live Standard', base_rate=100.0, capacity=2)
+    db_session.add_all([user, room_type])
+    db_session.flush()
+    customer = Customer(user_id=user.id, name='Live Guest')
+    room = Room(number='L101', room_type_id=room_type.id, status=Room.STATUS_BOOKED)
+    db_session.add_all([customer, room])
+    db_session.flush()
+    booking = Booking(
+        room_id=room.id,
+        customer_id=customer.id,
+        check_in_date=date.today(),
+        check_out_date=date.today() + timedelta(days=2),
+        status=Booking.STATUS_RESERVED,
+        total_price=200.0
+    )
+    db_session.add(booking)
+    db_session.commit()
+
+    subscription = event_bus.subscribe(('booking.', 'room.'))
+    try:
+        BookingService(db_session).check_in(booking.id)
+        events = _drain(subscription)
+    finally:
+        event_bus.unsubscribe(subscription)
+
+    assert [e['type'] for e in events] == ['room.status_changed', 'booking.checked_in']
+    assert events[0]['data']['old_status'] == Room.STATUS_BOOKED
+    assert events[0]['data']['new_status'] == Room.STATUS_OCCUPIED
+    assert events[1]['data']['room_number'] == 'L101'
+    assert events[1]['data']['customer_name'] == 'Live Guest'
+
+
+def test_live_event_response_is_disabled_by_default(app, monkeypatch):
+    bus = EventBus()
+    monkeypatch.delitem(app.config, 'LIVE_UPDATES_ENABLED', raising=False)
+
+    with app.test_request_context():
+        response = live_event_response(('room.',), bus=bus)
+
+    assert response.status_code == 404
+    assert bus.subscriber_count == 0
+
+
+def test_live_event_response_streams_event_source(app, monkeypatch):
+    bus = EventBus()
+    bus.publish('room.status_changed', {'room_id': 1})
+    monkeypatch.setitem(app.config, 'LIVE_UPDATES_ENABLED', True)
+
+    with app.test_request_context(headers={'Last-Event-ID': '0'}):
+        response = live_event_response(('room.',), bus=bus)
+
+    assert response.mimetype == 'text/event-stream'
+    assert response.headers['Cache-Control'] == 'no-cache'
+    chunks = response.response
+    assert next(chunks) == 'retry: 3000\n\n'
+    assert next(chunks).startswith('id: 1\nevent: room.status_changed\n')
+    chunks.close()
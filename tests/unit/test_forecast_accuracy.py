@@ -0,0 +1,126 @@
+"""
+Unit tests for incremental forecast accuracy tracking.
+"""
+
+import pytest
+from datetime import date, datetime, timedelta
+
+from app.models.booking import Booking
+from app.models.customer import Customer
+from app.models.revenue_forecast import RevenueForecast, ForecastAccuracy
+from app.models.room import Room
+from app.models.room_type import RoomType
+from app.models.user import User
+from app.services.forecast_service import ForecastService
+from app.services.pace_service import PaceService
+from app.tasks.night_audit import run_night_audit
+
+
+@pytest.fixture
+def accuracy_setup(db_session):
+    """Create a stayed booking and a forecast made five days before it."""
+    user = User(username='accuracy_guest', email='accuracy_guest@example.com', role='customer', password_hash='x')
+    room_type = RoomType(name='Accuracy Standard', base_rate=100.0, capacity=2)
+    db_session.add_all([user, room_type])
+    db_session.flush()
+    customer = Customer(user_id=user.id, name='Accuracy Guest')
+    room = Room(number='F101', room_type_id=room_type.id, status=Room.STATUS_AVAILABLE)
+    db_session.add_all([customer, room])
+    db_session.flush()
+
+    stay_date = date(2024, 6, 10)
+    predicted_on = datetime(2024, 6, 5, 9, 0)
+    db_session.add_all([
+        Booking(
+            room_id=room.id,
+            customer_id=customer.id,
+            check_in_date=stay_date,
+            check_out_date=stay_date + timedelta(days=1),
+            status=Booking.STATUS_CHECKED_OUT,
+            total_price=100.0
+        ),
+        RevenueForecast(
+            forecast_date=stay_date,
+            predicted_occupancy_rate=100.0,
+            predicted_adr=125.0,
+            predicted_revpar=125.0,
+            predicted_room_revenue=125.0,
+            confidence_score=80,
+            created_at=predicted_on,
+            updated_at=predicted_on
+        )
+    ])
+    db_session.commit()
+    return stay_date
+
+
+def test_bucket_for_and_running_metrics(db_session):
+    assert ForecastAccuracy.bucket_for(-1) == '0-7'
+    assert ForecastAccuracy.bucket_for(7) == '0-7'
+    assert ForecastAccuracy.bucket_for(8) == '8-30'
+    assert ForecastAccuracy.bucket_for(90) == '31-90'
+    assert ForecastAccuracy.bucket_for(400) == '91+'
+
+    accuracy = ForecastAccuracy(horizon_bucket='0-7')
+    assert accuracy.mape is None
+    accuracy.add(110.0, 100.0)
+    accuracy.add(80.0, 100.0)
+    accuracy.add(0.0, 0.0)
+
+    assert accuracy.forecast_count == 3
+    assert accuracy.bias == pytest.approx(-10.0 / 3)
+    assert accuracy.mae == pytest.approx(10.0)
+    assert accuracy.rmse == pytest.approx((500.0 / 3) ** 0.5)
+    # The zero prediction has no percentage error
+    assert accuracy.mape == pytest.approx((10.0 / 110 + 20.0 / 80) * 100 / 2)
+
+
+def test_record_actuals_adds_each_forecast_once(db_session, accuracy_setup):
+    stay_date = accuracy_setup
+    forecast_service = ForecastService(db_session)
+
+    assert forecast_service.record_actuals(stay_date) == 1
+    assert forecast_service.record_actuals(stay_date) == 0
+    assert forecast_service.record_actuals(stay_date + timedelta(days=1)) == 0
+
+    forecast = db_session.query(RevenueForecast).filter_by(forecast_date=stay_date).one()
+    assert forecast.actual_room_revenue == 100.0
+
+    accuracy = forecast_service.get_accuracy_by_horizon()
+    short_range = accuracy['horizons'][0]
+    assert [row['horizon'] for row in accuracy['horizons']] == ['0-7', '8-30', '31-90', '91+']
+    assert short_range['count'] == 1
+    assert short_range['bias'] == 25.0
+    assert short_range['rmse'] == 25.0
+    assert short_range['mape'] == 20.0
+    assert accuracy['horizons'][1]['count'] == 0
+    assert accuracy['horizons'][1]['mape'] is None
+    assert accuracy['overall']['count'] == 1
+    assert accuracy['overall']['mae'] == 25.0
+
+
+def test_record_actuals_catches_up_missed_nights(db_session, accuracy_setup):
+    stay_date = accuracy_setup
+    forecast_service = ForecastService(db_session)
+
+    # The audit did not run on the stay date; the next night scores it too
+    assert forecast_service.record_actuals(stay_date + timedelta(days=2)) == 1
+
+    forecast = db_session.query(RevenueForecast).filter_by(forecast_date=stay_date).one()
+    assert forecast.actual_room_revenue == 100.0
+    assert forecast_service.get_accuracy_by_horizon()['overall']['count'] == 1
+
+
+def test_night_audit_takes_pace_snapshot_when_scoring_fails(app, db_session, monkeypatch):
+    snapshots = []
+
+    def failing_record_actuals(self, business_date):
+        raise RuntimeError('scoring failed')
+
+    monkeypatch.setattr(ForecastService, 'record_actuals', failing_record_actuals)
+    monkeypatch.setattr(PaceService, 'take_snapshot',
+                        lambda self, snapshot_date=None: snapshots.append(snapshot_date))
+
+    run_night_audit(app, business_date=date(2024, 6, 10))
+
+    assert snapshots == [date(2024, 6, 11)]
@@ -0,0 +1,122 @@
+"""
+Unit tests for the full-text search indexes.
+"""
+
+import pytest
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+from flask_login import login_user
+
+from app.models.booking import Booking
+from app.models.customer import Customer
+from app.models.housekeeping_task import HousekeepingTask
+from app.models.maintenance_request import MaintenanceRequest
+from app.models.room import Room
+from app.models.room_type import RoomType
+from app.models.user import User
+from app.routes.receptionist import bookings as receptionist_bookings
+from app.services.housekeeping_service import HousekeepingService
+from app.services.maintenance_service import MaintenanceService
+from app.utils.full_text import apply_search, search_ids
+
+
+@pytest.fixture
+def search_setup(db_session):
+    """Create a room and a staff user."""
+    user = User(username='search_staff', email='search_staff@example.com', role='maintenance', password_hash='x')
+    room_type = RoomType(name='Search Standard', base_rate=100.0, capacity=2)
+    db_session.add_all([user, room_type])
+    db_session.flush()
+    room = Room(number='T101', room_type_id=room_type.id, status=Room.STATUS_AVAILABLE)
+    db_session.add(room)
+    db_session.commit()
+    return user, room
+
+
+def test_task_search_uses_index_and_ranks_by_relevance(db_session, search_setup):
+    _, room = search_setup
+    due = datetime.now() + timedelta(hours=1)
+    tasks = [
+        HousekeepingTask(room_id=room.id, task_type='regular_cleaning', due_date=due,
+                         description='Vacuum carpet', notes='Stain near the window'),
+        HousekeepingTask(room_id=room.id, task_type='deep_cleaning', due_date=due,
+                         description='Carpet stains everywhere', notes='Shampoo the carpet, carpet stains are old'),
+        HousekeepingTask(room_id=room.id, task_type='turnover', due_date=due,
+                         description='Change linens'),
+    ]
+    db_session.add_all(tasks)
+    db_session.commit()
+    assert search_ids(db_session, HousekeepingTask, 'carpet') is not None
+
+    service = HousekeepingService(db_session)
+    # Prefix and stemmed matches, most relevant first
+    results = service.get_all_housekeeping_tasks(filters={'q': 'carpet stain'}).items
+    assert [task.id for task in results] == [tasks[1].id, tasks[0].id]
+
+    # Edits and deletes keep the index in step
+    tasks[2].notes = 'Carpet was fine'
+    db_session.delete(tasks[0])
+    db_session.commit()
+    results = service.get_all_housekeeping_tasks(filters={'q': 'carpet'}).items
+    assert {task.id for task in results} == {tasks[1].id, tasks[2].id}
+
+    # Query syntax characters are treated as plain text
+    assert service.get_all_housekeeping_tasks(filters={'q': '"carpet" (*'}).total == 2
+
+
+def test_maintenance_and_guest_search(db_session, search_setup):
+    user, room = search_setup
+    db_session.add_all([
+        MaintenanceRequest(room_id=room.id, reported_by=user.id, issue_type='plumbing',
+                           description='Leaking tap in bathroom'),
+        MaintenanceRequest(room_id=room.id, reported_by=user.id, issue_type='electrical',
+                           description='Lamp flickers'),
+        Customer(user_id=user.id, name='Jordan Lee', notes='Prefers a quiet room away from the elevator'),
+    ])
+    db_session.commit()
+
+    results = MaintenanceService(db_session).get_all_maintenance_requests(filters={'q': 'leak'}).items
+    assert [request.issue_type for request in results] == ['plumbing']
+
+    guests, relevance = apply_search(db_session, db_session.query(Customer), Customer, 'quiet elevator')
+    assert relevance is not None
+    assert [guest.name for guest in guests] == ['Jordan Lee']
+
+
+def test_receptionist_bookings_guest_filter(app, db_session, search_setup):
+    _, room = search_setup
+    users = [
+        User(username=f'filter_user{i}', email=f'filter_user{i}@example.com', role=role, password_hash='x')
+        for i, role in enumerate(['receptionist', 'customer', 'customer', 'customer'])
+    ]
+    db_session.add_all(users)
+    db_session.flush()
+    guests = [
+        Customer(user_id=users[1].id, name='Joanne Smith', phone='555-123-4567'),
+        Customer(user_id=users[2].id, name='Ann Lee', phone='555-987-6543'),
+        Customer(user_id=users[3].id, name='Peter Brown', notes='Travels with Anne from accounting'),
+    ]
+    db_session.add_all(guests)
+    db_session.flush()
+    today = date.today()
+    db_session.add_all([
+        Booking(room_id=room.id, customer_id=guest.id, check_in_date=today + timedelta(days=i * 3),
+                check_out_date=today + timedelta(days=i * 3 + 2), total_price=200.0)
+        for i, guest in enumerate(guests)
+    ])
+    db_session.commit()
+
+    def guest_names(search):
+        with app.test_request_context('/receptionist/bookings', query_string={'q': search}):
+            login_user(users[0])
+            with patch('app.routes.receptionist.render_template') as render:
+                receptionist_bookings()
+        return sorted(booking.customer.name for booking in render.call_args.kwargs['bookings'].items)
+
+    # Whole words and prefixes come from the index, without guests who only match in their notes
+    assert guest_names('ann') == ['Ann Lee']
+    # A fragment from the middle of a name falls back to a substring match
+    assert guest_names('oann') == ['Joanne Smith']
+    # The last digits of a phone number are enough
+    assert guest_names('4567') == ['Joanne Smith']
@@ -13,6 +13,8 @@ from app.models.room_type import RoomType
 from app.models.user import User
 from app.models.booking import Booking
 from app.models.room_status_log import RoomStatusLog
+from app.models.maintenance_request import MaintenanceRequest
+from sqlalchemy import event, update
 
 
 @pytest.fixture
@@ -89,7 +91,7 @@ def booking(db_session, room, customer_user):
         room_id=room.id,
         check_in_date=datetime.now().date() - timedelta(days=2),
         check_out_date=check_out_date,
-        status="checked_in",
+        status=Booking.STATUS_CHECKED_IN,
         total_price=300.00
     )
     db_session.add(booking)
@@ -345,4 +347,168 @@ class TestHousekeepingService:
         
         # Test running again - should not create duplicate tasks
         tasks_created = housekeeping_service.generate_turnover_tasks(checkout_date)
-        assert tasks_created == 0 
\ No newline at end of file
+        assert tasks_created == 0 
+
+    def test_auto_assign_tasks(self, housekeeping_service, db_session, room_type):
+        """Test batch assignment balances workload, keeps floors together and skips blocked rooms."""
+        staff = [
+            User(username=f"auto_housekeeper{i}", email=f"auto_housekeeper{i}@example.com",
+                 role="housekeeping", is_active=True, password_hash="x")
+            for i in range(2)
+        ]
+        db_session.add_all(staff)
+        rooms = {
+            number: Room(number=number, room_type_id=room_type.id, status=status)
+            for number, status in [("301", "clean"), ("201", "clean"), ("202", "clean"),
+                                   ("102", Room.STATUS_OCCUPIED), ("103", "clean")]
+        }
+        db_session.add_all(rooms.values())
+        db_session.flush()
+        due = datetime.now() + timedelta(hours=2)
+        tasks = {
+            number: HousekeepingTask(room_id=rooms[number].id, task_type="turnover",
+                                     status="pending", priority=priority, due_date=due)
+            for number, priority in [("301", "urgent"), ("201", "high"), ("202", "normal"),
+                                     ("102", "high"), ("103", "high")]
+        }
+        db_session.add_all(tasks.values())
+        db_session.add(MaintenanceRequest(room_id=rooms["103"].id, reported_by=staff[0].id,
+                                          issue_type="plumbing", description="Leak", status="pending"))
+        db_session.commit()
+
+        statements = []
+        engine = db_session.get_bind().engine
+        def count_statement(conn, cursor, statement, *args):
+            statements.append(statement)
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            result = housekeeping_service.auto_assign_tasks()
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+
+        # Three reads, one bulk update and the read-back of the taken tasks
+        assert len(statements) == 5
+        assignments = {entry["task_id"]: entry["staff_id"] for entry in result["assigned"]}
+        assert assignments == {
+            tasks["301"].id: staff[0].id,
+            tasks["201"].id: staff[1].id,
+            # Same floor as room 201 outweighs the equal workload
+            tasks["202"].id: staff[1].id,
+        }
+        assert {entry["task_id"] for entry in result["skipped"]} == {tasks["102"].id, tasks["103"].id}
+        assert db_session.get(HousekeepingTask, tasks["202"].id).assigned_to == staff[1].id
+        assert housekeeping_service.get_staff_workloads()[staff[1].id]["active_tasks"] == 2
+
+        # Nothing is left to assign
+        assert housekeeping_service.auto_assign_tasks()["assigned"] == []
+
+    def test_auto_assign_tasks_reports_only_tasks_taken(self, housekeeping_service, db_session, room_type,
+                                                        monkeypatch):
+        """Test that a task assigned by someone else mid-batch is reported as skipped."""
+        staff = User(username="race_housekeeper", email="race_housekeeper@example.com",
+                     role="housekeeping", is_active=True, password_hash="x")
+        manager = User(username="race_manager", email="race_manager@example.com",
+                       role="manager", is_active=True, password_hash="x")
+        rooms = [Room(number=number, room_type_id=room_type.id, status="clean") for number in ("401", "402")]
+        db_session.add_all([staff, manager] + rooms)
+        db_session.flush()
+        tasks = [HousekeepingTask(room_id=room.id, task_type="turnover", status="pending", priority="high",
+                                  due_date=datetime.now() + timedelta(hours=2)) for room in rooms]
+        db_session.add_all(tasks)
+        db_session.commit()
+        task_ids = [task.id for task in tasks]
+
+        # The first task is assigned by hand after the batch has read it
+        def assign_by_hand():
+            db_session.execute(update(HousekeepingTask).where(HousekeepingTask.id == task_ids[0])
+                               .values(assigned_to=manager.id))
+            return {}
+        monkeypatch.setattr(housekeeping_service, "get_open_maintenance", assign_by_hand)
+
+        result = housekeeping_service.auto_assign_tasks(staff_ids=[staff.id])
+
+        assert result["assigned"] == [{"task_id": task_ids[1], "room_id": rooms[1].id, "staff_id": staff.id}]
+        assert result["skipped"] == [{"task_id": task_ids[0], "room_id": rooms[0].id, "reason": "already assigned"}]
+        assert db_session.get(HousekeepingTask, task_ids[0]).assigned_to == manager.id
+
+    def test_generate_turnover_tasks_look_ahead(self, housekeeping_service, db_session, room_type):
+        """Test generating turnover tasks for several days skips rooms that already have one."""
+        from app.models.customer import Customer
+
+        user = User(username="turnover_guest", email="turnover_guest@example.com", role="customer", password_hash="x")
+        db_session.add(user)
+        db_session.flush()
+        customer = Customer(user_id=user.id, name="Turnover Guest")
+        rooms = [Room(number=f"40{i}", room_type_id=room_type.id, status="clean") for i in range(2)]
+        db_session.add(customer)
+        db_session.add_all(rooms)
+        db_session.flush()
+
+        start = datetime.now().date() + timedelta(days=10)
+        for room, nights_before, check_out, status in [
+            (rooms[0], 2, start, Booking.STATUS_CHECKED_IN),
+            (rooms[1], 1, start + timedelta(days=1), Booking.STATUS_RESERVED),
+            (rooms[0], 1, start + timedelta(days=2), Booking.STATUS_RESERVED),
+            (rooms[1], 1, start + timedelta(days=2), Booking.STATUS_CANCELLED),
+        ]:
+            db_session.add(Booking(customer_id=customer.id, room_id=room.id, status=status, total_price=100.0,
+                                   check_in_date=check_out - timedelta(days=nights_before), check_out_date=check_out))
+        db_session.add(HousekeepingTask(room_id=rooms[1].id, task_type="turnover", status="pending",
+                                        due_date=datetime.combine(start + timedelta(days=1), datetime.min.time())))
+        db_session.commit()
+
+        assert housekeeping_service.generate_turnover_tasks(start, days=3) == 2
+        assert housekeeping_service.generate_turnover_tasks(start, days=3) == 0
+
+        due_dates = sorted(
+            task.due_date for task in db_session.query(HousekeepingTask).filter(
+                HousekeepingTask.room_id == rooms[0].id,
+                HousekeepingTask.task_type == "turnover"
+            )
+        )
+        assert due_dates == [
+            datetime.combine(start, HousekeepingService.TURNOVER_DUE_TIME),
+            datetime.combine(start + timedelta(days=2), HousekeepingService.TURNOVER_DUE_TIME),
+        ]
+
+    def test_open_maintenance_map(self, housekeeping_service, db_session, room, app):
+        """Test maintenance checks share one cached map that maintenance commits refresh."""
+        from app.services import housekeeping_service as housekeeping_module
+
+        reporter = User(username="maintenance_reporter", email="maintenance_reporter@example.com",
+                        role="maintenance", password_hash="x")
+        db_session.add(reporter)
+        db_session.flush()
+        db_session.add_all([
+            MaintenanceRequest(room_id=room.id, reported_by=reporter.id, issue_type="furniture",
+                               description="Wobbly chair", status="pending", priority="urgent"),
+            MaintenanceRequest(room_id=room.id, reported_by=reporter.id, issue_type="hvac",
+                               description="Noisy fan", status="in_progress", priority="low"),
+            MaintenanceRequest(room_id=room.id, reported_by=reporter.id, issue_type="plumbing",
+                               description="Fixed leak", status="completed", priority="urgent"),
+        ])
+        db_session.commit()
+        room_id = room.id
+
+        app.config["DASHBOARD_CACHE_ENABLED"] = True
+        housekeeping_module.maintenance_cache.invalidate()
+        statements = []
+        engine = db_session.get_bind().engine
+        def count_statement(conn, cursor, statement, *args):
+            statements.append(statement)
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            assert housekeeping_service.get_open_maintenance()[room_id] == {"furniture": True, "hvac": False}
+            assert housekeeping_service._has_conflicting_maintenance(room_id, "deep_cleaning")
+            assert not housekeeping_service._has_conflicting_maintenance(room_id, "regular_cleaning")
+            assert not housekeeping_service._has_pending_maintenance_blocking_completion(room_id)
+            assert len(statements) == 1
+
+            db_session.add(MaintenanceRequest(room_id=room_id, reported_by=reporter.id, issue_type="hvac",
+                                              description="No cooling", status="pending", priority="high"))
+            db_session.commit()
+            assert housekeeping_service._has_pending_maintenance_blocking_completion(room_id)
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+            app.config["DASHBOARD_CACHE_ENABLED"] = False
+            housekeeping_module.maintenance_cache.invalidate()
@@ -0,0 +1,106 @@
+"""
+Unit tests for the daily KPI rollup and snapshots.
+"""
+
+import pytest
+from datetime import date, datetime, timedelta
+
+from app.models.booking import Booking
+from app.models.customer import Customer
+from app.models.daily_kpi import DailyKpi
+from app.models.room import Room
+from app.models.room_type import RoomType
+from app.models.user import User
+from app.services.analytics_service import AnalyticsService
+from app.services.kpi_service import KpiService
+
+
+@pytest.fixture
+def kpi_bookings(db_session):
+    """Create four rooms and a spread of bookings in March 2024."""
+    user = User(username='kpi_guest', email='kpi_guest@example.com', role='customer', password_hash='x')
+    room_type = RoomType(name='KPI Standard', base_rate=100.0, capacity=2)
+    db_session.add_all([user, room_type])
+    db_session.flush()
+    customer = Customer(user_id=user.id, name='KPI Guest')
+    rooms = [Room(number=f'K10{i}', room_type_id=room_type.id, status=Room.STATUS_AVAILABLE) for i in range(4)]
+    db_session.add(customer)
+    db_session.add_all(rooms)
+    db_session.flush()
+
+    def booking(room, check_in, nights, status, total_price=0.0, source=None, **extra):
+        return Booking(
+            room_id=room.id,
+            customer_id=customer.id,
+            check_in_date=check_in,
+            check_out_date=check_in + timedelta(days=nights),
+            status=status,
+            total_price=total_price,
+            source=source,
+            **extra
+        )
+
+    db_session.add_all([
+        booking(rooms[0], date(2024, 3, 1), 2, Booking.STATUS_CHECKED_OUT, 200.0, 'Website'),
+        booking(rooms[1], date(2024, 3, 2), 3, Booking.STATUS_CHECKED_OUT, 450.0, 'Phone'),
+        booking(rooms[2], date(2024, 3, 2), 1, Booking.STATUS_NO_SHOW, 100.0),
+        booking(rooms[3], date(2024, 3, 5), 2, Booking.STATUS_CANCELLED, 200.0,
+                cancellation_date=datetime(2024, 3, 1, 9, 30)),
+    ])
+    db_session.commit()
+    return rooms
+
+
+def test_compute_range_rolls_up_each_day(db_session, kpi_bookings):
+    days = {d['business_date']: d for d in KpiService(db_session).compute_range(date(2024, 3, 1), date(2024, 3, 5))}
+
+    assert days[date(2024, 3, 1)]['rooms_sold'] == 1
+    assert days[date(2024, 3, 1)]['cancellations'] == 1
+    assert days[date(2024, 3, 2)]['rooms_sold'] == 2
+    assert days[date(2024, 3, 2)]['room_revenue'] == 250.0
+    assert days[date(2024, 3, 2)]['occupancy_rate'] == 50.0
+    assert days[date(2024, 3, 2)]['adr'] == 125.0
+    assert days[date(2024, 3, 2)]['revpar'] == 62.5
+    assert days[date(2024, 3, 2)]['arrivals'] == 1
+    assert days[date(2024, 3, 2)]['no_shows'] == 1
+    assert days[date(2024, 3, 2)]['revenue_by_source'] == {'Website': 100.0, 'Phone': 150.0}
+    assert days[date(2024, 3, 3)]['departures'] == 1
+    assert days[date(2024, 3, 5)]['departures'] == 1
+    assert days[date(2024, 3, 5)]['rooms_sold'] == 0
+
+
+def test_backfill_snapshots_history_once(db_session, kpi_bookings):
+    kpi_service = KpiService(db_session)
+
+    assert kpi_service.backfill(until=date(2024, 3, 10)) == 10
+    assert kpi_service.backfill(until=date(2024, 3, 10)) == 0
+    assert kpi_service.backfill(until=date(2024, 3, 12)) == 2
+
+    snapshot = db_session.query(DailyKpi).filter_by(business_date=date(2024, 3, 2)).one()
+    assert snapshot.rooms_sold == 2
+    assert snapshot.revenue_by_source == {'Website': 100.0, 'Phone': 150.0}
+    assert db_session.query(DailyKpi).count() == 12
+
+
+def test_reads_prefer_snapshots_and_fill_gaps_live(db_session, kpi_bookings):
+    kpi_service = KpiService(db_session)
+    kpi_service.snapshot_range(date(2024, 3, 1), date(2024, 3, 2))
+
+    # Stored snapshots are the audited figures; later edits do not change them
+    db_session.query(DailyKpi).filter_by(business_date=date(2024, 3, 1)).update({'rooms_sold': 4})
+    db_session.commit()
+
+    summary = kpi_service.get_period_summary(date(2024, 3, 1), date(2024, 3, 4))
+    assert summary['rooms_sold'] == 4 + 2 + 1 + 1
+    assert summary['available_room_nights'] == 16
+    assert summary['occupancy_rate'] == 50.0
+
+
+def test_monthly_occupancy_reads_daily_kpis(db_session, kpi_bookings):
+    KpiService(db_session).backfill(until=date(2024, 3, 31))
+
+    data = AnalyticsService(db_session).get_monthly_occupancy(2024)['datasets'][0]['data']
+
+    # 5 room nights out of 4 rooms * 31 days
+    assert data[2] == round(5 / 124 * 100, 2)
+    assert data[1] == 0
@@ -0,0 +1,209 @@
+"""
+Unit tests for the in-process metrics cache.
+"""
+
+import threading
+import time
+import pytest
+
+from app.models.room import Room
+from app.models.room_type import RoomType
+from datetime import datetime, timedelta
+from sqlalchemy import event, update
+
+from app.models.housekeeping_task import HousekeepingTask
+from app.services import housekeeping_service, maintenance_service
+from app.services.dashboard_service import DashboardService, dashboard_cache
+from app.services.housekeeping_service import HousekeepingService
+from app.services.maintenance_service import MaintenanceService
+from app.utils.metrics_cache import MetricsCache
+
+
+def test_value_is_reused_within_ttl():
+    cache = MetricsCache('test_reuse')
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'count': len(calls)}
+
+    assert cache.get_or_compute('key', 60, compute) == {'count': 1}
+    assert cache.get_or_compute('key', 60, compute) == {'count': 1}
+    assert len(calls) == 1
+
+
+def test_expired_value_is_recomputed():
+    cache = MetricsCache('test_expiry')
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'count': len(calls)}
+
+    cache.get_or_compute('key', 0.01, compute)
+    time.sleep(0.02)
+
+    assert cache.get_or_compute('key', 0.01, compute) == {'count': 2}
+
+
+def test_zero_ttl_disables_caching():
+    cache = MetricsCache('test_disabled')
+    calls = []
+    cache.get_or_compute('key', 0, lambda: calls.append(1) or {})
+    cache.get_or_compute('key', 0, lambda: calls.append(1) or {})
+
+    assert len(calls) == 2
+
+
+def test_callers_get_independent_copies():
+    cache = MetricsCache('test_copies')
+    first = cache.get_or_compute('key', 60, lambda: {'items': [1]})
+    first['items'].append(2)
+
+    assert cache.get_or_compute('key', 60, lambda: {'items': []}) == {'items': [1]}
+
+
+def test_concurrent_misses_compute_once():
+    cache = MetricsCache('test_single_flight')
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return {'value': 42}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute('key', 60, compute)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{'value': 42}] * 8
+
+
+def test_invalidate_by_prefix():
+    cache = MetricsCache('test_prefix')
+    cache.get_or_compute('dashboard:manager', 60, lambda: {'v': 1})
+    cache.get_or_compute('stats:housekeeping', 60, lambda: {'v': 1})
+
+    cache.invalidate('dashboard:')
+
+    assert cache.get_or_compute('dashboard:manager', 60, lambda: {'v': 2}) == {'v': 2}
+    assert cache.get_or_compute('stats:housekeeping', 60, lambda: {'v': 2}) == {'v': 1}
+
+
+def test_value_computed_during_invalidation_is_not_stored():
+    cache = MetricsCache('test_generation')
+
+    def compute():
+        cache.invalidate()
+        return {'v': 'stale'}
+
+    assert cache.get_or_compute('key', 60, compute) == {'v': 'stale'}
+    assert cache.get_or_compute('key', 60, lambda: {'v': 'fresh'}) == {'v': 'fresh'}
+
+
+@pytest.fixture
+def cached_dashboard(app):
+    app.config['DASHBOARD_CACHE_ENABLED'] = True
+    dashboard_cache.invalidate()
+    yield
+    app.config['DASHBOARD_CACHE_ENABLED'] = False
+    dashboard_cache.invalidate()
+
+
+def test_dashboard_metrics_invalidated_by_room_write(db_session, cached_dashboard):
+    room_type = RoomType(name='Cache Type', base_rate=100.0, capacity=2)
+    db_session.add(room_type)
+    db_session.flush()
+    db_session.add(Room(number='M101', room_type_id=room_type.id, status=Room.STATUS_AVAILABLE))
+    db_session.commit()
+    dashboard_service = DashboardService(db_session)
+
+    assert dashboard_service.get_housekeeping_metrics()['total_to_clean'] == 0
+
+    # Uncommitted writes are invisible to other requests and keep the entry
+    room = db_session.query(Room).filter_by(number='M101').one()
+    room.status = Room.STATUS_CLEANING
+    db_session.flush()
+    assert dashboard_service.get_housekeeping_metrics()['total_to_clean'] == 0
+
+    db_session.commit()
+    assert dashboard_service.get_housekeeping_metrics()['total_to_clean'] == 1
+
+
+@pytest.fixture
+def cached_stats(app):
+    app.config['DASHBOARD_CACHE_ENABLED'] = True
+    housekeeping_service.stats_cache.invalidate()
+    maintenance_service.stats_cache.invalidate()
+    yield
+    app.config['DASHBOARD_CACHE_ENABLED'] = False
+    housekeeping_service.stats_cache.invalidate()
+    maintenance_service.stats_cache.invalidate()
+
+
+def test_task_stats_are_one_query_and_invalidated_by_task_write(db_session, cached_stats):
+    room_type = RoomType(name='Stats Cache Type', base_rate=100.0, capacity=2)
+    db_session.add(room_type)
+    db_session.flush()
+    room = Room(number='M201', room_type_id=room_type.id, status=Room.STATUS_AVAILABLE)
+    db_session.add(room)
+    db_session.flush()
+    db_session.add_all([
+        HousekeepingTask(room_id=room.id, task_type='turnover', status='pending',
+                         due_date=datetime.now() - timedelta(hours=1)),
+        HousekeepingTask(room_id=room.id, task_type='deep_cleaning', status='completed',
+                         due_date=datetime.now() + timedelta(days=2)),
+    ])
+    db_session.commit()
+
+    statements = []
+    engine = db_session.get_bind().engine
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+    event.listen(engine, 'before_cursor_execute', count_statement)
+    try:
+        stats = HousekeepingService(db_session).get_housekeeping_stats()
+        assert HousekeepingService(db_session).get_housekeeping_stats() == stats
+        MaintenanceService(db_session).get_maintenance_stats()
+    finally:
+        event.remove(engine, 'before_cursor_execute', count_statement)
+
+    # One query each; the second housekeeping read comes from the cache
+    assert len(statements) == 2
+    assert stats['status_counts'] == {'pending': 1, 'completed': 1}
+    assert stats['type_counts'] == {'turnover': 1, 'deep_cleaning': 1}
+    assert stats['overdue_count'] == 1
+    assert stats['total'] == 2
+
+    task = db_session.query(HousekeepingTask).filter_by(task_type='turnover').one()
+    task.status = 'in_progress'
+    db_session.commit()
+    assert HousekeepingService(db_session).get_housekeeping_stats()['status_counts'] == {
+        'in_progress': 1, 'completed': 1
+    }
+
+
+def test_task_stats_invalidated_by_bulk_task_write(db_session, cached_stats):
+    room_type = RoomType(name='Bulk Cache Type', base_rate=100.0, capacity=2)
+    db_session.add(room_type)
+    db_session.flush()
+    room = Room(number='M301', room_type_id=room_type.id, status=Room.STATUS_AVAILABLE)
+    db_session.add(room)
+    db_session.flush()
+    db_session.add(HousekeepingTask(room_id=room.id, task_type='turnover', status='pending',
+                                    due_date=datetime.now() + timedelta(hours=1)))
+    db_session.commit()
+    service = HousekeepingService(db_session)
+    assert service.get_housekeeping_stats()['status_counts'] == {'pending': 1}
+
+    # A Core update never puts a task into the session, but still counts as a task write
+    db_session.execute(update(HousekeepingTask.__table__).values(status='in_progress'))
+    db_session.commit()
+    assert service.get_housekeeping_stats()['status_counts'] == {'in_progress': 1}
@@ -0,0 +1,64 @@
+"""
+Unit tests for the notification service.
+"""
+
+import pytest
+from sqlalchemy import event
+
+from app.models.notification import Notification
+from app.models.user import User
+from app.services.notification_service import NotificationService
+
+
+@pytest.fixture
+def staff_ids(db_session):
+    """Create three staff users."""
+    users = [User(username=f'notify_staff{i}', email=f'notify_staff{i}@example.com',
+                  role='housekeeping', password_hash='x') for i in range(3)]
+    db_session.add_all(users)
+    db_session.commit()
+    return [user.id for user in users]
+
+
+def test_bulk_notifications_validate_once_and_insert_together(db_session, staff_ids):
+    missing_id = max(staff_ids) + 100
+    statements = []
+    engine = db_session.get_bind().engine
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+    event.listen(engine, 'before_cursor_execute', count_statement)
+    try:
+        result = NotificationService(db_session).create_notifications_bulk(
+            staff_ids + [missing_id, staff_ids[0]], 'Team meeting at 3pm',
+            type='staff_broadcast', priority='high', category='system'
+        )
+    finally:
+        event.remove(engine, 'before_cursor_execute', count_statement)
+
+    # One recipient check and one executemany insert
+    assert len(statements) == 2
+    assert result == {'created': 3, 'skipped': [missing_id]}
+    notifications = db_session.query(Notification).order_by(Notification.user_id).all()
+    assert [notification.user_id for notification in notifications] == sorted(staff_ids)
+    assert all(notification.message == 'Team meeting at 3pm' and notification.priority == 'high'
+               and not notification.is_read for notification in notifications)
+
+
+def test_bulk_notifications_fill_templates_per_recipient(db_session, staff_ids):
+    service = NotificationService(db_session)
+    service.create_notifications_bulk(
+        staff_ids[:2], 'Room {room} is ready for {name}',
+        template_id='room_ready', template_data={'room': '101', 'name': 'the team'},
+        recipient_data={staff_ids[1]: {'name': 'Sam'}}
+    )
+
+    messages = {notification.user_id: (notification.message, notification.template_data)
+                for notification in db_session.query(Notification)}
+    assert messages == {
+        staff_ids[0]: ('Room 101 is ready for the team', {'room': '101', 'name': 'the team'}),
+        staff_ids[1]: ('Room 101 is ready for Sam', {'room': '101', 'name': 'Sam'}),
+    }
+
+    with pytest.raises(ValueError):
+        service.create_notifications_bulk(staff_ids, 'Room {room} is ready', template_id='room_ready')
+    assert db_session.query(Notification).count() == 2
@@ -0,0 +1,86 @@
+"""
+Unit tests for booking pace snapshots, pace curves and pickup.
+"""
+
+import pytest
+from datetime import date, timedelta
+
+from app.models.booking import Booking
+from app.models.booking_pace import BookingPace
+from app.models.customer import Customer
+from app.models.room import Room
+from app.models.room_type import RoomType
+from app.models.user import User
+from app.services.pace_service import PaceService
+
+
+@pytest.fixture
+def pace_setup(db_session):
+    """Create a customer and two rooms."""
+    user = User(username='pace_guest', email='pace_guest@example.com', role='customer', password_hash='x')
+    room_type = RoomType(name='Pace Standard', base_rate=100.0, capacity=2)
+    db_session.add_all([user, room_type])
+    db_session.flush()
+    customer = Customer(user_id=user.id, name='Pace Guest')
+    rooms = [Room(number=f'P10{i}', room_type_id=room_type.id, status=Room.STATUS_AVAILABLE) for i in range(2)]
+    db_session.add(customer)
+    db_session.add_all(rooms)
+    db_session.commit()
+    return customer, rooms
+
+
+def _book(db_session, customer, room, check_in, nights, total_price, status=Booking.STATUS_RESERVED):
+    booking = Booking(
+        room_id=room.id,
+        customer_id=customer.id,
+        check_in_date=check_in,
+        check_out_date=check_in + timedelta(days=nights),
+        status=status,
+        total_price=total_price
+    )
+    db_session.add(booking)
+    db_session.commit()
+    return booking
+
+
+def test_snapshot_records_every_stay_date_in_horizon(db_session, pace_setup):
+    customer, rooms = pace_setup
+    _book(db_session, customer, rooms[0], date(2024, 6, 10), 2, 300.0)
+    _book(db_session, customer, rooms[1], date(2024, 6, 11), 1, 120.0)
+    _book(db_session, customer, rooms[1], date(2024, 6, 10), 1, 999.0, status=Booking.STATUS_CANCELLED)
+    pace_service = PaceService(db_session)
+
+    assert pace_service.take_snapshot(date(2024, 6, 1), horizon_days=30) == 30
+    # Retaking a snapshot replaces it
+    assert pace_service.take_snapshot(date(2024, 6, 1), horizon_days=30) == 30
+
+    rows = {row.stay_date: row for row in db_session.query(BookingPace).all()}
+    assert len(rows) == 30
+    assert rows[date(2024, 6, 10)].rooms_on_books == 1
+    assert rows[date(2024, 6, 10)].revenue_on_books == 150.0
+    assert rows[date(2024, 6, 11)].rooms_on_books == 2
+    assert rows[date(2024, 6, 11)].revenue_on_books == 270.0
+    assert rows[date(2024, 6, 12)].rooms_on_books == 0
+
+
+def test_pace_curve_and_pickup(db_session, pace_setup):
+    customer, rooms = pace_setup
+    pace_service = PaceService(db_session)
+    stay_date = date(2024, 6, 20)
+
+    _book(db_session, customer, rooms[0], stay_date, 1, 100.0)
+    pace_service.take_snapshot(date(2024, 6, 1), horizon_days=30)
+    _book(db_session, customer, rooms[1], stay_date, 2, 240.0)
+    pace_service.take_snapshot(date(2024, 6, 8), horizon_days=30)
+
+    curve = pace_service.get_pace_curve(stay_date, max_days_out=30)
+    assert [(p['days_out'], p['rooms']) for p in curve] == [(19, 1), (12, 2)]
+
+    pickup = {row['stay_date']: row for row in pace_service.get_pickup(date(2024, 6, 8), date(2024, 6, 1))}
+    assert pickup[stay_date]['rooms_picked_up'] == 1
+    assert pickup[stay_date]['revenue_picked_up'] == 120.0
+    assert pickup[stay_date + timedelta(days=1)]['rooms_picked_up'] == 1
+    assert pickup[date(2024, 6, 8)]['rooms_picked_up'] == 0
+
+    with pytest.raises(ValueError):
+        pace_service.get_pickup(date(2024, 6, 1), date(2024, 6, 8))
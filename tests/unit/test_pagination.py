@@ -0,0 +1,81 @@
+"""
+Unit tests for keyset pagination.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from app.models.housekeeping_task import HousekeepingTask
+from app.models.room import Room
+from app.models.room_type import RoomType
+from app.services.housekeeping_service import HousekeepingService
+from app.utils.pagination import paginate
+
+
+@pytest.fixture
+def paged_tasks(db_session):
+    """Create tasks with repeated due dates and some missing priorities."""
+    room_type = RoomType(name='Paging Standard', base_rate=100.0, capacity=2)
+    db_session.add(room_type)
+    db_session.flush()
+    room = Room(number='P101', room_type_id=room_type.id, status=Room.STATUS_AVAILABLE)
+    db_session.add(room)
+    db_session.flush()
+
+    start = datetime(2024, 5, 1, 9, 0)
+    priorities = ['high', 'normal', 'urgent', 'low', 'normal']
+    tasks = [
+        HousekeepingTask(room_id=room.id, task_type='regular_cleaning',
+                         due_date=start + timedelta(hours=i // 3), priority=priorities[i % 5])
+        for i in range(11)
+    ]
+    db_session.add_all(tasks)
+    db_session.flush()
+    # The column default fills in missing priorities on insert
+    for task in tasks:
+        if task.priority == 'normal':
+            task.priority = None
+    db_session.commit()
+    return tasks
+
+
+def test_cursors_walk_the_same_pages_as_offsets(db_session, paged_tasks):
+    service = HousekeepingService(db_session)
+    offset_pages = [
+        [task.id for task in service.get_all_housekeeping_tasks(page=number, per_page=4).items]
+        for number in (1, 2, 3)
+    ]
+    assert sorted(sum(offset_pages, [])) == sorted(task.id for task in paged_tasks)
+
+    # Forward through the cursors
+    page = service.get_all_housekeeping_tasks(per_page=4)
+    walked = [[task.id for task in page.items]]
+    while page.has_next:
+        page = service.get_all_housekeeping_tasks(page=page.next_num, per_page=4, cursor=page.next_cursor)
+        walked.append([task.id for task in page.items])
+    assert walked == offset_pages
+    assert page.page == 3 and not page.has_next
+
+    # And back again
+    page = page.prev()
+    assert [task.id for task in page.items] == offset_pages[1]
+    assert page.has_next and page.has_prev
+    page = page.prev()
+    assert [task.id for task in page.items] == offset_pages[0]
+    assert not page.has_prev and page.prev_cursor is None
+
+
+def test_counts_are_optional_and_bad_cursors_are_ignored(db_session, paged_tasks):
+    query = db_session.query(HousekeepingTask)
+    sort_keys = [(HousekeepingTask.due_date, False), (HousekeepingTask.id, False)]
+
+    page = paginate(query, sort_keys, per_page=5, count='estimate', count_cap=8)
+    assert (page.total, page.total_is_estimate, page.pages) == (8, True, 2)
+
+    page = paginate(query, sort_keys, page=3, per_page=5, count=False)
+    assert page.total is None
+    assert len(page.items) == 1 and not page.has_next
+
+    page = paginate(query, sort_keys, page=2, per_page=5, cursor='not-a-cursor')
+    assert page.total == 11
+    assert [task.id for task in page.items] == [task.id for task in paged_tasks[5:10]]
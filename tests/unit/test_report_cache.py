@@ -0,0 +1,208 @@
+"""
+Unit tests for the report cache.
+
+This module tests that closed report periods are served from the report
+cache and that booking changes invalidate only the periods they touch.
+"""
+
+import pytest
+from datetime import date, timedelta
+
+from app.models.booking import Booking
+from app.models.customer import Customer
+from app.models.report_cache import ReportCache
+from app.models.room import Room
+from app.models.room_type import RoomType
+from app.models.user import User
+from app.services.report_service import ReportService
+
+
+@pytest.fixture
+def cache_data(db_session):
+    """Create a room, a customer and a booking in March 2024."""
+    user = User(username='cache_guest', email='cache_guest@example.com',
+                role='customer', password_hash='x')
+    room_type = RoomType(name='Cache Standard', base_rate=100.0, capacity=2)
+    db_session.add_all([user, room_type])
+    db_session.flush()
+    room = Room(number='C101', room_type_id=room_type.id)
+    customer = Customer(user_id=user.id, name='Cache Guest')
+    db_session.add_all([room, customer])
+    db_session.flush()
+    booking = Booking(
+        room_id=room.id,
+        customer_id=customer.id,
+        check_in_date=date(2024, 3, 10),
+        check_out_date=date(2024, 3, 12),
+        total_price=200.0
+    )
+    db_session.add(booking)
+    db_session.commit()
+    return {'room': room, 'customer': customer, 'booking': booking}
+
+
+def _cached_periods(db_session):
+    return sorted(
+        (entry.report_type, entry.period_start)
+        for entry in db_session.query(ReportCache).all()
+    )
+
+
+def test_closed_period_is_served_from_cache(db_session, cache_data):
+    """Test that a closed month is computed once and then read from the cache."""
+    report_service = ReportService(db_session)
+    
+    first = report_service.get_monthly_report(2024, 3)
+    assert _cached_periods(db_session) == [('monthly', date(2024, 3, 1))]
+    
+    calls = []
+    report_service._build_monthly_report = lambda *args: calls.append(args)
+    second = report_service.get_monthly_report(2024, 3)
+    
+    assert calls == []
+    assert second['revenue_summary'] == first['revenue_summary']
+    assert second['daily_occupancy'] == first['daily_occupancy']
+
+
+def test_open_period_is_not_cached(db_session, cache_data):
+    """Test that periods that have not ended are always recomputed."""
+    report_service = ReportService(db_session)
+    today = date.today()
+    
+    report_service.get_occupancy_report(
+        (today - timedelta(days=3)).strftime('%Y-%m-%d'),
+        today.strftime('%Y-%m-%d')
+    )
+    
+    assert _cached_periods(db_session) == []
+
+
+def test_booking_change_invalidates_overlapping_periods_only(db_session, cache_data):
+    """Test that modifying a booking drops only cache entries it overlaps."""
+    report_service = ReportService(db_session)
+    report_service.get_monthly_report(2024, 3)
+    report_service.get_monthly_report(2024, 5)
+    report_service.get_revenue_report('2024-03-01', '2024-03-31')
+    
+    booking = cache_data['booking']
+    booking.check_out_date = date(2024, 3, 14)
+    db_session.commit()
+    
+    assert _cached_periods(db_session) == [('monthly', date(2024, 5, 1))]
+    
+    report = report_service.get_monthly_report(2024, 3)
+    assert report['occupancy_summary']['total_room_nights'] == 4
+
+
+def test_moving_booking_invalidates_old_and_new_periods(db_session, cache_data):
+    """Test that moving a booking drops both the old and the new period."""
+    report_service = ReportService(db_session)
+    report_service.get_monthly_report(2024, 3)
+    report_service.get_monthly_report(2024, 5)
+    report_service.get_monthly_report(2024, 7)
+    
+    booking = cache_data['booking']
+    booking.check_in_date = date(2024, 5, 10)
+    booking.check_out_date = date(2024, 5, 12)
+    db_session.commit()
+    
+    assert _cached_periods(db_session) == [('monthly', date(2024, 7, 1))]
+
+
+def test_new_room_invalidates_all_periods(db_session, cache_data):
+    """Test that adding a room drops every cached period."""
+    report_service = ReportService(db_session)
+    report_service.get_monthly_report(2024, 3)
+    report_service.get_monthly_report(2024, 5)
+    
+    db_session.add(Room(number='C102', room_type_id=cache_data['room'].room_type_id))
+    db_session.commit()
+    
+    assert _cached_periods(db_session) == []
+
+
+def test_stale_data_version_is_recomputed(db_session, cache_data):
+    """Test that entries written by an older report version are ignored."""
+    report_service = ReportService(db_session)
+    report_service.get_monthly_report(2024, 3)
+    entry = db_session.query(ReportCache).one()
+    entry.data_version = ReportCache.DATA_VERSION - 1
+    entry.payload = {'stale': True}
+    db_session.commit()
+    
+    report = report_service.get_monthly_report(2024, 3)
+    
+    assert 'stale' not in report
+    assert db_session.query(ReportCache).one().data_version == ReportCache.DATA_VERSION
+
+
+def test_caching_leaves_caller_transaction_open(db_session, cache_data):
+    """Test that caching never commits the caller's pending changes."""
+    report_service = ReportService(db_session)
+    user = User(username='cache_pending', email='cache_pending@example.com',
+                role='customer', password_hash='x')
+    db_session.add(user)
+    
+    report_service.get_monthly_report(2024, 3)
+    
+    assert user in db_session.new
+    assert _cached_periods(db_session) == []
+    
+    db_session.commit()
+    assert _cached_periods(db_session) == [('monthly', date(2024, 3, 1))]
+
+
+def test_report_after_flushed_booking_change_is_cached_on_commit(db_session, cache_data):
+    """Test that a report built from flushed changes is only cached once they commit."""
+    report_service = ReportService(db_session)
+    report_service.get_monthly_report(2024, 3)
+    
+    booking = cache_data['booking']
+    booking.check_out_date = date(2024, 3, 14)
+    db_session.flush()
+    
+    report = report_service.get_monthly_report(2024, 3)
+    assert report['occupancy_summary']['total_room_nights'] == 4
+    assert _cached_periods(db_session) == []
+    
+    db_session.commit()
+    assert _cached_periods(db_session) == [('monthly', date(2024, 3, 1))]
+    cached = db_session.query(ReportCache).one()
+    assert cached.payload['occupancy_summary']['total_room_nights'] == 4
+
+
+def test_report_after_rolled_back_change_is_not_cached(db_session, cache_data):
+    """Test that a report built from changes that roll back never reaches the cache."""
+    report_service = ReportService(db_session)
+    
+    booking = cache_data['booking']
+    booking.check_out_date = date(2024, 3, 14)
+    db_session.flush()
+    report_service.get_monthly_report(2024, 3)
+    db_session.rollback()
+    db_session.commit()
+    
+    assert _cached_periods(db_session) == []
+
+
+def test_report_invalidated_while_building_is_not_stored(db_session, cache_data):
+    """Test that a report outdated by a commit made while it was built is not cached."""
+    report_service = ReportService(db_session)
+    build_monthly_report = report_service._build_monthly_report
+    
+    def build_then_change_booking(*args):
+        report = build_monthly_report(*args)
+        # Another request moves the booking before this one stores its report
+        cache_data['booking'].check_out_date = date(2024, 3, 14)
+        db_session.commit()
+        return report
+    
+    report_service._build_monthly_report = build_then_change_booking
+    stale = report_service.get_monthly_report(2024, 3)
+    assert stale['occupancy_summary']['total_room_nights'] == 2
+    assert _cached_periods(db_session) == []
+    
+    report_service._build_monthly_report = build_monthly_report
+    report = report_service.get_monthly_report(2024, 3)
+    assert report['occupancy_summary']['total_room_nights'] == 4
+    assert _cached_periods(db_session) == [('monthly', date(2024, 3, 1))]
@@ -6,7 +6,9 @@ including monthly reports and data export.
 """
 
 import pytest
+import sys
 from datetime import datetime, timedelta, date
+from unittest.mock import patch
 from app.services.report_service import ReportService
 
 
@@ -205,4 +207,202 @@ def test_get_available_report_periods(app, db_session):
         for i in range(len(periods) - 1):
             current_period_date = datetime(int(periods[i][0]), int(periods[i][1]), 1)
             next_period_date = datetime(int(periods[i+1][0]), int(periods[i+1][1]), 1)
-            assert current_period_date >= next_period_date 
\ No newline at end of file
+            assert current_period_date >= next_period_date 
+
+def test_iter_csv_streams_one_line_per_row(app, db_session):
+    """Test that iter_csv yields each row as its own CSV line."""
+    with app.app_context():
+        report_service = ReportService(db_session)
+        
+        chunks = list(report_service.iter_csv(
+            [['Date', 'Value'], ['2024-01-01', 'a,b']],
+            title='Export'
+        ))
+        
+        assert chunks == ['Export\r\n', 'Date,Value\r\n', '2024-01-01,"a,b"\r\n']
+
+
+def test_export_to_csv_accepts_list_of_rows(app, db_session):
+    """Test CSV export of a header row followed by data rows."""
+    with app.app_context():
+        report_service = ReportService(db_session)
+        
+        output = report_service.export_to_csv([['Date', 'Value'], ['2024-01-01', 5]], 'Rows')
+        
+        assert output.decode('utf-8').splitlines() == ['Rows', 'Date,Value', '2024-01-01,5']
+
+
+def test_iter_booking_rows_streams_overlapping_bookings(app, db_session):
+    """Test that booking export rows cover only bookings overlapping the period."""
+    from app.models.user import User
+    from app.models.customer import Customer
+    from app.models.room import Room
+    from app.models.room_type import RoomType
+    from app.models.booking import Booking
+    
+    with app.app_context():
+        room_type = RoomType(name="Stream Type", base_rate=100.0, capacity=2)
+        user = User(username="stream_guest", email="stream_guest@example.com",
+                    role="customer", password_hash="x")
+        db_session.add_all([room_type, user])
+        db_session.flush()
+        room = Room(number="ST101", room_type_id=room_type.id)
+        customer = Customer(user_id=user.id, name="Stream Guest")
+        db_session.add_all([room, customer])
+        db_session.flush()
+        
+        for check_in, check_out in [
+            (date(2024, 3, 30), date(2024, 4, 2)),
+            (date(2024, 4, 10), date(2024, 4, 12)),
+            (date(2024, 5, 1), date(2024, 5, 3)),
+        ]:
+            db_session.add(Booking(
+                room_id=room.id,
+                customer_id=customer.id,
+                check_in_date=check_in,
+                check_out_date=check_out,
+                total_price=200.0
+            ))
+        db_session.flush()
+        
+        report_service = ReportService(db_session)
+        rows = list(report_service.iter_booking_rows(
+            date(2024, 4, 1), date(2024, 4, 30), batch_size=1
+        ))
+        
+        assert rows[0][0] == 'Booking ID'
+        assert [row[5] for row in rows[1:]] == ['2024-03-30', '2024-04-10']
+        assert rows[1][2:5] == ['ST101', 'Stream Type', 'Stream Guest']
+        assert rows[1][8] == '200.00'
+
+
+def test_iter_forecast_rows(app, db_session):
+    """Test forecast export rows, including missing actuals."""
+    from app.models.revenue_forecast import RevenueForecast
+    
+    with app.app_context():
+        db_session.add_all([
+            RevenueForecast(
+                forecast_date=date(2024, 6, 1),
+                predicted_occupancy_rate=80.0,
+                predicted_adr=120.0,
+                predicted_revpar=96.0,
+                predicted_room_revenue=960.0,
+                confidence_score=70,
+                actual_occupancy_rate=75.0,
+                actual_adr=110.0,
+                actual_revpar=82.5,
+                actual_room_revenue=825.0
+            ),
+            RevenueForecast(
+                forecast_date=date(2024, 6, 2),
+                predicted_occupancy_rate=60.0,
+                predicted_adr=100.0,
+                predicted_revpar=60.0,
+                predicted_room_revenue=600.0,
+                confidence_score=65
+            ),
+        ])
+        db_session.flush()
+        
+        report_service = ReportService(db_session)
+        rows = list(report_service.iter_forecast_rows(date(2024, 6, 1), date(2024, 6, 30)))
+        
+        assert len(rows) == 3
+        assert rows[1] == ['2024-06-01', 80.0, 75.0, 120.0, 110.0, 96.0, 82.5, 960.0, 825.0, 70]
+        assert rows[2][2] == 'N/A'
+        assert rows[2][8] == 'N/A'
+
+
+def _read_sheets(content):
+    """Load an XLSX payload into {sheet name: list of row tuples}."""
+    import re
+    import zipfile
+    import xml.etree.ElementTree as ET
+    from io import BytesIO
+    
+    ns = {'m': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+    archive = zipfile.ZipFile(BytesIO(content))
+    
+    shared = []
+    if 'xl/sharedStrings.xml' in archive.namelist():
+        root = ET.fromstring(archive.read('xl/sharedStrings.xml'))
+        shared = [''.join(t.text or '' for t in si.iter(f"{{{ns['m']}}}t"))
+                  for si in root.findall('m:si', ns)]
+    
+    def cell_value(cell):
+        kind = cell.get('t')
+        if kind == 'inlineStr':
+            return ''.join(t.text or '' for t in cell.iter(f"{{{ns['m']}}}t"))
+        value = cell.find('m:v', ns)
+        if value is None:
+            return None
+        if kind == 's':
+            return shared[int(value.text)]
+        number = float(value.text)
+        return int(number) if number.is_integer() else number
+    
+    workbook = ET.fromstring(archive.read('xl/workbook.xml'))
+    sheets = {}
+    for index, sheet in enumerate(workbook.find('m:sheets', ns), start=1):
+        root = ET.fromstring(archive.read(f'xl/worksheets/sheet{index}.xml'))
+        rows = []
+        for row in root.iter(f"{{{ns['m']}}}row"):
+            cells = {}
+            for cell in row.findall('m:c', ns):
+                column = re.match(r'[A-Z]+', cell.get('r')).group()
+                cells[ord(column) - ord('A')] = cell_value(cell)
+            rows.append(tuple(cells.get(i) for i in range(max(cells) + 1)))
+        sheets[sheet.get('name')] = rows
+    return sheets
+
+
+def test_export_to_excel_streams_row_iterator(app, db_session):
+    """Test XLSX export from a header-first row iterator."""
+    with app.app_context():
+        report_service = ReportService(db_session)
+        rows = iter([['Date', 'Value'], ['2024-01-01', 1], ['2024-01-02', 2]])
+        
+        sheets = _read_sheets(report_service.export_to_excel(rows, 'Forecast'))
+        
+        assert list(sheets) == ['Data', 'Report Info']
+        assert sheets['Data'] == [('Date', 'Value'), ('2024-01-01', 1), ('2024-01-02', 2)]
+        assert sheets['Report Info'][0] == ('Forecast',)
+        assert sheets['Report Info'][2] == ('Total Records: 2',)
+
+
+def test_export_to_excel_falls_back_to_csv_for_row_iterator(app, db_session):
+    """Test that the CSV fallback keeps every row of a row iterator."""
+    with app.app_context():
+        report_service = ReportService(db_session)
+        rows = iter([['Date', 'Value'], ['2024-01-01', 1], ['2024-01-02', 2]])
+        
+        # A None entry makes the import raise ImportError
+        with patch.dict(sys.modules, {'app.utils.xlsx_export': None}):
+            output = report_service.export_to_excel(rows, 'Forecast')
+        
+        assert output.decode('utf-8').splitlines() == [
+            'Forecast', 'Date,Value', '2024-01-01,1', '2024-01-02,2'
+        ]
+
+
+def test_export_monthly_report_to_excel(app, db_session):
+    """Test the multi-sheet monthly report workbook."""
+    from io import BytesIO
+    
+    with app.app_context():
+        report_service = ReportService(db_session)
+        report_data = report_service.get_monthly_report(2024, 2)
+        output = BytesIO()
+        
+        report_service.export_monthly_report_to_excel(
+            report_data, 'February 2024', date(2024, 2, 1), date(2024, 2, 29), output
+        )
+        sheets = _read_sheets(output.getvalue())
+        
+        assert list(sheets) == ['Report Info', 'Summary', 'Room Type Revenue',
+                                'Daily Occupancy', 'Bookings']
+        assert sheets['Report Info'][0] == ('Hotel Monthly Report - February 2024',)
+        assert sheets['Summary'][0] == ('Metric', 'Value')
+        assert len(sheets['Daily Occupancy']) == 30
+        assert sheets['Bookings'][0][0] == 'Booking ID'
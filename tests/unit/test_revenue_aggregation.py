@@ -0,0 +1,193 @@
+"""
+Unit tests for the set-based revenue aggregation.
+
+The reference functions below reproduce the previous per-room-type loops
+(load bookings, clip nights in Python) so the SQL aggregate can be checked
+against the numbers the reports used to produce.
+"""
+
+import random
+import pytest
+from datetime import date, timedelta
+from unittest.mock import patch
+from sqlalchemy import select, and_, or_
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from app.models.booking import Booking
+from app.models.customer import Customer
+from app.models.room import Room
+from app.models.room_type import RoomType
+from app.models.user import User
+from app.services.analytics_service import AnalyticsService
+from app.services.report_service import ReportService
+from app.utils.revenue import clipped_nights, room_type_revenue
+
+
+STATUSES = [
+    Booking.STATUS_RESERVED,
+    Booking.STATUS_CHECKED_IN,
+    Booking.STATUS_CHECKED_OUT,
+    Booking.STATUS_CANCELLED,
+    Booking.STATUS_NO_SHOW,
+]
+
+
+@pytest.fixture
+def revenue_data(db_session):
+    """Create three room types with rooms and a random spread of bookings."""
+    user = User(username='revenue_guest', email='revenue_guest@example.com',
+                role='customer', password_hash='x')
+    db_session.add(user)
+    db_session.flush()
+    customer = Customer(user_id=user.id, name='Revenue Guest')
+    room_types = [
+        RoomType(name='Parity Standard', base_rate=99.5, capacity=2),
+        RoomType(name='Parity Deluxe', base_rate=180.0, capacity=2),
+        RoomType(name='Parity Empty', base_rate=400.0, capacity=2),
+    ]
+    db_session.add(customer)
+    db_session.add_all(room_types)
+    db_session.flush()
+
+    rooms = []
+    for room_type in room_types[:2]:
+        for i in range(3):
+            rooms.append(Room(number=f'{room_type.name[7]}{i}', room_type_id=room_type.id))
+    db_session.add_all(rooms)
+    db_session.flush()
+
+    rng = random.Random(30)
+    for _ in range(120):
+        check_in = date(2024, 1, 1) + timedelta(days=rng.randint(0, 150))
+        db_session.add(Booking(
+            room_id=rng.choice(rooms).id,
+            customer_id=customer.id,
+            check_in_date=check_in,
+            check_out_date=check_in + timedelta(days=rng.randint(1, 20)),
+            status=rng.choice(STATUSES),
+            total_price=100.0
+        ))
+    db_session.flush()
+    return room_types
+
+
+def _reference_room_type_revenue(db_session, start_date, end_date):
+    """Previous implementation of the report room type revenue breakdown."""
+    result = {}
+    total_revenue = 0
+    for rt in db_session.execute(select(RoomType)).scalars().all():
+        bookings = db_session.execute(
+            select(Booking).join(Room, Booking.room_id == Room.id).filter(
+                Room.room_type_id == rt.id,
+                or_(
+                    and_(Booking.check_in_date >= start_date, Booking.check_in_date <= end_date),
+                    and_(Booking.check_out_date >= start_date, Booking.check_out_date <= end_date),
+                    and_(Booking.check_in_date <= start_date, Booking.check_out_date >= end_date)
+                ),
+                Booking.status != Booking.STATUS_CANCELLED
+            )
+        ).scalars().all()
+        rt_revenue = 0
+        for booking in bookings:
+            nights = (min(booking.check_out_date, end_date) - max(booking.check_in_date, start_date)).days
+            if nights > 0:
+                rt_revenue += float(rt.base_rate) * nights
+        result[rt.name] = {'revenue': rt_revenue, 'percentage': 0}
+        total_revenue += rt_revenue
+    if total_revenue > 0:
+        for name in result:
+            result[name]['percentage'] = (result[name]['revenue'] / total_revenue) * 100
+    return result
+
+
+def _reference_room_nights(db_session, start_date, end_date):
+    """Previous implementation of the report total room nights."""
+    total = 0
+    for booking in db_session.execute(
+        select(Booking).filter(Booking.status != Booking.STATUS_CANCELLED)
+    ).scalars():
+        nights = (min(booking.check_out_date, end_date) - max(booking.check_in_date, start_date)).days
+        if nights > 0:
+            total += nights
+    return total
+
+
+PERIODS = [
+    (date(2024, 1, 1), date(2024, 1, 31)),
+    (date(2024, 2, 1), date(2024, 2, 29)),
+    (date(2024, 3, 15), date(2024, 4, 15)),
+    (date(2024, 6, 1), date(2024, 6, 1)),
+    (date(2023, 12, 1), date(2023, 12, 31)),
+]
+
+
+@pytest.mark.parametrize('start_date,end_date', PERIODS)
+def test_room_type_revenue_matches_previous_numbers(db_session, revenue_data, start_date, end_date):
+    report_service = ReportService(db_session)
+    expected = _reference_room_type_revenue(db_session, start_date, end_date)
+
+    _, result, _ = report_service._calculate_revenue_summary(start_date, end_date)
+
+    assert list(result) == list(expected)
+    for name, values in expected.items():
+        assert result[name]['revenue'] == pytest.approx(values['revenue'])
+        assert result[name]['percentage'] == pytest.approx(values['percentage'])
+
+
+@pytest.mark.parametrize('start_date,end_date', PERIODS)
+def test_monthly_revenue_and_nights_match_previous_numbers(db_session, revenue_data, start_date, end_date):
+    report_service = ReportService(db_session)
+    expected = _reference_room_type_revenue(db_session, start_date, end_date)
+
+    total_revenue, _, total_room_nights = report_service._calculate_revenue_summary(start_date, end_date)
+
+    assert total_revenue == pytest.approx(sum(values['revenue'] for values in expected.values()))
+    assert total_room_nights == _reference_room_nights(db_session, start_date, end_date)
+
+
+def test_reports_run_the_room_type_aggregate_once(db_session, revenue_data):
+    report_service = ReportService(db_session)
+
+    with patch('app.services.report_service.room_type_revenue', wraps=room_type_revenue) as aggregate:
+        report_service._build_monthly_report(2024, 3, date(2024, 3, 1), date(2024, 3, 31))
+        assert aggregate.call_count == 1
+
+        aggregate.reset_mock()
+        report_service._build_revenue_report(date(2024, 3, 1), date(2024, 3, 31))
+        assert aggregate.call_count == 1
+
+
+def test_room_type_revenue_includes_empty_room_types(db_session, revenue_data):
+    rows = room_type_revenue(db_session, date(2024, 1, 1), date(2024, 12, 31))
+
+    assert ('Parity Empty', 0.0, 0) in rows
+
+
+def test_analytics_revenue_by_room_type_uses_calendar_period(db_session, revenue_data):
+    analytics_service = AnalyticsService(db_session)
+    march = date(2024, 3, 1)
+    april = date(2024, 4, 1)
+    expected = {}
+    for booking in db_session.query(Booking).filter(
+        Booking.status.in_(STATUSES[:3])
+    ).all():
+        nights = (min(booking.check_out_date, april) - max(booking.check_in_date, march)).days
+        if nights > 0:
+            room_type = booking.room.room_type
+            expected[room_type.name] = expected.get(room_type.name, 0) + room_type.base_rate * nights
+
+    result = analytics_service.get_revenue_by_room_type(2024, 3)
+
+    assert result['labels'] == list(expected)
+    assert result['datasets'][0]['data'] == pytest.approx(list(expected.values()))
+
+
+@pytest.mark.parametrize('dialect,fragment', [
+    (sqlite.dialect(), 'julianday'),
+    (postgresql.dialect(), "DATE '1970-01-01'"),
+    (mysql.dialect(), 'TO_DAYS'),
+])
+def test_clipped_nights_compiles_for_each_dialect(dialect, fragment):
+    sql = str(select(clipped_nights(date(2024, 1, 1), date(2024, 2, 1))).compile(dialect=dialect))
+
+    assert fragment in sql
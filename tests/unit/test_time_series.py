@@ -0,0 +1,204 @@
+"""
+Unit tests for the time series utilities.
+"""
+
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy import func
+
+from app.models.booking import Booking
+from app.models.customer import Customer
+from app.models.room import Room
+from app.models.room_type import RoomType
+from app.models.user import User
+from app.models.room_status_log import RoomStatusLog
+from app.services.dashboard_service import DashboardService
+from app.utils.time_series import daily_series, date_range, occupancy_series
+
+
+@pytest.fixture
+def occupancy_data(db_session):
+    """Create two room types, three rooms and a customer."""
+    user = User(username='series_user', email='series@example.com',
+                role='customer', password_hash='x')
+    db_session.add(user)
+    db_session.flush()
+    customer = Customer(user_id=user.id, name='Series Guest')
+    standard = RoomType(name='Series Standard', base_rate=100.0, capacity=2)
+    suite = RoomType(name='Series Suite', base_rate=250.0, capacity=2)
+    db_session.add_all([customer, standard, suite])
+    db_session.flush()
+    rooms = [
+        Room(number='S101', room_type_id=standard.id, status='Available'),
+        Room(number='S102', room_type_id=standard.id, status='Available'),
+        Room(number='S201', room_type_id=suite.id, status='Available'),
+    ]
+    db_session.add_all(rooms)
+    db_session.flush()
+    return {'customer': customer, 'rooms': rooms, 'standard': standard, 'suite': suite}
+
+
+def _book(db_session, room, customer, check_in, check_out, status=Booking.STATUS_RESERVED):
+    booking = Booking(
+        room_id=room.id,
+        customer_id=customer.id,
+        check_in_date=check_in,
+        check_out_date=check_out,
+        status=status,
+        total_price=100.0
+    )
+    db_session.add(booking)
+    db_session.flush()
+    return booking
+
+
+def _naive_count(db_session, day, statuses, room_type_id=None, distinct_rooms=False):
+    """Reference implementation: one query per day."""
+    query = db_session.query(Booking).filter(
+        Booking.check_in_date <= day,
+        Booking.check_out_date > day,
+        Booking.status.in_(statuses)
+    )
+    if room_type_id is not None:
+        query = query.join(Room, Room.id == Booking.room_id).filter(
+            Room.room_type_id == room_type_id
+        )
+    bookings = query.all()
+    if distinct_rooms:
+        return len({booking.room_id for booking in bookings})
+    return len(bookings)
+
+
+def test_date_range_is_inclusive():
+    start = date(2024, 1, 30)
+    assert list(date_range(start, date(2024, 2, 1))) == [
+        date(2024, 1, 30), date(2024, 1, 31), date(2024, 2, 1)
+    ]
+
+
+def test_empty_range_returns_empty_series(db_session):
+    assert occupancy_series(db_session, date(2024, 1, 2), date(2024, 1, 1)) == {}
+
+
+def test_checkout_night_is_not_occupied(db_session, occupancy_data):
+    room = occupancy_data['rooms'][0]
+    _book(db_session, room, occupancy_data['customer'], date(2024, 3, 1), date(2024, 3, 3))
+
+    series = occupancy_series(db_session, date(2024, 2, 28), date(2024, 3, 4))
+
+    assert series == {
+        date(2024, 2, 28): 0,
+        date(2024, 2, 29): 0,
+        date(2024, 3, 1): 1,
+        date(2024, 3, 2): 1,
+        date(2024, 3, 3): 0,
+        date(2024, 3, 4): 0,
+    }
+
+
+def test_series_matches_per_day_queries(db_session, occupancy_data):
+    customer = occupancy_data['customer']
+    rooms = occupancy_data['rooms']
+    start = date(2024, 5, 1)
+    end = date(2024, 5, 20)
+
+    # Bookings straddling both edges, fully inside, outside and cancelled
+    _book(db_session, rooms[0], customer, date(2024, 4, 25), date(2024, 5, 4))
+    _book(db_session, rooms[0], customer, date(2024, 5, 3), date(2024, 5, 8))
+    _book(db_session, rooms[1], customer, date(2024, 5, 10), date(2024, 5, 30),
+          status=Booking.STATUS_CHECKED_IN)
+    _book(db_session, rooms[2], customer, date(2024, 5, 5), date(2024, 5, 6))
+    _book(db_session, rooms[2], customer, date(2024, 5, 12), date(2024, 5, 15),
+          status=Booking.STATUS_CANCELLED)
+    _book(db_session, rooms[2], customer, date(2024, 6, 1), date(2024, 6, 3))
+
+    statuses = [Booking.STATUS_RESERVED, Booking.STATUS_CHECKED_IN]
+    cases = [
+        {},
+        {'distinct_rooms': True},
+        {'room_type_id': occupancy_data['standard'].id},
+        {'room_type_id': occupancy_data['suite'].id, 'distinct_rooms': True},
+    ]
+    for options in cases:
+        series = occupancy_series(db_session, start, end, **options)
+        expected = {
+            day: _naive_count(db_session, day, statuses, **options)
+            for day in date_range(start, end)
+        }
+        assert series == expected, options
+
+
+def test_status_filter(db_session, occupancy_data):
+    customer = occupancy_data['customer']
+    rooms = occupancy_data['rooms']
+    day = date(2024, 7, 1)
+    _book(db_session, rooms[0], customer, day, day + timedelta(days=1))
+    _book(db_session, rooms[1], customer, day, day + timedelta(days=1),
+          status=Booking.STATUS_CHECKED_IN)
+
+    series = occupancy_series(db_session, day, day, statuses=[Booking.STATUS_RESERVED])
+
+    assert series == {day: 1}
+
+
+def test_daily_series_sums_date_column_and_zero_fills(db_session, occupancy_data):
+    customer = occupancy_data['customer']
+    room = occupancy_data['rooms'][0]
+    start = date(2024, 5, 1)
+    _book(db_session, room, customer, start, start + timedelta(days=1))
+    _book(db_session, room, customer, start, start + timedelta(days=2))
+    _book(db_session, room, customer, start + timedelta(days=2), start + timedelta(days=3))
+    _book(db_session, room, customer, start + timedelta(days=2), start + timedelta(days=3),
+          status=Booking.STATUS_CANCELLED)
+
+    series = daily_series(
+        db_session,
+        Booking.check_in_date,
+        start,
+        start + timedelta(days=3),
+        aggregate=func.sum(Booking.total_price),
+        criteria=(Booking.status != Booking.STATUS_CANCELLED,)
+    )
+
+    assert list(series) == list(date_range(start, start + timedelta(days=3)))
+    assert list(series.values()) == [200.0, 0, 100.0, 0]
+
+
+def test_daily_series_buckets_datetime_column_by_day(db_session, occupancy_data):
+    room = occupancy_data['rooms'][0]
+    day = date(2024, 5, 10)
+    for change_time in [
+        datetime(2024, 5, 9, 23, 59, 59),
+        datetime(2024, 5, 10, 0, 0),
+        datetime(2024, 5, 10, 23, 59, 59, 999999),
+        datetime(2024, 5, 11, 0, 0),
+        datetime(2024, 5, 12, 0, 0),
+    ]:
+        db_session.add(RoomStatusLog(room_id=room.id, new_status='Available', change_time=change_time))
+    db_session.flush()
+
+    series = daily_series(db_session, RoomStatusLog.change_time, day, day + timedelta(days=1))
+
+    assert series == {day: 2, day + timedelta(days=1): 1}
+
+
+def test_dashboard_histories_match_per_day_counts(db_session, occupancy_data):
+    room = occupancy_data['rooms'][0]
+    now = datetime.now()
+    for days_ago in [0, 1, 1, 3, 8]:
+        db_session.add(RoomStatusLog(
+            room_id=room.id,
+            old_status=Room.STATUS_CLEANING,
+            new_status=Room.STATUS_AVAILABLE,
+            change_time=now - timedelta(days=days_ago)
+        ))
+    db_session.flush()
+
+    history = DashboardService(db_session).get_cleaning_history(days=7)
+
+    today = now.date()
+    assert list(history) == [(today - timedelta(days=i)).strftime('%Y-%m-%d') for i in range(7, -1, -1)]
+    assert history[today.strftime('%Y-%m-%d')] == 1
+    assert history[(today - timedelta(days=1)).strftime('%Y-%m-%d')] == 2
+    assert history[(today - timedelta(days=3)).strftime('%Y-%m-%d')] == 1
+    assert sum(history.values()) == 4
@@ -0,0 +1,90 @@
+"""
+Unit tests for batch waitlist matching.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app.models.booking import Booking
+from app.models.customer import Customer
+from app.models.room import Room
+from app.models.room_type import RoomType
+from app.models.user import User
+from app.models.waitlist import Waitlist
+from app.services.waitlist_service import WaitlistService
+from app.utils.interval_index import IntervalIndex
+
+
+@pytest.fixture
+def waitlist_setup(db_session):
+    """Create two room types with a room each and a waiting customer."""
+    user = User(username='matcher_guest', email='matcher_guest@example.com', role='customer', password_hash='x')
+    standard = RoomType(name='Matcher Standard', base_rate=100.0, capacity=2)
+    suite = RoomType(name='Matcher Suite', base_rate=300.0, capacity=2)
+    db_session.add_all([user, standard, suite])
+    db_session.flush()
+    customer = Customer(user_id=user.id, name='Matcher Guest')
+    rooms = [Room(number='M101', room_type_id=standard.id, status=Room.STATUS_AVAILABLE),
+             Room(number='M501', room_type_id=suite.id, status=Room.STATUS_AVAILABLE)]
+    db_session.add(customer)
+    db_session.add_all(rooms)
+    db_session.commit()
+    return customer, standard, suite, rooms
+
+
+def test_interval_index_finds_contained_intervals():
+    index = IntervalIndex([(5, 7, 'b'), (1, 3, 'a'), (2, 6, 'c'), (5, 6, 'd'), (8, 9, 'e')])
+    assert index.contained_in(1, 7) == ['b', 'a', 'c', 'd']
+    assert index.contained_in(5, 8) == ['b', 'd']
+    assert index.contained_in(3, 5) == []
+
+
+def test_cancellations_are_matched_in_one_pass(db_session, waitlist_setup):
+    customer, standard, suite, rooms = waitlist_setup
+    start = datetime.now().date() + timedelta(days=20)
+
+    def waiting(room_type, offset, nights, status='waiting'):
+        return Waitlist(customer_id=customer.id, room_type_id=room_type.id, status=status,
+                        requested_date_start=start + timedelta(days=offset),
+                        requested_date_end=start + timedelta(days=offset + nights))
+
+    entries = [
+        waiting(standard, 0, 2),
+        waiting(standard, 1, 2),
+        waiting(standard, 2, 4),  # Outlasts the freed stay
+        waiting(suite, 0, 1),
+        waiting(standard, 0, 1, status='expired'),
+    ]
+    db_session.add_all(entries)
+    cancelled = [
+        Booking(room_id=room.id, customer_id=customer.id, check_in_date=start, check_out_date=start + timedelta(days=4),
+                status=Booking.STATUS_CANCELLED, total_price=400.0, cancellation_date=datetime.utcnow())
+        for room in rooms
+    ]
+    db_session.add_all(cancelled)
+    db_session.commit()
+    booking_ids = [booking.id for booking in cancelled]
+
+    statements = []
+    engine = db_session.get_bind().engine
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+    event.listen(engine, 'before_cursor_execute', count_statement)
+    try:
+        notified = WaitlistService(db_session).process_cancellations(booking_ids)
+    finally:
+        event.remove(engine, 'before_cursor_execute', count_statement)
+
+    # Slots, waiting entries and one bulk update
+    assert len(statements) == 3
+    assert [entry.id for entry in notified] == [entries[0].id, entries[1].id, entries[3].id]
+    assert all(entry.notification_sent and entry.notification_sent_at for entry in notified)
+    assert not db_session.get(Waitlist, entries[2].id).notification_sent
+
+    # Running again finds the same cancellations but nobody left to notify
+    notified_at = db_session.get(Waitlist, entries[0].id).notification_sent_at
+    processed, notified = WaitlistService(db_session).process_recent_cancellations()
+    assert processed == 2 and notified == []
+    assert db_session.get(Waitlist, entries[0].id).notification_sent_at == notified_at
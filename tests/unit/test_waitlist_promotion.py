@@ -0,0 +1,107 @@
+"""
+Unit tests for automatic waitlist promotion.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from app.models.booking import Booking
+from app.models.customer import Customer
+from app.models.room import Room
+from app.models.room_type import RoomType
+from app.models.user import User
+from app.models.waitlist import Waitlist
+from app.services.booking_service import BookingService
+from app.services.waitlist_service import WaitlistService
+from app.tasks.waitlist_promotion import CAPACITY_FREED, WaitlistPromotionWorker
+from app.utils.event_bus import event_bus
+
+
+@pytest.fixture
+def worker(app):
+    """Create a worker listening on the application bus, without its thread."""
+    worker = WaitlistPromotionWorker()
+    worker.attach(app)
+    yield worker
+    worker.stop()
+
+
+@pytest.fixture
+def promotion_setup(db_session):
+    """Create a booked room and two customers waiting for its dates."""
+    users = [User(username=f'promotion_guest{i}', email=f'promotion_guest{i}@example.com',
+                  role='customer', password_hash='x') for i in range(3)]
+    room_type = RoomType(name='Promotion Standard', base_rate=100.0, capacity=2)
+    db_session.add_all(users + [room_type])
+    db_session.flush()
+    customers = [Customer(user_id=user.id, name=f'Promotion Guest {i}') for i, user in enumerate(users)]
+    room = Room(number='W101', room_type_id=room_type.id, status=Room.STATUS_BOOKED)
+    db_session.add_all(customers + [room])
+    db_session.flush()
+
+    start = datetime.now().date() + timedelta(days=30)
+    booking = Booking(room_id=room.id, customer_id=customers[0].id, check_in_date=start,
+                      check_out_date=start + timedelta(days=3), status=Booking.STATUS_RESERVED, total_price=300.0)
+    entries = [
+        Waitlist(customer_id=customers[1].id, room_type_id=room_type.id, requested_date_start=start,
+                 requested_date_end=start + timedelta(days=2), created_at=datetime.utcnow() - timedelta(days=2)),
+        Waitlist(customer_id=customers[2].id, room_type_id=room_type.id, requested_date_start=start + timedelta(days=1),
+                 requested_date_end=start + timedelta(days=3), created_at=datetime.utcnow() - timedelta(days=1)),
+    ]
+    db_session.add_all(entries + [booking])
+    db_session.commit()
+    return room.id, booking.id, [entry.id for entry in entries]
+
+
+def test_cancellation_promotes_oldest_waiting_entry(db_session, worker, promotion_setup):
+    room_id, booking_id, entry_ids = promotion_setup
+
+    BookingService(db_session).cancel_booking(booking_id, reason='Plans changed')
+    assert worker.backlog == 1
+    assert worker.drain() == 1
+
+    result = worker.run_once(auto_hold=True)
+    assert result == {'slots': 1, 'notified': 1, 'holds': 1}
+    assert worker.stats()['backlog'] == 0
+
+    held, notified = (db_session.get(Waitlist, entry_id) for entry_id in entry_ids)
+    assert held.status == 'promoted'
+    assert notified.status == 'waiting' and notified.notification_sent
+    hold = db_session.query(Booking).filter(Booking.source == 'waitlist').one()
+    assert (hold.room_id, hold.customer_id) == (room_id, held.customer_id)
+
+
+def test_events_for_the_same_slot_are_coalesced(db_session, worker):
+    start = datetime.now().date() + timedelta(days=10)
+    # The last stay has already ended, so there is nothing left to resell
+    for room_id, offset, nights in [(1, 0, 2), (2, 0, 2), (1, 0, 2), (3, 0, 4), (4, -20, 2)]:
+        event_bus.publish(CAPACITY_FREED, {
+            'booking_id': None, 'room_id': room_id, 'room_type_id': 7,
+            'start_date': (start + timedelta(days=offset)).isoformat(),
+            'end_date': (start + timedelta(days=offset + nights)).isoformat()
+        })
+
+    assert worker.drain() == 5
+    assert worker.backlog == 2
+
+    # Each run takes a bounded number of slots, oldest first
+    assert worker.run_once(batch_size=1) == {'slots': 1, 'notified': 0, 'holds': 0}
+    assert worker.backlog == 1
+    assert worker.stats()['events'] == 5
+
+
+def test_failed_run_requeues_its_slots(db_session, worker, promotion_setup, monkeypatch):
+    room_id, booking_id, entry_ids = promotion_setup
+    BookingService(db_session).cancel_booking(booking_id, reason='Plans changed')
+    worker.drain()
+
+    def fail(self, slots):
+        raise RuntimeError('database went away')
+    with monkeypatch.context() as patch:
+        patch.setattr(WaitlistService, 'match_freed_slots', fail)
+        with pytest.raises(RuntimeError):
+            worker.run_once(auto_hold=True)
+    assert worker.backlog == 1
+
+    assert worker.run_once(auto_hold=True) == {'slots': 1, 'notified': 1, 'holds': 1}
+    assert worker.backlog == 0